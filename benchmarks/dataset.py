@@ -0,0 +1,702 @@
+import os
+import gzip
+import json
+import time
+import random
+import argparse
+import collections
+from datetime import datetime, timezone
+
+# Default seed of the generated data; the same seed and size always give the same issues
+DEFAULT_SEED = 1
+
+# Issues are created over this period, in UTC
+DEFAULT_START_DATE = '2024-01-01'
+DEFAULT_DAYS = 365
+
+# Work projects: blocks of BLOCK_SIZE issues, an epic first, then the stories, tasks
+# and bugs of the epic, then sub-tasks of some of those
+BLOCK_SIZE = 50
+SUBTASK_OFFSET = 40
+
+# The sub-task at offset o of a block belongs to the issue at offset o - SUBTASK_PARENT_DISTANCE
+SUBTASK_PARENT_DISTANCE = 10
+
+# Issues at offsets ending in this digit block the next issue
+BLOCKING_DIGIT = 3
+
+# One CLM request per this many issues, each with one EST and one Improvement issue.
+# They take the last issue numbers, after the work projects.
+CLM_SHARE = 100
+
+# Improvement j is realized in the epic of block 2j and in the issue at this offset of
+# block 2j + 1, so CLM analyses follow both "Epic Link" and parent queries
+REALIZATIONS_PER_IMPROVEMENT = 2
+REALIZED_ISSUE_OFFSET = 30
+
+# Project keys and the components of their issues. The components of EST issues are
+# the names the CLM analysis maps to projects (see map_components_to_projects).
+WORK_PROJECTS = [
+    ('NBSSPORTAL', ['UNIGUI', 'NBSS']),
+    ('NUS', ['NUS', 'NBSS']),
+    ('CHM', ['PRAIM', 'PRAIM_INV']),
+    ('UDB', ['UDB', 'UDB_INV']),
+    ('SSO', ['UDB']),
+    ('BILLING', ['BILLING', 'RATING']),
+]
+EST_COMPONENTS = ['UNIGUI', 'NBSS', 'NUS', 'PRAIM', 'PRAIM_INV', 'UDB', 'UDB_INV', 'BILLING', 'RATING']
+CLM_PROJECT = 'CLM'
+EST_PROJECT = 'EST'
+IMPROVEMENT_PROJECT = 'IMPR'
+PROJECT_IDS = {project: str(10100 + number) for number, project in
+               enumerate([key for key, _ in WORK_PROJECTS] + [CLM_PROJECT, EST_PROJECT, IMPROVEMENT_PROJECT])}
+COMPONENT_IDS = {component: str(10200 + number) for number, component in
+                 enumerate(sorted({name for _, names in WORK_PROJECTS for name in names} | set(EST_COMPONENTS)))}
+
+# Issue types: name -> (id, is a sub-task)
+ISSUE_TYPES = {
+    'Epic': ('10000', False),
+    'Story': ('10001', False),
+    'Task': ('3', False),
+    'Bug': ('1', False),
+    'Sub-task': ('5', True),
+    'Change Request': ('10100', False),
+    'Estimation': ('10101', False),
+    'Improvement from CLM': ('10102', False),
+}
+WORK_ISSUE_TYPES = ['Story', 'Story', 'Task', 'Task', 'Task', 'Bug']
+
+# Statuses: name -> (id, status category key)
+STATUSES = {
+    'Open': ('1', 'new'),
+    'NEW': ('10000', 'new'),
+    'In Progress': ('3', 'indeterminate'),
+    'Review': ('10001', 'indeterminate'),
+    'Testing': ('10002', 'indeterminate'),
+    'Resolved': ('5', 'done'),
+    'Closed': ('6', 'done'),
+}
+STATUS_CATEGORIES = {
+    'new': {'id': 2, 'key': 'new', 'colorName': 'blue-gray', 'name': 'To Do'},
+    'indeterminate': {'id': 4, 'key': 'indeterminate', 'colorName': 'yellow', 'name': 'In Progress'},
+    'done': {'id': 3, 'key': 'done', 'colorName': 'green', 'name': 'Done'},
+}
+
+# Statuses an issue goes through after its initial one
+WORKFLOW = ['In Progress', 'Review', 'Testing', 'Resolved', 'Closed']
+
+# Share of issues whose status never changed, and of reviewed issues sent back to work
+NO_TRANSITIONS_SHARE = 0.15
+REOPEN_SHARE = 0.1
+
+# Mean days between status transitions
+MEAN_TRANSITION_DAYS = 4
+
+# Share of started issues with more worklogs than a search response embeds
+HEAVY_WORKLOG_SHARE = 0.05
+
+# Worklogs embedded in the worklog field of a search response, as in Jira
+EMBEDDED_WORKLOGS = 20
+
+# Original estimates in hours, set for some of the issues
+ESTIMATE_HOURS = [1, 2, 4, 8, 16, 24, 40, 80]
+ESTIMATE_SHARE = 0.6
+
+# Link types: name -> (id, inward description, outward description)
+LINK_TYPES = {
+    'Blocks': ('10000', 'is blocked by', 'blocks'),
+    'Relates': ('10003', 'relates to', 'relates to'),
+    'CLM': ('10400', 'is linked from CLM', 'links CLM to'),
+    'Realization': ('10500', 'realizes', 'is realized in'),
+}
+
+# Field with the key of an issue's epic, as on most Jira Server instances
+EPIC_LINK_FIELD = 'customfield_10100'
+
+USERS = ['a.ivanov', 'm.petrova', 's.sidorov', 'e.smirnova', 'd.kuznetsov', 'o.popova', 'i.volkov',
+         'n.sokolova', 'p.lebedev', 'k.kozlova', 'v.novikov', 't.morozova']
+
+WORDS = ['billing', 'portal', 'account', 'tariff', 'invoice', 'migration', 'report', 'service', 'customer',
+         'balance', 'order', 'payment', 'profile', 'integration', 'subscription', 'notification', 'export',
+         'import', 'validation', 'catalog', 'discount', 'contract', 'provisioning', 'interface', 'cache',
+         'timeout', 'error', 'update', 'refactor', 'support', 'add', 'fix', 'remove', 'configure', 'check']
+
+# Users, statuses and issue types as Jira returns them. They are shared by all
+# generated issues, which are only ever serialized.
+USER_OBJECTS = {name: {'name': name, 'key': name, 'emailAddress': f"{name}@example.com",
+                       'displayName': ' '.join(part.capitalize() for part in reversed(name.split('.'))),
+                       'active': True, 'timeZone': 'UTC'} for name in USERS}
+STATUS_OBJECTS = {name: {'description': '', 'name': name, 'id': status_id, 'statusCategory': STATUS_CATEGORIES[category]}
+                  for name, (status_id, category) in STATUSES.items()}
+ISSUE_TYPE_OBJECTS = {name: {'id': type_id, 'description': '', 'name': name, 'subtask': subtask}
+                      for name, (type_id, subtask) in ISSUE_TYPES.items()}
+
+# Random text is cut out of one long shuffled word sequence, which is much faster
+# than picking every word
+CORPUS_WORDS = WORDS * 200
+random.Random(DEFAULT_SEED).shuffle(CORPUS_WORDS)
+CORPUS = ' '.join(CORPUS_WORDS) + ' '
+CORPUS_STARTS = [0]
+for _word in CORPUS_WORDS:
+    CORPUS_STARTS.append(CORPUS_STARTS[-1] + len(_word) + 1)
+
+# Fields that are not changed in status transitions but show up in changelogs
+CHANGELOG_NOISE_FIELDS = ['assignee', 'priority', 'Sprint', 'description', 'labels', 'Fix Version']
+
+PRIORITIES = [('1', 'Blocker'), ('2', 'Critical'), ('3', 'Major'), ('4', 'Minor')]
+
+# Random streams of an issue: structure (status, dates, worklogs), summary, and the rest of the text
+CORE_STREAM = 0
+SUMMARY_STREAM = 1
+DETAILS_STREAM = 2
+
+# Status, dates and worklogs of an issue: everything queries are evaluated on
+IssueCore = collections.namedtuple('IssueCore', [
+    'index', 'key', 'project', 'issue_type', 'status', 'component', 'created', 'updated',
+    'status_category_changed', 'transitions', 'worklogs', 'estimate'
+])
+
+
+def format_jira_time(timestamp):
+    """
+    Format a POSIX timestamp the way Jira returns dates
+
+    Args:
+        timestamp (float): POSIX timestamp
+
+    Returns:
+        str: Date like '2024-03-05T10:15:00.000+0000'
+    """
+    return time.strftime('%Y-%m-%dT%H:%M:%S.000+0000', time.gmtime(timestamp))
+
+
+def format_duration(seconds):
+    """Format seconds as a Jira duration ('1d 2h 30m', 8 hour days)"""
+    minutes = seconds // 60
+    days, minutes = divmod(minutes, 8 * 60)
+    hours, minutes = divmod(minutes, 60)
+    parts = [f"{value}{unit}" for value, unit in ((days, 'd'), (hours, 'h'), (minutes, 'm')) if value]
+    return ' '.join(parts) or '0m'
+
+
+class SyntheticDataset:
+    """
+    Deterministic synthetic Jira issues.
+
+    Issue i is generated from the seed and i alone, so any issue can be built on
+    demand and nothing is kept in memory: a dataset of a million issues costs no
+    more than one of a thousand until it is read.
+
+    The first issues form the work projects, in blocks of an epic, the issues
+    linked to it with the Epic Link field and sub-tasks of some of those. The
+    last issues are CLM requests, each related to an EST issue and linked to an
+    Improvement issue, which is realized in an epic and a story of the work
+    projects. Keys carry the issue number (NUS-1234 is issue 1233), so issues,
+    parents, epics and links are all found by arithmetic.
+    """
+
+    def __init__(self, issue_count, seed=DEFAULT_SEED, start_date=DEFAULT_START_DATE, days=DEFAULT_DAYS):
+        """
+        Args:
+            issue_count (int): Number of issues
+            seed (int): Seed of the random data
+            start_date (str): Date the first issues are created on (YYYY-MM-DD)
+            days (int): Days over which issues are created and worked on
+
+        Raises:
+            ValueError: If issue_count is less than 1
+        """
+        if issue_count < 1:
+            raise ValueError("A dataset needs at least one issue")
+
+        self.issue_count = issue_count
+        self.seed = seed
+        self.start = datetime.strptime(start_date, '%Y-%m-%d').replace(tzinfo=timezone.utc).timestamp()
+        self.end = self.start + days * 86400
+
+        # Issue numbers: work projects first, then CLM, EST and Improvement issues
+        self.clm_count = max(1, issue_count // CLM_SHARE) if issue_count >= 3 else 0
+        self.work_count = issue_count - 3 * self.clm_count
+
+    def __len__(self):
+        return self.issue_count
+
+    def _random(self, index, stream):
+        """Random generator of one stream of an issue"""
+        return random.Random(((self.seed * 4 + stream) << 32) | index)
+
+    # Structure
+
+    def _region(self, index):
+        """
+        Part of the dataset an issue belongs to
+
+        Returns:
+            tuple: ('work', block, offset) or (CLM_PROJECT/EST_PROJECT/IMPROVEMENT_PROJECT, number, None)
+        """
+        if index < self.work_count:
+            block, offset = divmod(index, BLOCK_SIZE)
+            return 'work', block, offset
+        number = index - self.work_count
+        group, number = divmod(number, self.clm_count)
+        return (CLM_PROJECT, EST_PROJECT, IMPROVEMENT_PROJECT)[group], number, None
+
+    def project(self, index):
+        """Project key of an issue"""
+        region, block, _ = self._region(index)
+        if region == 'work':
+            return WORK_PROJECTS[block % len(WORK_PROJECTS)][0]
+        return region
+
+    def issue_type(self, index):
+        """Issue type name of an issue"""
+        region, _, offset = self._region(index)
+        if region == CLM_PROJECT:
+            return 'Change Request'
+        if region == EST_PROJECT:
+            return 'Estimation'
+        if region == IMPROVEMENT_PROJECT:
+            return 'Improvement from CLM'
+        if offset == 0:
+            return 'Epic'
+        if offset >= SUBTASK_OFFSET:
+            return 'Sub-task'
+        return WORK_ISSUE_TYPES[index % len(WORK_ISSUE_TYPES)]
+
+    def key(self, index):
+        """Issue key of an issue"""
+        return f"{self.project(index)}-{index + 1}"
+
+    def index(self, key):
+        """
+        Find an issue by key
+
+        Args:
+            key (str): Issue key, any case
+
+        Returns:
+            int: Issue index, or None if there is no such issue
+        """
+        project, _, number = str(key).strip().upper().rpartition('-')
+        if not number.isdigit():
+            return None
+        index = int(number) - 1
+        if 0 <= index < self.issue_count and self.project(index) == project:
+            return index
+        return None
+
+    def parent(self, index):
+        """Index of the parent of a sub-task, None for other issues"""
+        region, _, offset = self._region(index)
+        if region == 'work' and offset >= SUBTASK_OFFSET:
+            return index - SUBTASK_PARENT_DISTANCE
+        return None
+
+    def subtasks(self, index):
+        """Indexes of the sub-tasks of an issue"""
+        region, _, offset = self._region(index)
+        if region == 'work' and SUBTASK_OFFSET - SUBTASK_PARENT_DISTANCE <= offset < SUBTASK_OFFSET:
+            subtask = index + SUBTASK_PARENT_DISTANCE
+            if subtask < self.work_count:
+                return [subtask]
+        return []
+
+    def epic(self, index):
+        """Index of the epic of an issue linked to one with the Epic Link field, None otherwise"""
+        region, block, offset = self._region(index)
+        if region == 'work' and 0 < offset < SUBTASK_OFFSET:
+            return block * BLOCK_SIZE
+        return None
+
+    def epic_issues(self, index):
+        """Indexes of the issues of an epic"""
+        region, _, offset = self._region(index)
+        if region != 'work' or offset != 0:
+            return []
+        return list(range(index + 1, min(index + SUBTASK_OFFSET, self.work_count)))
+
+    def _realized_issues(self, improvement):
+        """Indexes of the work issues an Improvement is realized in"""
+        issues = []
+        for k in range(REALIZATIONS_PER_IMPROVEMENT):
+            block = improvement * REALIZATIONS_PER_IMPROVEMENT + k
+            index = block * BLOCK_SIZE + (REALIZED_ISSUE_OFFSET if k else 0)
+            if index < self.work_count:
+                issues.append(index)
+        return issues
+
+    def links(self, index):
+        """
+        Links of an issue
+
+        Returns:
+            list: (link type name, 'outward' or 'inward', linked issue index) tuples
+        """
+        region, number, offset = self._region(index)
+        clm_start = self.work_count
+
+        if region == CLM_PROJECT:
+            return [('Relates', 'outward', clm_start + self.clm_count + number),
+                    ('CLM', 'outward', clm_start + 2 * self.clm_count + number)]
+        if region == EST_PROJECT:
+            return [('Relates', 'inward', clm_start + number)]
+        if region == IMPROVEMENT_PROJECT:
+            return [('CLM', 'inward', clm_start + number)] + [
+                ('Realization', 'outward', issue) for issue in self._realized_issues(number)]
+
+        links = []
+        if 0 < offset < SUBTASK_OFFSET:
+            if offset % 10 == BLOCKING_DIGIT and index + 1 < self.work_count and offset + 1 < SUBTASK_OFFSET:
+                links.append(('Blocks', 'outward', index + 1))
+            if offset % 10 == BLOCKING_DIGIT + 1:
+                links.append(('Blocks', 'inward', index - 1))
+
+        # Improvements realized in this issue
+        if offset in (0, REALIZED_ISSUE_OFFSET):
+            improvement, k = divmod(number, REALIZATIONS_PER_IMPROVEMENT)
+            if improvement < self.clm_count and (k == 0) == (offset == 0):
+                links.append(('Realization', 'inward', clm_start + 2 * self.clm_count + improvement))
+        return links
+
+    # Content
+
+    def core(self, index):
+        """
+        Generate the status history, dates, worklogs and estimate of an issue
+
+        Args:
+            index (int): Issue index
+
+        Returns:
+            IssueCore: Issue structure
+        """
+        rng = self._random(index, CORE_STREAM)
+        project = self.project(index)
+        span = self.end - self.start
+
+        created = self.start + rng.random() * span * 0.9
+        age = (self.end - created) / span
+
+        # Older issues are more likely to be done
+        initial = 'NEW' if project in (CLM_PROJECT, EST_PROJECT, IMPROVEMENT_PROJECT) or index % 7 == 0 else 'Open'
+        if rng.random() < NO_TRANSITIONS_SHARE:
+            steps = 0
+        elif rng.random() < 0.15 + 0.7 * age:
+            steps = len(WORKFLOW) - rng.randrange(2)
+        else:
+            steps = rng.randint(1, 3)
+
+        status = initial
+        moment = created
+        transitions = []
+        for target in WORKFLOW[:steps]:
+            moment += rng.expovariate(1 / (MEAN_TRANSITION_DAYS * 86400))
+            if moment >= self.end:
+                break
+            transitions.append((moment, status, target))
+            status = target
+
+            if target == 'Review' and rng.random() < REOPEN_SHARE:
+                moment += rng.expovariate(1 / 86400)
+                transitions.append((moment, 'Review', 'In Progress'))
+                moment += rng.expovariate(1 / 86400)
+                transitions.append((moment, 'In Progress', 'Review'))
+
+        category_changed = created
+        for moment, old, new in transitions:
+            if STATUSES[old][1] != STATUSES[new][1]:
+                category_changed = moment
+
+        # Time is logged between the start of the work and its end (or now)
+        worklogs = []
+        if transitions:
+            work_start = transitions[0][0]
+            work_end = transitions[-1][0] if STATUSES[status][1] == 'done' else self.end
+            if rng.random() < HEAVY_WORKLOG_SHARE:
+                count = rng.randint(EMBEDDED_WORKLOGS + 1, EMBEDDED_WORKLOGS * 3)
+            else:
+                count = rng.randrange(9)
+            for _ in range(count):
+                started = work_start + rng.random() * max(work_end - work_start, 3600)
+                worklogs.append((started, 900 * rng.randint(1, 32)))
+            worklogs.sort()
+
+        estimate = rng.choice(ESTIMATE_HOURS) * 3600 if rng.random() < ESTIMATE_SHARE else None
+
+        if project == EST_PROJECT:
+            component = EST_COMPONENTS[(index - self.work_count) % len(EST_COMPONENTS)]
+        elif project in (CLM_PROJECT, IMPROVEMENT_PROJECT):
+            component = None
+        else:
+            components = WORK_PROJECTS[(index // BLOCK_SIZE) % len(WORK_PROJECTS)][1]
+            component = components[rng.randrange(len(components))]
+
+        updated = max([created] + [moment for moment, _, _ in transitions[-1:]] +
+                      [started for started, _ in worklogs[-1:]])
+
+        return IssueCore(index, self.key(index), project, self.issue_type(index), status, component, created,
+                         min(updated, self.end), category_changed, transitions, worklogs, estimate)
+
+    def summary(self, index):
+        """Summary of an issue"""
+        rng = self._random(index, SUMMARY_STREAM)
+        words = rng.sample(WORDS, rng.randint(3, 8))
+        return ' '.join(words).capitalize()
+
+    def _user(self, rng):
+        """Random user as Jira returns it"""
+        return USER_OBJECTS[USERS[rng.randrange(len(USERS))]]
+
+    def _text(self, rng, min_words, max_words):
+        """Random text"""
+        count = rng.randint(min_words, max_words)
+        first = rng.randrange(len(CORPUS_WORDS) - count)
+        return CORPUS[CORPUS_STARTS[first]:CORPUS_STARTS[first + count] - 1].capitalize() + '.'
+
+    def _issue_ref(self, index):
+        """Short form of another issue, as in links, parents and sub-tasks"""
+        core = self.core(index)
+        return {
+            'id': str(10000 + index),
+            'key': core.key,
+            'fields': {
+                'summary': self.summary(index),
+                'status': STATUS_OBJECTS[core.status],
+                'issuetype': ISSUE_TYPE_OBJECTS[core.issue_type]
+            }
+        }
+
+    def worklog(self, core, number):
+        """Worklog of an issue as Jira returns it"""
+        started, seconds = core.worklogs[number]
+        author = USER_OBJECTS[USERS[(core.index + number) % len(USERS)]]
+        return {
+            'author': author,
+            'updateAuthor': author,
+            'comment': '',
+            'created': format_jira_time(started),
+            'updated': format_jira_time(started),
+            'started': format_jira_time(started),
+            'timeSpent': format_duration(seconds),
+            'timeSpentSeconds': seconds,
+            'id': str(core.index * 1000 + number),
+            'issueId': str(10000 + core.index)
+        }
+
+    def worklogs(self, index):
+        """
+        All worklogs of an issue, as the issue worklog endpoint returns them
+
+        Args:
+            index (int): Issue index
+
+        Returns:
+            list: Worklog dictionaries, oldest first
+        """
+        core = self.core(index)
+        return [self.worklog(core, number) for number in range(len(core.worklogs))]
+
+    def _changelog(self, core, rng):
+        """Changelog with the status transitions of an issue and unrelated edits"""
+        events = [(moment, 'status', old, new) for moment, old, new in core.transitions]
+        for _ in range(rng.randrange(8)):
+            moment = core.created + rng.random() * (core.updated - core.created)
+            events.append((moment, rng.choice(CHANGELOG_NOISE_FIELDS), None, None))
+        events.sort(key=lambda event: event[0])
+
+        histories = []
+        for number, (moment, field, old, new) in enumerate(events):
+            if field == 'status':
+                item = {'field': 'status', 'fieldtype': 'jira', 'from': STATUSES[old][0], 'fromString': old,
+                        'to': STATUSES[new][0], 'toString': new}
+            else:
+                item = {'field': field, 'fieldtype': 'jira' if field != 'Sprint' else 'custom',
+                        'from': None, 'fromString': rng.choice(WORDS), 'to': None, 'toString': rng.choice(WORDS)}
+            histories.append({
+                'id': str(core.index * 100 + number),
+                'author': self._user(rng),
+                'created': format_jira_time(moment),
+                'items': [item]
+            })
+
+        return {'startAt': 0, 'maxResults': len(histories), 'total': len(histories), 'histories': histories}
+
+    def issue(self, index, fields=None, expand=()):
+        """
+        Generate an issue as the Jira search and issue endpoints return it
+
+        Args:
+            index (int): Issue index
+            fields (set): Names of the fields to include, all fields if None
+            expand (tuple): Expansions, 'changelog' is supported
+
+        Returns:
+            dict: Issue dictionary
+        """
+        core = self.core(index)
+        rng = self._random(index, DETAILS_STREAM)
+        issue_id = str(10000 + index)
+
+        def wanted(name):
+            return fields is None or name in fields
+
+        data = {}
+        if wanted('project'):
+            data['project'] = {'id': PROJECT_IDS[core.project], 'key': core.project,
+                               'name': f"Project {core.project}", 'projectTypeKey': 'software'}
+        if wanted('summary'):
+            data['summary'] = self.summary(index)
+        if wanted('description'):
+            data['description'] = ' '.join(self._text(rng, 5, 15) for _ in range(rng.randint(1, 6)))
+        if wanted('issuetype'):
+            data['issuetype'] = ISSUE_TYPE_OBJECTS[core.issue_type]
+        if wanted('priority'):
+            priority_id, priority = PRIORITIES[index % len(PRIORITIES)]
+            data['priority'] = {'id': priority_id, 'name': priority}
+        if wanted('status'):
+            data['status'] = STATUS_OBJECTS[core.status]
+        if wanted('statuscategorychangedate'):
+            data['statuscategorychangedate'] = format_jira_time(core.status_category_changed)
+        if wanted('created'):
+            data['created'] = format_jira_time(core.created)
+        if wanted('updated'):
+            data['updated'] = format_jira_time(core.updated)
+        if wanted('resolutiondate') or wanted('resolution'):
+            done = STATUSES[core.status][1] == 'done'
+            if wanted('resolutiondate'):
+                data['resolutiondate'] = format_jira_time(core.status_category_changed) if done else None
+            if wanted('resolution'):
+                data['resolution'] = {'id': '10000', 'name': 'Done'} if done else None
+        if wanted('assignee'):
+            data['assignee'] = self._user(rng)
+        if wanted('reporter'):
+            data['reporter'] = self._user(rng)
+        if wanted('labels'):
+            data['labels'] = rng.sample(WORDS, rng.randrange(3))
+
+        time_spent = sum(seconds for _, seconds in core.worklogs) or None
+        if wanted('timeoriginalestimate'):
+            data['timeoriginalestimate'] = core.estimate
+        if wanted('timeestimate'):
+            data['timeestimate'] = max((core.estimate or 0) - (time_spent or 0), 0) if core.estimate else None
+        if wanted('timespent'):
+            data['timespent'] = time_spent
+        if wanted('aggregatetimespent'):
+            data['aggregatetimespent'] = time_spent
+
+        if wanted('worklog'):
+            embedded = min(len(core.worklogs), EMBEDDED_WORKLOGS)
+            data['worklog'] = {'startAt': 0, 'maxResults': EMBEDDED_WORKLOGS, 'total': len(core.worklogs),
+                               'worklogs': [self.worklog(core, number) for number in range(embedded)]}
+
+        if wanted('comment'):
+            comments = []
+            for number in range(rng.randrange(6) if core.transitions else rng.randrange(2)):
+                moment = core.created + rng.random() * (core.updated - core.created)
+                author = self._user(rng)
+                comments.append({'id': str(index * 100 + number), 'author': author, 'updateAuthor': author,
+                                 'body': ' '.join(self._text(rng, 5, 20) for _ in range(rng.randint(1, 4))),
+                                 'created': format_jira_time(moment), 'updated': format_jira_time(moment)})
+            data['comment'] = {'comments': comments, 'maxResults': len(comments), 'total': len(comments), 'startAt': 0}
+
+        if wanted('attachment'):
+            attachments = []
+            for number in range(rng.randint(1, 3) if rng.random() < 0.2 else 0):
+                attachment_id = str(index * 10 + number)
+                attachments.append({'id': attachment_id, 'filename': f"screenshot_{number}.png",
+                                    'author': self._user(rng), 'created': format_jira_time(core.created),
+                                    'size': rng.randint(10000, 900000), 'mimeType': 'image/png',
+                                    'content': f"/secure/attachment/{attachment_id}/screenshot_{number}.png"})
+            data['attachment'] = attachments
+
+        if wanted('components'):
+            data['components'] = [{'id': COMPONENT_IDS[core.component], 'name': core.component}
+                                  ] if core.component else []
+
+        if wanted('issuelinks'):
+            issuelinks = []
+            for number, (link_type, direction, other) in enumerate(self.links(index)):
+                type_id, inward, outward = LINK_TYPES[link_type]
+                issuelinks.append({
+                    'id': str(index * 10 + number),
+                    'type': {'id': type_id, 'name': link_type, 'inward': inward, 'outward': outward},
+                    f"{direction}Issue": self._issue_ref(other)
+                })
+            data['issuelinks'] = issuelinks
+
+        if wanted('subtasks'):
+            data['subtasks'] = [self._issue_ref(subtask) for subtask in self.subtasks(index)]
+        if wanted('parent'):
+            parent = self.parent(index)
+            if parent is not None:
+                data['parent'] = self._issue_ref(parent)
+        if wanted(EPIC_LINK_FIELD):
+            epic = self.epic(index)
+            data[EPIC_LINK_FIELD] = self.key(epic) if epic is not None else None
+
+        issue = {'expand': 'operations,changelog', 'id': issue_id, 'key': core.key, 'fields': data}
+        if 'changelog' in expand:
+            issue['changelog'] = self._changelog(core, rng)
+        return issue
+
+
+def write_search_responses(dataset, output_dir, page_size=100, fields=None, expand=('changelog',), compress=False):
+    """
+    Write the whole dataset as the pages of a search for all issues
+
+    Pages are written one at a time, so any size fits in memory. Files are
+    named by the startAt of their page, e.g. search_0000100.json.
+
+    Args:
+        dataset (SyntheticDataset): Issues to write
+        output_dir (str): Directory for the pages, created if needed
+        page_size (int): Issues per page
+        fields (set): Names of the fields to include, all fields if None
+        expand (tuple): Expansions, 'changelog' is supported
+        compress (bool): Write gzip files (.json.gz)
+
+    Returns:
+        int: Number of pages written
+    """
+    os.makedirs(output_dir, exist_ok=True)
+
+    pages = 0
+    for start_at in range(0, len(dataset), page_size):
+        indexes = range(start_at, min(start_at + page_size, len(dataset)))
+        response = {
+            'expand': 'schema,names',
+            'startAt': start_at,
+            'maxResults': page_size,
+            'total': len(dataset),
+            'issues': [dataset.issue(index, fields, expand) for index in indexes]
+        }
+
+        name = f"search_{start_at:07d}.json"
+        if compress:
+            with gzip.open(os.path.join(output_dir, name + '.gz'), 'wt', encoding='utf-8') as f:
+                json.dump(response, f, ensure_ascii=False)
+        else:
+            with open(os.path.join(output_dir, name), 'w', encoding='utf-8') as f:
+                json.dump(response, f, ensure_ascii=False)
+        pages += 1
+
+    return pages
+
+
+def main():
+    """Write a synthetic dataset as search responses"""
+    parser = argparse.ArgumentParser(description='Write synthetic Jira search responses')
+    parser.add_argument('--issues', type=int, default=1000, help='Number of issues')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help='Seed of the random data')
+    parser.add_argument('--output', required=True, help='Directory for the response pages')
+    parser.add_argument('--page-size', type=int, default=100, help='Issues per page')
+    parser.add_argument('--gzip', action='store_true', help='Compress the pages')
+    args = parser.parse_args()
+
+    dataset = SyntheticDataset(args.issues, seed=args.seed)
+    pages = write_search_responses(dataset, args.output, args.page_size, compress=args.gzip)
+    print(f"Wrote {len(dataset)} issues in {pages} pages to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,475 @@
+import re
+import sys
+import gzip
+import json
+import time
+import logging
+import argparse
+import threading
+from urllib.parse import urlsplit, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from benchmarks.dataset import SyntheticDataset, DEFAULT_SEED, WORK_PROJECTS, CLM_PROJECT, USER_OBJECTS, USERS
+from benchmarks.jql import JqlEngine, JqlError, JqlParser
+
+# Get logger
+logger = logging.getLogger(__name__)
+
+# Saved filters of a new fake Jira: the default filters of modules.analysis.run_analysis
+DEFAULT_FILTERS = {
+    '114476': {'name': 'Work projects', 'jql': f"project in ({', '.join(key for key, _ in WORK_PROJECTS)})"},
+    '114473': {'name': 'CLM requests', 'jql': f"project = {CLM_PROJECT}"},
+}
+
+# IDs of filters created through the API start here
+FIRST_FILTER_ID = 200000
+
+# Search page size when the request sets none, and the largest one allowed, as in Jira
+DEFAULT_MAX_RESULTS = 50
+MAX_RESULTS = 1000
+
+# gzip level of compressed responses
+GZIP_LEVEL = 6
+
+# User the token belongs to; queries use its time zone
+CURRENT_USER = dict(USER_OBJECTS[USERS[0]], timeZone='UTC')
+
+# Route of the request counters of the fake Jira itself
+STATS_PATH = '/rest/benchmark/1.0/stats'
+
+
+class JiraHttpError(Exception):
+    """Error response with Jira's error body"""
+
+    def __init__(self, status, messages=None, errors=None):
+        """
+        Args:
+            status (int): HTTP status code
+            messages (list): Entries of errorMessages
+            errors (dict): Entries of errors, field name -> message
+        """
+        super().__init__(status, messages, errors)
+        self.status = status
+        self.body = {'errorMessages': messages or [], 'errors': errors or {}}
+
+
+def parse_list(value):
+    """
+    Read a list parameter given as a JSON list or a comma separated string
+
+    Returns:
+        list: Stripped non-empty items
+    """
+    if value is None:
+        return []
+    if isinstance(value, str):
+        value = value.split(',')
+    return [str(item).strip() for item in value if str(item).strip()]
+
+
+def parse_fields(value):
+    """
+    Read the fields parameter of a search or issue request
+
+    Returns:
+        set: Field names to return, or None for all fields ('*all', '*navigable' or no parameter)
+    """
+    fields = parse_list(value)
+    if not fields or any(field in ('*all', '*navigable') for field in fields):
+        return None
+    return {field for field in fields if not field.startswith('-')}
+
+
+class FakeJira:
+    """
+    Local Jira REST API v2 serving a SyntheticDataset.
+
+    Implements what the application calls: /myself, /search (GET and POST, with
+    fields, expand=changelog, paging and validateQuery), /issue/{key},
+    /issue/{key}/worklog and saved filters. Responses are gzip-compressed when
+    the client accepts it, as Jira does, and may be delayed by a fixed latency.
+    Requests must carry an Authorization header, but any token is accepted.
+    """
+
+    def __init__(self, dataset, host='127.0.0.1', port=0, latency=0.0, compress=True, filters=None):
+        """
+        Args:
+            dataset (SyntheticDataset): Issues to serve
+            host (str): Interface to listen on
+            port (int): Port to listen on, 0 for any free port
+            latency (float): Seconds added to every API response
+            compress (bool): Compress responses for clients that accept gzip
+            filters (dict): Saved filters, filter ID -> {'name', 'jql'}; DEFAULT_FILTERS by default
+        """
+        self.dataset = dataset
+        self.latency = latency
+        self.compress = compress
+        self.filters = {filter_id: dict(saved, id=filter_id)
+                        for filter_id, saved in (filters if filters is not None else DEFAULT_FILTERS).items()}
+        self.engine = JqlEngine(dataset, self.filters)
+
+        self._next_filter_id = FIRST_FILTER_ID
+        self._filters_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.stats = {'requests': 0, 'errors': 0, 'issues': 0, 'bytes': 0, 'wire_bytes': 0}
+
+        self._server = ThreadingHTTPServer((host, port), FakeJiraHandler)
+        self._server.daemon_threads = True
+        self._server.jira = self
+        self._thread = None
+
+    @property
+    def url(self):
+        """Base URL of the fake Jira"""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def prepare(self):
+        """Index the issues for queries now rather than on the first search"""
+        started = time.perf_counter()
+        table = self.engine.table
+        logger.info(f"Indexed {len(table.created)} issues in {time.perf_counter() - started:.1f}s")
+
+    def start(self):
+        """Serve requests in a background thread"""
+        self._thread = threading.Thread(target=self._server.serve_forever, name='fake-jira', daemon=True)
+        self._thread.start()
+
+    def serve_forever(self):
+        """Serve requests in the current thread until stop() is called"""
+        self._server.serve_forever()
+
+    def stop(self):
+        """Stop serving and close the socket"""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def get_stats(self):
+        """
+        Get the request counters of the fake Jira
+
+        Returns:
+            dict: Requests, error responses, issues returned, response bytes before and after
+                  compression, and CPU seconds of this process
+        """
+        with self._stats_lock:
+            stats = dict(self.stats)
+        stats['cpu_seconds'] = time.process_time()
+        return stats
+
+    def count(self, status, issues, size, wire_size):
+        """Add a response to the counters"""
+        with self._stats_lock:
+            self.stats['requests'] += 1
+            self.stats['errors'] += status >= 400
+            self.stats['issues'] += issues
+            self.stats['bytes'] += size
+            self.stats['wire_bytes'] += wire_size
+
+    # API
+
+    def myself(self):
+        """GET /rest/api/2/myself"""
+        return CURRENT_USER
+
+    def search(self, params):
+        """
+        GET or POST /rest/api/2/search
+
+        Args:
+            params (dict): jql, startAt, maxResults, fields, expand and validateQuery
+
+        Returns:
+            dict: Search response
+        """
+        start_at = max(int(params.get('startAt') or 0), 0)
+        max_results = min(max(int(params.get('maxResults') or DEFAULT_MAX_RESULTS), 0), MAX_RESULTS)
+
+        validate = params.get('validateQuery', 'strict')
+        if validate in (True, 'true'):
+            validate = 'strict'
+        elif validate in (False, 'false'):
+            validate = 'none'
+
+        try:
+            indexes, warnings = self.engine.search(params.get('jql') or '', validate)
+        except JqlError as e:
+            raise JiraHttpError(400, [str(e)])
+
+        fields = parse_fields(params.get('fields'))
+        expand = parse_list(params.get('expand'))
+        response = {
+            'expand': 'schema,names',
+            'startAt': start_at,
+            'maxResults': max_results,
+            'total': len(indexes),
+            'issues': [self.dataset.issue(index, fields, expand)
+                       for index in indexes[start_at:start_at + max_results]]
+        }
+        if warnings:
+            response['warningMessages'] = warnings
+        return response
+
+    def _find_issue(self, key):
+        """Issue index of a key or ID from a URL"""
+        index = self.dataset.index(key)
+        if index is None and key.isdigit() and 0 <= int(key) - 10000 < len(self.dataset):
+            index = int(key) - 10000
+        if index is None:
+            raise JiraHttpError(404, ['Issue Does Not Exist'])
+        return index
+
+    def get_issue(self, key, params):
+        """GET /rest/api/2/issue/{key}"""
+        index = self._find_issue(key)
+        return self.dataset.issue(index, parse_fields(params.get('fields')), parse_list(params.get('expand')))
+
+    def get_worklogs(self, key, params):
+        """GET /rest/api/2/issue/{key}/worklog"""
+        worklogs = self.dataset.worklogs(self._find_issue(key))
+        start_at = max(int(params.get('startAt') or 0), 0)
+        max_results = int(params.get('maxResults') or len(worklogs) or 1)
+        return {'startAt': start_at, 'maxResults': max_results, 'total': len(worklogs),
+                'worklogs': worklogs[start_at:start_at + max_results]}
+
+    def _filter_response(self, saved):
+        """Saved filter as Jira returns it"""
+        return {
+            'self': f"{self.url}/rest/api/2/filter/{saved['id']}",
+            'id': saved['id'],
+            'name': saved['name'],
+            'description': saved.get('description', ''),
+            'owner': CURRENT_USER,
+            'jql': saved['jql'],
+            'viewUrl': f"{self.url}/issues/?filter={saved['id']}",
+            'searchUrl': f"{self.url}/rest/api/2/search?jql=filter%3D{saved['id']}",
+            'favourite': False
+        }
+
+    def _check_jql(self, jql):
+        """Reject a filter query Jira could not parse"""
+        try:
+            JqlParser(jql or '').parse()
+        except JqlError as e:
+            raise JiraHttpError(400, errors={'jql': str(e)})
+
+    def get_filter(self, filter_id):
+        """GET /rest/api/2/filter/{id}"""
+        with self._filters_lock:
+            saved = self.filters.get(filter_id)
+            if saved is None:
+                raise JiraHttpError(404, [f"The selected filter with id '{filter_id}' does not exist."])
+            return self._filter_response(saved)
+
+    def create_filter(self, body):
+        """POST /rest/api/2/filter"""
+        name = (body.get('name') or '').strip()
+        if not name:
+            raise JiraHttpError(400, errors={'filterName': 'You must specify a name to save this filter as.'})
+        self._check_jql(body.get('jql'))
+
+        with self._filters_lock:
+            if any(saved['name'].lower() == name.lower() for saved in self.filters.values()):
+                raise JiraHttpError(400, errors={'filterName': 'Filter with same name already exists.'})
+            filter_id = str(self._next_filter_id)
+            self._next_filter_id += 1
+            self.filters[filter_id] = {'id': filter_id, 'name': name, 'jql': body.get('jql') or '',
+                                       'description': body.get('description') or ''}
+            return self._filter_response(self.filters[filter_id])
+
+    def update_filter(self, filter_id, body):
+        """PUT /rest/api/2/filter/{id}"""
+        with self._filters_lock:
+            saved = self.filters.get(filter_id)
+            if saved is None:
+                raise JiraHttpError(404, [f"The selected filter with id '{filter_id}' does not exist."])
+            if 'jql' in body:
+                self._check_jql(body['jql'])
+                saved['jql'] = body['jql'] or ''
+            for field in ('name', 'description'):
+                if field in body:
+                    saved[field] = body[field]
+            response = self._filter_response(saved)
+
+        # Cached results of queries that use the filter are stale now
+        self.engine.clear_cache()
+        return response
+
+    def delete_filter(self, filter_id):
+        """DELETE /rest/api/2/filter/{id}"""
+        with self._filters_lock:
+            if self.filters.pop(filter_id, None) is None:
+                raise JiraHttpError(404, [f"The selected filter with id '{filter_id}' does not exist."])
+
+        self.engine.clear_cache()
+        return None
+
+
+class FakeJiraHandler(BaseHTTPRequestHandler):
+    """HTTP front end of a FakeJira (the server's jira attribute)"""
+
+    protocol_version = 'HTTP/1.1'
+
+    # (method, path pattern, handler name)
+    ROUTES = [
+        ('GET', re.compile(r'^/$'), '_home'),
+        ('GET', re.compile(r'^/rest/api/2/myself$'), '_myself'),
+        ('GET', re.compile(r'^/rest/api/2/search$'), '_search'),
+        ('POST', re.compile(r'^/rest/api/2/search$'), '_search'),
+        ('GET', re.compile(r'^/rest/api/2/issue/(?P<key>[^/]+)$'), '_issue'),
+        ('GET', re.compile(r'^/rest/api/2/issue/(?P<key>[^/]+)/worklog$'), '_worklogs'),
+        ('POST', re.compile(r'^/rest/api/2/filter$'), '_create_filter'),
+        ('GET', re.compile(r'^/rest/api/2/filter/(?P<filter_id>\d+)$'), '_get_filter'),
+        ('PUT', re.compile(r'^/rest/api/2/filter/(?P<filter_id>\d+)$'), '_update_filter'),
+        ('DELETE', re.compile(r'^/rest/api/2/filter/(?P<filter_id>\d+)$'), '_delete_filter'),
+        ('GET', re.compile(f"^{re.escape(STATS_PATH)}$"), '_stats'),
+    ]
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} {format % args}")
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def do_PUT(self):
+        self._dispatch('PUT')
+
+    def do_DELETE(self):
+        self._dispatch('DELETE')
+
+    def _dispatch(self, method):
+        jira = self.server.jira
+        url = urlsplit(self.path)
+        self.params = {name: values[-1] for name, values in parse_qs(url.query).items()}
+
+        # The request body must be read even when the request fails, or the connection can't be reused
+        length = int(self.headers.get('Content-Length') or 0)
+        self.raw_body = self.rfile.read(length) if length else b''
+
+        try:
+            for route_method, pattern, handler_name in self.ROUTES:
+                match = pattern.match(url.path)
+                if match and route_method == method:
+                    break
+            else:
+                raise JiraHttpError(404, [f"No resource {method} {url.path}"])
+
+            if url.path.startswith('/rest/api/') and not self.headers.get('Authorization'):
+                raise JiraHttpError(401, ['You are not authenticated. Authentication required to perform this operation.'])
+
+            if jira.latency and url.path.startswith('/rest/api/'):
+                time.sleep(jira.latency)
+
+            body = getattr(self, handler_name)(jira, **match.groupdict())
+            # Handlers without a response body answer 204 No Content, as Jira does for deletes
+            status = 200 if body is not None else 204
+        except JiraHttpError as e:
+            status, body = e.status, e.body
+        except (ValueError, json.JSONDecodeError) as e:
+            status, body = 400, {'errorMessages': [f"Invalid request: {e}"], 'errors': {}}
+        except Exception as e:
+            logger.error(f"Error handling {method} {self.path}: {e}", exc_info=True)
+            status, body = 500, {'errorMessages': [str(e)], 'errors': {}}
+
+        self._send(jira, status, body)
+
+    def _json_body(self):
+        """Decoded JSON request body"""
+        return json.loads(self.raw_body or b'{}')
+
+    def _send(self, jira, status, body):
+        if body is None:
+            data = b''
+            content_type = 'application/json;charset=UTF-8'
+        elif isinstance(body, str):
+            data = body.encode('utf-8')
+            content_type = 'text/html; charset=UTF-8'
+        else:
+            data = json.dumps(body, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+            content_type = 'application/json;charset=UTF-8'
+
+        size = len(data)
+        compressed = data and jira.compress and 'gzip' in (self.headers.get('Accept-Encoding') or '')
+        if compressed:
+            data = gzip.compress(data, GZIP_LEVEL)
+
+        issues = body.get('issues') if isinstance(body, dict) else None
+        jira.count(status, len(issues) if isinstance(issues, list) else 0, size, len(data))
+
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        if compressed:
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    # Routes
+
+    def _home(self, jira):
+        return '<html><head><title>Fake Jira</title></head><body>Fake Jira for benchmarks</body></html>'
+
+    def _myself(self, jira):
+        return jira.myself()
+
+    def _search(self, jira):
+        params = self._json_body() if self.command == 'POST' else self.params
+        return jira.search(params)
+
+    def _issue(self, jira, key):
+        return jira.get_issue(key, self.params)
+
+    def _worklogs(self, jira, key):
+        return jira.get_worklogs(key, self.params)
+
+    def _create_filter(self, jira):
+        return jira.create_filter(self._json_body())
+
+    def _get_filter(self, jira, filter_id):
+        return jira.get_filter(filter_id)
+
+    def _update_filter(self, jira, filter_id):
+        return jira.update_filter(filter_id, self._json_body())
+
+    def _delete_filter(self, jira, filter_id):
+        return jira.delete_filter(filter_id)
+
+    def _stats(self, jira):
+        return jira.get_stats()
+
+
+def main():
+    """Serve a synthetic dataset until interrupted"""
+    parser = argparse.ArgumentParser(description='Fake Jira serving synthetic issues')
+    parser.add_argument('--issues', type=int, default=1000, help='Number of issues')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help='Seed of the random data')
+    parser.add_argument('--host', default='127.0.0.1', help='Interface to listen on')
+    parser.add_argument('--port', type=int, default=8080, help='Port to listen on, 0 for any free port')
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every API response')
+    parser.add_argument('--no-compress', action='store_true', help='Never compress responses')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    jira = FakeJira(SyntheticDataset(args.issues, seed=args.seed), host=args.host, port=args.port,
+                    latency=args.latency, compress=not args.no_compress)
+    jira.prepare()
+
+    # The benchmark runner waits for this line
+    print(f"Fake Jira with {args.issues} issues listening on {jira.url}", flush=True)
+    try:
+        jira.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        jira._server.server_close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
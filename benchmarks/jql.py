@@ -0,0 +1,626 @@
+import re
+import array
+import threading
+import collections
+from datetime import datetime, timezone
+
+from benchmarks.dataset import (STATUSES, STATUS_CATEGORIES, ISSUE_TYPES, PROJECT_IDS, COMPONENT_IDS,
+                                LINK_TYPES, EPIC_LINK_FIELD)
+
+# Number of query results kept by a JqlEngine, so paging through a result set
+# evaluates its query once
+RESULT_CACHE_SIZE = 64
+
+# Saved filters may refer to other filters this deep
+MAX_FILTER_DEPTH = 5
+
+TOKEN_PATTERN = re.compile(r"""
+    \s*(?:
+        (?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+      | (?P<operator>!=|>=|<=|!~|=|>|<|~)
+      | (?P<punctuation>[(),])
+      | (?P<word>[^\s"'(),=!<>~]+)
+    )""", re.VERBOSE)
+
+# Accepted spellings of the fields queries can use
+FIELD_ALIASES = {
+    'project': 'project',
+    'issuetype': 'issuetype',
+    'type': 'issuetype',
+    'status': 'status',
+    'statuscategory': 'statuscategory',
+    'component': 'component',
+    'key': 'key',
+    'issuekey': 'key',
+    'issue': 'key',
+    'id': 'key',
+    'parent': 'parent',
+    'epic link': 'epic',
+    EPIC_LINK_FIELD: 'epic',
+    f"cf[{EPIC_LINK_FIELD.split('_')[1]}]": 'epic',
+    'created': 'created',
+    'createddate': 'created',
+    'updated': 'updated',
+    'updateddate': 'updated',
+    'worklogdate': 'worklogdate',
+    'filter': 'filter',
+    'request': 'filter',
+    'savedfilter': 'filter',
+    'searchrequest': 'filter',
+}
+
+# Operators each kind of field supports
+EQUALITY_OPERATORS = {'=', '!=', 'in', 'not in'}
+DATE_OPERATORS = {'=', '!=', '>', '>=', '<', '<='}
+
+# Relative dates: '-7d', '2w', '-12h', '-30m'
+RELATIVE_DATE_PATTERN = re.compile(r'^([+-]?)(\d+)([wdhm])$')
+RELATIVE_DATE_UNITS = {'w': 7 * 86400, 'd': 86400, 'h': 3600, 'm': 60}
+DATE_FORMATS = ['%Y-%m-%d %H:%M', '%Y/%m/%d %H:%M', '%Y-%m-%d', '%Y/%m/%d']
+
+
+class JqlError(Exception):
+    """Query Jira would reject, with Jira's error message"""
+
+
+def tokenize(jql):
+    """
+    Split JQL into tokens
+
+    Args:
+        jql (str): Query
+
+    Returns:
+        list: (kind, text) tuples; strings are unquoted
+
+    Raises:
+        JqlError: On characters that can't start a token
+    """
+    tokens = []
+    position = 0
+    jql = jql.rstrip()
+    while position < len(jql):
+        match = TOKEN_PATTERN.match(jql, position)
+        if match is None or match.end() == position:
+            raise JqlError(f"Error in the JQL Query: the character '{jql[position]}' "
+                           f"is a reserved JQL character (line 1, character {position + 1}).")
+        kind = match.lastgroup
+        text = match.group(kind)
+        if kind == 'string':
+            text = re.sub(r'\\(.)', r'\1', text[1:-1])
+        tokens.append((kind, text))
+        position = match.end()
+    return tokens
+
+
+class JqlParser:
+    """
+    Recursive descent parser of the JQL subset the application sends.
+
+    Produces nested tuples: ('or', [nodes]), ('and', [nodes]), ('not', node) and
+    ('clause', field, operator, operand). An operand is ('value', text),
+    ('list', [texts]), ('function', name, [arguments]) or ('empty',).
+    """
+
+    def __init__(self, jql):
+        self.tokens = tokenize(jql)
+        self.position = 0
+
+    def parse(self):
+        """
+        Parse the whole query
+
+        Returns:
+            tuple: (condition node or None for an empty query, [(field, descending)] ordering)
+        """
+        condition = None
+        if self._peek() and not self._is_keyword('order'):
+            condition = self._parse_or()
+
+        order_by = []
+        if self._accept_keyword('order'):
+            self._expect_keyword('by')
+            while True:
+                field = self._expect_value()
+                descending = False
+                if self._accept_keyword('desc'):
+                    descending = True
+                else:
+                    self._accept_keyword('asc')
+                order_by.append((field.lower(), descending))
+                if not self._accept(','):
+                    break
+
+        if self._peek():
+            raise JqlError(f"Error in the JQL Query: Expecting either 'OR' or 'AND' but got '{self._peek()[1]}'.")
+        return condition, order_by
+
+    def _peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def _next(self):
+        token = self._peek()
+        if token is None:
+            raise JqlError("Error in the JQL Query: The query ended unexpectedly.")
+        self.position += 1
+        return token
+
+    def _is_keyword(self, keyword):
+        token = self._peek()
+        return token is not None and token[0] == 'word' and token[1].lower() == keyword
+
+    def _accept_keyword(self, keyword):
+        if self._is_keyword(keyword):
+            self.position += 1
+            return True
+        return False
+
+    def _expect_keyword(self, keyword):
+        if not self._accept_keyword(keyword):
+            raise JqlError(f"Error in the JQL Query: Expecting '{keyword.upper()}'.")
+
+    def _accept(self, text):
+        token = self._peek()
+        if token is not None and token[0] in ('punctuation', 'operator') and token[1] == text:
+            self.position += 1
+            return True
+        return False
+
+    def _expect(self, text):
+        if not self._accept(text):
+            token = self._peek()
+            raise JqlError(f"Error in the JQL Query: Expecting '{text}' but got "
+                           f"'{token[1] if token else 'the end of the query'}'.")
+
+    def _expect_value(self):
+        kind, text = self._next()
+        if kind not in ('word', 'string'):
+            raise JqlError(f"Error in the JQL Query: Expecting a field name or value but got '{text}'.")
+        return text
+
+    def _parse_or(self):
+        nodes = [self._parse_and()]
+        while self._accept_keyword('or'):
+            nodes.append(self._parse_and())
+        return nodes[0] if len(nodes) == 1 else ('or', nodes)
+
+    def _parse_and(self):
+        nodes = [self._parse_not()]
+        while self._accept_keyword('and'):
+            nodes.append(self._parse_not())
+        return nodes[0] if len(nodes) == 1 else ('and', nodes)
+
+    def _parse_not(self):
+        if self._accept_keyword('not'):
+            return 'not', self._parse_not()
+        if self._accept('('):
+            node = self._parse_or()
+            self._expect(')')
+            return node
+        return self._parse_clause()
+
+    def _parse_clause(self):
+        field = self._expect_value()
+
+        kind, text = self._next()
+        if kind == 'operator':
+            operator = text
+        elif kind == 'word' and text.lower() == 'in':
+            operator = 'in'
+        elif kind == 'word' and text.lower() == 'not' and self._accept_keyword('in'):
+            operator = 'not in'
+        elif kind == 'word' and text.lower() == 'is':
+            operator = 'is not' if self._accept_keyword('not') else 'is'
+        else:
+            raise JqlError(f"Error in the JQL Query: Expecting operator but got '{text}'.")
+
+        if operator in ('is', 'is not'):
+            if not (self._accept_keyword('empty') or self._accept_keyword('null')):
+                raise JqlError("Error in the JQL Query: Expecting 'EMPTY' or 'NULL'.")
+            return 'clause', field, operator, ('empty',)
+
+        if self._accept('('):
+            values = []
+            if not self._accept(')'):
+                while True:
+                    values.append(self._parse_value())
+                    if self._accept(')'):
+                        break
+                    self._expect(',')
+            return 'clause', field, operator, ('list', values)
+
+        return 'clause', field, operator, self._parse_value()
+
+    def _parse_value(self):
+        """A value, or a function call"""
+        kind, text = self._next()
+        if kind not in ('word', 'string'):
+            raise JqlError(f"Error in the JQL Query: Expecting a value but got '{text}'.")
+
+        if kind == 'word' and self._accept('('):
+            arguments = []
+            if not self._accept(')'):
+                while True:
+                    arguments.append(self._expect_value())
+                    if self._accept(')'):
+                        break
+                    self._expect(',')
+            return 'function', text, arguments
+
+        return 'value', text
+
+
+class IssueTable:
+    """
+    Query columns of every issue of a dataset, built once.
+
+    Holds codes and timestamps in arrays, so even a million issues take a few
+    dozen megabytes and a query scans them without generating any issue.
+    """
+
+    def __init__(self, dataset):
+        """
+        Args:
+            dataset (SyntheticDataset): Issues to index
+        """
+        self.projects = list(PROJECT_IDS)
+        self.issue_types = list(ISSUE_TYPES)
+        self.statuses = list(STATUSES)
+        self.components = [None] + list(COMPONENT_IDS)
+
+        project_codes = {name: code for code, name in enumerate(self.projects)}
+        type_codes = {name: code for code, name in enumerate(self.issue_types)}
+        status_codes = {name: code for code, name in enumerate(self.statuses)}
+        component_codes = {name: code for code, name in enumerate(self.components)}
+
+        self.project = array.array('B')
+        self.issue_type = array.array('B')
+        self.status = array.array('B')
+        self.component = array.array('B')
+        self.created = array.array('d')
+        self.updated = array.array('d')
+
+        # Worklog days of issue i are worklog_days[worklog_offsets[i]:worklog_offsets[i + 1]]
+        self.worklog_days = array.array('l')
+        self.worklog_offsets = array.array('q', [0])
+
+        for index in range(len(dataset)):
+            core = dataset.core(index)
+            self.project.append(project_codes[core.project])
+            self.issue_type.append(type_codes[core.issue_type])
+            self.status.append(status_codes[core.status])
+            self.component.append(component_codes[core.component])
+            self.created.append(core.created)
+            self.updated.append(core.updated)
+            self.worklog_days.extend(int(started // 86400) for started, _ in core.worklogs)
+            self.worklog_offsets.append(len(self.worklog_days))
+
+
+class JqlEngine:
+    """
+    Evaluates JQL against a SyntheticDataset.
+
+    Supports the clauses the application sends: project, issuetype, status,
+    statusCategory, component, key/issue (including linkedIssues()), parent,
+    "Epic Link", created, updated, worklogDate and saved filters, combined with
+    AND, OR, NOT and parentheses, and ORDER BY key, created or updated. Issue
+    key clauses are answered from the dataset structure; other clauses scan an
+    IssueTable. Dates are UTC, and relative dates count back from the end of
+    the dataset period.
+    """
+
+    def __init__(self, dataset, filters=None):
+        """
+        Args:
+            dataset (SyntheticDataset): Issues to search
+            filters (dict): Saved filters, filter ID -> {'id', 'name', 'jql', ...}
+        """
+        self.dataset = dataset
+        self.filters = filters if filters is not None else {}
+        self._table = None
+        self._table_lock = threading.Lock()
+        self._results = collections.OrderedDict()
+        self._results_lock = threading.Lock()
+
+    @property
+    def table(self):
+        """IssueTable of the dataset, built on first use"""
+        with self._table_lock:
+            if self._table is None:
+                self._table = IssueTable(self.dataset)
+            return self._table
+
+    def clear_cache(self):
+        """Forget query results, e.g. after a saved filter changed"""
+        with self._results_lock:
+            self._results.clear()
+
+    def search(self, jql, validate='strict'):
+        """
+        Find the issues matching a query
+
+        Args:
+            jql (str): Query
+            validate (str): 'strict' rejects unknown issue keys like Jira does, 'warn' and 'none' skip them
+
+        Returns:
+            tuple: (list of issue indexes in result order, list of warning messages)
+
+        Raises:
+            JqlError: If Jira would reject the query
+        """
+        cache_key = (jql or '', validate)
+        with self._results_lock:
+            if cache_key in self._results:
+                self._results.move_to_end(cache_key)
+                return self._results[cache_key]
+
+        condition, order_by = JqlParser(jql or '').parse()
+        warnings = []
+        if condition is None:
+            predicate, candidates = None, None
+        else:
+            predicate, candidates = self._compile(condition, warnings, 0)
+
+        if warnings and validate == 'strict':
+            raise JqlError(warnings[0])
+
+        indexes = sorted(candidates) if candidates is not None else range(len(self.dataset))
+        if predicate is not None:
+            indexes = [index for index in indexes if predicate(index)]
+        else:
+            indexes = list(indexes)
+
+        for field, descending in reversed(order_by):
+            indexes.sort(key=self._sort_key(field), reverse=descending)
+
+        result = (indexes, warnings if validate == 'warn' else [])
+        with self._results_lock:
+            self._results[cache_key] = result
+            while len(self._results) > RESULT_CACHE_SIZE:
+                self._results.popitem(last=False)
+        return result
+
+    def _sort_key(self, field):
+        """Sort key of an ORDER BY field"""
+        name = FIELD_ALIASES.get(field)
+        if name == 'created':
+            return self.table.created.__getitem__
+        if name == 'updated':
+            return self.table.updated.__getitem__
+        if name == 'key':
+            return None
+        raise JqlError(f"Field '{field}' does not exist or you do not have permission to view it.")
+
+    def _compile(self, node, warnings, depth):
+        """
+        Compile a node into a predicate over issue indexes
+
+        Returns:
+            tuple: (predicate, set of candidate indexes or None if any issue may match)
+        """
+        kind = node[0]
+        if kind == 'and':
+            compiled = [self._compile(child, warnings, depth) for child in node[1]]
+            predicates = [predicate for predicate, _ in compiled]
+            candidate_sets = [candidates for _, candidates in compiled if candidates is not None]
+            candidates = set.intersection(*candidate_sets) if candidate_sets else None
+            return (lambda index: all(predicate(index) for predicate in predicates)), candidates
+
+        if kind == 'or':
+            compiled = [self._compile(child, warnings, depth) for child in node[1]]
+            predicates = [predicate for predicate, _ in compiled]
+            candidates = None
+            if all(candidates is not None for _, candidates in compiled):
+                candidates = set().union(*(candidates for _, candidates in compiled))
+            return (lambda index: any(predicate(index) for predicate in predicates)), candidates
+
+        if kind == 'not':
+            predicate, _ = self._compile(node[1], warnings, depth)
+            return (lambda index: not predicate(index)), None
+
+        return self._compile_clause(node, warnings, depth)
+
+    def _compile_clause(self, node, warnings, depth):
+        """Compile a single field clause"""
+        _, field_text, operator, operand = node
+        field = FIELD_ALIASES.get(field_text.lower())
+        if field is None:
+            raise JqlError(f"Field '{field_text}' does not exist or you do not have permission to view it.")
+
+        if field == 'filter':
+            return self._compile_filter(field_text, operator, operand, warnings, depth)
+        if field in ('created', 'updated', 'worklogdate'):
+            return self._compile_date(field, field_text, operator, operand), None
+        if field in ('key', 'parent', 'epic'):
+            return self._compile_issue_clause(field, field_text, operator, operand, warnings)
+        return self._compile_attribute(field, field_text, operator, operand), None
+
+    def _values(self, field_text, operator, operand, allowed=EQUALITY_OPERATORS):
+        """Literal values of an equality clause"""
+        if operator not in allowed:
+            raise JqlError(f"The operator '{operator}' is not supported by the '{field_text}' field.")
+        if operand[0] == 'value':
+            if operator in ('in', 'not in'):
+                raise JqlError(f"The operator '{operator}' requires a list of values.")
+            return [operand[1]]
+        if operand[0] == 'list':
+            if operator not in ('in', 'not in'):
+                raise JqlError(f"The operator '{operator}' does not support a list of values.")
+            values = []
+            for item in operand[1]:
+                if item[0] != 'value':
+                    raise JqlError(f"Unable to find JQL function '{item[1]}'.")
+                values.append(item[1])
+            return values
+        if operand[0] == 'function':
+            raise JqlError(f"Unable to find JQL function '{operand[1]}()' for field '{field_text}'.")
+        return []
+
+    def _compile_attribute(self, field, field_text, operator, operand):
+        """Clauses on project, issue type, status, status category and component"""
+        table = self.table
+
+        if operand[0] == 'empty':
+            if field != 'component':
+                raise JqlError(f"The field '{field_text}' does not support searching for EMPTY values.")
+            column, codes = table.component, {0}
+            negate = operator == 'is not'
+        else:
+            values = [value.lower() for value in self._values(field_text, operator, operand)]
+            negate = operator in ('!=', 'not in')
+
+            if field == 'project':
+                column = table.project
+                codes = {code for code, key in enumerate(table.projects)
+                         if key.lower() in values or PROJECT_IDS[key] in values}
+            elif field == 'issuetype':
+                column = table.issue_type
+                codes = {code for code, name in enumerate(table.issue_types)
+                         if name.lower() in values or ISSUE_TYPES[name][0] in values}
+            elif field == 'status':
+                column = table.status
+                codes = {code for code, name in enumerate(table.statuses)
+                         if name.lower() in values or STATUSES[name][0] in values}
+            elif field == 'statuscategory':
+                column = table.status
+                categories = {key for key, category in STATUS_CATEGORIES.items()
+                              if key in values or category['name'].lower() in values or str(category['id']) in values}
+                codes = {code for code, name in enumerate(table.statuses) if STATUSES[name][1] in categories}
+            else:
+                column = table.component
+                codes = {code for code, name in enumerate(table.components)
+                         if name and (name.lower() in values or COMPONENT_IDS[name] in values)}
+
+        if negate:
+            return lambda index: column[index] not in codes
+        return lambda index: column[index] in codes
+
+    def _compile_date(self, field, field_text, operator, operand):
+        """Clauses on created, updated and worklogDate"""
+        if operator not in DATE_OPERATORS or operand[0] not in ('value', 'function'):
+            raise JqlError(f"The operator '{operator}' is not supported by the '{field_text}' field.")
+        moment = self._parse_date(field_text, operand)
+
+        compare = {
+            '=': lambda value, limit: value == limit,
+            '!=': lambda value, limit: value != limit,
+            '>': lambda value, limit: value > limit,
+            '>=': lambda value, limit: value >= limit,
+            '<': lambda value, limit: value < limit,
+            '<=': lambda value, limit: value <= limit,
+        }[operator]
+
+        table = self.table
+        if field == 'worklogdate':
+            # Worklog dates are days: any worklog of the issue on a matching day
+            day = int(moment // 86400)
+            days, offsets = table.worklog_days, table.worklog_offsets
+            return lambda index: any(compare(value, day) for value in days[offsets[index]:offsets[index + 1]])
+
+        column = table.created if field == 'created' else table.updated
+        return lambda index: compare(column[index], moment)
+
+    def _parse_date(self, field_text, operand):
+        """Timestamp of a date value, a relative date or now()"""
+        if operand[0] == 'function':
+            if operand[1].lower() == 'now':
+                return self.dataset.end
+            raise JqlError(f"Unable to find JQL function '{operand[1]}()' for field '{field_text}'.")
+
+        text = operand[1].strip()
+        relative = RELATIVE_DATE_PATTERN.match(text)
+        if relative:
+            sign, amount, unit = relative.groups()
+            offset = int(amount) * RELATIVE_DATE_UNITS[unit]
+            return self.dataset.end - offset if sign == '-' else self.dataset.end + offset
+
+        for date_format in DATE_FORMATS:
+            try:
+                return datetime.strptime(text, date_format).replace(tzinfo=timezone.utc).timestamp()
+            except ValueError:
+                continue
+
+        raise JqlError(f"Date value '{text}' for field '{field_text}' is invalid. Valid formats include: "
+                       f"'yyyy/MM/dd HH:mm', 'yyyy-MM-dd HH:mm', 'yyyy/MM/dd', 'yyyy-MM-dd', or a period format e.g. '-5d'.")
+
+    def _compile_issue_clause(self, field, field_text, operator, operand, warnings):
+        """Clauses on issue keys, parents and epics, answered from the dataset structure"""
+        dataset = self.dataset
+
+        if field == 'key' and operand[0] == 'function':
+            if operator not in ('in', 'not in'):
+                raise JqlError(f"The operator '{operator}' is not supported by the '{field_text}' field.")
+            matching = self._linked_issues(operand, warnings)
+        elif field == 'key' and operand[0] == 'list' and any(item[0] == 'function' for item in operand[1]):
+            raise JqlError("Functions are not supported inside a list of issue keys.")
+        else:
+            indexes = set()
+            for value in self._values(field_text, operator, operand):
+                index = dataset.index(value)
+                if index is None and value.isdigit() and field == 'key':
+                    # Issue IDs (see SyntheticDataset.issue)
+                    number = int(value) - 10000
+                    index = number if 0 <= number < len(dataset) else None
+                if index is None:
+                    warnings.append(f"An issue with key '{value}' does not exist for field '{field_text}'.")
+                    continue
+                indexes.add(index)
+
+            if field == 'key':
+                matching = indexes
+            elif field == 'parent':
+                matching = {subtask for index in indexes for subtask in dataset.subtasks(index)}
+            else:
+                matching = {issue for index in indexes for issue in dataset.epic_issues(index)}
+
+        if operator in ('!=', 'not in'):
+            return (lambda index: index not in matching), None
+        return (lambda index: index in matching), matching
+
+    def _linked_issues(self, operand, warnings):
+        """Issues matched by linkedIssues(key[, link description])"""
+        _, name, arguments = operand
+        if name.lower() != 'linkedissues':
+            raise JqlError(f"Unable to find JQL function '{name}()'.")
+        if not 1 <= len(arguments) <= 2:
+            raise JqlError("Function 'linkedIssues' expects one issue key and an optional link description.")
+
+        index = self.dataset.index(arguments[0])
+        if index is None:
+            warnings.append(f"Issue '{arguments[0]}' could not be found in function 'linkedIssues'.")
+            return set()
+
+        wanted = arguments[1].lower() if len(arguments) == 2 else None
+        matching = set()
+        for link_type, direction, other in self.dataset.links(index):
+            _, inward, outward = LINK_TYPES[link_type]
+            description = outward if direction == 'outward' else inward
+            if wanted is None or description.lower() == wanted:
+                matching.add(other)
+        return matching
+
+    def _compile_filter(self, field_text, operator, operand, warnings, depth):
+        """filter = ID or name: the query of a saved filter"""
+        if depth >= MAX_FILTER_DEPTH:
+            raise JqlError("Saved filters refer to each other too deeply.")
+
+        nodes = []
+        for value in self._values(field_text, operator, operand):
+            saved = self.filters.get(value) or next(
+                (saved for saved in self.filters.values() if saved.get('name', '').lower() == value.lower()), None)
+            if saved is None:
+                raise JqlError(f"A value with ID '{value}' does not exist for the field '{field_text}'.")
+            condition, _ = JqlParser(saved.get('jql') or '').parse()
+            nodes.append(condition)
+
+        compiled = [self._compile(node, warnings, depth + 1) if node is not None else (lambda index: True, None)
+                    for node in nodes]
+        predicates = [predicate for predicate, _ in compiled]
+        candidates = None
+        if compiled and all(candidates is not None for _, candidates in compiled):
+            candidates = set().union(*(candidates for _, candidates in compiled))
+
+        if operator in ('!=', 'not in'):
+            return (lambda index: not any(predicate(index) for predicate in predicates)), None
+        return (lambda index: any(predicate(index) for predicate in predicates)), candidates
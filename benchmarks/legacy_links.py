@@ -0,0 +1,69 @@
+import logging
+
+# Get logger
+logger = logging.getLogger(__name__)
+
+# Issue keys per linkedIssues(), parent and Epic Link query before get_issues_by_keys
+LEGACY_CHUNK_SIZE = 10
+
+
+def get_linked_issues_by_search(analyzer, issue_keys, link_type):
+    """
+    Get linked issues the way JiraAnalyzer.get_linked_issues did before links were
+    read from the issuelinks field: one linkedIssues() search per 10 keys
+
+    Args:
+        analyzer (JiraAnalyzer): Analyzer sending the searches
+        issue_keys (list): Keys of the linked-from issues
+        link_type (str): Link description
+
+    Returns:
+        list: Linked issues, once per chunk they were found in
+    """
+    linked_issues = []
+    for i in range(0, len(issue_keys), LEGACY_CHUNK_SIZE):
+        chunk = issue_keys[i:i + LEGACY_CHUNK_SIZE]
+        jql = " OR ".join(f'issue in linkedIssues("{key}", "{link_type}")' for key in chunk)
+        linked_issues.extend(analyzer.get_issues_by_filter(jql_query=jql))
+    return linked_issues
+
+
+def search_by_key_chunks(analyzer, issue_keys, clause):
+    """Search the issues matching clause (e.g. 'parent = "{key}"') for every key, 10 keys per query"""
+    issues = []
+    for i in range(0, len(issue_keys), LEGACY_CHUNK_SIZE):
+        chunk = issue_keys[i:i + LEGACY_CHUNK_SIZE]
+        issues.extend(analyzer.get_issues_by_filter(jql_query=" OR ".join(clause.format(key=key) for key in chunk)))
+    return issues
+
+
+def get_clm_related_issues_by_search(analyzer, clm_issues):
+    """
+    Get the issues related to CLM issues as JiraAnalyzer.get_clm_related_issues did
+    before it resolved links locally, for counting the searches it sent
+
+    Args:
+        analyzer (JiraAnalyzer): Analyzer sending the searches
+        clm_issues (list): CLM issue dictionaries
+
+    Returns:
+        tuple: (est_issues, improvement_issues, implementation_issues)
+    """
+    clm_keys = [issue['key'] for issue in clm_issues]
+
+    est_issues = [issue for issue in get_linked_issues_by_search(analyzer, clm_keys, 'relates to')
+                  if issue['fields']['project']['key'] == 'EST']
+    improvement_issues = [issue for issue in get_linked_issues_by_search(analyzer, clm_keys, 'links CLM to')
+                          if issue['fields']['issuetype']['name'] == 'Improvement from CLM']
+
+    implementation_issues = []
+    improvement_keys = [issue['key'] for issue in improvement_issues]
+    if improvement_keys:
+        implementation_issues = get_linked_issues_by_search(analyzer, improvement_keys, 'is realized in')
+        implementation_keys = [issue['key'] for issue in implementation_issues]
+        if implementation_keys:
+            subtasks = search_by_key_chunks(analyzer, implementation_keys, 'parent = "{key}"')
+            epic_issues = search_by_key_chunks(analyzer, implementation_keys, '"Epic Link" = "{key}"')
+            implementation_issues = implementation_issues + subtasks + epic_issues
+
+    return est_issues, improvement_issues, implementation_issues
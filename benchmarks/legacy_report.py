@@ -0,0 +1,292 @@
+import os
+import logging
+import pandas as pd
+
+from modules.analysis import prepare_chart_data
+from modules.data_processor import get_improved_open_statuses, get_status_categories
+from modules.metrics import compute_issue_metrics
+from modules.report_store import write_json, read_json
+from modules.render_cache import CHART_SPECS_FILE
+from modules.visualization import create_visualizations, bar_chart_spec, message_chart_spec, publish_charts
+
+# Get logger
+logger = logging.getLogger(__name__)
+
+# Report files compared between the legacy and the current writer
+REPORT_FILES = ['summary.json', 'data/chart_data.json', f"data/{CHART_SPECS_FILE}", 'metrics/no_transitions_tasks.json',
+                'metrics/open_tasks.json', 'metrics/closed_tasks.json']
+
+# Slices of the pie chart before the rest is grouped as "Другие"
+MAX_SLICES = 10
+
+
+def write_current_report(df, output_dir):
+    """
+    Write the summary, chart specs, metrics and chart data of a Jira analysis with the current code
+
+    Args:
+        df (pandas.DataFrame): Processed data with the status category column
+        output_dir (str): Report directory
+    """
+    metrics = compute_issue_metrics(df)
+    create_visualizations(df, output_dir, logger=logger, prerender=False, metrics=metrics)
+    chart_data = prepare_chart_data(df, filter_id=114476, metrics=metrics)
+    write_json(os.path.join(output_dir, 'data', 'chart_data.json'), chart_data)
+
+
+def write_legacy_report(df, output_dir):
+    """
+    Write the same files the way run_analysis did before compute_issue_metrics:
+    every chart helper, the summary and the chart data computed their own aggregates.
+
+    Args:
+        df (pandas.DataFrame): Processed data with the status category column
+        output_dir (str): Report directory
+    """
+    os.makedirs(os.path.join(output_dir, 'metrics'), exist_ok=True)
+    os.makedirs(os.path.join(output_dir, 'data'), exist_ok=True)
+
+    specs = []
+    specs.append(_project_distribution_spec(df, output_dir))
+    specs.append(_comparison_spec(df, output_dir))
+    specs.extend(_pie_specs(df, output_dir))
+    specs.extend(_efficiency_specs(df, output_dir))
+    specs.append(_no_transitions_spec(df, output_dir))
+    specs.append(_open_tasks_spec(df, output_dir))
+    specs.append(_closed_tasks_spec(df, output_dir))
+    publish_charts(specs, output_dir, logger, prerender=False)
+
+    summary = {
+        'total_issues': len(df),
+        'total_original_estimate_hours': df['original_estimate_hours'].sum(),
+        'total_time_spent_hours': df['time_spent_hours'].sum(),
+        'projects_count': len(df['project'].unique()),
+        'projects': df['project'].unique().tolist(),
+        'avg_estimate_per_issue': df['original_estimate_hours'].mean() if len(df) > 0 else 0,
+        'avg_time_spent_per_issue': df['time_spent_hours'].mean() if len(df) > 0 else 0,
+        'overall_efficiency': (df['time_spent_hours'].sum() / df['original_estimate_hours'].sum())
+        if df['original_estimate_hours'].sum() > 0 else 0
+    }
+
+    no_transitions_count = df['no_transitions'].sum()
+    if no_transitions_count > 0:
+        summary['no_transitions_tasks_count'] = int(no_transitions_count)
+
+    open_statuses = get_improved_open_statuses(df)
+    open_tasks = df[df['status'].isin(open_statuses) & (df['time_spent_hours'] > 0)]
+    if not open_tasks.empty:
+        summary['open_tasks_count'] = len(open_tasks)
+        summary['open_tasks_time_spent_hours'] = open_tasks['time_spent_hours'].sum()
+
+    closed_statuses = get_status_categories(df)['closed_statuses']
+    closed_tasks = df[df['status'].isin(closed_statuses) & (~df['has_comments']) & (~df['has_attachments'])]
+    if not closed_tasks.empty:
+        summary['completed_tasks_no_comments_count'] = len(closed_tasks)
+
+    write_json(os.path.join(output_dir, 'summary.json'), summary)
+    write_json(os.path.join(output_dir, 'data', 'chart_data.json'), _chart_data(df))
+
+
+def read_report(output_dir):
+    """
+    Read the files written by write_current_report or write_legacy_report
+
+    Args:
+        output_dir (str): Report directory
+
+    Returns:
+        dict: File name -> content. The project list of the chart data is sorted,
+              since both writers build it from a set.
+    """
+    report = {name: read_json(os.path.join(output_dir, name)) for name in REPORT_FILES}
+    if report['data/chart_data.json']:
+        report['data/chart_data.json']['projects'].sort()
+    return report
+
+
+def _project_distribution_spec(df, output_dir):
+    project_counts = df['project'].value_counts()
+    project_counts = project_counts[project_counts > 0]
+    return bar_chart_spec('project_distribution', f"{output_dir}/project_distribution.png",
+                          project_counts.index.tolist(), project_counts.values,
+                          'Распределение задач по проектам', 'Проект', 'Количество задач', figsize=(10, 6))
+
+
+def _comparison_spec(df, output_dir):
+    comparison_df = pd.DataFrame({
+        'Исходная оценка': df.groupby('project', observed=True)['original_estimate_hours'].sum(),
+        'Затраченное время': df.groupby('project', observed=True)['time_spent_hours'].sum()
+    }).fillna(0)
+
+    comparison_df['Всего'] = comparison_df['Исходная оценка'] + comparison_df['Затраченное время']
+    comparison_df = comparison_df.sort_values('Всего', ascending=False, kind='stable').drop('Всего', axis=1)
+
+    return {
+        'name': 'comparison',
+        'kind': 'grouped_bar',
+        'path': f"{output_dir}/estimate_vs_spent_by_project.png",
+        'figsize': (14, 8),
+        'labels': [str(project) for project in comparison_df.index],
+        'series': {column: comparison_df[column].astype(float).tolist() for column in comparison_df.columns},
+        'hue_title': 'Метрика',
+        'title': 'Исходная оценка vs. Затраченное время по проектам (часы)',
+        'xlabel': 'Проект',
+        'ylabel': 'Часы',
+        'tight_layout': True
+    }
+
+
+def _pie_specs(df, output_dir):
+    project_counts = df['project'].value_counts()
+    project_counts = project_counts[project_counts > 0]
+    if project_counts.empty:
+        return []
+
+    if len(project_counts) > MAX_SLICES:
+        top_projects = project_counts.nlargest(MAX_SLICES - 1)
+        pie_data = pd.Series({**top_projects.to_dict(), "Другие": project_counts.sum() - top_projects.sum()})
+    else:
+        pie_data = project_counts
+
+    return [{
+        'name': 'project_pie',
+        'kind': 'pie',
+        'path': f"{output_dir}/project_distribution_pie.png",
+        'figsize': (10, 10),
+        'labels': [str(label) for label in pie_data.index],
+        'values': [float(value) for value in pie_data.values],
+        'title': 'Распределение задач по проектам'
+    }]
+
+
+def _efficiency_specs(df, output_dir):
+    efficiency_df = pd.DataFrame({
+        'Исходная оценка': df.groupby('project', observed=True)['original_estimate_hours'].sum(),
+        'Затраченное время': df.groupby('project', observed=True)['time_spent_hours'].sum()
+    }).fillna(0)
+
+    efficiency_df['Коэффициент эффективности'] = efficiency_df.apply(
+        lambda row: row['Затраченное время'] / row['Исходная оценка'] if row['Исходная оценка'] > 0 else 0,
+        axis=1
+    )
+    efficiency_df = efficiency_df[efficiency_df['Исходная оценка'] > 0].sort_values('Коэффициент эффективности')
+    if efficiency_df.empty:
+        return []
+
+    return [bar_chart_spec('efficiency', f"{output_dir}/efficiency_ratio_by_project.png",
+                           efficiency_df.index.tolist(), efficiency_df['Коэффициент эффективности'].values,
+                           'Коэффициент эффективности по проектам (Затраченное время / Исходная оценка)',
+                           'Проект', 'Коэффициент', hline=1, bbox_inches='tight', tight_layout=False)]
+
+
+def _no_transitions_spec(df, output_dir):
+    no_transitions_tasks = df[df['no_transitions'] == True]
+    chart_path = f"{output_dir}/no_transitions_tasks.png"
+    by_project = no_transitions_tasks.groupby('project', observed=True).size().sort_values(ascending=False)
+
+    if not by_project.empty:
+        spec = bar_chart_spec('no_transitions_tasks', chart_path, by_project.index.tolist(), by_project.values,
+                              'Задачи без transitions по проектам (вероятно новые)', 'Проект', 'Количество задач')
+    else:
+        spec = message_chart_spec('no_transitions_tasks', chart_path, "Нет задач без transitions",
+                                  'Задачи без transitions (вероятно новые)')
+
+    write_json(os.path.join(output_dir, 'metrics', 'no_transitions_tasks.json'), {
+        'count': len(no_transitions_tasks),
+        'by_project': no_transitions_tasks.groupby(
+            'project', observed=True).size().to_dict() if not no_transitions_tasks.empty else {}
+    })
+    return spec
+
+
+def _open_tasks_spec(df, output_dir):
+    open_tasks = df[df['status'].isin(get_improved_open_statuses(df)) & (df['time_spent_hours'] > 0)]
+    chart_path = f"{output_dir}/open_tasks_time_spent.png"
+    title = 'Затраченное время на открытые задачи'
+
+    if not open_tasks.empty:
+        by_project = open_tasks.groupby('project', observed=True)['time_spent_hours'].sum().sort_values(
+            ascending=False)
+        spec = bar_chart_spec('open_tasks', chart_path, by_project.index.tolist(), by_project.values,
+                              title, 'Проект', 'Затраченное время (часы)')
+    else:
+        spec = message_chart_spec('open_tasks', chart_path, "Нет открытых задач с логированием времени",
+                                  title, 'Проект', 'Затраченное время (часы)')
+
+    write_json(os.path.join(output_dir, 'metrics', 'open_tasks.json'), {
+        'count': int(len(open_tasks)),
+        'total_time_spent': float(open_tasks['time_spent_hours'].sum()) if not open_tasks.empty else 0.0,
+        'by_project': open_tasks.groupby('project', observed=True)[
+            'time_spent_hours'].sum().to_dict() if not open_tasks.empty else {},
+        'task_statuses': {status: count for status, count in open_tasks[
+            'status'].value_counts().items() if count > 0} if not open_tasks.empty else {},
+        'sample_tasks': open_tasks['issue_key'].head(10).tolist() if not open_tasks.empty else []
+    })
+    return spec
+
+
+def _closed_tasks_spec(df, output_dir):
+    closed_statuses = get_status_categories(df)['closed_statuses']
+    closed_tasks = df[df['status'].isin(closed_statuses) & (~df['has_comments']) & (~df['has_attachments'])]
+    chart_path = f"{output_dir}/completed_tasks_no_comments.png"
+    title = 'Закрытые задачи без комментариев и вложений'
+
+    if not closed_tasks.empty:
+        by_project = closed_tasks.groupby('project', observed=True).size().sort_values(ascending=False)
+        spec = bar_chart_spec('completed_tasks_no_comments', chart_path, by_project.index.tolist(), by_project.values,
+                              title, 'Проект', 'Количество задач')
+    else:
+        spec = message_chart_spec('completed_tasks_no_comments', chart_path,
+                                  "Нет закрытых задач без комментариев и вложений", title, 'Проект', 'Количество задач')
+
+    write_json(os.path.join(output_dir, 'metrics', 'closed_tasks.json'), {
+        'count': len(closed_tasks),
+        'by_project': closed_tasks.groupby('project', observed=True).size().to_dict() if not closed_tasks.empty else {}
+    })
+    return spec
+
+
+def _chart_data(df):
+    project_counts = df['project'].value_counts().to_dict()
+    project_estimates = df.groupby('project', observed=True)['original_estimate_hours'].sum().to_dict()
+    project_time_spent = df.groupby('project', observed=True)['time_spent_hours'].sum().to_dict()
+    all_projects = list(set(list(project_counts.keys()) + list(project_estimates.keys()) +
+                            list(project_time_spent.keys())))
+
+    project_issue_mapping = {}
+    for project in all_projects:
+        project_issue_mapping[project] = df[df['project'] == project]['issue_key'].tolist()
+
+    no_transitions_tasks = df[df['no_transitions'] == True]
+    no_transitions_by_project = {}
+    open_tasks_by_project = {}
+    if not no_transitions_tasks.empty:
+        no_transitions_by_project = no_transitions_tasks.groupby('project', observed=True).size().to_dict()
+        for project in no_transitions_by_project:
+            project_tasks = no_transitions_tasks[no_transitions_tasks['project'] == project]
+            open_tasks_by_project[project] = project_tasks['issue_key'].tolist()
+
+    return {
+        'project_counts': project_counts,
+        'project_estimates': project_estimates,
+        'project_time_spent': project_time_spent,
+        'projects': all_projects,
+        'data_source': 'jira',
+        'filter_params': {
+            'filter_id': 114476,
+            'jql': None,
+            'clm_filter_id': None,
+            'clm_jql': None,
+            'date_from': None,
+            'date_to': None
+        },
+        'special_charts': {
+            'no_transitions': {
+                'title': 'Открытые задачи со списаниями',
+                'by_project': no_transitions_by_project,
+                'total': len(no_transitions_tasks),
+                'issue_keys_by_project': open_tasks_by_project
+            }
+        },
+        'project_issue_mapping': project_issue_mapping
+    }
@@ -0,0 +1,817 @@
+import os
+import sys
+import gzip
+import json
+import time
+import queue
+import shutil
+import threading
+import logging
+import platform
+import argparse
+import tempfile
+import statistics
+import tracemalloc
+from datetime import datetime
+from logging.handlers import QueueListener
+
+import config
+
+from benchmarks.dataset import SyntheticDataset, DEFAULT_SEED
+
+# Issues generated and added to the builder at a time
+DATASET_PAGE_SIZE = 1000
+
+# Seconds a probe thread sleeps between wake-ups while the changelog stage runs
+PROBE_INTERVAL = 0.002
+
+# Charts and summary projects in the index.json of every report of the report-catalog mode
+CATALOG_BENCH_CHARTS = 8
+CATALOG_BENCH_PROJECTS = 200
+
+# Projects of the CLM keys of the key-index mode, and the chart slices it looks up
+KEY_INDEX_PROJECTS = 40
+KEY_INDEX_SLICES = [('linked_issues', 'P3'), ('open_tasks', 'P3'), ('open_tasks', 'all'), ('project_issues', 'P3')]
+
+# Search field profiles compared by the field-profiles mode
+FIELD_PROFILE_NAMES = ['full', 'analysis', 'analysis_two_phase']
+
+# Issues per search response page of the decode mode
+DECODE_PAGE_SIZE = 100
+
+# Get logger
+logger = logging.getLogger(__name__)
+
+
+def iter_dataset_pages(dataset, expand=()):
+    """Generate the issues of a synthetic dataset page by page"""
+    for start in range(0, len(dataset), DATASET_PAGE_SIZE):
+        yield [dataset.issue(index, expand=expand) for index in range(start, min(start + DATASET_PAGE_SIZE,
+                                                                                  len(dataset)))]
+
+
+def build_issue_frame(issue_count, seed):
+    """
+    Build the processed issues of a synthetic dataset as run_analysis does
+
+    Args:
+        issue_count (int): Number of issues
+        seed (int): Seed of the random data
+
+    Returns:
+        pandas.DataFrame: Processed issues with the status category column
+    """
+    from modules.data_processor import IssueFrameBuilder
+    from modules.status_classifier import get_status_classifier
+
+    builder = IssueFrameBuilder()
+    for page in iter_dataset_pages(SyntheticDataset(issue_count, seed)):
+        builder.add_page(page)
+    return get_status_classifier().add_category_column(builder.build())
+
+
+def best_time(function, repeat):
+    """
+    Time a function
+
+    Args:
+        function (callable): Function without arguments
+        repeat (int): Number of calls
+
+    Returns:
+        float: Wall seconds of the fastest call
+    """
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def traced_peak(function):
+    """
+    Run a function under tracemalloc
+
+    Returns:
+        tuple: (result, peak of Python allocations in MB)
+    """
+    tracemalloc.start()
+    try:
+        result = function()
+        return result, tracemalloc.get_traced_memory()[1] / 1024 / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def bench_report_metrics(args, workdir):
+    """
+    Time the report writers: the per-helper aggregates used before compute_issue_metrics
+    against the current code, and check that both write the same files
+
+    Args:
+        args (argparse.Namespace): Benchmark options
+        workdir (str): Scratch directory
+
+    Returns:
+        list: One result per dataset size
+    """
+    from benchmarks.legacy_report import write_legacy_report, write_current_report, read_report
+
+    results = []
+    for issue_count in args.issues:
+        df = build_issue_frame(issue_count, args.seed)
+        item = {'issues': issue_count, 'projects': int(df['project'].nunique())}
+
+        reports = {}
+        for name, writer in (('legacy', write_legacy_report), ('current', write_current_report)):
+            output_dir = os.path.join(workdir, name)
+
+            def write():
+                # Chart specs are merged with saved ones, so every run starts from an empty report
+                shutil.rmtree(output_dir, ignore_errors=True)
+                writer(df, output_dir)
+
+            item[f"{name}_seconds"] = round(best_time(write, args.repeat), 4)
+            reports[name] = read_report(output_dir)
+
+        item['identical'] = reports['legacy'] == reports['current']
+        print(f"{issue_count:>8} issues: legacy {item['legacy_seconds'] * 1000:.1f} ms, "
+              f"current {item['current_seconds'] * 1000:.1f} ms, identical {item['identical']}", flush=True)
+        results.append(item)
+    return results
+
+
+def measure_latency(stop, interval, overshoots):
+    """Sleep in short steps until stopped, recording how late every wake-up is"""
+    while not stop.is_set():
+        started = time.perf_counter()
+        time.sleep(interval)
+        overshoots.append(time.perf_counter() - started - interval)
+
+
+def bench_changelog(args, workdir):
+    """
+    Time the changelog stage as run_analysis drives it: every page is written
+    to the raw dump and parsed in-process or by a process pool of each size
+
+    Besides the wall time, the CPU time of the main thread (the Flask process
+    in the app) and how late a thread sleeping PROBE_INTERVAL wakes up are
+    recorded, since the pool is meant to keep the server responsive.
+
+    Args:
+        args (argparse.Namespace): Benchmark options
+        workdir (str): Scratch directory
+
+    Returns:
+        list: One result per dataset size and process count
+    """
+    from modules import process_pool
+    from modules.changelog_parser import ChangelogStage
+    from modules.utils import RawIssueWriter
+
+    results = []
+    for issue_count in args.issues:
+        pages = list(iter_dataset_pages(SyntheticDataset(issue_count, args.seed), expand=('changelog',)))
+        histories = sum(len(issue['changelog']['histories']) for page in pages for issue in page)
+
+        for processes in args.processes:
+            config.process_workers = processes
+            process_pool.reset_process_pool()
+            pool = process_pool.get_process_pool()
+            if pool is not None:
+                # Workers are started before the clock, as in a server that has already run an analysis
+                list(pool.map(time.sleep, [0.5] * processes))
+
+            path = os.path.join(workdir, 'raw_issues.jsonl.gz')
+            runs = []
+            for _ in range(args.repeat):
+                stop = threading.Event()
+                overshoots = []
+                probe = threading.Thread(target=measure_latency, args=(stop, PROBE_INTERVAL, overshoots))
+                probe.start()
+
+                started, cpu_started = time.perf_counter(), time.thread_time()
+                stage = ChangelogStage()
+                with RawIssueWriter(path) as writer:
+                    for page in pages:
+                        offset, length = writer.write_page(page)
+                        stage.add_page(page, shard=(path, offset, length))
+                records = stage.records()
+                wall, cpu = time.perf_counter() - started, time.thread_time() - cpu_started
+
+                stop.set()
+                probe.join()
+                assert len(records) == issue_count
+                runs.append({'wall_seconds': wall, 'main_thread_cpu_seconds': cpu,
+                             'probe_p99_ms': sorted(overshoots)[int(len(overshoots) * 0.99)] * 1000})
+
+            item = {'issues': issue_count, 'changelog_histories': histories, 'processes': processes}
+            for name in runs[0]:
+                item[name] = round(statistics.median(run[name] for run in runs), 3)
+            print(f"{issue_count:>8} issues, {processes} processes: wall {item['wall_seconds']:.2f} s, "
+                  f"main thread CPU {item['main_thread_cpu_seconds']:.2f} s, "
+                  f"probe p99 {item['probe_p99_ms']:.1f} ms", flush=True)
+            results.append(item)
+
+    process_pool.reset_process_pool()
+    return results
+
+
+def bench_clm_links(args, workdir):
+    """
+    Count the Jira requests that follow the links of the CLM issues: links read
+    from the issuelinks field and fetched by key, against one linkedIssues()
+    search per 10 keys as before
+
+    Args:
+        args (argparse.Namespace): Benchmark options
+        workdir (str): Scratch directory
+
+    Returns:
+        list: One result per dataset size and method
+    """
+    from benchmarks.legacy_links import get_clm_related_issues_by_search
+    from benchmarks.run import start_fake_jira, stop_fake_jira
+    from modules.jira_analyzer import JiraAnalyzer
+
+    results = []
+    for issue_count in args.issues:
+        process, url = start_fake_jira(issue_count, args.seed, args.latency, os.path.join(workdir, 'fake_jira.log'))
+        try:
+            clm_issues = JiraAnalyzer(jira_url=url, check_connection=False).get_issues_by_filter(
+                jql_query='project = CLM', profile='links')
+
+            found = {}
+            for name, method in (('search', get_clm_related_issues_by_search),
+                                 ('issuelinks', lambda analyzer, issues: analyzer.get_clm_related_issues(issues))):
+                analyzer = JiraAnalyzer(jira_url=url, check_connection=False)
+                started = time.perf_counter()
+                related = method(analyzer, clm_issues)
+                item = {'issues': issue_count, 'clm_issues': len(clm_issues), 'method': name,
+                        'requests': analyzer.request_stats['requests'],
+                        'megabytes': round(analyzer.request_stats['bytes'] / 1024 / 1024, 2),
+                        'wall_seconds': round(time.perf_counter() - started, 3)}
+                found[name] = [sorted({issue['key'] for issue in issues}) for issues in related]
+                print(f"{issue_count:>8} issues, {len(clm_issues)} CLM, {name}: {item['requests']} requests, "
+                      f"{item['megabytes']:.2f} MB, {item['wall_seconds']:.2f} s", flush=True)
+                results.append(item)
+
+            results[-1]['same_issues'] = found['search'] == found['issuelinks']
+        finally:
+            stop_fake_jira(process)
+    return results
+
+
+def bench_stream_memory(args, workdir):
+    """
+    Peak Python memory of a Jira analysis, which streams issue pages through
+    the builder and the raw dump, next to the peak of only collecting all raw
+    issues in a list as run_analysis did before
+
+    Args:
+        args (argparse.Namespace): Benchmark options
+        workdir (str): Scratch directory
+
+    Returns:
+        list: One result per dataset size
+    """
+    from benchmarks.run import start_fake_jira, stop_fake_jira
+    from modules.analysis import run_analysis
+    from modules.jira_analyzer import JiraAnalyzer
+    from modules.jobs import new_job_state
+
+    results = []
+    for issue_count in args.issues:
+        process, url = start_fake_jira(issue_count, args.seed, args.latency, os.path.join(workdir, 'fake_jira.log'))
+        config.jira_url = url
+        try:
+            state = new_job_state()
+            _, analysis_mb = traced_peak(lambda: run_analysis(data_source='jira', use_filter=True, use_cache=False,
+                                                              analysis_state=state))
+            if state['error']:
+                raise RuntimeError(f"Analysis failed: {state['error']}")
+
+            analyzer = JiraAnalyzer(jira_url=url, check_connection=False)
+            issues, raw_issues_mb = traced_peak(lambda: analyzer.get_issues_by_filter(filter_id=114476))
+        finally:
+            stop_fake_jira(process)
+
+        item = {'issues': issue_count, 'analyzed_issues': state['total_issues'], 'raw_issues': len(issues),
+                'run_analysis_peak_mb': round(analysis_mb, 1), 'raw_issue_list_peak_mb': round(raw_issues_mb, 1)}
+        print(f"{issue_count:>8} issues: run_analysis peak {item['run_analysis_peak_mb']:.1f} MB, "
+              f"list of raw issues alone {item['raw_issue_list_peak_mb']:.1f} MB", flush=True)
+        results.append(item)
+    return results
+
+
+def bench_issue_frame(args, workdir):
+    """
+    Time and peak memory of building the issues DataFrame from pages of raw
+    issues, and the size of the frame with its categorical columns against the same
+    columns as Python strings
+
+    Args:
+        args (argparse.Namespace): Benchmark options
+        workdir (str): Scratch directory
+
+    Returns:
+        list: One result per dataset size
+    """
+    from modules.data_processor import IssueFrameBuilder
+
+    results = []
+    for issue_count in args.issues:
+        pages = list(iter_dataset_pages(SyntheticDataset(issue_count, args.seed), expand=('changelog',)))
+
+        def build():
+            builder = IssueFrameBuilder()
+            for page in pages:
+                builder.add_page(page)
+            return builder.build()
+
+        seconds = best_time(build, args.repeat)
+        df, peak_mb = traced_peak(build)
+        item = {'issues': issue_count, 'build_seconds': round(seconds, 3), 'build_peak_mb': round(peak_mb, 1),
+                'frame_mb': round(df.memory_usage(deep=True).sum() / 1024 / 1024, 2),
+                'string_frame_mb': round(df.astype({column: object for column in df.select_dtypes('category')})
+                                         .memory_usage(deep=True).sum() / 1024 / 1024, 2)}
+        print(f"{issue_count:>8} issues: build {item['build_seconds']:.2f} s, peak {item['build_peak_mb']:.1f} MB, "
+              f"frame {item['frame_mb']:.1f} MB, with strings {item['string_frame_mb']:.1f} MB", flush=True)
+        results.append(item)
+    return results
+
+
+def scan_report_folders(charts_dir, limit):
+    """First page of the report list as the home page built it before the catalog, by reading every index.json"""
+    from modules.report_catalog import get_report_info
+
+    reports = []
+    for folder in os.listdir(charts_dir):
+        index_file = os.path.join(charts_dir, folder, 'index.json')
+        if os.path.isdir(os.path.join(charts_dir, folder)) and folder != 'data':
+            index_data = {}
+            if os.path.exists(index_file):
+                with open(index_file, 'r', encoding='utf-8') as f:
+                    index_data = json.load(f)
+            reports.append(get_report_info(folder, index_data))
+    reports.sort(key=lambda report: report['timestamp'], reverse=True)
+    return len(reports), reports[:limit]
+
+
+def bench_report_catalog(args, workdir):
+    """
+    Time the first page of the report list: a scan of every report folder
+    against the report catalog, plus the one-time catalog rebuild
+
+    args.issues is the number of report folders here. Each has an index.json
+    with CATALOG_BENCH_CHARTS charts and a summary of CATALOG_BENCH_PROJECTS projects.
+
+    Args:
+        args (argparse.Namespace): Benchmark options
+        workdir (str): Scratch directory
+
+    Returns:
+        list: One result per number of reports
+    """
+    from modules.report_catalog import ReportCatalog
+    from routes.main_routes import REPORTS_PER_PAGE
+
+    results = []
+    for report_count in args.issues:
+        charts_dir = os.path.join(workdir, f"reports_{report_count}")
+        summary = {f"P{project}": {'issues': project, 'time_spent_hours': project * 1.5}
+                   for project in range(CATALOG_BENCH_PROJECTS)}
+        for number in range(report_count):
+            folder = os.path.join(charts_dir, f"20240101_{number:06d}")
+            os.makedirs(folder)
+            index_data = {'charts': {f"chart_{chart}": f"chart_{chart}.png" for chart in range(CATALOG_BENCH_CHARTS)},
+                          'total_issues': number, 'date_from': '2024-01-01', 'date_to': '2024-01-31',
+                          'data_source': 'jira', 'summary': summary}
+            with open(os.path.join(folder, 'index.json'), 'w', encoding='utf-8') as f:
+                json.dump(index_data, f, ensure_ascii=False, indent=2)
+
+        catalog_path = os.path.join(charts_dir, 'data', 'report_catalog.sqlite')
+
+        def rebuild():
+            if os.path.exists(catalog_path):
+                os.remove(catalog_path)
+            ReportCatalog(catalog_path, charts_dir)
+
+        def list_from_catalog():
+            catalog = ReportCatalog(catalog_path, charts_dir)
+            return catalog.count_reports(), catalog.list_reports(offset=0, limit=REPORTS_PER_PAGE)
+
+        item = {'reports': report_count,
+                'rebuild_ms': round(best_time(rebuild, args.repeat) * 1000, 2),
+                'folder_scan_ms': round(best_time(lambda: scan_report_folders(charts_dir, REPORTS_PER_PAGE),
+                                                  args.repeat) * 1000, 2),
+                'catalog_ms': round(best_time(list_from_catalog, args.repeat) * 1000, 2)}
+        item['identical'] = scan_report_folders(charts_dir, REPORTS_PER_PAGE) == list_from_catalog()
+        print(f"{report_count:>8} reports: folder scan {item['folder_scan_ms']:.1f} ms, "
+              f"catalog {item['catalog_ms']:.1f} ms, rebuild {item['rebuild_ms']:.1f} ms, "
+              f"identical {item['identical']}", flush=True)
+        results.append(item)
+    return results
+
+
+def scan_clm_keys(report_dir, chart_type, project):
+    """Keys of a chart slice as the drill-down routes read them before the key index"""
+    from modules.key_index import CHART_TYPE_KEYS, CLM_KEYS_FILE
+
+    with open(os.path.join(report_dir, 'data', CLM_KEYS_FILE), 'r', encoding='utf-8') as f:
+        clm_data = json.load(f)
+
+    project_mapping = clm_data.get('project_issue_mapping')
+    if chart_type == 'project_issues':
+        if project != 'all' and project_mapping is not None:
+            return project_mapping.get(project, [])
+        return clm_data.get('filtered_issue_keys', [])
+
+    keys = clm_data.get(CHART_TYPE_KEYS.get(chart_type, 'filtered_issue_keys'), [])
+    if project != 'all' and project_mapping is not None:
+        project_issues = project_mapping.get(project, [])
+        keys = [key for key in keys if key in project_issues]
+    return keys
+
+
+def bench_key_index(args, workdir):
+    """
+    Time chart drill-down key lookups of a CLM report: parsing
+    clm_issue_keys.json and filtering it by project as before, against the
+    key index read cold (cache cleared) and warm
+
+    Args:
+        args (argparse.Namespace): Benchmark options
+        workdir (str): Scratch directory
+
+    Returns:
+        list: One result per number of keys and chart slice
+    """
+    from modules.key_index import build_key_index, get_issue_keys, clear_key_cache, CLM_KEYS_FILE
+
+    results = []
+    for key_count in args.issues:
+        report_dir = os.path.join(workdir, f"report_{key_count}")
+        data_dir = os.path.join(report_dir, 'data')
+        os.makedirs(data_dir)
+
+        # Keys spread round-robin over the projects; the lists are slices of the filtered keys
+        keys = [f"ISSUE-{number}" for number in range(key_count)]
+        projects = [f"P{project}" for project in range(KEY_INDEX_PROJECTS)]
+        clm_data = {
+            'filtered_issue_keys': keys,
+            'clm_issue_keys': keys[::50],
+            'est_issue_keys': keys[1::50],
+            'improvement_issue_keys': keys[2::50],
+            'implementation_issue_keys': keys[::3],
+            'open_tasks_issue_keys': keys[::7],
+            'project_issue_mapping': {project: keys[number::len(projects)] for number, project in enumerate(projects)}
+        }
+        with open(os.path.join(data_dir, CLM_KEYS_FILE), 'w', encoding='utf-8') as f:
+            json.dump(clm_data, f)
+
+        started = time.perf_counter()
+        build_key_index(data_dir)
+        build_ms = (time.perf_counter() - started) * 1000
+
+        for chart_type, project in KEY_INDEX_SLICES:
+            def cold():
+                clear_key_cache()
+                return get_issue_keys(report_dir, chart_type, project)
+
+            item = {'keys': key_count, 'chart_type': chart_type, 'project': project,
+                    'slice_keys': len(cold()), 'index_build_ms': round(build_ms, 1),
+                    'json_scan_ms': round(best_time(lambda: scan_clm_keys(report_dir, chart_type, project),
+                                                    args.repeat) * 1000, 3),
+                    'index_cold_ms': round(best_time(cold, args.repeat) * 1000, 3)}
+            cold()
+            item['index_warm_ms'] = round(best_time(lambda: get_issue_keys(report_dir, chart_type, project),
+                                                    args.repeat) * 1000, 4)
+            item['identical'] = cold() == scan_clm_keys(report_dir, chart_type, project)
+            print(f"{key_count:>8} keys, {chart_type}/{project} ({item['slice_keys']} keys): "
+                  f"JSON scan {item['json_scan_ms']:.2f} ms, index cold {item['index_cold_ms']:.2f} ms, "
+                  f"warm {item['index_warm_ms']:.3f} ms, identical {item['identical']}", flush=True)
+            results.append(item)
+    return results
+
+
+def bench_report_store(args, workdir):
+    """
+    Size and load time of the processed issues of a report in each storage
+    format: Feather, the gzip JSON used without pyarrow, and the plain
+    raw_data.json records of older reports
+
+    Args:
+        args (argparse.Namespace): Benchmark options
+        workdir (str): Scratch directory
+
+    Returns:
+        list: One result per dataset size and format
+    """
+    from modules import report_store
+
+    feather = report_store.feather
+    results = []
+    for issue_count in args.issues:
+        df = build_issue_frame(issue_count, args.seed)
+
+        for name in ('feather', 'json_gzip', 'legacy_json'):
+            if name == 'feather' and feather is None:
+                logger.warning('pyarrow is not installed, skipping Feather')
+                continue
+
+            report_dir = os.path.join(workdir, f"{name}_{issue_count}")
+            data_dir = os.path.join(report_dir, 'data')
+            os.makedirs(data_dir)
+
+            def save():
+                if name == 'legacy_json':
+                    # As run_analysis wrote it before report_store
+                    df.to_json(os.path.join(data_dir, report_store.LEGACY_ISSUES_FILE), orient='records')
+                    return os.path.join(data_dir, report_store.LEGACY_ISSUES_FILE)
+                return report_store.save_issue_frame(df, data_dir)
+
+            # The JSON fallback is what save_issue_frame writes without pyarrow
+            report_store.feather = feather if name == 'feather' else None
+            try:
+                save_seconds = best_time(save, args.repeat)
+                path = save()
+            finally:
+                report_store.feather = feather
+
+            loaded = report_store.load_issue_frame(report_dir)
+            item = {'issues': issue_count, 'format': name, 'file': os.path.basename(path),
+                    'megabytes': round(os.path.getsize(path) / 1024 / 1024, 3),
+                    'save_ms': round(save_seconds * 1000, 1),
+                    'load_ms': round(best_time(lambda: report_store.load_issue_frame(report_dir),
+                                               args.repeat) * 1000, 1),
+                    'same_dtypes': loaded.dtypes.astype(str).to_dict() == df.dtypes.astype(str).to_dict()}
+            print(f"{issue_count:>8} issues, {name}: {item['megabytes']:.2f} MB, save {item['save_ms']:.1f} ms, "
+                  f"load {item['load_ms']:.1f} ms, same dtypes {item['same_dtypes']}", flush=True)
+            results.append(item)
+    return results
+
+
+def bench_field_profiles(args, workdir):
+    """
+    Bytes, requests and wall time of fetching all issues of the Jira filter
+    with each search field profile
+
+    Args:
+        args (argparse.Namespace): Benchmark options
+        workdir (str): Scratch directory
+
+    Returns:
+        list: One result per dataset size and profile
+    """
+    from benchmarks.run import start_fake_jira, stop_fake_jira
+    from modules.jira_analyzer import JiraAnalyzer
+
+    results = []
+    for issue_count in args.issues:
+        process, url = start_fake_jira(issue_count, args.seed, args.latency, os.path.join(workdir, 'fake_jira.log'))
+        try:
+            for profile in FIELD_PROFILE_NAMES:
+                runs = []
+                for _ in range(args.repeat):
+                    analyzer = JiraAnalyzer(jira_url=url, check_connection=False)
+                    started = time.perf_counter()
+                    fetched = sum(len(page) for page in analyzer.iter_issue_pages(filter_id=114476, profile=profile))
+                    runs.append(time.perf_counter() - started)
+
+                stats = analyzer.request_stats
+                item = {'issues': issue_count, 'profile': profile, 'fetched': fetched, 'requests': stats['requests'],
+                        'megabytes': round(stats['bytes'] / 1024 / 1024, 2),
+                        'wire_megabytes': round(stats['wire_bytes'] / 1024 / 1024, 2),
+                        'wall_seconds': round(statistics.median(runs), 3)}
+                print(f"{issue_count:>8} issues, {profile}: {item['requests']} requests, {item['megabytes']:.2f} MB "
+                      f"({item['wire_megabytes']:.2f} MB on the wire), {item['wall_seconds']:.2f} s", flush=True)
+                results.append(item)
+        finally:
+            stop_fake_jira(process)
+    return results
+
+
+def bench_decode(args, workdir):
+    """
+    Time decoding search response pages of 100 full-profile issues: the
+    body decoded to str first as response.json() does, json.loads on the
+    bytes, and decode_json (orjson when installed); plus the gzip size
+
+    Args:
+        args (argparse.Namespace): Benchmark options
+        workdir (str): Scratch directory
+
+    Returns:
+        list: One result per dataset size
+    """
+    from modules.jira_analyzer import decode_json, orjson
+
+    decoders = {
+        'text_json': lambda body: json.loads(body.decode('utf-8')),
+        'bytes_json': json.loads,
+        'decode_json': decode_json
+    }
+
+    results = []
+    for issue_count in args.issues:
+        dataset = SyntheticDataset(issue_count, args.seed)
+        bodies = [json.dumps({'startAt': start, 'maxResults': DECODE_PAGE_SIZE, 'total': len(dataset),
+                              'issues': [dataset.issue(index, expand=('changelog',))
+                                         for index in range(start, min(start + DECODE_PAGE_SIZE, len(dataset)))]}
+                             ).encode('utf-8')
+                  for start in range(0, len(dataset), DECODE_PAGE_SIZE)]
+
+        item = {'issues': issue_count, 'pages': len(bodies), 'orjson': orjson is not None,
+                'page_megabytes': round(statistics.mean(len(body) for body in bodies) / 1024 / 1024, 3),
+                'gzip_page_megabytes': round(statistics.mean(len(gzip.compress(body, 6)) for body in bodies)
+                                             / 1024 / 1024, 3)}
+        for name, decode in decoders.items():
+            seconds = best_time(lambda: [decode(body) for body in bodies], args.repeat)
+            item[f"{name}_ms_per_page"] = round(seconds / len(bodies) * 1000, 2)
+
+        print(f"{issue_count:>8} issues, {item['page_megabytes']:.2f} MB pages ({item['gzip_page_megabytes']:.3f} MB "
+              f"gzip): " + ', '.join(f"{name} {item[f'{name}_ms_per_page']:.2f} ms" for name in decoders), flush=True)
+        results.append(item)
+    return results
+
+
+class HandledCounter(logging.Handler):
+    """Handler counting the records that reach it"""
+
+    def __init__(self):
+        super().__init__()
+        self.count = 0
+
+    def emit(self, record):
+        self.count += 1
+
+
+def log_records(bench_logger, setup, record_count, stream):
+    """
+    Log INFO records from one call site through one logging setup
+
+    Args:
+        bench_logger (logging.Logger): Logger without other handlers
+        setup (str): 'handlers', 'queue' or 'queue_rate_limit'
+        record_count (int): Number of records
+        stream (file): Stream of the console handler
+
+    Returns:
+        tuple: (seconds spent in the calling thread, records that reached the handlers)
+    """
+    from modules.log_buffer import (BufferLogHandler, DeferredQueueHandler, RateLimitFilter, DEFAULT_LOG_RATE_LIMIT,
+                                    DEFAULT_LOG_BURST)
+
+    console = logging.StreamHandler(stream)
+    console.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    counter = HandledCounter()
+    handlers = [console, BufferLogHandler(), counter]
+
+    listener = None
+    if setup == 'handlers':
+        logger_handlers = handlers
+    else:
+        log_queue = queue.SimpleQueue()
+        queue_handler = DeferredQueueHandler(log_queue)
+        if setup == 'queue_rate_limit':
+            queue_handler.addFilter(RateLimitFilter(DEFAULT_LOG_RATE_LIMIT, DEFAULT_LOG_BURST))
+        logger_handlers = [queue_handler]
+        listener = QueueListener(log_queue, *handlers)
+        listener.start()
+
+    for handler in logger_handlers:
+        bench_logger.addHandler(handler)
+    try:
+        started = time.perf_counter()
+        for number in range(record_count):
+            bench_logger.info('Processed issue %s of %s', number, record_count)
+        seconds = time.perf_counter() - started
+    finally:
+        # Stopping the listener handles the records still in the queue
+        if listener is not None:
+            listener.stop()
+        for handler in logger_handlers:
+            bench_logger.removeHandler(handler)
+    return seconds, counter.count
+
+
+def bench_logging(args, workdir):
+    """
+    Time spent in the calling thread per INFO record logged in a loop from
+    one call site: handlers called directly as before, the queue listener
+    without a rate limit, and the queue listener with the default rate limit
+
+    args.issues is the number of records here. The console handler writes to
+    os.devnull and the buffer handler to the event stream, as in the app.
+
+    Args:
+        args (argparse.Namespace): Benchmark options
+        workdir (str): Scratch directory
+
+    Returns:
+        list: One result per number of records and setup
+    """
+    bench_logger = logging.getLogger('benchmarks.logging')
+    bench_logger.propagate = False
+    bench_logger.setLevel(logging.INFO)
+
+    results = []
+    with open(os.devnull, 'w', encoding='utf-8') as devnull:
+        for record_count in args.issues:
+            for setup in ('handlers', 'queue', 'queue_rate_limit'):
+                runs = [log_records(bench_logger, setup, record_count, devnull) for _ in range(args.repeat)]
+                seconds, passed = min(runs)
+                item = {'records': record_count, 'setup': setup,
+                        'caller_us_per_record': round(seconds / record_count * 1e6, 2), 'records_passed': passed}
+                print(f"{record_count:>8} records, {setup}: {item['caller_us_per_record']:.1f} us per record in the "
+                      f"caller, {passed} passed", flush=True)
+                results.append(item)
+    return results
+
+
+# Benchmark modes: name -> (function, description, default dataset sizes)
+MODES = {
+    'report-metrics': (bench_report_metrics, 'Summary, chart specs, metrics and chart data: legacy vs current writer',
+                       [1000, 10000, 50000]),
+    'changelog': (bench_changelog, 'Raw dump and changelog parsing, in-process or in a process pool',
+                  [20000]),
+    'clm-links': (bench_clm_links, 'Requests following the links of CLM issues: issuelinks vs linkedIssues() searches',
+                  [1000, 10000, 30000]),
+    'stream-memory': (bench_stream_memory, 'Peak Python memory of a Jira analysis vs a list of all raw issues',
+                      [1000, 10000, 30000]),
+    'issue-frame': (bench_issue_frame, 'Building the issues DataFrame from pages, compact dtypes vs strings',
+                    [10000, 100000]),
+    'report-catalog': (bench_report_catalog, 'First page of the report list: folder scan vs report catalog '
+                                             '(--issues is the number of reports)', [100, 1000]),
+    'key-index': (bench_key_index, 'Chart drill-down keys: clm_issue_keys.json scan vs key index '
+                                   '(--issues is the number of keys)', [50000]),
+    'report-store': (bench_report_store, 'Size and load time of the processed issues: Feather, gzip JSON, '
+                                         'legacy raw_data.json', [10000, 50000]),
+    'field-profiles': (bench_field_profiles, 'Bytes, requests and time of fetching the Jira filter per field profile',
+                       [5000, 20000]),
+    'decode': (bench_decode, 'Decoding search response pages: str + json, json on bytes, decode_json', [2000]),
+    'logging': (bench_logging, 'Caller time per INFO record: handlers, queue listener, queue listener with rate limit '
+                               '(--issues is the number of records)', [20000]),
+}
+
+
+def main():
+    """Run one benchmark mode"""
+    parser = argparse.ArgumentParser(description='Benchmarks of single analysis stages on synthetic data')
+    parser.add_argument('mode', choices=sorted(MODES), help='Stage to measure')
+    parser.add_argument('--issues', type=int, nargs='+',
+                        help='Dataset sizes (reports, keys or records in the modes that say so), '
+                             'depending on the mode by default')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help='Seed of the random data')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='Runs per measurement; timings keep the fastest run, '
+                             'the changelog and field-profiles modes the median')
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='Seconds added to every response of the fake Jira, in modes that use one')
+    parser.add_argument('--processes', type=int, nargs='+', default=[1, 2, 4, 8],
+                        help='Process pool sizes of the changelog mode, 1 parses in-process')
+    parser.add_argument('--output', help='File the results are written to, <mode>_results.json by default')
+    parser.add_argument('-v', '--verbose', action='store_true', help='Print the log of the measured code')
+    args = parser.parse_args()
+
+    function, description, default_issues = MODES[args.mode]
+    args.issues = args.issues or default_issues
+    output_path = os.path.abspath(args.output or f"{args.mode.replace('-', '_')}_results.json")
+
+    # modules.jira_analyzer refuses to load without a token; nothing here talks to a real Jira
+    if not getattr(config, 'api_token', None):
+        config.api_token = 'benchmark'
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING,
+                        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    # Reports and caches go to a scratch directory, never to the repository's jira_charts
+    workdir = tempfile.mkdtemp(prefix='jira-stats-micro-')
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        print(f"{args.mode}: {description}", flush=True)
+        results = function(args, workdir)
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'mode': args.mode,
+            'description': description,
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'settings': {key: getattr(args, key) for key in ('seed', 'repeat', 'latency', 'processes')},
+            'results': results
+        }, f, ensure_ascii=False, indent=2)
+    print(f"Results saved to {output_path}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,340 @@
+import os
+import sys
+import json
+import time
+import shutil
+import logging
+import platform
+import argparse
+import tempfile
+import statistics
+import subprocess
+from datetime import datetime
+
+import requests
+
+import config
+
+from benchmarks.dataset import DEFAULT_SEED
+from benchmarks.fake_jira import STATS_PATH
+
+# Root of the repository, where the fake Jira is started from
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Metrics a baseline comparison can guard, all of them lower is better
+GUARD_METRICS = ['wall_seconds', 'cpu_seconds', 'peak_rss_mb', 'requests', 'bytes']
+
+# Number of slowest top-level stages shown per benchmark
+TOP_STAGES = 5
+
+# Seconds to wait for the fake Jira to stop before killing it
+SERVER_STOP_TIMEOUT = 10
+
+# Get logger
+logger = logging.getLogger(__name__)
+
+
+def start_fake_jira(issue_count, seed, latency, log_path):
+    """
+    Start a fake Jira in a separate process, so serving it does not slow down the analysis
+
+    Args:
+        issue_count (int): Number of issues
+        seed (int): Seed of the random data
+        latency (float): Seconds added to every API response
+        log_path (str): File receiving the log of the fake Jira
+
+    Returns:
+        tuple: (subprocess.Popen, base URL)
+
+    Raises:
+        RuntimeError: If the fake Jira exits before it listens
+    """
+    command = [sys.executable, '-m', 'benchmarks.fake_jira', '--issues', str(issue_count), '--seed', str(seed),
+               '--port', '0', '--latency', str(latency)]
+    with open(log_path, 'a', encoding='utf-8') as log_file:
+        process = subprocess.Popen(command, cwd=REPO_ROOT, stdout=subprocess.PIPE, stderr=log_file, text=True)
+
+    # The fake Jira prints its URL once the issues are indexed
+    line = process.stdout.readline()
+    if ' listening on ' not in line:
+        process.kill()
+        raise RuntimeError(f"Fake Jira did not start, see {log_path}")
+    return process, line.rsplit(' listening on ', 1)[1].strip()
+
+
+def stop_fake_jira(process):
+    """Stop a fake Jira started by start_fake_jira"""
+    process.terminate()
+    try:
+        process.wait(SERVER_STOP_TIMEOUT)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+    process.stdout.close()
+
+
+def get_server_stats(url):
+    """Request counters and CPU time of a fake Jira"""
+    response = requests.get(url + STATS_PATH, timeout=10)
+    response.raise_for_status()
+    return response.json()
+
+
+def read_json(path):
+    """Read a JSON file of a report, None if it is missing"""
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def run_once(url, mode, args):
+    """
+    Run one analysis against the fake Jira
+
+    Args:
+        url (str): Base URL of the fake Jira
+        mode (str): Data source, 'jira' or 'clm'
+        args (argparse.Namespace): Benchmark options
+
+    Returns:
+        dict: Measurements of the run
+
+    Raises:
+        RuntimeError: If the analysis failed
+    """
+    # Imported here, once config points at the fake Jira
+    from modules.analysis import run_analysis, CHARTS_DIR
+    from modules.jobs import new_job_state
+    from modules.perf import PERF_FILE
+
+    server_before = get_server_stats(url)
+    state = new_job_state()
+    started = time.perf_counter()
+    run_analysis(data_source=mode, use_filter=True, date_from=args.date_from, date_to=args.date_to,
+                 use_cache=args.cache, analysis_state=state, profiling=args.profiling)
+    wall_seconds = time.perf_counter() - started
+    server_after = get_server_stats(url)
+
+    if state['error']:
+        raise RuntimeError(f"Analysis failed: {state['error']}")
+
+    output_dir = os.path.join(CHARTS_DIR, state['current_folder'])
+    perf = read_json(os.path.join(output_dir, 'metrics', PERF_FILE)) or {}
+    index = read_json(os.path.join(output_dir, 'index.json')) or {}
+    total = perf.get('total') or {}
+
+    run = {
+        'wall_seconds': round(wall_seconds, 3),
+        'cpu_seconds': total.get('cpu_seconds'),
+        'peak_rss_mb': total.get('peak_rss_mb'),
+        'requests': total.get('requests'),
+        'bytes': total.get('bytes'),
+        'issues': state['total_issues'],
+        'server_cpu_seconds': round(server_after['cpu_seconds'] - server_before['cpu_seconds'], 3),
+        'server_requests': server_after['requests'] - server_before['requests'],
+        'server_wire_bytes': server_after['wire_bytes'] - server_before['wire_bytes'],
+        'cache_stats': index.get('cache_stats'),
+        'stages': {stage['path']: stage['wall_seconds'] for stage in perf.get('stages', [])},
+        'report': output_dir
+    }
+
+    if not args.keep:
+        shutil.rmtree(output_dir, ignore_errors=True)
+        run['report'] = None
+    return run
+
+
+def summarize(runs):
+    """
+    Summarize the runs of one benchmark
+
+    Args:
+        runs (list): Results of run_once
+
+    Returns:
+        dict: Medians of the measurements, the fastest wall time and the slowest top-level stages
+    """
+    summary = {}
+    for key in ('wall_seconds', 'cpu_seconds', 'peak_rss_mb', 'requests', 'bytes', 'issues',
+                'server_cpu_seconds', 'server_wire_bytes'):
+        values = [run[key] for run in runs if run.get(key) is not None]
+        summary[key] = round(statistics.median(values), 3) if values else None
+    summary['min_wall_seconds'] = min(run['wall_seconds'] for run in runs)
+
+    # Top-level stages only: nested ones are already part of their parents
+    stages = {}
+    for run in runs:
+        for path, seconds in run['stages'].items():
+            if '/' not in path:
+                stages.setdefault(path, []).append(seconds)
+    medians = {path: round(statistics.median(values), 3) for path, values in stages.items()}
+    summary['top_stages'] = dict(sorted(medians.items(), key=lambda item: -item[1])[:TOP_STAGES])
+    return summary
+
+
+def result_key(item):
+    """Identify a benchmark of a results file; files without worker counts used the default"""
+    from modules.jira_analyzer import DEFAULT_MAX_WORKERS
+
+    return item['issues'], item['mode'], item.get('max_workers') or DEFAULT_MAX_WORKERS
+
+
+def compare(results, baseline, metric, tolerance):
+    """
+    Compare results with a baseline
+
+    Args:
+        results (list): Benchmarks of this run
+        baseline (dict): Results file of an earlier run
+        metric (str): Summary value compared
+        tolerance (float): Allowed relative increase, e.g. 0.2 for 20%
+
+    Returns:
+        list: Messages of the benchmarks that got slower than allowed
+    """
+    previous = {result_key(item): item['summary'] for item in baseline.get('results', [])}
+    regressions = []
+    for item in results:
+        base = previous.get(result_key(item), {}).get(metric)
+        value = item['summary'].get(metric)
+        if not base or value is None:
+            continue
+
+        change = value / base - 1
+        message = (f"{item['mode']} {item['issues']} issues, {item['max_workers']} workers: "
+                   f"{metric} {base} -> {value} ({change:+.0%})")
+        if change > tolerance:
+            regressions.append(message)
+            print(f"REGRESSION {message}")
+        else:
+            print(f"ok         {message}")
+    return regressions
+
+
+def print_table(results):
+    """Print the summaries of the benchmarks"""
+    print()
+    print(f"{'issues':>8} {'mode':<5} {'workers':>7} {'wall':>8} {'min':>8} {'cpu':>8} {'server':>8} {'rss MB':>8} "
+          f"{'requests':>8} {'MB':>8}")
+    for item in results:
+        summary = item['summary']
+        print(f"{item['issues']:>8} {item['mode']:<5} {item['max_workers']:>7} {summary['wall_seconds']:>8.2f} "
+              f"{summary['min_wall_seconds']:>8.2f} {summary['cpu_seconds'] or 0:>8.2f} "
+              f"{summary['server_cpu_seconds'] or 0:>8.2f} {summary['peak_rss_mb'] or 0:>8.1f} "
+              f"{summary['requests'] or 0:>8.0f} {(summary['bytes'] or 0) / 1024 / 1024:>8.1f}")
+        stages = ', '.join(f"{path} {seconds:.2f}s" for path, seconds in summary['top_stages'].items())
+        print(f"{'':>22} {stages}")
+    print()
+
+
+def setup_logging(verbose):
+    """Log like the application does, printing only warnings unless verbose"""
+    from modules.log_buffer import setup_log_buffer
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    if not verbose:
+        for handler in logging.getLogger().handlers:
+            handler.setLevel(logging.WARNING)
+    setup_log_buffer()
+
+
+def main():
+    """Run the benchmarks"""
+    parser = argparse.ArgumentParser(description='End-to-end benchmark of the analysis against a fake Jira')
+    parser.add_argument('--issues', type=int, nargs='+', default=[1000, 10000], help='Dataset sizes')
+    parser.add_argument('--modes', nargs='+', choices=['jira', 'clm'], default=['jira', 'clm'],
+                        help='Data sources to analyze')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per dataset size, mode and worker count')
+    parser.add_argument('--max-workers', type=int, nargs='+',
+                        help='Concurrent Jira requests to compare, 1 fetches the pages sequentially '
+                             '(config.max_workers by default)')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help='Seed of the random data')
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every Jira response')
+    parser.add_argument('--date-from', help='Start date of the worklog filter (YYYY-MM-DD)')
+    parser.add_argument('--date-to', help='End date of the worklog filter (YYYY-MM-DD)')
+    parser.add_argument('--cache', action='store_true',
+                        help='Use the issue cache (the first run of each dataset fills it)')
+    parser.add_argument('--profiling', action='store_true', help='Profile the analyses')
+    parser.add_argument('--workdir', help='Directory for reports and caches, a temporary one by default')
+    parser.add_argument('--keep', action='store_true', help='Keep the reports and the working directory')
+    parser.add_argument('--output', default='benchmark_results.json', help='File the results are written to')
+    parser.add_argument('--baseline', help='Results file to compare with')
+    parser.add_argument('--metric', choices=GUARD_METRICS, default='wall_seconds',
+                        help='Summary value compared with the baseline')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='Allowed relative increase over the baseline')
+    parser.add_argument('-v', '--verbose', action='store_true', help='Print the log of the analyses')
+    args = parser.parse_args()
+
+    output_path = os.path.abspath(args.output)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    # modules.jira_analyzer refuses to load without a token; the fake Jira accepts any
+    if not getattr(config, 'api_token', None):
+        config.api_token = 'benchmark'
+
+    # Imported here, once the token is set
+    from modules.jira_analyzer import DEFAULT_MAX_WORKERS
+
+    worker_counts = args.max_workers or [getattr(config, 'max_workers', None) or DEFAULT_MAX_WORKERS]
+
+    # Reports and caches go to the working directory, never to the repository's jira_charts
+    workdir = os.path.abspath(args.workdir) if args.workdir else tempfile.mkdtemp(prefix='jira-stats-benchmark-')
+    os.makedirs(workdir, exist_ok=True)
+    os.chdir(workdir)
+    setup_logging(args.verbose)
+
+    results = []
+    try:
+        # Smallest datasets first, since peak RSS is the high-water mark of this process
+        for issue_count in sorted(set(args.issues)):
+            print(f"Starting fake Jira with {issue_count} issues...", flush=True)
+            process, url = start_fake_jira(issue_count, args.seed, args.latency,
+                                           os.path.join(workdir, 'fake_jira.log'))
+            config.jira_url = url
+            try:
+                for mode in args.modes:
+                    for max_workers in worker_counts:
+                        # Read by every JiraAnalyzer the analysis creates
+                        config.max_workers = max_workers
+                        runs = []
+                        for number in range(args.repeat):
+                            run = run_once(url, mode, args)
+                            runs.append(run)
+                            print(f"  {mode} {max_workers} workers run {number + 1}/{args.repeat}: "
+                                  f"{run['issues']} issues, {run['wall_seconds']:.2f}s", flush=True)
+                        results.append({'issues': issue_count, 'mode': mode, 'max_workers': max_workers, 'runs': runs,
+                                        'summary': summarize(runs)})
+            finally:
+                stop_fake_jira(process)
+    finally:
+        if not args.workdir and not args.keep:
+            os.chdir(REPO_ROOT)
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    print_table(results)
+
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'settings': dict({key: getattr(args, key) for key in ('seed', 'latency', 'date_from', 'date_to', 'cache',
+                                                                  'profiling', 'repeat')}, max_workers=worker_counts),
+            'results': results
+        }, f, ensure_ascii=False, indent=2)
+    print(f"Results saved to {output_path}")
+
+    if baseline is not None and compare(results, baseline, args.metric, args.tolerance):
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
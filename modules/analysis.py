@@ -1,10 +1,22 @@
 import os
-import json
+import shutil
 import logging
 from datetime import datetime
-from routes.main_routes import analysis_state
-from modules.jira_analyzer import JiraAnalyzer
-from modules.data_processor import get_improved_open_statuses, get_status_categories
+from modules.jira_analyzer import JiraAnalyzer, get_analysis_profile
+from modules.issue_cache import IssueCache, get_cache_path
+from modules.data_processor import IssueFrameBuilder, apply_worklog_window
+from modules.utils import RawIssueWriter, create_report_folder
+from modules.report_store import (write_json, read_json, save_issue_frame, save_frame,
+                                  TRANSITIONS_FRAME, STATUS_TIMELINE_FRAME)
+from modules.jobs import new_job_state, check_cancelled, JobCancelled
+from modules.report_catalog import ReportCatalog
+from modules.key_index import build_key_index
+from modules.visualization import bar_chart_spec, publish_charts
+from modules.metrics import compute_issue_metrics
+from modules.changelog_parser import ChangelogStage
+from modules.status_timeline import build_status_timeline, compute_flow_metrics
+from modules.perf import PerfRecorder, span, timed_iter, PERF_FILE
+from modules.profiling import AnalysisProfiler
 
 # Get logger
 logger = logging.getLogger(__name__)
@@ -16,7 +28,7 @@ CHARTS_DIR = 'jira_charts'
 def prepare_chart_data(df, data_source='jira', use_filter=True, filter_id=None, jql_query=None,
                        date_from=None, date_to=None, clm_filter_id=None, clm_jql_query=None,
                        clm_metrics=None, clm_issues=None, est_issues=None, improvement_issues=None,
-                       implementation_issues=None, filtered_issues=None):
+                       implementation_issues=None, filtered_issues=None, metrics=None, flow=None):
     """
     Prepare chart data for interactive charts with special attention to special charts
 
@@ -36,13 +48,13 @@ def prepare_chart_data(df, data_source='jira', use_filter=True, filter_id=None,
         improvement_issues: List of improvement issues (optional)
         implementation_issues: List of implementation issues (optional)
         filtered_issues: List of filtered issues (optional)
+        metrics (IssueMetrics): Aggregates of df, computed here if not given
+        flow (FlowMetrics): Lead time, cycle time and time in status, optional
 
     Returns:
         dict: Chart data for interactive charts
     """
     import logging
-    from modules.data_processor import get_status_categories, get_improved_open_statuses
-    import json
 
     logger = logging.getLogger(__name__)
 
@@ -60,11 +72,15 @@ def prepare_chart_data(df, data_source='jira', use_filter=True, filter_id=None,
                 logger.info(f"Filtered from {len(df)} to {len(filtered_df)} rows for chart data")
                 # Use the filtered DataFrame for all subsequent operations
                 df = filtered_df
+                metrics = None
+
+        if metrics is None:
+            metrics = compute_issue_metrics(df)
 
         # Project data from the (potentially filtered) DataFrame
-        project_counts = df['project'].value_counts().to_dict()
-        project_estimates = df.groupby('project')['original_estimate_hours'].sum().to_dict()
-        project_time_spent = df.groupby('project')['time_spent_hours'].sum().to_dict()
+        project_counts = metrics.project_counts.to_dict()
+        project_estimates = metrics.by_project['original_estimate_hours'].to_dict()
+        project_time_spent = metrics.by_project['time_spent_hours'].to_dict()
 
         # Generate the list of all projects
         all_projects = list(set(list(project_counts.keys()) +
@@ -76,24 +92,23 @@ def prepare_chart_data(df, data_source='jira', use_filter=True, filter_id=None,
         # Extract issue keys by project for JQL generation
         project_issue_mapping = {}
         for project in all_projects:
-            project_df = df[df['project'] == project]
-            project_issue_mapping[project] = project_df['issue_key'].tolist()
+            project_issue_mapping[project] = list(metrics.issue_keys_by_project.get(project, ()))
 
         logger.info(f"Created project-to-issues mapping for {len(project_issue_mapping)} projects")
 
         # Special chart 1: No transitions tasks data (переименован в "Открытые задачи со списаниями")
-        no_transitions_tasks = df[df['no_transitions'] == True]
+        no_transitions_tasks = metrics.no_transitions_tasks
         no_transitions_by_project = {}
         if not no_transitions_tasks.empty:
             try:
-                no_transitions_by_project = no_transitions_tasks.groupby('project').size().to_dict()
+                no_transitions_by_project = metrics.project_column(
+                    'no_transitions_tasks', only_with='no_transitions_tasks').to_dict()
                 logger.info(f"Prepared open tasks with worklogs data with {len(no_transitions_by_project)} projects")
 
                 # Store the open task issue keys by project
                 open_tasks_by_project = {}
                 for project in no_transitions_by_project.keys():
-                    project_open_tasks = no_transitions_tasks[no_transitions_tasks['project'] == project]
-                    open_tasks_by_project[project] = project_open_tasks['issue_key'].tolist()
+                    open_tasks_by_project[project] = list(metrics.no_transitions_keys_by_project[project])
             except Exception as e:
                 logger.error(f"Error preparing open tasks with worklogs data: {str(e)}")
                 # Provide an empty dict in case of error
@@ -134,6 +149,10 @@ def prepare_chart_data(df, data_source='jira', use_filter=True, filter_id=None,
             'project_issue_mapping': project_issue_mapping
         }
 
+        # Lead time, cycle time and time in status by project
+        if flow is not None:
+            chart_data['flow'] = flow.to_chart_data()
+
         # Add CLM specific data if available
         if data_source == 'clm' and clm_metrics:
             chart_data['clm_metrics'] = clm_metrics
@@ -172,7 +191,8 @@ def prepare_chart_data(df, data_source='jira', use_filter=True, filter_id=None,
 
 
 def run_analysis(data_source='jira', use_filter=True, filter_id=114476, jql_query=None, date_from=None, date_to=None,
-                 clm_filter_id=114473, clm_jql_query=None):
+                 clm_filter_id=114473, clm_jql_query=None, use_cache=True, status_mapping=None, analysis_state=None,
+                 profiling=False):
     """
     Run Jira data analysis in a separate thread
 
@@ -185,8 +205,29 @@ def run_analysis(data_source='jira', use_filter=True, filter_id=114476, jql_quer
         date_to (str): End date for worklog filtering (YYYY-MM-DD)
         clm_filter_id (str/int): ID of CLM filter to use
         clm_jql_query (str): CLM JQL query to use instead of filter ID
+        use_cache (bool): Reuse issues from the local issue cache and only fetch updated ones
+        status_mapping (dict): Status IDs or names -> 'open'/'closed' overrides for this analysis,
+                               defaults to config.status_mapping
+        analysis_state (dict): Progress state of this run, see modules.jobs.new_job_state
+        profiling (bool): Profile this run and save the results to the report's profile directory
+
+    Raises:
+        JobCancelled: If the job running this analysis was cancelled
     """
-    global analysis_state
+    if analysis_state is None:
+        analysis_state = new_job_state()
+
+    output_dir = None
+
+    # Wall time, CPU time, memory and Jira traffic of every stage, saved to metrics/perf.json
+    perf = PerfRecorder()
+    perf.start()
+
+    # Profilers are only set up on request, so normal runs pay nothing for them
+    profiler = None
+    if profiling:
+        profiler = AnalysisProfiler()
+        profiler.start()
 
     try:
         analysis_state['is_running'] = True
@@ -194,13 +235,10 @@ def run_analysis(data_source='jira', use_filter=True, filter_id=114476, jql_quer
         analysis_state['status_message'] = 'Initialization...'
 
         # Create timestamp folder
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = create_report_folder(CHARTS_DIR, datetime.now().strftime("%Y%m%d_%H%M%S"))
         output_dir = os.path.join(CHARTS_DIR, timestamp)
         analysis_state['current_folder'] = timestamp
 
-        if not os.path.exists(output_dir):
-            os.makedirs(output_dir)
-
         # Create directory for JSON data
         data_dir = os.path.join(output_dir, 'data')
         if not os.path.exists(data_dir):
@@ -212,7 +250,27 @@ def run_analysis(data_source='jira', use_filter=True, filter_id=114476, jql_quer
             os.makedirs(metrics_dir)
 
         # Initialize Jira analyzer
-        analyzer = JiraAnalyzer()
+        analyzer = JiraAnalyzer(status_mapping=status_mapping)
+
+        # Local issue stores for incremental refreshes, one per field profile
+        issue_caches = {}
+        cache_stats = {'hits': 0, 'misses': 0}
+
+        def iter_issue_pages(query, profile):
+            """Iterate over pages of issues for a query, through the issue cache when enabled"""
+            if not use_cache:
+                return analyzer.iter_issue_pages(jql_query=query, profile=profile)
+
+            if profile not in issue_caches:
+                issue_caches[profile] = IssueCache(get_cache_path(profile))
+
+            # Pages stream through the cache, with a cancellation check after every Jira request
+            return analyzer.iter_cached_issue_pages(query, issue_caches[profile], profile, cache_stats,
+                                                    cancel_check=lambda: check_cancelled(analysis_state))
+
+        def fetch_issues(query, profile):
+            """Fetch all issues for a query as one list"""
+            return [issue for page in iter_issue_pages(query, profile) for issue in page]
 
         # Get the right query based on data source
         clm_metrics = None
@@ -244,8 +302,8 @@ def run_analysis(data_source='jira', use_filter=True, filter_id=114476, jql_quer
             analysis_state['status_message'] = f'Fetching CLM issues with query: {clm_query}'
             analysis_state['progress'] = 5
 
-            # Get CLM issues
-            clm_issues = analyzer.get_issues_by_filter(jql_query=clm_query)
+            # Get CLM issues, only their links are followed
+            clm_issues = fetch_issues(clm_query, 'links')
             clm_count = len(clm_issues)
             analysis_state['status_message'] = f'Found {clm_count} CLM issues'
 
@@ -255,6 +313,7 @@ def run_analysis(data_source='jira', use_filter=True, filter_id=114476, jql_quer
                 return
 
             # Get related issues using the improved method
+            check_cancelled(analysis_state)
             analysis_state['status_message'] = 'Fetching related EST, Improvement and implementation issues...'
             analysis_state['progress'] = 25
 
@@ -322,6 +381,7 @@ def run_analysis(data_source='jira', use_filter=True, filter_id=114476, jql_quer
 
                 # Process issues in batches to avoid query length limitations
                 for i in range(0, len(implementation_issue_keys), batch_size):
+                    check_cancelled(analysis_state)
                     batch_keys = implementation_issue_keys[i:i + batch_size]
                     # Create JQL with issue keys AND date filter
                     batch_query = f"key in ({','.join(batch_keys)}) AND ({date_query})"
@@ -376,9 +436,8 @@ def run_analysis(data_source='jira', use_filter=True, filter_id=114476, jql_quer
                 'project_implementation_mapping': project_implementation_mapping
             }
 
+            # Written once the processed issues are known, see below
             clm_keys_path = os.path.join(data_dir, 'clm_issue_keys.json')
-            with open(clm_keys_path, 'w', encoding='utf-8') as f:
-                json.dump(clm_keys_data, f, indent=4, ensure_ascii=False)
 
             # Prepare CLM metrics
             components_to_projects = map_components_to_projects(est_issues, implementation_issues)
@@ -395,8 +454,7 @@ def run_analysis(data_source='jira', use_filter=True, filter_id=114476, jql_quer
 
             # Save CLM metrics
             clm_metrics_path = os.path.join(metrics_dir, 'clm_metrics.json')
-            with open(clm_metrics_path, 'w', encoding='utf-8') as f:
-                json.dump(clm_metrics, f, indent=4, ensure_ascii=False)
+            write_json(clm_metrics_path, clm_metrics)
 
             # Create array of issue dictionaries for processing
             analysis_state['status_message'] = f'Processing {len(issues)} issues...'
@@ -418,8 +476,7 @@ def run_analysis(data_source='jira', use_filter=True, filter_id=114476, jql_quer
                 }
                 summary_data.update(clm_metrics)
 
-                with open(summary_path, 'w', encoding='utf-8') as f:
-                    json.dump(summary_data, f, indent=4, ensure_ascii=False)
+                write_json(summary_path, summary_data)
 
                 # Create index file
                 index_data = {
@@ -437,8 +494,9 @@ def run_analysis(data_source='jira', use_filter=True, filter_id=114476, jql_quer
                 }
 
                 index_path = os.path.join(output_dir, 'index.json')
-                with open(index_path, 'w', encoding='utf-8') as f:
-                    json.dump(index_data, f, indent=4, ensure_ascii=False)
+                write_json(index_path, index_data)
+
+                write_json(clm_keys_path, clm_keys_data)
 
                 analysis_state[
                     'status_message'] = "No implementation issues found with time logged in the specified period."
@@ -463,15 +521,35 @@ def run_analysis(data_source='jira', use_filter=True, filter_id=114476, jql_quer
             analysis_state['status_message'] = f'Using query: {final_jql}'
             analysis_state['progress'] = 10
 
-            # Fetch issues
+            # Issues are fetched lazily, page by page, while they are processed below
             analysis_state['status_message'] = 'Fetching issues from Jira...'
-            issues = analyzer.get_issues_by_filter(jql_query=final_jql)
+            issue_pages = iter_issue_pages(final_jql, get_analysis_profile())
+        else:
+            # CLM issues are already in memory
+            issue_pages = [issues]
+
+        # Reduce every page to compact rows and write it to the raw dump as soon as it arrives.
+        # Changelogs are parsed from the dumped page by the process pool while the next page is fetched.
+        builder = IssueFrameBuilder()
+        changelog_stage = ChangelogStage()
+        raw_issues_path = os.path.join(output_dir, 'raw_issues.jsonl.gz')
+        with RawIssueWriter(raw_issues_path) as raw_writer:
+            for page in timed_iter(issue_pages, 'fetch_issues'):
+                check_cancelled(analysis_state)
+                builder.add_page(page)
+                with span('raw_dump'):
+                    offset, length = raw_writer.write_page(page)
+                changelog_stage.add_page(page, shard=(raw_issues_path, offset, length))
+                analysis_state['total_issues'] = len(builder)
+                analysis_state['status_message'] = f'Fetched and processed {len(builder)} issues...'
+        logger.info(f"Raw issue data saved to {raw_issues_path}")
 
-        analysis_state['total_issues'] = len(issues)
-        analysis_state['status_message'] = f'Found {len(issues)} issues.'
+        issue_count = len(builder)
+        analysis_state['total_issues'] = issue_count
+        analysis_state['status_message'] = f'Found {issue_count} issues.'
         analysis_state['progress'] = 50
 
-        if not issues:
+        if not issue_count:
             # Create empty summary file with required fields
             summary_path = os.path.join(output_dir, 'summary.json')
             summary_data = {
@@ -489,8 +567,7 @@ def run_analysis(data_source='jira', use_filter=True, filter_id=114476, jql_quer
             if clm_metrics:
                 summary_data.update(clm_metrics)
 
-            with open(summary_path, 'w', encoding='utf-8') as f:
-                json.dump(summary_data, f, indent=4, ensure_ascii=False)
+            write_json(summary_path, summary_data)
 
             # Create index file
             index_data = {
@@ -508,8 +585,7 @@ def run_analysis(data_source='jira', use_filter=True, filter_id=114476, jql_quer
             }
 
             index_path = os.path.join(output_dir, 'index.json')
-            with open(index_path, 'w', encoding='utf-8') as f:
-                json.dump(index_data, f, indent=4, ensure_ascii=False)
+            write_json(index_path, index_data)
 
             analysis_state['status_message'] = "No issues found. Check query or credentials."
             analysis_state['is_running'] = False
@@ -518,70 +594,73 @@ def run_analysis(data_source='jira', use_filter=True, filter_id=114476, jql_quer
         # Process data
         analysis_state['status_message'] = 'Processing issue data...'
         analysis_state['progress'] = 60
-        df = analyzer.process_issues_data(issues)
-
-        # Save raw data for interactive charts
-        raw_data_path = os.path.join(data_dir, 'raw_data.json')
-        df.to_json(raw_data_path, orient='records')
+        df = builder.build()
+
+        # Count only the time logged within the analysis period
+        if date_from or date_to:
+            analysis_state['status_message'] = 'Attributing worklogs to the analysis period...'
+            with span('worklog_window'):
+                truncated_keys = builder.get_truncated_worklog_keys()
+                if truncated_keys:
+                    for issue_key, worklogs in analyzer.get_issue_worklogs(truncated_keys).items():
+                        builder.set_full_worklogs(issue_key, worklogs)
+
+                df = apply_worklog_window(df, builder.build_worklogs(), date_from, date_to)
+
+        # Categorize the status of every issue
+        with span('classify_statuses'):
+            df = analyzer.status_classifier.add_category_column(df)
+
+        # Save the processed issues for later use
+        with span('save_frames'):
+            save_issue_frame(df, data_dir)
+
+        # Status timelines of all issues from the changelogs
+        analysis_state['status_message'] = 'Collecting status transitions...'
+        changelog_records = changelog_stage.records()
+        with span('status_timeline'):
+            transitions_df, timeline_df = build_status_timeline(changelog_records)
+        with span('save_frames'):
+            save_frame(transitions_df, data_dir, TRANSITIONS_FRAME)
+            save_frame(timeline_df, data_dir, STATUS_TIMELINE_FRAME)
+
+        # Aggregates shared by the charts, the summary and the chart data
+        with span('issue_metrics'):
+            metrics = compute_issue_metrics(df, analyzer.status_classifier)
+        with span('flow_metrics'):
+            flow = compute_flow_metrics(timeline_df, df, analyzer.status_classifier)
 
         # If this is CLM mode, let's also identify and store open task issue keys for better JQL generation
         if data_source == 'clm':
-            # Identify open tasks with time spent
-            open_statuses = get_improved_open_statuses(df)
-            open_tasks = df[df['status'].isin(open_statuses) & (df['time_spent_hours'] > 0)]
-
-            if not open_tasks.empty:
-                open_tasks_issue_keys = open_tasks['issue_key'].tolist()
-
-                # Update the CLM keys data with open tasks
-                try:
-                    with open(clm_keys_path, 'r', encoding='utf-8') as f:
-                        clm_keys_data = json.load(f)
-
-                    clm_keys_data['open_tasks_issue_keys'] = open_tasks_issue_keys
-
-                    with open(clm_keys_path, 'w', encoding='utf-8') as f:
-                        json.dump(clm_keys_data, f, indent=4, ensure_ascii=False)
-                except Exception as e:
-                    logger.error(f"Error updating CLM keys data with open tasks: {e}")
+            # Open tasks with time spent
+            if not metrics.open_tasks.empty:
+                clm_keys_data['open_tasks_issue_keys'] = metrics.open_tasks['issue_key'].tolist()
 
             # Also update project-to-issues mapping from the processed data
-            project_to_issues = {}
-            for _, row in df.iterrows():
-                project = row['project']
-                issue_key = row['issue_key']
+            clm_keys_data['project_issue_mapping'] = {
+                project: list(keys) for project, keys in metrics.issue_keys_by_project.items()}
 
-                if project not in project_to_issues:
-                    project_to_issues[project] = []
-
-                project_to_issues[project].append(issue_key)
-
-            # Update the CLM keys data with project mapping
+            # Save the CLM keys once, with open tasks and project mapping
             try:
-                with open(clm_keys_path, 'r', encoding='utf-8') as f:
-                    clm_keys_data = json.load(f)
-
-                clm_keys_data['project_issue_mapping'] = project_to_issues
+                write_json(clm_keys_path, clm_keys_data)
+            except Exception as e:
+                logger.error(f"Error saving CLM keys data: {e}")
 
-                with open(clm_keys_path, 'w', encoding='utf-8') as f:
-                    json.dump(clm_keys_data, f, indent=4, ensure_ascii=False)
+            # Index the keys by chart type and project for chart drill-downs
+            try:
+                build_key_index(data_dir)
             except Exception as e:
-                logger.error(f"Error updating CLM keys data with project mapping: {e}")
+                logger.error(f"Error building issue key index: {e}")
 
         # Create visualizations
+        check_cancelled(analysis_state)
         analysis_state['status_message'] = 'Creating visualizations...'
         analysis_state['progress'] = 70
-        chart_paths = analyzer.create_visualizations(df, output_dir)
+        chart_paths = analyzer.create_visualizations(df, output_dir, metrics=metrics, flow=flow)
 
         # For CLM analysis, create additional CLM summary visualization
         if data_source == 'clm' and clm_metrics:
             analysis_state['status_message'] = 'Creating CLM summary visualization...'
-            import matplotlib.pyplot as plt
-            import seaborn as sns
-
-            # Create CLM summary chart
-            plt.figure(figsize=(10, 6))
-
             # Bar chart showing counts of different issue types
             counts = [
                 clm_metrics['clm_issues_count'],
@@ -592,46 +671,40 @@ def run_analysis(data_source='jira', use_filter=True, filter_id=114476, jql_quer
             ]
             labels = ['CLM Issues', 'EST Issues', 'Improvement Issues', 'Linked Issues', 'Filtered Issues']
 
-            ax = sns.barplot(x=labels, y=counts)
-            plt.title('CLM Analysis Summary')
-            plt.ylabel('Count')
-            plt.xticks(rotation=45, ha='right')
-            plt.tight_layout()
-
-            # Save chart
-            clm_summary_path = f"{output_dir}/clm_summary.png"
-            plt.savefig(clm_summary_path)
-            plt.close()
+            clm_summary_spec = bar_chart_spec('clm_summary', f"{output_dir}/clm_summary.png", labels, counts,
+                                              'CLM Analysis Summary', ylabel='Count', figsize=(10, 6))
 
             # Add to chart paths
-            chart_paths['clm_summary'] = clm_summary_path
+            chart_paths.update(publish_charts([clm_summary_spec], output_dir, logger))
 
         # Generate data for interactive charts
         analysis_state['status_message'] = 'Creating interactive charts...'
         analysis_state['progress'] = 80
 
         # Use the prepare_chart_data function instead of inline code
-        chart_data = prepare_chart_data(
-            df,
-            data_source=data_source,
-            use_filter=use_filter,
-            filter_id=filter_id,
-            jql_query=jql_query,
-            date_from=date_from,
-            date_to=date_to,
-            clm_filter_id=clm_filter_id,
-            clm_jql_query=clm_jql_query,
-            clm_metrics=clm_metrics
-        )
+        with span('chart_data'):
+            chart_data = prepare_chart_data(
+                df,
+                data_source=data_source,
+                use_filter=use_filter,
+                filter_id=filter_id,
+                jql_query=jql_query,
+                date_from=date_from,
+                date_to=date_to,
+                clm_filter_id=clm_filter_id,
+                clm_jql_query=clm_jql_query,
+                clm_metrics=clm_metrics,
+                metrics=metrics,
+                flow=flow
+            )
 
         chart_data_path = os.path.join(data_dir, 'chart_data.json')
-        with open(chart_data_path, 'w', encoding='utf-8') as f:
-            json.dump(chart_data, f, indent=4, ensure_ascii=False)
+        write_json(chart_data_path, chart_data)
 
         # Create index file with chart information
         index_data = {
             'timestamp': timestamp,
-            'total_issues': len(issues),
+            'total_issues': issue_count,
             'charts': chart_paths,
             'summary': {},
             'date_from': date_from,
@@ -640,47 +713,47 @@ def run_analysis(data_source='jira', use_filter=True, filter_id=114476, jql_quer
             'jql_query': jql_query if not use_filter and data_source == 'jira' else None,
             'clm_filter_id': clm_filter_id if use_filter and data_source == 'clm' else None,
             'clm_jql_query': clm_jql_query if not use_filter and data_source == 'clm' else None,
-            'data_source': data_source
+            'data_source': data_source,
+            'request_stats': analyzer.get_request_stats(),
+            'cache_stats': cache_stats
         }
 
         # Load summary data if available
         summary_path = chart_paths.get('summary')
         if summary_path and os.path.exists(summary_path):
             try:
-                with open(summary_path, 'r', encoding='utf-8') as f:
-                    summary_data = json.load(f)
+                summary_data = read_json(summary_path)
 
-                    # Add CLM metrics to summary if available
-                    if clm_metrics:
-                        summary_data.update(clm_metrics)
+                # Add CLM metrics to summary if available
+                if clm_metrics:
+                    summary_data.update(clm_metrics)
 
-                    # Ensure all required fields exist
-                    if 'total_original_estimate_hours' not in summary_data:
-                        summary_data['total_original_estimate_hours'] = 0
+                # Ensure all required fields exist
+                if 'total_original_estimate_hours' not in summary_data:
+                    summary_data['total_original_estimate_hours'] = 0
 
-                    if 'total_time_spent_hours' not in summary_data:
-                        summary_data['total_time_spent_hours'] = 0
+                if 'total_time_spent_hours' not in summary_data:
+                    summary_data['total_time_spent_hours'] = 0
 
-                    if 'avg_estimate_per_issue' not in summary_data:
-                        summary_data['avg_estimate_per_issue'] = 0
+                if 'avg_estimate_per_issue' not in summary_data:
+                    summary_data['avg_estimate_per_issue'] = 0
 
-                    if 'avg_time_spent_per_issue' not in summary_data:
-                        summary_data['avg_time_spent_per_issue'] = 0
+                if 'avg_time_spent_per_issue' not in summary_data:
+                    summary_data['avg_time_spent_per_issue'] = 0
 
-                    if 'overall_efficiency' not in summary_data:
-                        summary_data['overall_efficiency'] = 0
+                if 'overall_efficiency' not in summary_data:
+                    summary_data['overall_efficiency'] = 0
 
-                    index_data['summary'] = summary_data
+                index_data['summary'] = summary_data
 
-                    # Write updated summary back to file
-                    with open(summary_path, 'w', encoding='utf-8') as f:
-                        json.dump(summary_data, f, indent=4, ensure_ascii=False)
+                # Write updated summary back to file
+                write_json(summary_path, summary_data)
             except Exception as e:
                 logger.error(f"Error reading summary: {e}")
 
                 # Create default summary
                 index_data['summary'] = {
-                    'total_issues': len(issues),
+                    'total_issues': issue_count,
                     'total_original_estimate_hours': 0,
                     'total_time_spent_hours': 0,
                     'projects_count': len(df['project'].unique()) if not df.empty else 0,
@@ -695,24 +768,49 @@ def run_analysis(data_source='jira', use_filter=True, filter_id=114476, jql_quer
 
         # Save index file
         index_path = os.path.join(output_dir, 'index.json')
-        with open(index_path, 'w', encoding='utf-8') as f:
-            json.dump(index_data, f, indent=4, ensure_ascii=False)
+        write_json(index_path, index_data)
 
         analysis_state['status_message'] = f'Analysis complete. Charts saved to {output_dir}.'
         analysis_state['progress'] = 100
         analysis_state['last_run'] = timestamp
 
-        # Save raw issues for diagnostics
-        raw_issues_path = os.path.join(output_dir, 'raw_issues.json')
-        with open(raw_issues_path, 'w', encoding='utf-8') as f:
-            json.dump(issues, f, indent=2, ensure_ascii=False)
-        logger.info(f"Raw issue data saved to {raw_issues_path}")
-
+    except JobCancelled:
+        logger.info("Analysis cancelled")
+        analysis_state['status_message'] = 'Analysis cancelled.'
+        # Drop the incomplete report
+        if output_dir and os.path.exists(output_dir):
+            shutil.rmtree(output_dir, ignore_errors=True)
+        raise
     except Exception as e:
         logger.error(f"Error during analysis: {e}", exc_info=True)
         analysis_state['status_message'] = f"An error occurred: {str(e)}"
+        analysis_state['error'] = str(e)
     finally:
         analysis_state['is_running'] = False
+        if profiler is not None:
+            profiler.stop()
+        perf.stop()
+
+        # Save the stage timings of complete and failed runs (cancelled runs leave no report)
+        if output_dir and os.path.isdir(output_dir):
+            try:
+                os.makedirs(os.path.join(output_dir, 'metrics'), exist_ok=True)
+                write_json(os.path.join(output_dir, 'metrics', PERF_FILE), perf.to_dict())
+            except Exception as e:
+                logger.error(f"Error saving stage timings: {e}")
+
+            if profiler is not None:
+                try:
+                    profiler.save(output_dir)
+                except Exception as e:
+                    logger.error(f"Error saving profiling results: {e}")
+
+        # List the report on the main page (incomplete reports too, so they can be inspected or deleted)
+        if output_dir and os.path.isdir(output_dir):
+            try:
+                ReportCatalog().add_report(timestamp)
+            except Exception as e:
+                logger.error(f"Error adding report to catalog: {e}")
 
 
 def map_components_to_projects(est_issues, implementation_issues):
@@ -0,0 +1,183 @@
+import gzip
+import json
+import logging
+from datetime import datetime
+from concurrent.futures import CancelledError
+from concurrent.futures.process import BrokenProcessPool
+from modules.process_pool import get_process_pool, reset_process_pool
+from modules.perf import timed
+
+# Get logger
+logger = logging.getLogger(__name__)
+
+# Format of Jira dates; fromisoformat only reads the +0300 offset since Python 3.11
+JIRA_DATETIME_FORMAT = '%Y-%m-%dT%H:%M:%S.%f%z'
+
+
+def parse_jira_datetime(value):
+    """
+    Convert a Jira date ('2025-03-01T10:00:00.000+0300') to epoch seconds
+
+    Args:
+        value (str): Jira date
+
+    Returns:
+        float: Epoch seconds, or None if the date is missing or invalid
+    """
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, JIRA_DATETIME_FORMAT).timestamp()
+    except ValueError:
+        return None
+
+
+def parse_issue_changelog(issue):
+    """
+    Reduce the changelog of an issue to a compact transition record.
+
+    The status timeline starts with the status the issue was created in (at
+    its creation date) followed by one entry per status change, oldest first.
+    Each status is left when the next one is entered; the last one is current.
+
+    Args:
+        issue (dict): Raw issue with an expanded changelog
+
+    Returns:
+        tuple: (issue key, number of status changes, epoch seconds of the first
+                status change or None, timeline as a tuple of
+                (status ID, status name, epoch seconds entered) tuples).
+                Without a changelog the number of changes is None and the timeline empty.
+    """
+    if 'changelog' not in issue:
+        return issue.get('key'), None, None, ()
+
+    fields = issue.get('fields', {})
+
+    transitions = []
+    for history in issue.get('changelog', {}).get('histories', []):
+        for item in history.get('items', []):
+            if item.get('field') == 'status':
+                transitions.append((parse_jira_datetime(history.get('created')), item.get('from'),
+                                    item.get('fromString'), item.get('to'), item.get('toString')))
+
+    # Histories normally come oldest first, but don't rely on it
+    transitions = [transition for transition in transitions if transition[0] is not None]
+    transitions.sort(key=lambda transition: transition[0])
+
+    timeline = []
+    created = parse_jira_datetime(fields.get('created'))
+    if created is not None:
+        if transitions:
+            timeline.append((transitions[0][1], transitions[0][2], created))
+        else:
+            current_status = fields.get('status') or {}
+            timeline.append((current_status.get('id'), current_status.get('name', 'Unknown'), created))
+
+    # A status is never entered before the previous one, even if the clocks disagree
+    entered = created
+    for moment, _, _, to_id, to_status in transitions:
+        entered = moment if entered is None else max(entered, moment)
+        timeline.append((to_id, to_status, entered))
+
+    first_transition = transitions[0][0] if transitions else None
+    return issue.get('key'), len(transitions), first_transition, tuple(timeline)
+
+
+def parse_changelog_page(issues):
+    """
+    Reduce the changelogs of a page of issues to transition records
+
+    Args:
+        issues (list): Raw issues
+
+    Returns:
+        list: Transition records in page order
+    """
+    return [parse_issue_changelog(issue) for issue in issues]
+
+
+def parse_changelog_shard(shard):
+    """
+    Parse one page of a raw issue dump in a worker process.
+
+    The page is read back from its own gzip member of the dump, so only the
+    file position crosses the process boundary, not the issues themselves.
+
+    Args:
+        shard (tuple): (dump path, member offset, member length)
+
+    Returns:
+        list: Transition records in page order
+    """
+    path, offset, length = shard
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        data = gzip.decompress(f.read(length))
+
+    issues = [json.loads(line) for line in data.splitlines() if line]
+    return parse_changelog_page(issues)
+
+
+class ChangelogStage:
+    """
+    Parses issue changelogs page by page, in the shared process pool when it is enabled.
+
+    Pages that were written to a raw issue dump (see RawIssueWriter.write_page)
+    are parsed from the dump by the pool workers while further pages are still
+    being fetched, so the changelog walk does not hold the GIL of the Flask
+    process. Without a pool, or for pages that were not dumped, the page is
+    parsed right away in-process.
+    """
+
+    def __init__(self, use_pool=True):
+        """
+        Args:
+            use_pool (bool): Parse dumped pages in the shared process pool if it is enabled
+        """
+        self.pool = get_process_pool() if use_pool else None
+        self._pages = []
+
+    @timed('parse_changelogs')
+    def add_page(self, issues, shard=None):
+        """
+        Queue a page of issues for parsing
+
+        Args:
+            issues (list): Raw issues
+            shard (tuple): (dump path, member offset, member length) of the page in the raw dump, optional
+        """
+        if self.pool is not None and shard is not None:
+            try:
+                self._pages.append((self.pool.submit(parse_changelog_shard, shard), shard))
+                return
+            except (BrokenProcessPool, RuntimeError) as e:
+                logger.warning(f"Process pool is not available ({e}), parsing changelogs in-process")
+                reset_process_pool(self.pool)
+                self.pool = None
+
+        self._pages.append((None, parse_changelog_page(issues)))
+
+    @timed('parse_changelogs')
+    def records(self):
+        """
+        Get the transition records of all pages, waiting for the pool if needed
+
+        Returns:
+            list: Transition records in the order the issues were added
+        """
+        records = []
+        for future, page in self._pages:
+            if future is None:
+                records.extend(page)
+                continue
+
+            try:
+                records.extend(future.result())
+            except (BrokenProcessPool, CancelledError) as e:
+                # A cancelled future means the pool was shut down under this analysis
+                logger.warning(f"Process pool is broken ({e!r}), parsing changelogs in-process")
+                if isinstance(e, BrokenProcessPool) and self.pool is not None:
+                    reset_process_pool(self.pool)
+                records.extend(parse_changelog_shard(page))
+        return records
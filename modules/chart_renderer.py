@@ -0,0 +1,135 @@
+# Static chart rendering from compact specs (plain dicts of labels and values).
+# Figures are drawn with the object-oriented API on an explicit Agg canvas and never
+# touch pyplot's global state, so specs can be rendered concurrently in worker processes.
+# Worker processes import this module, so it must stay free of Flask, config and Jira imports.
+import time
+
+import pandas as pd
+import seaborn as sns
+from cycler import cycler
+from matplotlib import rc_context
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+# Default figure size in inches
+DEFAULT_FIGSIZE = (12, 7)
+
+# Matplotlib settings equivalent to sns.set(style="whitegrid") with font size 10,
+# applied per figure instead of globally
+CHART_RC = {
+    **sns.axes_style('whitegrid'),
+    **sns.plotting_context('notebook'),
+    'axes.prop_cycle': cycler('color', sns.color_palette('deep')),
+    'font.size': 10,
+}
+
+
+def render_chart(spec):
+    """
+    Render a chart spec to a PNG file
+
+    Supported kinds:
+        bar         - 'labels' and 'values', optional 'hline'
+        grouped_bar - 'labels' and 'series' ({legend label: values}), optional 'hue_title'
+        stacked_bar - 'labels' and 'series' ({legend label: values}), optional 'hue_title'
+        pie         - 'labels' and 'values'
+        message     - 'message' text in the middle of empty axes
+
+    Args:
+        spec (dict): Chart spec with at least 'name', 'kind' and 'path'
+
+    Returns:
+        dict: 'name', 'path', 'seconds' and, if rendering failed, 'error'
+    """
+    started = time.perf_counter()
+    result = {'name': spec['name'], 'path': spec['path']}
+
+    try:
+        with rc_context(CHART_RC):
+            fig = Figure(figsize=spec.get('figsize', DEFAULT_FIGSIZE))
+            FigureCanvasAgg(fig)
+            ax = fig.add_subplot()
+
+            draw = _DRAWERS[spec['kind']]
+            draw(ax, spec)
+
+            if spec.get('title'):
+                ax.set_title(spec['title'])
+            if spec.get('xlabel'):
+                ax.set_xlabel(spec['xlabel'])
+            if spec.get('ylabel'):
+                ax.set_ylabel(spec['ylabel'])
+
+            if spec.get('tight_layout'):
+                fig.tight_layout()
+
+            fig.savefig(spec['path'], bbox_inches=spec.get('bbox_inches'))
+    except Exception as e:
+        result['error'] = str(e)
+
+    result['seconds'] = time.perf_counter() - started
+    return result
+
+
+def _rotate_xticklabels(ax, rotation=45):
+    """Rotate category labels for better readability"""
+    for label in ax.get_xticklabels():
+        label.set_rotation(rotation)
+        label.set_horizontalalignment('right')
+
+
+def _draw_bar(ax, spec):
+    """Draw a single-series bar chart"""
+    sns.barplot(x=spec['labels'], y=spec['values'], ax=ax)
+    _rotate_xticklabels(ax)
+
+    # Optional reference line, e.g. y=1 where time spent equals the estimate
+    if spec.get('hline') is not None:
+        ax.axhline(y=spec['hline'], color='r', linestyle='--')
+
+
+def _draw_grouped_bar(ax, spec):
+    """Draw a bar chart with one bar per series for every label"""
+    hue_title = spec.get('hue_title', '')
+    rows = [(label, series_name, value)
+            for series_name, values in spec['series'].items()
+            for label, value in zip(spec['labels'], values)]
+    data = pd.DataFrame(rows, columns=['label', hue_title, 'value'])
+
+    sns.barplot(x='label', y='value', hue=hue_title, data=data, ax=ax)
+    _rotate_xticklabels(ax)
+
+
+def _draw_stacked_bar(ax, spec):
+    """Draw a bar chart with the series stacked on top of each other for every label"""
+    bottom = [0.0] * len(spec['labels'])
+    for series_name, values in spec['series'].items():
+        ax.bar(spec['labels'], values, bottom=bottom, label=series_name)
+        bottom = [base + value for base, value in zip(bottom, values)]
+
+    ax.legend(title=spec.get('hue_title') or None)
+    _rotate_xticklabels(ax)
+
+
+def _draw_pie(ax, spec):
+    """Draw a pie chart with percentage labels"""
+    ax.pie(spec['values'], labels=spec['labels'], autopct='%1.1f%%', startangle=90)
+    ax.axis('equal')
+
+
+def _draw_message(ax, spec):
+    """Draw empty axes with a message, used when a chart has no data"""
+    ax.text(0.5, 0.5, spec['message'],
+            horizontalalignment='center', verticalalignment='center',
+            transform=ax.transAxes, fontsize=14)
+    ax.set_xticks([])
+    ax.set_yticks([])
+
+
+_DRAWERS = {
+    'bar': _draw_bar,
+    'grouped_bar': _draw_grouped_bar,
+    'stacked_bar': _draw_stacked_bar,
+    'pie': _draw_pie,
+    'message': _draw_message,
+}
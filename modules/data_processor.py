@@ -1,6 +1,10 @@
+import numpy as np
 import pandas as pd
 import json
 import logging
+from modules.status_classifier import get_status_classifier
+from modules.changelog_parser import parse_jira_datetime
+from modules.perf import timed
 
 # Get logger
 logger = logging.getLogger(__name__)
@@ -17,124 +21,300 @@ def process_issues_data(issues):
     Returns:
         pandas.DataFrame: Processed data
     """
-    processed_data = []
-
-    # Output the first issue for debugging
-    if issues:
-        first_issue = issues[0]
-        status_raw = first_issue.get('fields', {}).get('status', {})
-        logger.info(f"Example status field structure: {json.dumps(status_raw, indent=2, ensure_ascii=False)}")
-
-        # Check changelog structure
-        if 'changelog' in first_issue:
-            changelog_sample = first_issue.get('changelog', {})
-            logger.info(f"Changelog structure: {json.dumps(changelog_sample, indent=2, ensure_ascii=False)[:500]}...")
-
-    for issue in issues:
-        issue_key = issue.get('key')
-        fields = issue.get('fields', {})
-
-        project = fields.get('project', {}).get('key', 'Unknown')
-        issue_type = fields.get('issuetype', {}).get('name', 'Unknown')
-        original_estimate = fields.get('timeoriginalestimate', 0) or 0  # Convert None to 0
-        time_spent = fields.get('timespent', 0) or 0  # Convert None to 0
-        created_date = fields.get('created', '')
-
-        # Get issue status (with debugging info)
-        status_obj = fields.get('status', {})
-        status = status_obj.get('name', 'Unknown')
-        status_id = status_obj.get('id', 'Unknown')
-        status_category = status_obj.get('statusCategory', {}).get('name', 'Unknown')
-
-        # Check for comments
-        comments = fields.get('comment', {}).get('comments', [])
-        has_comments = len(comments) > 0
-
-        # Check for attachments
-        attachments = fields.get('attachment', [])
-        has_attachments = len(attachments) > 0
-
-        # Convert seconds to hours
-        original_estimate_hours = original_estimate / 3600 if original_estimate else 0
-        time_spent_hours = time_spent / 3600 if time_spent else 0
-
-        # Analyze changelog for transitions
-        # Look for status changes in history
-        no_transitions = True  # Default assumption: no transitions
-
-        if 'changelog' in issue and 'histories' in issue['changelog']:
-            for history in issue['changelog']['histories']:
-                for item in history.get('items', []):
-                    if item.get('field') == 'status':
-                        # Found status transition
-                        no_transitions = False
-                        break
-                if not no_transitions:
-                    break
-
-        # Log info about issues without transitions
-        if no_transitions:
-            logger.info(f"Issue {issue_key} has no status transitions (possibly new), current status: {status}")
-
-        processed_data.append({
-            'issue_key': issue_key,
-            'project': project,
-            'issue_type': issue_type,
-            'original_estimate_hours': original_estimate_hours,
-            'time_spent_hours': time_spent_hours,
-            'status': status,
-            'status_id': status_id,
-            'status_category': status_category,
-            'has_comments': has_comments,
-            'has_attachments': has_attachments,
-            'created_date': created_date,
-            'no_transitions': no_transitions
+    builder = IssueFrameBuilder()
+    builder.add_page(issues)
+    return builder.build()
+
+
+# Jira sets the status category change date of a new issue a moment after its creation date (seconds)
+STATUS_CATEGORY_CHANGE_TOLERANCE = 60
+
+# Low-cardinality text columns stored as pandas categoricals
+CATEGORICAL_COLUMNS = ['project', 'issue_type', 'status', 'status_category']
+
+# Order of columns in the processed DataFrame
+ISSUE_COLUMNS = [
+    'issue_key',
+    'project',
+    'issue_type',
+    'original_estimate_hours',
+    'time_spent_hours',
+    'status',
+    'status_id',
+    'status_category',
+    'has_comments',
+    'has_attachments',
+    'created_date',
+    'no_transitions'
+]
+
+
+def has_status_transitions(issue):
+    """
+    Check the changelog of an issue for status changes.
+
+    Issues fetched without a changelog (see FIELD_PROFILES in modules.jira_analyzer)
+    are checked by the date of their last status category change instead.
+
+    Args:
+        issue (dict): Issue dictionary with an optional expanded changelog
+
+    Returns:
+        bool: True if the issue status has ever changed
+    """
+    if 'changelog' not in issue and 'statuscategorychangedate' in issue.get('fields', {}):
+        return status_category_changed(issue)
+
+    for history in issue.get('changelog', {}).get('histories', []):
+        for item in history.get('items', []):
+            if item.get('field') == 'status':
+                return True
+    return False
+
+
+def status_category_changed(issue):
+    """
+    Check whether the status category of an issue changed after it was created
+
+    Args:
+        issue (dict): Issue dictionary with 'created' and 'statuscategorychangedate' fields
+
+    Returns:
+        bool: True if the status category changed, False if it didn't or the dates are missing
+    """
+    fields = issue.get('fields', {})
+    created = parse_jira_datetime(fields.get('created'))
+    changed = parse_jira_datetime(fields.get('statuscategorychangedate'))
+    if created is None or changed is None:
+        return False
+    return changed - created > STATUS_CATEGORY_CHANGE_TOLERANCE
+
+
+class IssueFrameBuilder:
+    """
+    Builds the processed issues DataFrame page by page.
+
+    Each page of raw issues is reduced to columnar arrays as soon as it is added,
+    so the raw issues can be dropped right after and memory use depends on the
+    page size rather than on the size of the whole result set.
+    """
+
+    def __init__(self):
+        self.columns = {column: [] for column in ISSUE_COLUMNS}
+        self.count = 0
+
+        # Compact worklog table: one entry per worklog
+        self.worklogs = {'issue_key': [], 'work_date': [], 'hours': []}
+
+        # Issues whose embedded worklog list was truncated by Jira (key -> embedded worklogs)
+        self.truncated_worklogs = {}
+
+    @timed('process_issues')
+    def add_page(self, issues):
+        """
+        Reduce a page of raw issues to column values
+
+        Args:
+            issues (list): List of issue dictionaries
+        """
+        # Output the first issue for debugging; dumping it is only worth it when debug logging is on
+        if issues and not self.count and logger.isEnabledFor(logging.DEBUG):
+            first_issue = issues[0]
+            status_raw = first_issue.get('fields', {}).get('status', {})
+            logger.debug(f"Example status field structure: {json.dumps(status_raw, indent=2, ensure_ascii=False)}")
+
+            # Check changelog structure
+            if 'changelog' in first_issue:
+                changelog_sample = first_issue.get('changelog', {})
+                logger.debug(f"Changelog structure: {json.dumps(changelog_sample, indent=2, ensure_ascii=False)[:500]}...")
+
+        columns = self.columns
+        issue_keys = columns['issue_key']
+        projects = columns['project']
+        issue_types = columns['issue_type']
+        estimates = columns['original_estimate_hours']
+        time_spent = columns['time_spent_hours']
+        statuses = columns['status']
+        status_ids = columns['status_id']
+        status_categories = columns['status_category']
+        has_comments = columns['has_comments']
+        has_attachments = columns['has_attachments']
+        created_dates = columns['created_date']
+        no_transitions = columns['no_transitions']
+
+        for issue in issues:
+            fields = issue.get('fields', {})
+            status_obj = fields.get('status', {})
+
+            issue_keys.append(issue.get('key'))
+            projects.append(fields.get('project', {}).get('key', 'Unknown'))
+            issue_types.append(fields.get('issuetype', {}).get('name', 'Unknown'))
+            # None (no estimate or no logged time) becomes 0, seconds become hours
+            estimates.append((fields.get('timeoriginalestimate', 0) or 0) / 3600)
+            time_spent.append((fields.get('timespent', 0) or 0) / 3600)
+            statuses.append(status_obj.get('name', 'Unknown'))
+            status_ids.append(status_obj.get('id', 'Unknown'))
+            status_categories.append(status_obj.get('statusCategory', {}).get('name', 'Unknown'))
+            has_comments.append(len(fields.get('comment', {}).get('comments', [])) > 0)
+            has_attachments.append(len(fields.get('attachment', [])) > 0)
+            created_dates.append(fields.get('created', ''))
+            no_transitions.append(not has_status_transitions(issue))
+
+            # Jira embeds at most 20 worklogs per issue, the rest must be paged separately
+            worklog_field = fields.get('worklog') or {}
+            embedded_worklogs = worklog_field.get('worklogs', [])
+            if worklog_field.get('total', 0) > len(embedded_worklogs):
+                self.truncated_worklogs[issue.get('key')] = embedded_worklogs
+            else:
+                self._add_worklog_rows(issue.get('key'), embedded_worklogs)
+
+        self.count += len(issues)
+
+    def _add_worklog_rows(self, issue_key, worklogs):
+        """Append worklogs of one issue to the worklog table"""
+        for worklog in worklogs:
+            # The date part is the work day in the worklog author's time zone, as worklogDate uses it
+            self.worklogs['issue_key'].append(issue_key)
+            self.worklogs['work_date'].append(worklog.get('started', '')[:10])
+            self.worklogs['hours'].append((worklog.get('timeSpentSeconds', 0) or 0) / 3600)
+
+    def get_truncated_worklog_keys(self):
+        """
+        Get keys of issues whose embedded worklogs were truncated
+
+        Returns:
+            list: Issue keys
+        """
+        return list(self.truncated_worklogs)
+
+    def set_full_worklogs(self, issue_key, worklogs):
+        """
+        Replace the truncated embedded worklogs of an issue with the complete list
+
+        Args:
+            issue_key (str): Issue key
+            worklogs (list): All worklogs of the issue
+        """
+        if issue_key in self.truncated_worklogs:
+            self.truncated_worklogs[issue_key] = worklogs
+
+    def build_worklogs(self):
+        """
+        Create the worklog table from all issues added so far.
+        Issues whose complete worklogs were not fetched use the embedded (partial) list.
+
+        Returns:
+            pandas.DataFrame: Worklogs with issue_key, work_date (datetime64) and hours
+        """
+        for issue_key, worklogs in self.truncated_worklogs.items():
+            self._add_worklog_rows(issue_key, worklogs)
+        self.truncated_worklogs = {}
+
+        return pd.DataFrame({
+            'issue_key': self.worklogs['issue_key'],
+            'work_date': pd.to_datetime(pd.Series(self.worklogs['work_date'], dtype='object'),
+                                        format='%Y-%m-%d', errors='coerce'),
+            'hours': np.array(self.worklogs['hours'], dtype=np.float64)
         })
 
-    # Create DataFrame
-    df = pd.DataFrame(processed_data)
+    def __len__(self):
+        return self.count
+
+    @timed('build_issue_frame')
+    def build(self):
+        """
+        Create the DataFrame from all issues added so far
+
+        Returns:
+            pandas.DataFrame: Processed data
+        """
+        if not self.count:
+            logger.info("No issues to process")
+            return pd.DataFrame()
+
+        data = {}
+        for column in ISSUE_COLUMNS:
+            values = self.columns[column]
+            if column in CATEGORICAL_COLUMNS:
+                # Sorted categories keep groupby results in the same order as with plain strings
+                data[column] = pd.Categorical(values, categories=sorted(set(values)))
+            elif column == 'created_date':
+                # Parse all dates once; Jira dates carry their own UTC offset
+                data[column] = pd.to_datetime(pd.Series(values, dtype='object').replace('', None),
+                                              format='%Y-%m-%dT%H:%M:%S.%f%z', utc=True, errors='coerce')
+            elif column in ('has_comments', 'has_attachments', 'no_transitions'):
+                data[column] = np.array(values, dtype=bool)
+            elif column in ('original_estimate_hours', 'time_spent_hours'):
+                data[column] = np.array(values, dtype=np.float64)
+            else:
+                data[column] = values
+
+        df = pd.DataFrame(data, columns=ISSUE_COLUMNS)
+
+        # Output unique statuses for debugging
+        unique_statuses = df['status'].unique()
+        logger.info(f"Unique issue statuses: {list(unique_statuses)}")
+
+        # Output count of issues without transitions
+        no_transitions_count = int(df['no_transitions'].sum())
+        logger.info(f"Found {no_transitions_count} of {len(df)} issues without transitions (possibly new)")
+
+        return df
+
+
+def apply_worklog_window(df, worklogs_df, date_from=None, date_to=None):
+    """
+    Attribute logged time to the analysis period.
 
-    # Output unique statuses for debugging
-    unique_statuses = df['status'].unique()
-    logger.info(f"Unique issue statuses: {unique_statuses}")
+    'time_spent_hours' is replaced by the hours logged between date_from and
+    date_to (inclusive), so every chart and summary built from the DataFrame
+    only counts work done in the period. The lifetime value is kept in
+    'time_spent_total_hours'.
+
+    Args:
+        df (pandas.DataFrame): Processed data
+        worklogs_df (pandas.DataFrame): Worklog table from IssueFrameBuilder.build_worklogs
+        date_from (str): Start date (YYYY-MM-DD), optional
+        date_to (str): End date (YYYY-MM-DD), optional
 
-    # Output count of issues without transitions
-    no_transitions_count = df['no_transitions'].sum()
-    logger.info(f"Found {no_transitions_count} issues without transitions")
+    Returns:
+        pandas.DataFrame: Processed data with windowed time spent
+    """
+    if df.empty or not (date_from or date_to):
+        return df
+
+    in_window = pd.Series(True, index=worklogs_df.index)
+    if date_from:
+        in_window &= worklogs_df['work_date'] >= pd.Timestamp(date_from)
+    if date_to:
+        in_window &= worklogs_df['work_date'] <= pd.Timestamp(date_to)
+
+    window_hours = worklogs_df[in_window].groupby('issue_key')['hours'].sum()
+
+    df = df.copy()
+    df['time_spent_total_hours'] = df['time_spent_hours']
+    df['time_spent_hours'] = df['issue_key'].map(window_hours).fillna(0.0).astype(np.float64)
 
+    logger.info(f"Attributed {df['time_spent_hours'].sum():.1f} of {df['time_spent_total_hours'].sum():.1f} "
+                f"logged hours to the period {date_from or '...'} - {date_to or '...'}")
     return df
 
 
-def get_improved_open_statuses(df):
+def get_improved_open_statuses(df, classifier=None):
     """
     Improved detection of open statuses
 
     Args:
         df (pandas.DataFrame): Processed data
+        classifier (StatusClassifier): Status classifier, the shared one if not given
 
     Returns:
         list: List of status names identified as 'open'
     """
-    logger.info("IMPROVED OPEN STATUS DETECTION")
-
-    # Common open status terms (expanded)
-    open_terms = [
-        'OPEN', 'NEW'
-    ]
-
-    # Get all unique statuses
-    all_statuses = df['status'].unique().tolist()
-    logger.info(f"ALL UNIQUE STATUSES: {all_statuses}")
-
-    # Identify open statuses
-    open_statuses = []
-    for status in all_statuses:
-        status_lower = status.lower()
-        for term in open_terms:
-            if term.lower() in status_lower:
-                open_statuses.append(status)
-                logger.info(f"Status '{status}' identified as OPEN (matches '{term}')")
-                break
+    if classifier is None:
+        classifier = get_status_classifier()
+
+    open_statuses = classifier.categorize_frame(df)['open_statuses']
 
     # If none found, use a default approach
     if not open_statuses:
@@ -144,72 +324,25 @@ def get_improved_open_statuses(df):
     return open_statuses
 
 
-def get_status_categories(df):
+def get_status_categories(df, classifier=None):
     """
     Get status categories (open, closed, unknown)
 
     Args:
         df (pandas.DataFrame): Processed data
+        classifier (StatusClassifier): Status classifier, the shared one if not given
 
     Returns:
         dict: Dictionary with categorized statuses
     """
-    # Get all unique statuses
-    all_statuses = df['status'].unique().tolist()
-    logger.info(f"ALL STATUSES IN DATASET: {all_statuses}")
-
-    # Terms for detecting open and closed statuses - expanded list with Russian terms
-    open_terms = [
-        'OPEN', 'NEW'
-    ]
-
-    closed_terms = [
-        'CLOSED', 'RESOLVED', 'DONE'
-    ]
-
-    # Initialize categories
-    open_statuses = []
-    closed_statuses = []
-    unknown_statuses = []
-
-    # Log every status matching decision for debugging
-    for status in all_statuses:
-        status_lower = status.lower()
-        matched = False
-
-        # Check if it matches open terms
-        for term in open_terms:
-            if term.lower() in status_lower:
-                open_statuses.append(status)
-                logger.info(f"STATUS '{status}' categorized as OPEN (matched term: '{term}')")
-                matched = True
-                break
-
-        if not matched:
-            # Check if it matches closed terms
-            for term in closed_terms:
-                if term.lower() in status_lower:
-                    closed_statuses.append(status)
-                    logger.info(f"STATUS '{status}' categorized as CLOSED (matched term: '{term}')")
-                    matched = True
-                    break
-
-        # If it doesn't match any known pattern, consider it unknown
-        if not matched:
-            unknown_statuses.append(status)
-            logger.info(f"STATUS '{status}' NOT CATEGORIZED (no matching terms)")
-
-    logger.info(f"OPEN STATUSES: {open_statuses}")
-    logger.info(f"CLOSED STATUSES: {closed_statuses}")
-    logger.info(f"UNKNOWN STATUSES: {unknown_statuses}")
-
-    # Return categorization
-    return {
-        'all_statuses': all_statuses,
-        'open_statuses': open_statuses,
-        'closed_statuses': closed_statuses,
-        'unknown_statuses': unknown_statuses
-    }
+    if classifier is None:
+        classifier = get_status_classifier()
+
+    status_categories = classifier.categorize_frame(df)
+    logger.debug(f"OPEN STATUSES: {status_categories['open_statuses']}, "
+                 f"CLOSED STATUSES: {status_categories['closed_statuses']}, "
+                 f"UNKNOWN STATUSES: {status_categories['unknown_statuses']}")
+    return status_categories
 
 
 def diagnose_issues_data(df, status_mapping=None):
@@ -218,15 +351,18 @@ def diagnose_issues_data(df, status_mapping=None):
 
     Args:
         df (pandas.DataFrame): Processed data
-        status_mapping (dict): Optional mapping of statuses to categories
+        status_mapping (dict): Optional mapping of status IDs or names to categories
 
     Returns:
         dict: Diagnostic report
     """
+    from modules.metrics import compute_issue_metrics
+
     logger.info("=== ISSUE DATA DIAGNOSTICS ===")
 
-    # Get statuses using extended method
-    status_categories = get_status_categories(df)
+    # Statuses and task groups come from the shared metrics
+    metrics = compute_issue_metrics(df, get_status_classifier(status_mapping))
+    status_categories = metrics.status_categories
     open_statuses = status_categories['open_statuses']
     closed_statuses = status_categories['closed_statuses']
     unknown_statuses = status_categories['unknown_statuses']
@@ -242,36 +378,38 @@ def diagnose_issues_data(df, status_mapping=None):
     # 3. Check issues with logged time
     tasks_with_time = df[df['time_spent_hours'] > 0]
     status_with_time = tasks_with_time['status'].value_counts()
+    status_with_time = status_with_time[status_with_time > 0]
     logger.info(f"Statuses of issues with logged time:\n{status_with_time}")
 
     # 4. Check issues without comments and attachments
     tasks_no_comments_attachments = df[(~df['has_comments']) & (~df['has_attachments'])]
     status_no_comments = tasks_no_comments_attachments['status'].value_counts()
+    status_no_comments = status_no_comments[status_no_comments > 0]
     logger.info(f"Statuses of issues without comments and attachments:\n{status_no_comments}")
 
     # 5. Find open issues with logged time
-    open_tasks = df[df['status'].isin(open_statuses) & (df['time_spent_hours'] > 0)]
+    open_tasks = metrics.open_tasks
     logger.info(f"Found {len(open_tasks)} open issues with logged time")
     if not open_tasks.empty:
-        open_by_project = open_tasks.groupby('project')['time_spent_hours'].sum()
+        open_by_project = metrics.project_column('open_tasks_time_spent_hours', only_with='open_tasks')
         logger.info(f"Distribution by project:\n{open_by_project}")
 
     # 6. Find closed issues without comments and attachments
-    closed_tasks = df[df['status'].isin(closed_statuses) & (~df['has_comments']) & (~df['has_attachments'])]
+    closed_tasks = metrics.closed_tasks
     logger.info(f"Found {len(closed_tasks)} closed issues without comments and attachments")
     if not closed_tasks.empty:
-        closed_by_project = closed_tasks.groupby('project').size()
+        closed_by_project = metrics.project_column('closed_tasks', only_with='closed_tasks')
         logger.info(f"Distribution by project:\n{closed_by_project}")
 
     # 7. Diagnose issues without transitions
-    no_transitions_tasks = df[df['no_transitions'] == True]
+    no_transitions_tasks = metrics.no_transitions_tasks
     logger.info(f"Found {len(no_transitions_tasks)} issues without transitions (likely new)")
     if not no_transitions_tasks.empty:
-        no_transitions_by_project = no_transitions_tasks.groupby('project').size()
+        no_transitions_by_project = metrics.project_column('no_transitions_tasks', only_with='no_transitions_tasks')
         logger.info(f"Distribution of issues without transitions by project:\n{no_transitions_by_project}")
 
     return {
-        "unique_statuses": unique_statuses.tolist(),
+        "unique_statuses": list(unique_statuses),
         "open_statuses": open_statuses,
         "closed_statuses": closed_statuses,
         "unknown_statuses": unknown_statuses,
@@ -0,0 +1,156 @@
+import json
+import collections
+import threading
+
+# Number of log records kept for clients that reconnect
+MAX_STREAM_RECORDS = 500
+
+# Event kinds
+LOG_EVENT = 'log'
+STATUS_EVENT = 'status'
+
+
+def format_sse(kind, data, event_id=None):
+    """
+    Format one Server-Sent Event.
+
+    Data is sent as a single line of JSON, so multi-line log records
+    (tracebacks) can't break the event framing.
+
+    Args:
+        kind (str): Event name
+        data: JSON-serializable event data
+        event_id (int): Sequence number the client sends back as Last-Event-ID
+
+    Returns:
+        str: Event text
+    """
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {kind}")
+    lines.append(f"data: {json.dumps(data, ensure_ascii=False, default=str)}")
+    return '\n'.join(lines) + '\n\n'
+
+
+class EventStream:
+    """
+    Log records and job status changes numbered by one monotonic sequence.
+
+    Log records are kept in a bounded history, so a client that passes the
+    last sequence number it saw (SSE Last-Event-ID) gets only the records it
+    missed. Status is state rather than history: only the sequence number of
+    its last change is kept, and the client is sent the current status if it
+    changed after the number it saw.
+    """
+
+    def __init__(self, max_records=MAX_STREAM_RECORDS):
+        """
+        Args:
+            max_records (int): Number of log records kept
+        """
+        self._records = collections.deque(maxlen=max_records)
+        self._changed = {}
+        self._seq = 0
+        self._condition = threading.Condition()
+
+    @property
+    def last_id(self):
+        """Sequence number of the latest event"""
+        with self._condition:
+            return self._seq
+
+    def append(self, record):
+        """
+        Add a log record and wake up waiting clients
+
+        Args:
+            record: Log record as shown to clients
+
+        Returns:
+            int: Sequence number of the record
+        """
+        with self._condition:
+            self._seq += 1
+            self._records.append((self._seq, record))
+            self._condition.notify_all()
+            return self._seq
+
+    def touch(self, kind=STATUS_EVENT):
+        """
+        Record that a piece of state changed and wake up waiting clients
+
+        Args:
+            kind (str): Kind of the changed state
+
+        Returns:
+            int: Sequence number of the change
+        """
+        with self._condition:
+            self._seq += 1
+            self._changed[kind] = self._seq
+            self._condition.notify_all()
+            return self._seq
+
+    def records(self, limit=None):
+        """
+        Get the most recent log records
+
+        Args:
+            limit (int): Maximum number of records, all kept records if None
+
+        Returns:
+            list: Records, oldest first
+        """
+        with self._condition:
+            records = [record for _, record in self._records]
+        return records[-limit:] if limit else records
+
+    def read(self, last_id):
+        """
+        Get everything that happened after a sequence number
+
+        Args:
+            last_id (int): Last sequence number the client saw
+
+        Returns:
+            tuple: (list of (seq, record) log records, set of changed state kinds,
+                    sequence number of the latest event)
+        """
+        with self._condition:
+            return self._read(last_id)
+
+    def wait(self, last_id, timeout):
+        """
+        Wait until something happens after a sequence number, then read it
+
+        Args:
+            last_id (int): Last sequence number the client saw
+            timeout (float): Maximum time to wait in seconds
+
+        Returns:
+            tuple: Same as read(); empty if nothing happened before the timeout
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self._seq > last_id, timeout)
+            return self._read(last_id)
+
+    def _read(self, last_id):
+        """Collect events after last_id (called with the condition held)"""
+        if self._seq <= last_id:
+            return [], set(), self._seq
+
+        # Records are ordered, so walk back from the newest one
+        records = []
+        for seq, record in reversed(self._records):
+            if seq <= last_id:
+                break
+            records.append((seq, record))
+        records.reverse()
+
+        changed = {kind for kind, seq in self._changed.items() if seq > last_id}
+        return records, changed, self._seq
+
+
+# Stream shared by the log buffer, the job manager and the /events route
+event_stream = EventStream()
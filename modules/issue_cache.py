@@ -0,0 +1,183 @@
+import os
+import json
+import zlib
+import sqlite3
+import logging
+import threading
+
+# Get logger
+logger = logging.getLogger(__name__)
+
+# The cache lives in jira_charts/data, which is not listed as a report folder
+CACHE_PATH = os.path.join('jira_charts', 'data', 'issue_cache.sqlite')
+
+
+def get_cache_path(profile=None):
+    """
+    Get the cache file for issues fetched with a field profile.
+
+    Issues of different profiles carry different fields, so each profile has
+    its own cache and an issue is never served with fields it was fetched without.
+
+    Args:
+        profile (str): Field profile name (see modules.jira_analyzer.FIELD_PROFILES), 'full' by default
+
+    Returns:
+        str: Path to the SQLite database file
+    """
+    if not profile or profile == 'full':
+        return CACHE_PATH
+    return os.path.join(os.path.dirname(CACHE_PATH), f'issue_cache_{profile}.sqlite')
+
+
+class IssueCache:
+    """
+    On-disk store of raw Jira issues keyed by issue key.
+
+    For every query the cache remembers when it was last synchronized and which
+    issues matched it, so that later runs only need to download issues that
+    were updated since then.
+    """
+
+    def __init__(self, path=CACHE_PATH):
+        """
+        Open (and create if needed) the issue cache database
+
+        Args:
+            path (str): Path to the SQLite database file
+        """
+        self.path = path
+        self._lock = threading.Lock()
+
+        cache_dir = os.path.dirname(path)
+        if cache_dir and not os.path.exists(cache_dir):
+            os.makedirs(cache_dir)
+
+        with self._connect() as conn:
+            conn.executescript('''
+                CREATE TABLE IF NOT EXISTS issues (
+                    issue_key TEXT PRIMARY KEY,
+                    data BLOB NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS queries (
+                    query TEXT PRIMARY KEY,
+                    last_sync TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS query_issues (
+                    query TEXT NOT NULL,
+                    position INTEGER NOT NULL,
+                    issue_key TEXT NOT NULL,
+                    PRIMARY KEY (query, position)
+                );
+            ''')
+
+    def _connect(self):
+        """Open a new connection to the cache database"""
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get_last_sync(self, query):
+        """
+        Get the time of the last synchronization of a query
+
+        Args:
+            query (str): JQL query string
+
+        Returns:
+            str: ISO timestamp (UTC) of the last sync, or None if the query was never synced
+        """
+        with self._connect() as conn:
+            row = conn.execute('SELECT last_sync FROM queries WHERE query = ?', (query,)).fetchone()
+        return row[0] if row else None
+
+    def get_cached_keys(self, keys):
+        """
+        Get the subset of issue keys that are present in the cache
+
+        Args:
+            keys (iterable): Issue keys to check
+
+        Returns:
+            set: Keys present in the cache
+        """
+        keys = list(keys)
+        cached = set()
+
+        with self._connect() as conn:
+            # Stay below SQLite's limit on the number of bound parameters
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                placeholders = ','.join('?' * len(chunk))
+                rows = conn.execute(f'SELECT issue_key FROM issues WHERE issue_key IN ({placeholders})', chunk)
+                cached.update(row[0] for row in rows)
+
+        return cached
+
+    def put_issues(self, issues):
+        """
+        Insert or update issues in the cache
+
+        Args:
+            issues (list): Issue dictionaries fetched from Jira
+        """
+        rows = [(issue['key'], zlib.compress(json.dumps(issue, ensure_ascii=False).encode('utf-8')))
+                for issue in issues if issue.get('key')]
+
+        with self._lock, self._connect() as conn:
+            conn.executemany('INSERT OR REPLACE INTO issues (issue_key, data) VALUES (?, ?)', rows)
+
+    def set_query_result(self, query, issue_keys, sync_time):
+        """
+        Record the current result set of a query and the time it was synchronized
+
+        Args:
+            query (str): JQL query string
+            issue_keys (list): Keys of all issues currently matching the query, in Jira order
+            sync_time (str): ISO timestamp (UTC) taken before fetching started
+        """
+        with self._lock, self._connect() as conn:
+            conn.execute('DELETE FROM query_issues WHERE query = ?', (query,))
+            conn.executemany('INSERT INTO query_issues (query, position, issue_key) VALUES (?, ?, ?)',
+                             [(query, position, key) for position, key in enumerate(issue_keys)])
+            conn.execute('INSERT OR REPLACE INTO queries (query, last_sync) VALUES (?, ?)', (query, sync_time))
+
+        logger.info(f"Issue cache updated, query now matches {len(issue_keys)} issues")
+
+    def iter_issue_pages(self, query, page_size=100):
+        """
+        Iterate over the issues matching a query in Jira order, page by page
+
+        Args:
+            query (str): JQL query string
+            page_size (int): Number of issues per page
+
+        Yields:
+            list: Page of issue dictionaries
+        """
+        with self._connect() as conn:
+            cursor = conn.execute('''
+                SELECT i.data FROM query_issues q
+                JOIN issues i ON i.issue_key = q.issue_key
+                WHERE q.query = ?
+                ORDER BY q.position
+            ''', (query,))
+
+            while True:
+                rows = cursor.fetchmany(page_size)
+                if not rows:
+                    break
+                yield [json.loads(zlib.decompress(row[0]).decode('utf-8')) for row in rows]
+
+    def load_issues(self, query):
+        """
+        Load all issues matching a query from the cache, in Jira order
+
+        Args:
+            query (str): JQL query string
+
+        Returns:
+            list: List of issue dictionaries
+        """
+        issues = []
+        for page in self.iter_issue_pages(query):
+            issues.extend(page)
+        return issues
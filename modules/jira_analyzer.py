@@ -1,8 +1,28 @@
+import re
 import requests
 import pandas as pd
 import json
 import logging
 import sys
+import itertools
+import collections
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+from urllib3.util.retry import Retry
+
+try:
+    from zoneinfo import ZoneInfo
+except ImportError:
+    ZoneInfo = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Try to import the config with API token
 try:
@@ -17,35 +37,396 @@ except ImportError:
     sys.exit(1)
 
 # Import visualization and data processing
-from modules.data_processor import process_issues_data, get_status_categories
+from modules.data_processor import process_issues_data, get_status_categories, status_category_changed
+from modules.status_classifier import get_status_classifier, StatusCategory
 from modules.visualization import create_visualizations
+from modules.metrics import compute_issue_metrics
+from modules.perf import get_recorder, timed, span
+
+# Jira instance used unless config.jira_url points elsewhere (e.g. the fake Jira of the benchmarks)
+DEFAULT_JIRA_URL = 'https://jira.nexign.com'
+
+# Number of issues requested per search page (API limit)
+PAGE_SIZE = 100
+
+# Larger pages are fine when only a few small fields are requested
+KEYS_PAGE_SIZE = 1000
+
+# Number of issue keys per 'key in (...)' style query, one search page each
+KEY_BATCH_SIZE = PAGE_SIZE
+
+# Number of worklogs requested per page from the issue worklog endpoint
+WORKLOG_PAGE_SIZE = 1000
+
+# Fields requested for every issue by default
+SEARCH_FIELDS = [
+    'project',
+    'summary',
+    'issuetype',
+    'timeoriginalestimate',
+    'timespent',
+    'status',
+    'worklog',
+    'comment',
+    'attachment',
+    'created',  # Request creation date
+    'components',  # Request components for CLM/EST analysis
+    'issuelinks'  # Request links to resolve CLM relations locally
+]
+
+# Expansions requested for every issue by default
+SEARCH_EXPAND = ['changelog']  # Request changelog for transitions analysis
+
+# Fields read by the Jira analysis (IssueFrameBuilder and the changelog stage)
+ANALYSIS_FIELDS = [
+    'project',
+    'issuetype',
+    'timeoriginalestimate',
+    'timespent',
+    'status',
+    'worklog',
+    'comment',
+    'attachment',
+    'created'
+]
+
+# Two-phase analysis: small fields of every issue first...
+ANALYSIS_SUMMARY_FIELDS = [
+    'project',
+    'issuetype',
+    'timeoriginalestimate',
+    'timespent',
+    'status',
+    'worklog',
+    'created',
+    'statuscategorychangedate'  # Tells which issues certainly changed status
+]
+
+# ...then comments, attachments and the changelog only where they are read (see needs_issue_details)
+ANALYSIS_DETAIL_FIELDS = ['comment', 'attachment']
+
+# Fields needed to follow the links of CLM issues
+LINK_FIELDS = ['project', 'issuetype', 'summary', 'status', 'created', 'components', 'issuelinks']
+
+# Fields and expansions requested per kind of search. Profiles with 'details' are
+# fetched in two phases: the profile fields for every issue, then the detail fields
+# for the issues of each page that need them, merged into those issues.
+FIELD_PROFILES = {
+    'full': {'fields': SEARCH_FIELDS, 'expand': SEARCH_EXPAND},
+    'analysis': {'fields': ANALYSIS_FIELDS, 'expand': ['changelog']},
+    'analysis_two_phase': {
+        'fields': ANALYSIS_SUMMARY_FIELDS,
+        'expand': [],
+        'details': {'fields': ANALYSIS_DETAIL_FIELDS, 'expand': ['changelog']}
+    },
+    'links': {'fields': LINK_FIELDS, 'expand': []},
+    'keys': {'fields': ['updated'], 'expand': []}
+}
+
+# Which issues the Jira analysis gets changelogs for: 'all', or 'needed' for the
+# two-phase fetch. With 'needed' only closed issues and issues that may never have
+# changed status have a changelog, so time in status covers just those.
+DEFAULT_CHANGELOG_SCOPE = 'all'
+
+# Default number of concurrent search requests
+DEFAULT_MAX_WORKERS = 4
+
+# Retry policy for transient Jira errors (rate limiting and gateway failures)
+RETRY_TOTAL = 5
+RETRY_BACKOFF_FACTOR = 0.5
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# Methods retried after an error response or a read timeout. Search is sent as POST
+# but does not modify anything. Writes (saved filters) are only retried when the
+# connection failed, so a request Jira may already have applied is never replayed.
+READ_RETRY_METHODS = frozenset(['GET', 'POST'])
+WRITE_RETRY_METHODS = frozenset(['GET'])
+
+# Re-fetch issues updated slightly before the last sync to cover clock skew
+SYNC_OVERLAP = timedelta(minutes=10)
+
+# Without the user's time zone JQL dates may be off by up to a day
+SYNC_OVERLAP_UNKNOWN_TZ = timedelta(hours=14)
+
+# Trailing ORDER BY clause of a JQL query, conditions can only be added before it
+ORDER_BY_PATTERN = re.compile(r'\s*\bORDER\s+BY\b.*$', re.IGNORECASE | re.DOTALL)
+
+
+class JiraFetchError(Exception):
+    """Raised when Jira did not return all issues of a query and partial data must not be stored"""
+    pass
+
+
+def split_order_by(jql_query):
+    """
+    Split a JQL query into its conditions and its ORDER BY clause
+
+    Args:
+        jql_query (str): JQL query string
+
+    Returns:
+        tuple: (conditions, ORDER BY clause or '')
+    """
+    match = ORDER_BY_PATTERN.search(jql_query)
+    if not match:
+        return jql_query.strip(), ''
+    return jql_query[:match.start()].strip(), match.group(0).strip()
+
+
+def get_issue_link_keys(issue, link_type=None):
+    """
+    Get keys of issues linked to an issue from its 'issuelinks' field.
+
+    The link description is taken from the side of the given issue, the same way
+    linkedIssues() matches it: the outward description for outward links and the
+    inward description for inward links.
+
+    Args:
+        issue (dict): Issue dictionary with fields.issuelinks
+        link_type (str): Optional link description to filter by (e.g., "relates to")
+
+    Returns:
+        list: Linked issue keys
+    """
+    wanted = link_type.lower() if link_type else None
+    keys = []
+
+    for link in issue.get('fields', {}).get('issuelinks') or []:
+        link_info = link.get('type', {})
+        if 'outwardIssue' in link:
+            linked_issue = link['outwardIssue']
+            description = link_info.get('outward', '')
+        elif 'inwardIssue' in link:
+            linked_issue = link['inwardIssue']
+            description = link_info.get('inward', '')
+        else:
+            continue
+
+        if wanted is None or description.lower() == wanted:
+            key = linked_issue.get('key')
+            if key:
+                keys.append(key)
+
+    return keys
+
+
+def decode_json(content):
+    """
+    Decode a JSON response body.
+
+    Uses orjson when it is installed, which parses the bytes directly and
+    several times faster. The standard library parser is used otherwise.
+    Either way the body is not first decoded into a separate str the way
+    response.json() does it.
+
+    Args:
+        content (bytes): Response body
+
+    Returns:
+        Decoded JSON value
+
+    Raises:
+        json.JSONDecodeError: If the body is not valid JSON
+    """
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def get_jira_url():
+    """
+    Get the base URL of the Jira instance
+
+    Returns:
+        str: config.jira_url or DEFAULT_JIRA_URL, without a trailing slash
+    """
+    return (getattr(config, 'jira_url', None) or DEFAULT_JIRA_URL).rstrip('/')
+
+
+def get_analysis_profile():
+    """
+    Get the field profile of the issues of a Jira analysis
+
+    Returns:
+        str: 'analysis_two_phase' if config.changelog_scope is 'needed', otherwise 'analysis'
+    """
+    if getattr(config, 'changelog_scope', DEFAULT_CHANGELOG_SCOPE) == 'needed':
+        return 'analysis_two_phase'
+    return 'analysis'
 
 
 class JiraAnalyzer:
-    def __init__(self, jira_url=None, status_mapping=None):
+    def __init__(self, jira_url=None, status_mapping=None, max_workers=None, check_connection=True):
         """
         Initialize Jira analyzer with token from config.py
 
         Args:
-            jira_url (str): Base URL for your Jira instance
-            status_mapping (dict): Optional mapping of statuses to categories ('open' or 'closed')
-                                  Example: {'Custom Status': 'open', 'Another Status': 'closed'}
+            jira_url (str): Base URL for your Jira instance. Defaults to config.jira_url or DEFAULT_JIRA_URL.
+            status_mapping (dict): Optional mapping of status IDs or names to categories ('open' or 'closed')
+                                  Example: {'Custom Status': 'open', '10005': 'closed'}.
+                                  Defaults to config.status_mapping.
+            max_workers (int): Maximum number of concurrent requests to Jira.
+                               Defaults to config.max_workers or DEFAULT_MAX_WORKERS.
+            check_connection (bool): Check server availability and the token on creation.
+                                     Can be skipped for a few quick requests outside of an analysis.
         """
-        self.jira_url = jira_url or 'https://jira.nexign.com'
+        self.jira_url = jira_url or get_jira_url()
         self.logger = logging.getLogger(__name__)
         self.status_mapping = status_mapping or {}
+        self.status_classifier = get_status_classifier(self.status_mapping)
+        self.max_workers = max_workers or getattr(config, 'max_workers', DEFAULT_MAX_WORKERS)
+
+        # Time zone JQL dates are interpreted in, filled in by the connection check
+        self.jira_timezone = None
+
+        # Every issue fetched by key or link resolution, so it is never fetched twice
+        self._issue_index = {}
 
         # Use token from config
         self.headers = {
             "Authorization": f"Bearer {config.api_token}",
             "Accept": "application/json",
-            "Content-Type": "application/json"
+            "Content-Type": "application/json",
+            # Every encoding urllib3 can decode here (gzip and deflate, brotli and zstd if installed)
+            "Accept-Encoding": make_headers(accept_encoding=True)['accept-encoding']
+        }
+
+        # One keep-alive session shared by all reads of this analyzer, and one for writes
+        self.session = self._create_session(READ_RETRY_METHODS, max(self.max_workers, 1))
+        self.write_session = self._create_session(WRITE_RETRY_METHODS, 1)
+        self._stats_lock = threading.Lock()
+        self.request_stats = {
+            'requests': 0,
+            'retries': 0,
+            'errors': 0,
+            'total_time': 0.0,
+            'max_time': 0.0,
+            'bytes': 0,
+            'wire_bytes': 0,
+            'decode_time': 0.0,
+            'max_decode_time': 0.0
         }
 
+        # Count the requests of this analyzer in the stage timings of the running analysis
+        recorder = get_recorder()
+        if recorder is not None:
+            recorder.add_request_source(self.get_request_stats)
+
         # Check connection but continue even if it fails
-        if not self._check_connection():
+        if check_connection and not self._check_connection():
             self.logger.warning("Connection check failed, but will try to continue.")
 
+    def _create_session(self, retry_methods, pool_size):
+        """
+        Create a pooled HTTP session that retries transient errors.
+        Retries use exponential backoff and honour the Retry-After header.
+
+        Args:
+            retry_methods (frozenset): Methods retried after error responses and read timeouts;
+                                       failed connections are retried for every method
+            pool_size (int): Pooled connections, enough for every parallel worker to keep its own alive
+
+        Returns:
+            requests.Session: Configured session
+        """
+        retry = Retry(
+            total=RETRY_TOTAL,
+            backoff_factor=RETRY_BACKOFF_FACTOR,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=retry_methods,
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry, pool_block=True)
+
+        session = requests.Session()
+        session.headers.update(self.headers)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def _request(self, method, url, write=False, **kwargs):
+        """
+        Send a request through the shared session and record latency and retries.
+
+        Args:
+            method (str): HTTP method
+            url (str): Request URL
+            write (bool): The request changes data in Jira and must not be replayed
+            **kwargs: Extra arguments for requests.Session.request
+
+        Returns:
+            requests.Response: Server response
+        """
+        session = self.write_session if write else self.session
+        started = time.perf_counter()
+        try:
+            response = session.request(method, url, **kwargs)
+        except requests.RequestException:
+            with self._stats_lock:
+                self.request_stats['requests'] += 1
+                self.request_stats['errors'] += 1
+            raise
+
+        elapsed = time.perf_counter() - started
+        retries = response.raw.retries
+        retry_count = len(retries.history) if retries is not None else 0
+
+        with self._stats_lock:
+            self.request_stats['requests'] += 1
+            self.request_stats['retries'] += retry_count
+            self.request_stats['total_time'] += elapsed
+            self.request_stats['max_time'] = max(self.request_stats['max_time'], elapsed)
+            self.request_stats['bytes'] += len(response.content)
+            # Bytes as received, before the content encoding is removed
+            self.request_stats['wire_bytes'] += response.raw.tell()
+            if response.status_code >= 400:
+                self.request_stats['errors'] += 1
+
+        self.logger.info(f"{method} {url} -> {response.status_code} in {elapsed:.2f}s (retries: {retry_count})")
+        return response
+
+    def _decode_response(self, response):
+        """
+        Decode the JSON body of a response and record the decode time.
+
+        The body is already downloaded by _request, so this is pure CPU time and
+        is kept apart from the network time.
+
+        Args:
+            response (requests.Response): Server response
+
+        Returns:
+            Decoded JSON value
+
+        Raises:
+            json.JSONDecodeError: If the body is not valid JSON
+        """
+        started = time.perf_counter()
+        try:
+            return decode_json(response.content)
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._stats_lock:
+                self.request_stats['decode_time'] += elapsed
+                self.request_stats['max_decode_time'] = max(self.request_stats['max_decode_time'], elapsed)
+
+    def get_request_stats(self):
+        """
+        Get request statistics collected by this analyzer.
+
+        Returns:
+            dict: Request count, retry count, error count, network and JSON decode time in seconds,
+                  decoded and on-the-wire response bytes
+        """
+        with self._stats_lock:
+            stats = dict(self.request_stats)
+
+        stats['avg_time'] = stats['total_time'] / stats['requests'] if stats['requests'] else 0.0
+        return stats
+
+    @timed('jira_connect')
     def _check_connection(self):
         """
         Check connection to Jira.
@@ -56,8 +437,7 @@ class JiraAnalyzer:
             self.logger.info("Checking Jira server availability...")
 
             try:
-                session = requests.Session()
-                resp = session.get(self.jira_url, timeout=10, allow_redirects=False)
+                resp = self._request('GET', self.jira_url, timeout=10, allow_redirects=False)
                 if resp.status_code >= 300 and resp.status_code < 400:
                     self.logger.error(f"Server redirecting to: {resp.headers.get('Location', 'unknown')}")
                     self.logger.error("VPN connection or NetScaler authentication may be required")
@@ -69,9 +449,9 @@ class JiraAnalyzer:
             self.logger.info("Server available, checking token authentication...")
 
             # Now check authentication using API v2
-            response = requests.get(
+            response = self._request(
+                'GET',
                 f"{self.jira_url}/rest/api/2/myself",
-                headers=self.headers,
                 timeout=10
             )
 
@@ -79,8 +459,9 @@ class JiraAnalyzer:
 
             if response.status_code == 200:
                 try:
-                    user_data = response.json()
+                    user_data = self._decode_response(response)
                     self.logger.info(f"Authentication successful! User: {user_data.get('displayName', 'unknown')}")
+                    self.jira_timezone = user_data.get('timeZone')
                     return True
                 except json.JSONDecodeError as e:
                     self.logger.error(f"Error parsing JSON: {e}")
@@ -94,20 +475,74 @@ class JiraAnalyzer:
             self.logger.error(f"Error checking connection: {e}")
             return False
 
-    def get_issues_by_filter(self, jql_query=None, filter_id=None, max_results=10000):
+    @timed('jira_search')
+    def get_issues_by_filter(self, jql_query=None, filter_id=None, max_results=10000, parallel=True,
+                             fields=None, expand=None, page_size=PAGE_SIZE, validate_query=None, profile=None):
         """
         Get issues from Jira using a JQL query or filter ID.
         No limit on the number of issues (default 10000 should be sufficient).
         Includes changelog request for transitions analysis.
 
+        Collects all pages from iter_issue_pages into one list. Prefer
+        iter_issue_pages for large result sets that can be processed page by page.
+
         Args:
             jql_query (str): JQL query string
             filter_id (str/int): Jira filter ID to use instead of JQL
             max_results (int): Maximum number of results to return
+            parallel (bool): Fetch remaining pages concurrently
+            fields (list): Fields to request instead of those of the profile
+            expand (list): Expansions to request instead of those of the profile
+            page_size (int): Number of issues to request per page
+            validate_query (str): Optional JQL validation mode ('strict', 'warn' or 'none')
+            profile (str): Name of a FIELD_PROFILES entry, 'full' by default
 
         Returns:
             list: List of issue dictionaries
         """
+        all_issues = []
+        for page in self.iter_issue_pages(jql_query=jql_query, filter_id=filter_id, parallel=parallel, fields=fields,
+                                          expand=expand, page_size=page_size, validate_query=validate_query,
+                                          profile=profile):
+            all_issues.extend(page)
+
+        return all_issues
+
+    def iter_issue_pages(self, jql_query=None, filter_id=None, parallel=True, fields=None, expand=None,
+                         page_size=PAGE_SIZE, validate_query=None, profile=None, fetch_stats=None):
+        """
+        Iterate over pages of issues matching a JQL query or filter ID.
+
+        The first page is always fetched on its own to learn the total number of
+        matching issues. In parallel mode the remaining pages are then requested
+        concurrently by a bounded pool of workers (see max_workers). Pages are
+        yielded in startAt order and issues are deduplicated by key, and only a
+        few pages are held in memory at any time.
+
+        With a two-phase profile the details of every page are fetched by the
+        same worker right after the page, so both phases run concurrently.
+
+        Args:
+            jql_query (str): JQL query string
+            filter_id (str/int): Jira filter ID to use instead of JQL
+            parallel (bool): Fetch remaining pages concurrently
+            fields (list): Fields to request instead of those of the profile
+            expand (list): Expansions to request instead of those of the profile
+            page_size (int): Number of issues to request per page
+            validate_query (str): Optional JQL validation mode ('strict', 'warn' or 'none')
+            profile (str): Name of a FIELD_PROFILES entry, 'full' by default
+            fetch_stats (dict): Filled with 'total' (reported by Jira), 'retrieved' and 'errors'
+                                (failed requests), so callers can tell a partial result from a complete one
+
+        Yields:
+            list: Page of issue dictionaries
+        """
+        if fetch_stats is None:
+            fetch_stats = {}
+        fetch_stats.update(total=0, retrieved=0, errors=0)
+
+        field_profile = FIELD_PROFILES[profile or 'full']
+        details = field_profile.get('details')
         # Use API v2
         search_url = f"{self.jira_url}/rest/api/2/search"
 
@@ -119,83 +554,430 @@ class JiraAnalyzer:
 
         self.logger.info(f"Using query: {query_string}")
 
-        start_at = 0
-        all_issues = []
+        search_params = {
+            'jql': query_string,
+            'fields': field_profile['fields'] if fields is None else fields,
+            'expand': field_profile['expand'] if expand is None else expand
+        }
+        if validate_query:
+            search_params['validateQuery'] = validate_query
+
+        # The first page tells us how many issues match the query
+        data = self._fetch_search_page(search_url, search_params, 0, page_size)
+        if data is None:
+            fetch_stats['errors'] += 1
+            return
+
+        first_issues = data.get('issues', [])
+        total = data.get('total', 0)
+        fetch_stats['total'] = total
+
+        if not first_issues:
+            self.logger.info("No more issues found.")
+            return
+
+        if details:
+            self._add_issue_details(first_issues, details)
+
+        # Issues can move between pages while paging, so drop repeated keys
+        seen_keys = set()
+
+        def unique_issues(page):
+            result = []
+            for issue in page:
+                key = issue.get('key')
+                if key not in seen_keys:
+                    seen_keys.add(key)
+                    result.append(issue)
+            return result
+
+        retrieved = len(first_issues)
+        fetch_stats['retrieved'] = retrieved
+        self.logger.info(f"Retrieved {retrieved}/{total} issues...")
+        yield unique_issues(first_issues)
+
+        if retrieved < total:
+            if not parallel or self.max_workers <= 1:
+                for page in self._iter_search_range(search_url, search_params, retrieved, total, page_size,
+                                                    fetch_stats):
+                    if details:
+                        self._add_issue_details(page, details)
+                    retrieved += len(page)
+                    fetch_stats['retrieved'] = retrieved
+                    self.logger.info(f"Retrieved {retrieved}/{total} issues...")
+                    yield unique_issues(page)
+            else:
+                # Jira may return fewer issues per page than requested, so use the size of
+                # the first page as the stride for the remaining offsets
+                stride = len(first_issues)
+                offsets = iter(range(stride, total, stride))
+                window = self.max_workers * 2
+
+                self.logger.info(
+                    f"Fetching remaining {total - stride} issues with up to {self.max_workers} parallel requests...")
+
+                with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                    def submit(offset):
+                        return executor.submit(self._fetch_search_range, search_url, search_params, offset,
+                                               min(offset + stride, total), page_size, details, fetch_stats)
+
+                    # Keep a bounded number of pages in flight so memory does not grow with the result set
+                    pending = collections.deque()
+                    for offset in itertools.islice(offsets, window):
+                        pending.append((offset, submit(offset)))
+
+                    while pending:
+                        offset, future = pending.popleft()
+                        try:
+                            page = future.result()
+                        except Exception as e:
+                            self.logger.error(f"Exception occurred while fetching page at {offset}: {str(e)}")
+                            with self._stats_lock:
+                                fetch_stats['errors'] += 1
+                            page = []
+
+                        next_offset = next(offsets, None)
+                        if next_offset is not None:
+                            pending.append((next_offset, submit(next_offset)))
+
+                        retrieved += len(page)
+                        fetch_stats['retrieved'] = retrieved
+                        self.logger.info(f"Retrieved {retrieved}/{total} issues...")
+                        yield unique_issues(page)
+
+        if len(seen_keys) < total:
+            self.logger.warning(f"Retrieved {len(seen_keys)} of {total} issues matching the query")
+        else:
+            self.logger.info("Retrieved all issues matching the query.")
+
+    def _fetch_search_range(self, search_url, search_params, start_at, end_at, page_size=PAGE_SIZE, details=None,
+                            fetch_stats=None):
+        """
+        Sequentially fetch search results from start_at up to end_at.
+
+        Args:
+            search_url (str): Search endpoint URL
+            search_params (dict): JQL query, fields and expansions
+            start_at (int): Offset of the first issue to fetch
+            end_at (int): Offset to stop at (exclusive)
+            page_size (int): Number of issues to request per page
+            details (dict): Detail fields and expansions of a two-phase profile, optional
+            fetch_stats (dict): Statistics of iter_issue_pages counting failed requests, optional
+
+        Returns:
+            list: List of issue dictionaries
+        """
+        issues = []
+        for page in self._iter_search_range(search_url, search_params, start_at, end_at, page_size, fetch_stats):
+            if details:
+                self._add_issue_details(page, details)
+            issues.extend(page)
+        return issues
+
+    def needs_issue_details(self, issue):
+        """
+        Check whether the two-phase analysis needs comments, attachments and the changelog of an issue.
+
+        Comments and attachments are only read for closed issues, which also need
+        their changelog for lead and cycle time. Of the other issues, only those
+        whose status category never changed after creation may have no status
+        transitions at all, which the changelog tells for sure.
+
+        Args:
+            issue (dict): Issue with the ANALYSIS_SUMMARY_FIELDS
+
+        Returns:
+            bool: True if the details must be fetched
+        """
+        status = issue.get('fields', {}).get('status') or {}
+        if self.status_classifier.classify(status.get('name'), status.get('id')) == StatusCategory.CLOSED:
+            return True
+        return not status_category_changed(issue)
 
-        while True:
-            query = {
-                'jql': query_string,
-                'maxResults': 100,  # Get 100 issues per request (API limit)
-                'startAt': start_at,
-                'fields': [
-                    'project',
-                    'summary',
-                    'issuetype',
-                    'timeoriginalestimate',
-                    'timespent',
-                    'status',
-                    'worklog',
-                    'comment',
-                    'attachment',
-                    'created',  # Request creation date
-                    'components'  # Request components for CLM/EST analysis
-                ],
-                'expand': ['changelog']  # Request changelog for transitions analysis
-            }
+    def _add_issue_details(self, issues, details):
+        """
+        Fetch the detail fields of the issues of a page that need them and merge them into those issues
+
+        Args:
+            issues (list): Page of issues, updated in place
+            details (dict): 'fields' and 'expand' to fetch
+        """
+        keys = [issue.get('key') for issue in issues if issue.get('key') and self.needs_issue_details(issue)]
+        if not keys:
+            return
+
+        detail_issues = self.get_issues_by_filter(jql_query=f"key in ({','.join(keys)})", parallel=False,
+                                                  fields=details['fields'], expand=details['expand'],
+                                                  page_size=max(len(keys), 1), validate_query='warn')
+        details_by_key = {detail.get('key'): detail for detail in detail_issues}
+
+        for issue in issues:
+            detail = details_by_key.get(issue.get('key'))
+            if detail is None:
+                continue
+            issue.setdefault('fields', {}).update(detail.get('fields', {}))
+            if 'changelog' in detail:
+                issue['changelog'] = detail['changelog']
+
+    def _iter_search_range(self, search_url, search_params, start_at, end_at, page_size=PAGE_SIZE, fetch_stats=None):
+        """
+        Sequentially iterate over search result pages from start_at up to end_at.
+        Stops early on errors or when Jira has no more issues.
+
+        Args:
+            search_url (str): Search endpoint URL
+            search_params (dict): JQL query, fields and expansions
+            start_at (int): Offset of the first issue to fetch
+            end_at (int): Offset to stop at (exclusive)
+            page_size (int): Number of issues to request per page
+            fetch_stats (dict): Statistics of iter_issue_pages counting failed requests, optional
+
+        Yields:
+            list: Page of issue dictionaries
+        """
+        while start_at < end_at:
+            data = self._fetch_search_page(search_url, search_params, start_at,
+                                           min(page_size, end_at - start_at))
+            if data is None:
+                if fetch_stats is not None:
+                    with self._stats_lock:
+                        fetch_stats['errors'] += 1
+                break
+
+            page_issues = data.get('issues', [])
+            if not page_issues:
+                self.logger.info("No more issues found.")
+                break
+
+            yield page_issues
+            start_at += len(page_issues)
+
+            # The result set may have shrunk since the first page was read
+            end_at = min(end_at, data.get('total', 0))
 
+    def _fetch_search_page(self, search_url, search_params, start_at, page_size=PAGE_SIZE):
+        """
+        Fetch a single page of search results.
+
+        Args:
+            search_url (str): Search endpoint URL
+            search_params (dict): JQL query, fields and expansions
+            start_at (int): Offset of the first issue on the page
+            page_size (int): Number of issues to request
+
+        Returns:
+            dict: Parsed search response, or None if the request failed
+        """
+        query = dict(search_params)
+        query['maxResults'] = page_size
+        query['startAt'] = start_at
+
+        try:
+            response = self._request(
+                'POST',
+                search_url,
+                data=json.dumps(query),
+                timeout=30
+            )
+
+            # Check for errors
+            if response.status_code != 200:
+                self.logger.error(f"Error getting data: {response.status_code}")
+                self.logger.error(f"Server response: {response.text[:200]}...")
+                return None
+
+            # Check for valid JSON
             try:
-                response = requests.post(
-                    search_url,
-                    headers=self.headers,
-                    data=json.dumps(query),
-                    timeout=30
-                )
+                return self._decode_response(response)
+            except json.JSONDecodeError as e:
+                self.logger.error(f"Error parsing JSON: {e}")
+                self.logger.error(f"Response content: {response.text[:200]}...")
+                return None
+
+        except Exception as e:
+            self.logger.error(f"Exception occurred: {str(e)}")
+            self.logger.error("Traceback:", exc_info=True)
+            return None
 
-                # Print request info for debugging
-                self.logger.info(f"Request to {search_url}, response code: {response.status_code}")
+    @timed('issue_cache_sync')
+    def sync_issue_cache(self, jql_query, cache, profile=None, cancel_check=None):
+        """
+        Bring the local issue cache up to date for a JQL query.
 
-                # Check for errors
-                if response.status_code != 200:
-                    self.logger.error(f"Error getting data: {response.status_code}")
-                    self.logger.error(f"Server response: {response.text[:200]}...")
-                    break
+        Only issues updated since the last sync of this query are downloaded in
+        full. The current list of matching keys is always re-read (which is cheap)
+        so that issues which left the result set are dropped and issues missing
+        from the cache are fetched. Pages are written to the cache as they arrive.
+        Read the result afterwards with cache.iter_issue_pages(jql_query).
 
-                # Check for valid JSON
-                try:
-                    data = response.json()
-                except json.JSONDecodeError as e:
-                    self.logger.error(f"Error parsing JSON: {e}")
-                    self.logger.error(f"Response content: {response.text[:200]}...")
-                    break
+        The sync time is only recorded once every page was fetched, otherwise
+        updates would be skipped by the next sync for good.
+
+        Args:
+            jql_query (str): JQL query string
+            cache (IssueCache): Local issue store, holding issues of this profile only
+            profile (str): Name of a FIELD_PROFILES entry, 'full' by default
+            cancel_check (callable): Called after every page, raises to stop the sync
+
+        Returns:
+            dict: Cache statistics with 'hits' and 'misses'
+
+        Raises:
+            JiraFetchError: If the current keys or the updated issues could not all be fetched;
+                            the last sync time is kept, so the next sync fetches the updates again
+        """
+        sync_time = datetime.now(timezone.utc)
+        last_sync = cache.get_last_sync(jql_query)
+
+        if last_sync is None:
+            self.logger.info("Query not cached yet, fetching all issues...")
+            issue_keys = []
+            fetch_stats = {}
+            for page in self.iter_issue_pages(jql_query=jql_query, profile=profile, fetch_stats=fetch_stats):
+                cache.put_issues(page)
+                issue_keys.extend(issue.get('key') for issue in page if issue.get('key'))
+                if cancel_check:
+                    cancel_check()
+
+            if fetch_stats['errors']:
+                self.logger.warning("Not all issues were fetched, the query will be synced again next time")
+            else:
+                cache.set_query_result(jql_query, issue_keys, sync_time.isoformat())
+            return {'hits': 0, 'misses': len(issue_keys)}
+
+        # Current result set: keys only, in Jira order
+        issue_keys = []
+        fetch_stats = {}
+        for page in self.iter_issue_pages(jql_query=jql_query, profile='keys', page_size=KEYS_PAGE_SIZE,
+                                          fetch_stats=fetch_stats):
+            issue_keys.extend(issue.get('key') for issue in page if issue.get('key'))
+            if cancel_check:
+                cancel_check()
+
+        if fetch_stats['errors']:
+            raise JiraFetchError(f"Could not list all issues of the query: {fetch_stats['retrieved']} "
+                                 f"of {fetch_stats['total']} keys retrieved")
+
+        # Issues changed since the last sync; the condition goes before any ORDER BY clause
+        updated_since = self._format_jql_datetime(datetime.fromisoformat(last_sync))
+        conditions, order_by = split_order_by(jql_query)
+        updated_condition = f'updated >= "{updated_since}"'
+        updated_jql = f'({conditions}) AND {updated_condition}' if conditions else updated_condition
+        if order_by:
+            updated_jql = f'{updated_jql} {order_by}'
+        self.logger.info(f"Fetching issues updated since last sync: {updated_jql}")
+
+        fetched_keys = set()
+        fetch_stats = {}
+        for page in self.iter_issue_pages(jql_query=updated_jql, profile=profile, fetch_stats=fetch_stats):
+            cache.put_issues(page)
+            fetched_keys.update(issue.get('key') for issue in page)
+            if cancel_check:
+                cancel_check()
+
+        if fetch_stats['errors']:
+            raise JiraFetchError(f"Could not fetch all issues updated since the last sync: "
+                                 f"{fetch_stats['retrieved']} of {fetch_stats['total']} retrieved")
+
+        # Issues that match now but were never downloaded (e.g. moved into the filter)
+        cached_keys = cache.get_cached_keys(issue_keys)
+        missing_keys = [key for key in issue_keys if key not in cached_keys]
+        for i in range(0, len(missing_keys), KEY_BATCH_SIZE):
+            chunk = missing_keys[i:i + KEY_BATCH_SIZE]
+            cache.put_issues(self.get_issues_by_filter(jql_query=f"key in ({','.join(chunk)})",
+                                                       validate_query='warn', profile=profile))
+            if cancel_check:
+                cancel_check()
+
+        cache.set_query_result(jql_query, issue_keys, sync_time.isoformat())
+
+        misses = len(fetched_keys | set(missing_keys))
+        cache_stats = {'hits': max(len(issue_keys) - misses, 0), 'misses': misses}
+        self.logger.info(f"Issue cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses")
+
+        return cache_stats
+
+    def iter_cached_issue_pages(self, jql_query, cache, profile=None, cache_stats=None, cancel_check=None):
+        """
+        Iterate over the issues of a JQL query through the local issue cache, page by page.
 
-                issues = data.get('issues', [])
+        A query that was never synced is streamed from Jira: every page is
+        stored in the cache and yielded as soon as it arrives, and the query
+        result is recorded after the last page if no page failed, so an
+        interrupted or partial first sync is simply redone. Otherwise the cache is brought up to date first (see
+        sync_issue_cache, which only downloads issues updated since the last
+        sync) and the pages are then read from the cache one at a time.
+
+        Args:
+            jql_query (str): JQL query string
+            cache (IssueCache): Local issue store, holding issues of this profile only
+            profile (str): Name of a FIELD_PROFILES entry, 'full' by default
+            cache_stats (dict): 'hits' and 'misses' counters to add this query to
+            cancel_check (callable): Called after every page fetched from Jira, raises to stop
 
-                if not issues:
-                    self.logger.info("No more issues found.")
-                    break
+        Yields:
+            list: Page of issue dictionaries, in Jira order
 
-                all_issues.extend(issues)
-                start_at += len(issues)
+        Raises:
+            JiraFetchError: If the sync of a cached query could not fetch all updates
+        """
+        if cache_stats is None:
+            cache_stats = {'hits': 0, 'misses': 0}
+
+        if cache.get_last_sync(jql_query) is not None:
+            query_stats = self.sync_issue_cache(jql_query, cache, profile, cancel_check)
+            cache_stats['hits'] += query_stats['hits']
+            cache_stats['misses'] += query_stats['misses']
+            yield from cache.iter_issue_pages(jql_query)
+            return
+
+        self.logger.info("Query not cached yet, streaming all issues into the cache...")
+        sync_time = datetime.now(timezone.utc)
+        issue_keys = []
+        fetch_stats = {}
+        for page in self.iter_issue_pages(jql_query=jql_query, profile=profile, fetch_stats=fetch_stats):
+            with span('issue_cache_sync'):
+                cache.put_issues(page)
+            issue_keys.extend(issue.get('key') for issue in page if issue.get('key'))
+            cache_stats['misses'] += len(page)
+            if cancel_check:
+                cancel_check()
+            yield page
+
+        if fetch_stats['errors']:
+            self.logger.warning("Not all issues were fetched, the query will be synced again next time")
+        else:
+            cache.set_query_result(jql_query, issue_keys, sync_time.isoformat())
 
-                # Progress indicator
-                self.logger.info(f"Retrieved {len(all_issues)}/{data.get('total', 0)} issues...")
+    def _format_jql_datetime(self, moment):
+        """
+        Format a timezone-aware datetime for JQL in the Jira user's time zone,
+        moved back by a safety overlap.
 
-                # Exit if all issues received or max_results reached
-                if start_at >= data.get('total', 0):
-                    self.logger.info("Retrieved all issues matching the query.")
-                    break
+        Args:
+            moment (datetime): Timezone-aware datetime
 
+        Returns:
+            str: Date in 'yyyy/MM/dd HH:mm' format
+        """
+        if self.jira_timezone and ZoneInfo is not None:
+            try:
+                local_moment = moment.astimezone(ZoneInfo(self.jira_timezone)) - SYNC_OVERLAP
+                return local_moment.strftime('%Y/%m/%d %H:%M')
             except Exception as e:
-                self.logger.error(f"Exception occurred: {str(e)}")
-                self.logger.error("Traceback:", exc_info=True)
-                break
+                self.logger.warning(f"Unknown Jira time zone {self.jira_timezone}: {e}")
 
-        return all_issues
+        return (moment - SYNC_OVERLAP_UNKNOWN_TZ).strftime('%Y/%m/%d %H:%M')
 
+    @timed('jira_linked_issues')
     def get_linked_issues(self, issues, link_type=None, max_depth=1):
         """
         Get issues linked to the provided issues.
 
+        Links are read locally from the 'issuelinks' field of the source issues,
+        so no linkedIssues() search is needed. Only neighbour issues that this
+        analyzer has not seen yet are fetched, in large 'key in (...)' batches.
+
         Args:
             issues (list): List of issue dictionaries or issue keys
             link_type (str): Optional link type to filter by (e.g., "relates to")
@@ -207,51 +989,118 @@ class JiraAnalyzer:
         if not issues:
             return []
 
-        # Extract issue keys if issues are dictionaries
-        issue_keys = []
+        # Resolve source issues to dictionaries that include their links
+        source_issues = []
+        keys_to_fetch = []
         for issue in issues:
-            if isinstance(issue, dict):
-                key = issue.get('key')
+            if isinstance(issue, dict) and 'issuelinks' in issue.get('fields', {}):
+                self._issue_index.setdefault(issue.get('key'), issue)
+                source_issues.append(issue)
+            else:
+                key = issue.get('key') if isinstance(issue, dict) else issue
                 if key:
-                    issue_keys.append(key)
-            elif isinstance(issue, str):
-                issue_keys.append(issue)
+                    keys_to_fetch.append(key)
 
-        if not issue_keys:
+        if keys_to_fetch:
+            source_issues.extend(self.get_issues_by_keys(keys_to_fetch))
+
+        if not source_issues:
             return []
 
-        # Split issue keys into much smaller chunks to avoid query length limitations
-        # Jira has a smaller limit than expected, use 10 keys per chunk
-        chunk_size = 10
-        all_linked_issues = []
+        visited_keys = {issue.get('key') for issue in source_issues}
+        linked_keys = []
+        frontier = source_issues
 
-        for i in range(0, len(issue_keys), chunk_size):
-            chunk = issue_keys[i:i + chunk_size]
+        for depth in range(max_depth):
+            neighbour_keys = []
+            for issue in frontier:
+                for key in get_issue_link_keys(issue, link_type):
+                    if key not in visited_keys:
+                        visited_keys.add(key)
+                        neighbour_keys.append(key)
 
-            # Create the JQL query with proper syntax - important to use OR for multiple issues
-            if link_type:
-                jql_parts = []
-                for key in chunk:
-                    jql_parts.append(f'issue in linkedIssues("{key}", "{link_type}")')
+            if not neighbour_keys:
+                break
 
-                jql = " OR ".join(jql_parts)
-            else:
-                jql_parts = []
-                for key in chunk:
-                    jql_parts.append(f'issue in linkedIssues("{key}")')
+            self.logger.info(
+                f"Found {len(neighbour_keys)} issues linked with '{link_type or 'any'}' at depth {depth + 1}")
+            linked_keys.extend(neighbour_keys)
+            frontier = self.get_issues_by_keys(neighbour_keys)
 
-                jql = " OR ".join(jql_parts)
+        linked_issues = [self._issue_index[key] for key in linked_keys if key in self._issue_index]
+        self.logger.info(f"Retrieved {len(linked_issues)} linked issues for {len(source_issues)} source issues")
+        return linked_issues
 
-            # Get the linked issues
-            self.logger.info(f"Fetching linked issues with query: {jql}")
-            linked_issues = self.get_issues_by_filter(jql_query=jql)
-            all_linked_issues.extend(linked_issues)
+    @timed('jira_issues_by_key')
+    def get_issues_by_keys(self, issue_keys):
+        """
+        Get issues by key, fetching only those this analyzer has not seen yet.
+        Unseen keys are requested in 'key in (...)' batches, several at a time.
 
-            self.logger.info(
-                f"Retrieved {len(linked_issues)} linked issues for chunk {i // chunk_size + 1}/{(len(issue_keys) + chunk_size - 1) // chunk_size}")
+        Args:
+            issue_keys (list): List of issue keys
+
+        Returns:
+            list: Issue dictionaries in the order of issue_keys (unknown keys are skipped)
+        """
+        unseen_keys = []
+        for key in dict.fromkeys(issue_keys):
+            if key not in self._issue_index:
+                unseen_keys.append(key)
+
+        if unseen_keys:
+            batches = [unseen_keys[i:i + KEY_BATCH_SIZE] for i in range(0, len(unseen_keys), KEY_BATCH_SIZE)]
+            self.logger.info(f"Fetching {len(unseen_keys)} issues by key in {len(batches)} batches...")
+
+            def fetch_batch(batch):
+                # Unknown or hidden keys must not fail the whole batch
+                return self.get_issues_by_filter(jql_query=f"key in ({','.join(batch)})", parallel=False,
+                                                 validate_query='warn')
+
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(batches))) as executor:
+                for batch_issues in executor.map(fetch_batch, batches):
+                    for issue in batch_issues:
+                        self._issue_index[issue.get('key')] = issue
+
+        return [self._issue_index[key] for key in issue_keys if key in self._issue_index]
+
+    def _search_in_batches(self, keys, clause_template, description):
+        """
+        Run a JQL clause over issue keys in large batches, several batches at a time.
+
+        Args:
+            keys (list): Issue keys to substitute into the clause
+            clause_template (str): JQL with a {keys} placeholder, e.g. 'parent in ({keys})'
+            description (str): What is fetched, for logging
+
+        Returns:
+            list: List of issue dictionaries
+        """
+        if not keys:
+            return []
+
+        batches = [keys[i:i + KEY_BATCH_SIZE] for i in range(0, len(keys), KEY_BATCH_SIZE)]
+        self.logger.info(f"Fetching {description} for {len(keys)} issues in {len(batches)} batches...")
+
+        def fetch_batch(batch):
+            quoted_keys = ', '.join(f'"{key}"' for key in batch)
+            try:
+                return self.get_issues_by_filter(jql_query=clause_template.format(keys=quoted_keys), parallel=False,
+                                                 validate_query='warn')
+            except Exception as e:
+                self.logger.error(f"Error fetching {description}: {e}")
+                return []
 
-        return all_linked_issues
+        results = []
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(batches))) as executor:
+            for batch_issues in executor.map(fetch_batch, batches):
+                for issue in batch_issues:
+                    self._issue_index.setdefault(issue.get('key'), issue)
+                results.extend(batch_issues)
 
+        return results
+
+    @timed('jira_clm_related')
     def get_clm_related_issues(self, clm_issues):
         """
         Get all issues related to CLM issues following the specific logic.
@@ -265,12 +1114,9 @@ class JiraAnalyzer:
         if not clm_issues:
             return [], [], []
 
-        # Extract CLM issue keys
-        clm_keys = [issue.get('key') for issue in clm_issues if issue.get('key')]
-
         # Get EST issues related to CLM with "relates to" link
-        self.logger.info(f"Fetching EST issues related to {len(clm_keys)} CLM issues...")
-        est_issues = self.get_linked_issues(clm_keys, link_type="relates to")
+        self.logger.info(f"Fetching EST issues related to {len(clm_issues)} CLM issues...")
+        est_issues = self.get_linked_issues(clm_issues, link_type="relates to")
 
         # Filter to include only EST project issues
         est_issues = [issue for issue in est_issues if
@@ -278,7 +1124,7 @@ class JiraAnalyzer:
 
         # Get Improvement issues linked to CLM with "links CLM to" link
         self.logger.info(f"Fetching Improvement issues linked to CLM...")
-        improvement_issues = self.get_linked_issues(clm_keys, link_type="links CLM to")
+        improvement_issues = self.get_linked_issues(clm_issues, link_type="links CLM to")
 
         # Filter for type "Improvement from CLM"
         improvement_issues = [issue for issue in improvement_issues if
@@ -288,41 +1134,16 @@ class JiraAnalyzer:
         implementation_keys = []
         implementation_issues = []
 
-        improvement_keys = [issue.get('key') for issue in improvement_issues if issue.get('key')]
-        if improvement_keys:
-            self.logger.info(f"Fetching implementation issues linked to {len(improvement_keys)} Improvement issues...")
-            implementation_issues = self.get_linked_issues(improvement_keys, link_type="is realized in")
+        if improvement_issues:
+            self.logger.info(f"Fetching implementation issues linked to {len(improvement_issues)} Improvement issues...")
+            implementation_issues = self.get_linked_issues(improvement_issues, link_type="is realized in")
             implementation_keys = [issue.get('key') for issue in implementation_issues if issue.get('key')]
 
         # Get subtasks using direct parent query instead of subtasksOf
-        subtasks = []
-        if implementation_keys:
-            for i in range(0, len(implementation_keys), 10):
-                chunk = implementation_keys[i:i + 10]
-                parents_clause = " OR ".join([f'parent = "{key}"' for key in chunk])
-                subtasks_query = parents_clause
-
-                self.logger.info(f"Fetching subtasks with query: {subtasks_query}")
-                try:
-                    chunk_subtasks = self.get_issues_by_filter(jql_query=subtasks_query)
-                    subtasks.extend(chunk_subtasks)
-                except Exception as e:
-                    self.logger.error(f"Error fetching subtasks: {e}")
+        subtasks = self._search_in_batches(implementation_keys, 'parent in ({keys})', 'subtasks')
 
         # Get epic issues using Epic Link field instead of issuesInEpics
-        epic_issues = []
-        if implementation_keys:
-            for i in range(0, len(implementation_keys), 10):
-                chunk = implementation_keys[i:i + 10]
-                epics_clause = " OR ".join([f'"Epic Link" = "{key}"' for key in chunk])
-                epics_query = epics_clause
-
-                self.logger.info(f"Fetching epic issues with query: {epics_query}")
-                try:
-                    chunk_epics = self.get_issues_by_filter(jql_query=epics_query)
-                    epic_issues.extend(chunk_epics)
-                except Exception as e:
-                    self.logger.error(f"Error fetching epic issues: {e}")
+        epic_issues = self._search_in_batches(implementation_keys, '"Epic Link" in ({keys})', 'epic issues')
 
         # Combine all implementation-related issues
         implementation_issues.extend(subtasks)
@@ -332,6 +1153,66 @@ class JiraAnalyzer:
             f"Found {len(est_issues)} EST issues, {len(improvement_issues)} Improvement issues, and {len(implementation_issues)} implementation issues")
         return est_issues, improvement_issues, implementation_issues
 
+    @timed('jira_worklogs')
+    def get_issue_worklogs(self, issue_keys):
+        """
+        Get the complete worklog lists of issues from /issue/{key}/worklog.
+        Needed when the worklogs embedded in search results are truncated.
+        Several issues are requested at once.
+
+        Args:
+            issue_keys (list): List of issue keys
+
+        Returns:
+            dict: Mapping from issue key to list of worklog dictionaries
+                  (issues whose worklogs could not be fetched are left out)
+        """
+        if not issue_keys:
+            return {}
+
+        def fetch_worklogs(key):
+            worklogs = []
+            start_at = 0
+
+            while True:
+                try:
+                    response = self._request(
+                        'GET',
+                        f"{self.jira_url}/rest/api/2/issue/{key}/worklog",
+                        params={'startAt': start_at, 'maxResults': WORKLOG_PAGE_SIZE},
+                        timeout=30
+                    )
+                except requests.RequestException as e:
+                    self.logger.error(f"Exception getting worklogs for issue {key}: {e}")
+                    return key, None
+
+                if response.status_code != 200:
+                    self.logger.error(f"Error getting worklogs for issue {key}: {response.status_code}")
+                    return key, None
+
+                try:
+                    data = self._decode_response(response)
+                except json.JSONDecodeError as e:
+                    self.logger.error(f"Error parsing worklogs of issue {key}: {e}")
+                    return key, None
+
+                page = data.get('worklogs', [])
+                worklogs.extend(page)
+                start_at += len(page)
+
+                if not page or start_at >= data.get('total', 0):
+                    return key, worklogs
+
+        self.logger.info(f"Fetching complete worklogs for {len(issue_keys)} issues...")
+
+        results = {}
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(issue_keys))) as executor:
+            for key, worklogs in executor.map(fetch_worklogs, issue_keys):
+                if worklogs is not None:
+                    results[key] = worklogs
+
+        return results
+
     def get_subtasks_by_rest_api(self, issue_keys):
         """
         Get subtasks for issues using direct REST API calls instead of JQL
@@ -349,14 +1230,14 @@ class JiraAnalyzer:
                 # Make a direct API call to get the issue with subtasks expanded
                 issue_url = f"{self.jira_url}/rest/api/2/issue/{key}?expand=subtasks"
 
-                response = requests.get(
+                response = self._request(
+                    'GET',
                     issue_url,
-                    headers=self.headers,
                     timeout=30
                 )
 
                 if response.status_code == 200:
-                    issue_data = response.json()
+                    issue_data = self._decode_response(response)
                     # Extract subtask keys
                     subtask_keys = [subtask.get('key') for subtask in issue_data.get('subtasks', [])]
 
@@ -378,6 +1259,86 @@ class JiraAnalyzer:
 
         return all_subtasks
 
+    def create_filter(self, name, jql, description=''):
+        """
+        Create a saved filter owned by the token's user
+
+        Args:
+            name (str): Filter name, must be unique for the user
+            jql (str): Filter JQL
+            description (str): Filter description
+
+        Returns:
+            str: ID of the created filter, or None if it could not be created
+        """
+        url = f"{self.jira_url}/rest/api/2/filter"
+        payload = {'name': name, 'jql': jql, 'description': description}
+
+        try:
+            response = self._request('POST', url, write=True, json=payload, timeout=30)
+        except requests.RequestException as e:
+            self.logger.error(f"Error creating filter '{name}': {e}")
+            return None
+
+        if response.status_code != 200:
+            self.logger.error(f"Error creating filter '{name}': {response.status_code} - {response.text[:200]}")
+            return None
+
+        filter_id = str(self._decode_response(response).get('id'))
+        self.logger.info(f"Created filter {filter_id} '{name}'")
+        return filter_id
+
+    def update_filter(self, filter_id, jql):
+        """
+        Replace the JQL of a saved filter
+
+        Args:
+            filter_id (str): Filter ID
+            jql (str): New filter JQL
+
+        Returns:
+            bool: True if the filter was updated
+        """
+        url = f"{self.jira_url}/rest/api/2/filter/{filter_id}"
+
+        try:
+            response = self._request('PUT', url, write=True, json={'jql': jql}, timeout=30)
+        except requests.RequestException as e:
+            self.logger.error(f"Error updating filter {filter_id}: {e}")
+            return False
+
+        if response.status_code != 200:
+            self.logger.error(f"Error updating filter {filter_id}: {response.status_code} - {response.text[:200]}")
+            return False
+
+        self.logger.info(f"Updated filter {filter_id}")
+        return True
+
+    def delete_filter(self, filter_id):
+        """
+        Delete a saved filter
+
+        Args:
+            filter_id (str): Filter ID
+
+        Returns:
+            bool: True if the filter was deleted or did not exist anymore
+        """
+        url = f"{self.jira_url}/rest/api/2/filter/{filter_id}"
+
+        try:
+            response = self._request('DELETE', url, write=True, timeout=30)
+        except requests.RequestException as e:
+            self.logger.error(f"Error deleting filter {filter_id}: {e}")
+            return False
+
+        if response.status_code not in (200, 204, 404):
+            self.logger.error(f"Error deleting filter {filter_id}: {response.status_code} - {response.text[:200]}")
+            return False
+
+        self.logger.info(f"Deleted filter {filter_id}")
+        return True
+
     # Delegate these methods to the imported modules to maintain backward compatibility
     def process_issues_data(self, issues):
         """Process issues data into a structured DataFrame"""
@@ -385,8 +1346,10 @@ class JiraAnalyzer:
 
     def get_status_categories(self, df):
         """Get status categories from the DataFrame"""
-        return get_status_categories(df)
+        return get_status_categories(df, self.status_classifier)
 
-    def create_visualizations(self, df, output_dir='jira_charts'):
+    def create_visualizations(self, df, output_dir='jira_charts', prerender=None, metrics=None, flow=None):
         """Create visualizations based on processed data"""
-        return create_visualizations(df, output_dir, self.logger)
\ No newline at end of file
+        if metrics is None:
+            metrics = compute_issue_metrics(df, self.status_classifier)
+        return create_visualizations(df, output_dir, self.logger, prerender, metrics, flow)
\ No newline at end of file
@@ -0,0 +1,292 @@
+import uuid
+import queue
+import logging
+import threading
+from datetime import datetime
+from modules.event_stream import event_stream, STATUS_EVENT
+
+try:
+    import config
+except ImportError:
+    config = None
+
+# Get logger
+logger = logging.getLogger(__name__)
+
+# Default number of analyses running at the same time
+DEFAULT_ANALYSIS_WORKERS = 2
+
+# Default number of jobs waiting for a free worker
+DEFAULT_MAX_QUEUED_JOBS = 20
+
+# Number of completed jobs kept for /status/<job_id>
+COMPLETED_JOBS_TO_KEEP = 50
+
+# Job statuses
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_FINISHED = 'finished'
+JOB_FAILED = 'failed'
+JOB_CANCELLED = 'cancelled'
+
+ACTIVE_STATUSES = (JOB_QUEUED, JOB_RUNNING)
+
+# Marks a key missing from a job state
+_MISSING = object()
+
+
+class JobQueueFull(Exception):
+    """Raised when no more jobs can be queued"""
+
+
+class JobCancelled(Exception):
+    """Raised inside a running job once its cancellation was requested"""
+
+
+def new_job_state():
+    """
+    Create the progress state of a single analysis run
+
+    Returns:
+        dict: State updated by run_analysis and reported by /status
+    """
+    return {
+        'is_running': False,
+        'last_run': None,
+        'progress': 0,
+        'total_issues': 0,
+        'status_message': '',
+        'current_folder': None,
+        'error': None,
+        'cancel_requested': False
+    }
+
+
+class JobState(dict):
+    """
+    Progress state of a job that reports every change to the event stream,
+    so /events clients see progress as soon as run_analysis updates it
+    """
+
+    def __setitem__(self, key, value):
+        if self.get(key, _MISSING) != value:
+            super().__setitem__(key, value)
+            event_stream.touch(STATUS_EVENT)
+
+
+def check_cancelled(state):
+    """
+    Stop a running job if its cancellation was requested.
+    Called by run_analysis between processing steps.
+
+    Args:
+        state (dict): Job state
+
+    Raises:
+        JobCancelled: If the job was cancelled
+    """
+    if state.get('cancel_requested'):
+        raise JobCancelled()
+
+
+class Job:
+    """A queued or running analysis with its own parameters and progress state"""
+
+    def __init__(self, params, key):
+        """
+        Args:
+            params (dict): Keyword arguments for the job target
+            key (tuple): Identity of the job used to detect duplicate requests
+        """
+        self.id = uuid.uuid4().hex[:12]
+        self.params = params
+        self.key = key
+        self.state = JobState(new_job_state())
+        self.status = JOB_QUEUED
+        self.created_at = datetime.now()
+        self.started_at = None
+        self.finished_at = None
+
+    def to_dict(self):
+        """
+        Get a JSON-serializable view of the job
+
+        Returns:
+            dict: Job id, status, timestamps, parameters and progress state
+        """
+        return {
+            'job_id': self.id,
+            'status': self.status,
+            'created_at': self.created_at.isoformat(timespec='seconds'),
+            'started_at': self.started_at.isoformat(timespec='seconds') if self.started_at else None,
+            'finished_at': self.finished_at.isoformat(timespec='seconds') if self.finished_at else None,
+            'params': self.params,
+            **self.state
+        }
+
+
+class JobManager:
+    """
+    Runs analyses from a bounded queue on a fixed number of worker threads.
+
+    Every job has its own state dict, so concurrent analyses never share
+    progress. Submitting a job identical to one that is still queued or running
+    returns the existing job instead of starting the same analysis twice.
+    """
+
+    def __init__(self, target, max_workers=None, max_queued=None):
+        """
+        Args:
+            target (callable): Function run for every job, called with the job
+                               parameters and analysis_state=<job state>
+            max_workers (int): Number of concurrent jobs.
+                               Defaults to config.analysis_workers or DEFAULT_ANALYSIS_WORKERS.
+            max_queued (int): Number of jobs waiting for a worker.
+                              Defaults to config.max_queued_jobs or DEFAULT_MAX_QUEUED_JOBS.
+        """
+        self.target = target
+        self.max_workers = max_workers or getattr(config, 'analysis_workers', DEFAULT_ANALYSIS_WORKERS)
+        self.max_queued = max_queued or getattr(config, 'max_queued_jobs', DEFAULT_MAX_QUEUED_JOBS)
+
+        self._queue = queue.Queue(maxsize=self.max_queued)
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._workers = []
+
+    def submit(self, **params):
+        """
+        Queue a new job, or return the active job with the same parameters
+
+        Args:
+            **params: Keyword arguments for the job target
+
+        Returns:
+            tuple: (Job, bool) - the job and whether it was newly created
+
+        Raises:
+            JobQueueFull: If the queue has no room for another job
+        """
+        # Dict parameters such as status_mapping are compared by their items
+        key = tuple(sorted((name, tuple(sorted(value.items())) if isinstance(value, dict) else value)
+                           for name, value in params.items()))
+
+        with self._lock:
+            for job in self._jobs.values():
+                if job.key == key and job.status in ACTIVE_STATUSES:
+                    logger.info(f"Identical job {job.id} is already {job.status}, not starting another one")
+                    return job, False
+
+            job = Job(params, key)
+            try:
+                self._queue.put_nowait(job)
+            except queue.Full:
+                raise JobQueueFull(f"Job queue is full ({self.max_queued} jobs waiting)")
+
+            self._jobs[job.id] = job
+            self._start_workers()
+
+        event_stream.touch(STATUS_EVENT)
+        logger.info(f"Job {job.id} queued")
+        return job, True
+
+    def get(self, job_id):
+        """
+        Get a job by id
+
+        Args:
+            job_id (str): Job id
+
+        Returns:
+            Job: The job, or None if it is unknown
+        """
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id):
+        """
+        Cancel a job. A queued job is dropped right away; a running job stops
+        at its next checkpoint (see check_cancelled).
+
+        Args:
+            job_id (str): Job id
+
+        Returns:
+            bool: True if the job was active and is being cancelled
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if not job or job.status not in ACTIVE_STATUSES:
+                return False
+
+            job.state['cancel_requested'] = True
+            if job.status == JOB_QUEUED:
+                self._finish(job, JOB_CANCELLED)
+                job.state['status_message'] = 'Analysis cancelled.'
+
+        logger.info(f"Job {job_id} cancellation requested")
+        return True
+
+    def active_jobs(self):
+        """
+        Get queued and running jobs, oldest first
+
+        Returns:
+            list: Active jobs
+        """
+        with self._lock:
+            return [job for job in self._jobs.values() if job.status in ACTIVE_STATUSES]
+
+    def _start_workers(self):
+        """Start worker threads on first use (called with the lock held)"""
+        while len(self._workers) < self.max_workers:
+            worker = threading.Thread(target=self._work, name=f"analysis-worker-{len(self._workers) + 1}")
+            worker.daemon = True
+            worker.start()
+            self._workers.append(worker)
+
+    def _work(self):
+        """Worker loop: take jobs from the queue and run them"""
+        while True:
+            job = self._queue.get()
+            try:
+                self._run(job)
+            finally:
+                self._queue.task_done()
+
+    def _run(self, job):
+        """Run a single job and record its outcome"""
+        with self._lock:
+            if job.status != JOB_QUEUED:
+                # Cancelled while waiting in the queue
+                return
+            job.status = JOB_RUNNING
+            job.started_at = datetime.now()
+        event_stream.touch(STATUS_EVENT)
+
+        logger.info(f"Job {job.id} started")
+        status = JOB_FINISHED
+        try:
+            self.target(**job.params, analysis_state=job.state)
+            if job.state.get('error'):
+                status = JOB_FAILED
+        except JobCancelled:
+            status = JOB_CANCELLED
+        except Exception as e:
+            logger.error(f"Job {job.id} failed: {e}", exc_info=True)
+            job.state['error'] = str(e)
+            status = JOB_FAILED
+
+        with self._lock:
+            self._finish(job, status)
+        logger.info(f"Job {job.id} {status}")
+
+    def _finish(self, job, status):
+        """Mark a job as completed and forget the oldest completed jobs (called with the lock held)"""
+        job.status = status
+        job.finished_at = datetime.now()
+        job.state['is_running'] = False
+        event_stream.touch(STATUS_EVENT)
+
+        completed = [job_id for job_id, other in self._jobs.items() if other.status not in ACTIVE_STATUSES]
+        for job_id in completed[:-COMPLETED_JOBS_TO_KEEP]:
+            del self._jobs[job_id]
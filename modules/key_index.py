@@ -0,0 +1,307 @@
+import os
+import json
+import sqlite3
+import logging
+import threading
+import collections
+
+# Get logger
+logger = logging.getLogger(__name__)
+
+# Files inside a report's data directory
+CLM_KEYS_FILE = 'clm_issue_keys.json'
+KEY_INDEX_FILE = 'key_index.sqlite'
+
+# Project value of the rows holding the keys of a chart type across all projects
+ALL_PROJECTS = 'all'
+
+# Number of (report, chart type, project) key lists kept in memory
+KEY_CACHE_SIZE = 256
+
+# Issue keys kept in memory across all cached key lists (roughly 70 bytes each).
+# Longer lists are read from the key index on every request.
+KEY_CACHE_MAX_KEYS = 200000
+
+# Chart type -> list in clm_issue_keys.json with its issue keys
+CHART_TYPE_KEYS = {
+    'clm_issues': 'clm_issue_keys',
+    'est_issues': 'est_issue_keys',
+    'improvement_issues': 'improvement_issue_keys',
+    'linked_issues': 'implementation_issue_keys',
+    'filtered_issues': 'filtered_issue_keys',
+    'open_tasks': 'open_tasks_issue_keys',
+    'project_issues': 'filtered_issue_keys'
+}
+
+_build_lock = threading.Lock()
+
+# (report, chart type, project) -> tuple of keys, least recently used first
+_key_cache = collections.OrderedDict()
+_key_cache_keys = 0
+_key_cache_lock = threading.Lock()
+
+
+def build_key_index(data_dir):
+    """
+    Build the issue key index of a report from its clm_issue_keys.json.
+
+    For every chart type the index holds the keys of all projects and, when
+    the report has a project mapping, the keys of each project, so chart
+    clicks only read the rows they need.
+
+    Args:
+        data_dir (str): Report data directory
+
+    Returns:
+        bool: True if the index was built, False if the report has no CLM keys
+    """
+    keys_path = os.path.join(data_dir, CLM_KEYS_FILE)
+    if not os.path.exists(keys_path):
+        return False
+
+    with open(keys_path, 'r', encoding='utf-8') as f:
+        clm_data = json.load(f)
+
+    project_mapping = clm_data.get('project_issue_mapping') or {}
+    project_of_key = {key: project for project, keys in project_mapping.items() for key in keys}
+
+    rows = []
+    for chart_type, list_name in CHART_TYPE_KEYS.items():
+        keys = clm_data.get(list_name, [])
+        if chart_type == 'project_issues':
+            # Project drill-down uses the project mapping itself
+            rows.extend((chart_type, ALL_PROJECTS, position, key) for position, key in enumerate(keys))
+            for project, project_keys in project_mapping.items():
+                rows.extend((chart_type, project, position, key) for position, key in enumerate(project_keys))
+            continue
+
+        rows.extend((chart_type, ALL_PROJECTS, position, key) for position, key in enumerate(keys))
+
+        # Split the keys by project in one pass
+        positions = {}
+        for key in keys:
+            project = project_of_key.get(key)
+            if project is not None:
+                position = positions.get(project, 0)
+                rows.append((chart_type, project, position, key))
+                positions[project] = position + 1
+
+    # Write to a temporary file and swap it in, so readers never see a partial index
+    index_path = os.path.join(data_dir, KEY_INDEX_FILE)
+    tmp_path = f"{index_path}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.executescript('''
+            CREATE TABLE issue_keys (
+                chart_type TEXT NOT NULL,
+                project TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                issue_key TEXT NOT NULL,
+                PRIMARY KEY (chart_type, project, position)
+            ) WITHOUT ROWID;
+            CREATE TABLE meta (name TEXT PRIMARY KEY, value TEXT);
+        ''')
+        conn.executemany('INSERT INTO issue_keys VALUES (?, ?, ?, ?)', rows)
+        conn.execute('INSERT INTO meta VALUES (?, ?)', ('has_project_mapping', '1' if project_mapping else '0'))
+        conn.commit()
+    finally:
+        conn.close()
+
+    os.replace(tmp_path, index_path)
+    clear_key_cache()
+
+    logger.info(f"Built issue key index with {len(rows)} entries in {index_path}")
+    return True
+
+
+def get_issue_keys(report_dir, chart_type, project=ALL_PROJECTS):
+    """
+    Get the issue keys behind a chart slice of a report.
+
+    The report's key index is opened lazily (and built from clm_issue_keys.json
+    for reports created before it existed); results are kept in an LRU cache
+    bounded by KEY_CACHE_SIZE lists and KEY_CACHE_MAX_KEYS keys in total.
+
+    Args:
+        report_dir (str): Report directory
+        chart_type (str): Type of chart, e.g. 'open_tasks' or 'project_issues'
+        project (str): Project key or 'all' for all projects
+
+    Returns:
+        list: Issue keys in the order they were saved
+    """
+    if chart_type not in CHART_TYPE_KEYS:
+        # Unknown chart types fall back to the filtered issues
+        chart_type = 'filtered_issues'
+
+    return list(_get_cached_keys(report_dir, chart_type, project or ALL_PROJECTS))
+
+
+def _get_cached_keys(report_dir, chart_type, project):
+    """Keys of a chart slice from the cache, loading and caching them on a miss"""
+    global _key_cache_keys
+
+    cache_key = (report_dir, chart_type, project)
+    with _key_cache_lock:
+        keys = _key_cache.get(cache_key)
+        if keys is not None:
+            _key_cache.move_to_end(cache_key)
+            return keys
+
+    keys = _load_issue_keys(report_dir, chart_type, project)
+
+    # Empty results are not kept: the report's index may just not be written yet
+    if not keys or len(keys) > KEY_CACHE_MAX_KEYS:
+        return keys
+
+    with _key_cache_lock:
+        if cache_key not in _key_cache:
+            _key_cache[cache_key] = keys
+            _key_cache_keys += len(keys)
+        while len(_key_cache) > KEY_CACHE_SIZE or _key_cache_keys > KEY_CACHE_MAX_KEYS:
+            _, evicted = _key_cache.popitem(last=False)
+            _key_cache_keys -= len(evicted)
+    return keys
+
+
+def _load_issue_keys(report_dir, chart_type, project):
+    """Read the keys of a chart slice from the report's key index"""
+    data_dir = os.path.join(report_dir, 'data')
+    index_path = os.path.join(data_dir, KEY_INDEX_FILE)
+
+    if not os.path.exists(index_path):
+        with _build_lock:
+            if not os.path.exists(index_path) and not build_key_index(data_dir):
+                logger.error(f"CLM issue keys file not found: {os.path.join(data_dir, CLM_KEYS_FILE)}")
+                return ()
+
+    conn = sqlite3.connect(f"file:{index_path}?mode=ro", uri=True)
+    try:
+        query = 'SELECT issue_key FROM issue_keys WHERE chart_type = ? AND project = ? ORDER BY position'
+        keys = tuple(row[0] for row in conn.execute(query, (chart_type, project)))
+
+        if not keys and project != ALL_PROJECTS:
+            # Without a project mapping keys cannot be split by project, use all of them
+            has_mapping = conn.execute("SELECT value FROM meta WHERE name = 'has_project_mapping'").fetchone()
+            if has_mapping and has_mapping[0] == '0':
+                keys = tuple(row[0] for row in conn.execute(query, (chart_type, ALL_PROJECTS)))
+    finally:
+        conn.close()
+
+    return keys
+
+
+def clear_key_cache():
+    """Forget cached key lists, e.g. after reports were deleted"""
+    global _key_cache_keys
+
+    with _key_cache_lock:
+        _key_cache.clear()
+        _key_cache_keys = 0
+
+
+def get_saved_filter(report_dir, chart_type, project):
+    """
+    Get the saved Jira filter created for a chart slice
+
+    Args:
+        report_dir (str): Report directory
+        chart_type (str): Type of chart
+        project (str): Project key or 'all'
+
+    Returns:
+        tuple: (filter ID, hash of the filtered keys, list of part filter IDs),
+               or None if no filter was saved
+    """
+    index_path = os.path.join(report_dir, 'data', KEY_INDEX_FILE)
+    if not os.path.exists(index_path):
+        return None
+
+    conn = _connect_filters(index_path)
+    try:
+        row = conn.execute('SELECT filter_id, keys_hash FROM saved_filters WHERE chart_type = ? AND project = ?',
+                           (chart_type, project)).fetchone()
+        if row is None:
+            return None
+        parts = [part[0] for part in conn.execute(
+            'SELECT filter_id FROM saved_filter_parts WHERE chart_type = ? AND project = ? ORDER BY part',
+            (chart_type, project))]
+        return row[0], row[1], parts
+    finally:
+        conn.close()
+
+
+def set_saved_filter(report_dir, chart_type, project, filter_id, keys_hash, part_ids=()):
+    """
+    Remember the saved Jira filter created for a chart slice
+
+    Args:
+        report_dir (str): Report directory
+        chart_type (str): Type of chart
+        project (str): Project key or 'all'
+        filter_id (str): Jira filter ID
+        keys_hash (str): Hash of the keys the filter matches
+        part_ids (list): IDs of the filters holding parts of the keys, if the filter refers to them
+    """
+    index_path = os.path.join(report_dir, 'data', KEY_INDEX_FILE)
+    conn = _connect_filters(index_path)
+    try:
+        with conn:
+            conn.execute('INSERT OR REPLACE INTO saved_filters VALUES (?, ?, ?, ?)',
+                         (chart_type, project, filter_id, keys_hash))
+            conn.execute('DELETE FROM saved_filter_parts WHERE chart_type = ? AND project = ?',
+                         (chart_type, project))
+            conn.executemany('INSERT INTO saved_filter_parts VALUES (?, ?, ?, ?)',
+                             [(chart_type, project, part, part_id) for part, part_id in enumerate(part_ids)])
+    finally:
+        conn.close()
+
+
+def get_report_filter_ids(report_dir):
+    """
+    Get every Jira filter saved for the chart slices of a report
+
+    Args:
+        report_dir (str): Report directory
+
+    Returns:
+        list: Filter IDs, part filters before the filters referring to them
+    """
+    index_path = os.path.join(report_dir, 'data', KEY_INDEX_FILE)
+    if not os.path.exists(index_path):
+        return []
+
+    conn = _connect_filters(index_path)
+    try:
+        parts = [row[0] for row in conn.execute('SELECT filter_id FROM saved_filter_parts')]
+        filters = [row[0] for row in conn.execute('SELECT filter_id FROM saved_filters')]
+        return parts + filters
+    finally:
+        conn.close()
+
+
+def _connect_filters(index_path):
+    """Open the key index for reading and writing saved filters"""
+    conn = sqlite3.connect(index_path, timeout=30)
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS saved_filters (
+            chart_type TEXT NOT NULL,
+            project TEXT NOT NULL,
+            filter_id TEXT NOT NULL,
+            keys_hash TEXT NOT NULL,
+            PRIMARY KEY (chart_type, project)
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS saved_filter_parts (
+            chart_type TEXT NOT NULL,
+            project TEXT NOT NULL,
+            part INTEGER NOT NULL,
+            filter_id TEXT NOT NULL,
+            PRIMARY KEY (chart_type, project, part)
+        )
+    ''')
+    return conn
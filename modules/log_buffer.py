@@ -1,28 +1,163 @@
-import collections
+import time
+import queue
+import atexit
 import logging
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from modules.event_stream import event_stream
 
-# Create a circular buffer for logs
-MAX_LOG_ENTRIES = 500
-log_buffer = collections.deque(maxlen=MAX_LOG_ENTRIES)
+try:
+    import config
+except ImportError:
+    config = None
+
+# Default records per second allowed from one logging call site, 0 disables rate limiting
+DEFAULT_LOG_RATE_LIMIT = 5
+
+# Default number of records a call site may log at once before it is rate limited
+DEFAULT_LOG_BURST = 20
+
+# Records above this level (warnings and errors) are never rate limited
+RATE_LIMIT_MAX_LEVEL = logging.INFO
+
+# Listener thread running the real handlers, started by setup_log_buffer
+_listener = None
+
+
+class LogEntry:
+    """
+    Log record kept by the buffer.
+
+    Holds only what the log line is made of; the line itself is built when a
+    client reads it, in the same format as the console.
+    """
+
+    __slots__ = ('created', 'name', 'levelname', 'message')
+
+    def __init__(self, record):
+        message = record.getMessage()
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        if record.exc_text:
+            message = f"{message}\n{record.exc_text}"
+
+        self.created = record.created
+        self.name = record.name
+        self.levelname = record.levelname
+        self.message = message
+
+    def __str__(self):
+        asctime = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self.created))
+        msecs = int((self.created - int(self.created)) * 1000)
+        return f"{asctime},{msecs:03d} - {self.name} - {self.levelname} - {self.message}"
 
 
 # Custom log handler to capture logs
 class BufferLogHandler(logging.Handler):
+    # Records go to the event stream, which numbers them for /events
     def emit(self, record):
-        log_entry = self.format(record)
-        log_buffer.append(log_entry)
+        event_stream.append(LogEntry(record))
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    Queue handler that leaves formatting to the listener thread.
+
+    QueueHandler formats every record in the caller's thread so that it can be
+    pickled. The queue here never leaves the process, so only %-style
+    arguments are merged, before the objects they refer to can change.
+    """
+
+    def prepare(self, record):
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Token bucket per logging call site.
+
+    A line of code that logs in a loop may log `burst` records at once and then
+    `rate` records per second. The next record let through reports how many
+    were dropped. Warnings and errors always pass.
+    """
+
+    def __init__(self, rate, burst):
+        """
+        Args:
+            rate (float): Records per second allowed from one call site
+            burst (int): Records a call site may log at once
+        """
+        super().__init__()
+        self.rate = rate
+        self.burst = burst
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno > RATE_LIMIT_MAX_LEVEL:
+            return True
+
+        key = (record.name, record.pathname, record.lineno)
+        with self._lock:
+            # Bucket: available records, time of the last record, records dropped since
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [self.burst, record.created, 0]
+
+            tokens = min(self.burst, bucket[0] + (record.created - bucket[1]) * self.rate)
+            bucket[1] = record.created
+            if tokens < 1:
+                bucket[0] = tokens
+                bucket[2] += 1
+                return False
+
+            bucket[0] = tokens - 1
+            suppressed, bucket[2] = bucket[2], 0
+
+        if suppressed:
+            record.msg = f"{record.msg} ({suppressed} similar messages suppressed)"
+        return True
 
 
 def setup_log_buffer():
-    """Initialize and configure the log buffer"""
-    # Add the buffer handler to the root logger
-    buffer_handler = BufferLogHandler()
-    buffer_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
-    logging.getLogger().addHandler(buffer_handler)
+    """
+    Initialize and configure the log buffer.
+
+    Handlers already on the root logger (the console handler of basicConfig)
+    and the buffer handler are moved to a listener thread. The root logger only
+    keeps a queue handler, so logging threads just rate limit and enqueue records.
+
+    Returns:
+        EventStream: Stream holding the buffered records
+    """
+    global _listener
+    if _listener is not None:
+        return event_stream
+
+    root = logging.getLogger()
+    handlers = list(root.handlers) + [BufferLogHandler()]
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = DeferredQueueHandler(log_queue)
+    rate = getattr(config, 'log_rate_limit', DEFAULT_LOG_RATE_LIMIT)
+    if rate:
+        queue_handler.addFilter(RateLimitFilter(rate, getattr(config, 'log_burst', DEFAULT_LOG_BURST)))
+    root.addHandler(queue_handler)
+
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+    # Write out records still in the queue on exit
+    atexit.register(_listener.stop)
 
-    return log_buffer
+    return event_stream
 
 
 def get_logs(limit=50):
     """Get the most recent logs from the buffer"""
-    return list(log_buffer)[-limit:]
\ No newline at end of file
+    return [str(entry) for entry in event_stream.records(limit)]
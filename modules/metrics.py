@@ -0,0 +1,162 @@
+import logging
+from dataclasses import dataclass
+from types import MappingProxyType
+import pandas as pd
+from modules.data_processor import get_improved_open_statuses, get_status_categories
+from modules.status_classifier import get_status_classifier, StatusCategory, CATEGORY_COLUMN
+
+# Get logger
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class IssueMetrics:
+    """
+    Aggregates of a processed issues DataFrame.
+
+    Computed once per DataFrame by compute_issue_metrics and shared by the
+    charts, the summary, the interactive chart data and the diagnostics.
+    The pandas objects are shared too, so consumers must not modify them.
+
+    Attributes:
+        total_issues (int): Number of issues
+        total_original_estimate_hours (float): Sum of original estimates
+        total_time_spent_hours (float): Sum of time spent
+        avg_estimate_per_issue (float): Mean original estimate
+        avg_time_spent_per_issue (float): Mean time spent
+        projects (tuple): Projects in order of first appearance
+        project_counts (pandas.Series): Issues per project, largest first (like value_counts)
+        by_project (pandas.DataFrame): Per-project sums of 'original_estimate_hours',
+            'time_spent_hours', 'open_tasks', 'open_tasks_time_spent_hours',
+            'closed_tasks' and 'no_transitions_tasks', for projects with issues
+        status_categories (mappingproxy): Result of get_status_categories
+        open_statuses (tuple): Result of get_improved_open_statuses
+        closed_statuses (tuple): Status names categorized as closed
+        open_tasks (pandas.DataFrame): Open issues with logged time
+        closed_tasks (pandas.DataFrame): Closed issues without comments and attachments
+        no_transitions_tasks (pandas.DataFrame): Issues that never changed status
+        issue_keys_by_project (mappingproxy): Project -> tuple of issue keys
+        no_transitions_keys_by_project (mappingproxy): Project -> tuple of keys of issues without transitions
+    """
+    total_issues: int
+    total_original_estimate_hours: float
+    total_time_spent_hours: float
+    avg_estimate_per_issue: float
+    avg_time_spent_per_issue: float
+    projects: tuple
+    project_counts: pd.Series
+    by_project: pd.DataFrame
+    status_categories: MappingProxyType
+    open_statuses: tuple
+    closed_statuses: tuple
+    open_tasks: pd.DataFrame
+    closed_tasks: pd.DataFrame
+    no_transitions_tasks: pd.DataFrame
+    issue_keys_by_project: MappingProxyType
+    no_transitions_keys_by_project: MappingProxyType
+
+    def project_column(self, column, only_with=None):
+        """
+        Get a per-project sum
+
+        Args:
+            column (str): Column of by_project
+            only_with (str): Keep only projects where this column is non-zero
+
+        Returns:
+            pandas.Series: Values by project
+        """
+        values = self.by_project[column]
+        if only_with:
+            values = values[self.by_project[only_with] > 0]
+        return values
+
+
+def compute_issue_metrics(df, classifier=None):
+    """
+    Compute all per-project and per-status aggregates of the processed issues.
+
+    Issues are split by their status category column (added with the
+    classifier if df doesn't have it yet), the open, closed and no-transition
+    masks are built once, and all per-project sums come from a single groupby.
+
+    Args:
+        df (pandas.DataFrame): Processed data
+        classifier (StatusClassifier): Status classifier, the shared one if not given
+
+    Returns:
+        IssueMetrics: Aggregates of the DataFrame
+    """
+    if classifier is None:
+        classifier = get_status_classifier()
+
+    if CATEGORY_COLUMN not in df.columns:
+        df = classifier.add_category_column(df)
+
+    status_categories = get_status_categories(df, classifier)
+    open_statuses = get_improved_open_statuses(df, classifier)
+    closed_statuses = status_categories['closed_statuses']
+
+    time_spent = df['time_spent_hours']
+    category = df[CATEGORY_COLUMN]
+    open_mask = (category == StatusCategory.OPEN.value) & (time_spent > 0)
+    closed_mask = (category == StatusCategory.CLOSED.value) & (~df['has_comments']) & (~df['has_attachments'])
+    no_transitions_mask = df['no_transitions'] == True
+
+    # One grouped pass for every per-project figure. Time spent outside open tasks
+    # is NaN rather than 0, so the sums match summing the open tasks alone.
+    flags = pd.DataFrame({
+        'project': df['project'],
+        'issues': 1,
+        'original_estimate_hours': df['original_estimate_hours'],
+        'time_spent_hours': time_spent,
+        'open_tasks': open_mask,
+        'open_tasks_time_spent_hours': time_spent.where(open_mask),
+        'closed_tasks': closed_mask,
+        'no_transitions_tasks': no_transitions_mask
+    })
+    by_project = flags.groupby('project', observed=True).sum()
+
+    # Same order as df['project'].value_counts(), including categories without issues
+    if isinstance(df['project'].dtype, pd.CategoricalDtype):
+        project_counts = by_project['issues'].reindex(df['project'].cat.categories, fill_value=0)
+        project_counts = project_counts.sort_values(ascending=False).rename('count')
+        project_counts.index.name = 'project'
+    else:
+        project_counts = df['project'].value_counts()
+    by_project = by_project.drop(columns='issues')
+
+    no_transitions_tasks = df[no_transitions_mask]
+
+    total_issues = len(df)
+    metrics = IssueMetrics(
+        total_issues=total_issues,
+        total_original_estimate_hours=df['original_estimate_hours'].sum(),
+        total_time_spent_hours=time_spent.sum(),
+        avg_estimate_per_issue=df['original_estimate_hours'].mean() if total_issues > 0 else 0,
+        avg_time_spent_per_issue=time_spent.mean() if total_issues > 0 else 0,
+        projects=tuple(df['project'].unique().tolist()),
+        project_counts=project_counts,
+        by_project=by_project,
+        status_categories=MappingProxyType(status_categories),
+        open_statuses=tuple(open_statuses),
+        closed_statuses=tuple(closed_statuses),
+        open_tasks=df[open_mask],
+        closed_tasks=df[closed_mask],
+        no_transitions_tasks=no_transitions_tasks,
+        issue_keys_by_project=_keys_by_project(df),
+        no_transitions_keys_by_project=_keys_by_project(no_transitions_tasks)
+    )
+
+    logger.info(f"Computed metrics for {total_issues} issues in {len(by_project)} projects: "
+                f"{len(metrics.open_tasks)} open, {len(metrics.closed_tasks)} closed without comments, "
+                f"{len(metrics.no_transitions_tasks)} without transitions")
+    return metrics
+
+
+def _keys_by_project(df):
+    """Map each project to the tuple of its issue keys, in DataFrame order"""
+    issue_keys = df['issue_key'].to_numpy()
+    positions_by_project = df.groupby('project', observed=True).indices
+    return MappingProxyType({project: tuple(issue_keys[positions].tolist())
+                             for project, positions in positions_by_project.items()})
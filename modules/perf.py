@@ -0,0 +1,224 @@
+import sys
+import time
+import functools
+import contextvars
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# File inside a report's metrics directory with the stage timings of the analysis
+PERF_FILE = 'perf.json'
+
+# ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+RSS_UNIT = 1 if sys.platform == 'darwin' else 1024
+
+# Recorder of the analysis running in the current thread
+_current_recorder = contextvars.ContextVar('perf_recorder', default=None)
+
+# Marks the end of an iterator in timed_iter
+_DONE = object()
+
+
+def get_peak_rss():
+    """
+    Get the peak resident set size of the process
+
+    Returns:
+        int: Bytes, or 0 where getrusage is not available
+    """
+    if resource is None:
+        return 0
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * RSS_UNIT
+
+
+class PerfRecorder:
+    """
+    Wall time, CPU time, peak RSS and Jira traffic of the stages of one analysis.
+
+    Spans with the same name are added up, so a span around per-page work
+    reports the total over all pages. Nested spans are recorded under
+    'parent/child' paths.
+
+    CPU time and RSS are those of this process. They include its helper
+    threads and any analysis running at the same time, but not process pool
+    workers. peak_rss_mb is the process high-water mark when the stage last
+    ended, rss_growth_mb how much the stage raised it. Requests and bytes are
+    counted when responses arrive, so pages prefetched by parallel search
+    workers are counted in whichever stage is running at the time.
+    """
+
+    def __init__(self):
+        self._stages = {}
+        self._stack = []
+        self._request_sources = []
+        self._token = None
+        self._started = None
+        self._total = None
+
+    def start(self):
+        """Start recording spans opened in the current thread"""
+        self._token = _current_recorder.set(self)
+        self._started = self._snapshot()
+
+    def stop(self):
+        """Stop recording and fix the totals"""
+        if self._token is not None:
+            _current_recorder.reset(self._token)
+            self._token = None
+        if self._started is not None and self._total is None:
+            self._total = self._delta(self._started)
+
+    def add_request_source(self, get_stats):
+        """
+        Count the requests of a Jira client in the spans
+
+        Args:
+            get_stats (callable): Returns a dict with 'requests' and 'bytes' counters
+        """
+        self._request_sources.append(get_stats)
+
+    @contextmanager
+    def span(self, name):
+        """
+        Record a stage
+
+        Args:
+            name (str): Stage name
+        """
+        path = '/'.join(self._stack + [name])
+
+        # Stages are listed in the order they are first entered, parents before children
+        stage = self._stages.get(path)
+        if stage is None:
+            stage = self._stages[path] = {'name': name, 'path': path, 'depth': len(self._stack), 'calls': 0,
+                                          'wall_seconds': 0.0, 'cpu_seconds': 0.0, 'peak_rss_mb': 0.0,
+                                          'rss_growth_mb': 0.0, 'requests': 0, 'bytes': 0}
+
+        self._stack.append(name)
+        started = self._snapshot()
+        try:
+            yield
+        finally:
+            self._stack.pop()
+            delta = self._delta(started)
+
+            stage['calls'] += 1
+            for key in ('wall_seconds', 'cpu_seconds', 'rss_growth_mb', 'requests', 'bytes'):
+                stage[key] += delta[key]
+            stage['peak_rss_mb'] = delta['peak_rss_mb']
+
+    def to_dict(self):
+        """
+        Get the recorded stages for metrics/perf.json
+
+        Returns:
+            dict: 'total' over the whole analysis and 'stages' in the order they were first entered
+        """
+        total = self._total or (self._delta(self._started) if self._started else None)
+        return {
+            'total': _rounded(total) if total else None,
+            'stages': [_rounded(stage) for stage in self._stages.values()]
+        }
+
+    def _snapshot(self):
+        """Current counters"""
+        requests = received = 0
+        for get_stats in self._request_sources:
+            stats = get_stats()
+            requests += stats.get('requests', 0)
+            received += stats.get('bytes', 0)
+
+        return {
+            'wall': time.perf_counter(),
+            'cpu': time.process_time(),
+            'peak_rss': get_peak_rss(),
+            'requests': requests,
+            'bytes': received
+        }
+
+    def _delta(self, started):
+        """Counters since a snapshot"""
+        now = self._snapshot()
+        return {
+            'wall_seconds': now['wall'] - started['wall'],
+            'cpu_seconds': now['cpu'] - started['cpu'],
+            'peak_rss_mb': now['peak_rss'] / (1024 * 1024),
+            'rss_growth_mb': (now['peak_rss'] - started['peak_rss']) / (1024 * 1024),
+            'requests': now['requests'] - started['requests'],
+            'bytes': now['bytes'] - started['bytes']
+        }
+
+
+def _rounded(values):
+    """Round the float values of a stage for output"""
+    return {key: round(value, 3) if isinstance(value, float) else value for key, value in values.items()}
+
+
+def get_recorder():
+    """
+    Get the recorder of the analysis running in the current thread
+
+    Returns:
+        PerfRecorder: Recorder, or None outside of an analysis
+    """
+    return _current_recorder.get()
+
+
+@contextmanager
+def span(name):
+    """
+    Record a stage of the analysis running in the current thread, if any.
+
+    Does nothing outside of an analysis and in helper threads. Must not be
+    held open across a yield: use timed_iter for generators.
+
+    Args:
+        name (str): Stage name
+    """
+    recorder = _current_recorder.get()
+    if recorder is None:
+        yield
+        return
+
+    with recorder.span(name):
+        yield
+
+
+def timed(name):
+    """
+    Decorator recording every call of a function as a stage (see span).
+    Not for generator functions, whose body runs after the call returns.
+
+    Args:
+        name (str): Stage name
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def timed_iter(iterable, name):
+    """
+    Iterate over a lazy iterable, recording the time spent waiting for each item as a stage
+
+    Args:
+        iterable: Iterable, e.g. pages of issues fetched on demand
+        name (str): Stage name
+
+    Yields:
+        Items of the iterable
+    """
+    iterator = iter(iterable)
+    while True:
+        with span(name):
+            item = next(iterator, _DONE)
+        if item is _DONE:
+            return
+        yield item
@@ -0,0 +1,119 @@
+import os
+import atexit
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, CancelledError
+from concurrent.futures.process import BrokenProcessPool
+
+try:
+    import config
+except ImportError:
+    config = None
+
+# Get logger
+logger = logging.getLogger(__name__)
+
+# Default number of worker processes for CPU-bound work (chart rendering, parsing)
+DEFAULT_PROCESS_WORKERS = min(4, os.cpu_count() or 1)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_process_workers():
+    """
+    Get the configured number of worker processes
+
+    Returns:
+        int: config.process_workers if set, otherwise DEFAULT_PROCESS_WORKERS
+    """
+    return getattr(config, 'process_workers', None) or DEFAULT_PROCESS_WORKERS
+
+
+def get_process_pool():
+    """
+    Get the process pool shared by all analysis runs, creating it on first use.
+
+    Workers are started with the 'spawn' method so they never inherit the
+    Flask process state (threads, locks, open sockets). Returns None when
+    parallel processing is disabled (process_workers <= 1), in which case
+    callers do the work in-process.
+
+    Returns:
+        ProcessPoolExecutor: Shared pool, or None
+    """
+    global _pool
+
+    workers = get_process_workers()
+    if workers <= 1:
+        return None
+
+    with _pool_lock:
+        if _pool is None:
+            logger.info(f"Starting process pool with {workers} workers")
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+        return _pool
+
+
+def reset_process_pool(broken_pool=None):
+    """
+    Drop the shared pool, e.g. after a worker died; the next call to get_process_pool starts a new one.
+
+    The old pool is shut down without cancelling its futures: other analyses
+    may still be waiting on them, and they either finish or fail with
+    BrokenProcessPool on their own.
+
+    Args:
+        broken_pool (ProcessPoolExecutor): Pool the caller found broken. If another
+                                           caller already replaced it, the new pool is kept.
+    """
+    global _pool
+
+    with _pool_lock:
+        if _pool is None or (broken_pool is not None and _pool is not broken_pool):
+            return
+        pool, _pool = _pool, None
+
+    pool.shutdown(wait=False)
+
+
+def map_in_pool(func, items):
+    """
+    Apply a picklable module-level function to every item in the shared pool.
+
+    Falls back to running in-process when the pool is disabled or broken,
+    so callers always get a result for every item, in input order.
+
+    Args:
+        func (callable): Module-level function taking one item
+        items (list): Picklable items
+
+    Returns:
+        list: Results in the same order as items
+    """
+    items = list(items)
+    if not items:
+        return []
+
+    pool = get_process_pool()
+    if pool is not None:
+        try:
+            return list(pool.map(func, items))
+        except (BrokenProcessPool, CancelledError) as e:
+            logger.warning(f"Process pool is broken ({e!r}), falling back to in-process execution")
+            reset_process_pool(pool)
+
+    return [func(item) for item in items]
+
+
+@atexit.register
+def _shutdown_process_pool():
+    """Stop worker processes when the application exits"""
+    global _pool
+
+    with _pool_lock:
+        pool, _pool = _pool, None
+
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,209 @@
+import os
+import json
+import uuid
+import hashlib
+import logging
+import threading
+
+from modules.chart_renderer import render_chart
+from modules.process_pool import map_in_pool
+
+try:
+    import config
+except ImportError:
+    config = None
+
+# Get logger
+logger = logging.getLogger(__name__)
+
+# Rendered charts are shared by all reports and live next to the issue cache
+RENDER_CACHE_DIR = os.path.join('jira_charts', 'data', 'render_cache')
+
+# Default size limit of the render cache
+DEFAULT_RENDER_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+# File inside a report's data directory with the specs of its static charts
+CHART_SPECS_FILE = 'chart_specs.json'
+
+# Bump when rendering changes so that cached images are not reused
+RENDER_VERSION = 1
+
+
+def chart_spec_key(spec):
+    """
+    Build the cache key of a chart spec from its type and a hash of its data and parameters.
+
+    The output path is not part of the key, so identical charts of different
+    reports share one cached image.
+
+    Args:
+        spec (dict): Chart spec
+
+    Returns:
+        str: Cache key usable as a file name
+    """
+    content = {key: value for key, value in spec.items() if key not in ('path', 'filename')}
+    payload = json.dumps([RENDER_VERSION, content], sort_keys=True, ensure_ascii=False)
+    digest = hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32]
+    return f"{spec['kind']}-{digest}"
+
+
+def save_chart_specs(specs, output_dir):
+    """
+    Save chart specs to the report's data directory for rendering on demand.
+
+    Specs are merged with the ones saved earlier, so charts can be added in
+    several steps. Paths are stored relative to the report directory.
+
+    Args:
+        specs (list): Chart specs with output paths inside output_dir
+        output_dir (str): Report directory
+    """
+    data_dir = os.path.join(output_dir, 'data')
+    if not os.path.exists(data_dir):
+        os.makedirs(data_dir)
+
+    specs_path = os.path.join(data_dir, CHART_SPECS_FILE)
+    saved = {}
+    if os.path.exists(specs_path):
+        with open(specs_path, 'r', encoding='utf-8') as f:
+            saved = json.load(f)
+
+    for spec in specs:
+        stored = {key: value for key, value in spec.items() if key != 'path'}
+        stored['filename'] = os.path.basename(spec['path'])
+        saved[spec['name']] = stored
+
+    with open(specs_path, 'w', encoding='utf-8') as f:
+        json.dump(saved, f, ensure_ascii=False)
+
+
+def load_chart_specs(report_dir):
+    """
+    Load the chart specs saved for a report
+
+    Args:
+        report_dir (str): Report directory
+
+    Returns:
+        dict: Chart file name -> chart spec (empty for reports without saved specs)
+    """
+    specs_path = os.path.join(report_dir, 'data', CHART_SPECS_FILE)
+    if not os.path.exists(specs_path):
+        return {}
+
+    try:
+        with open(specs_path, 'r', encoding='utf-8') as f:
+            saved = json.load(f)
+    except Exception as e:
+        logger.error(f"Error reading chart specs {specs_path}: {e}")
+        return {}
+
+    return {spec['filename']: spec for spec in saved.values()}
+
+
+def get_render_cache_max_bytes():
+    """
+    Get the configured size limit of the render cache
+
+    Returns:
+        int: config.render_cache_max_bytes if set, otherwise DEFAULT_RENDER_CACHE_MAX_BYTES
+    """
+    return getattr(config, 'render_cache_max_bytes', None) or DEFAULT_RENDER_CACHE_MAX_BYTES
+
+
+class RenderCache:
+    """
+    Content-addressed cache of rendered chart images.
+
+    Images are stored under the key of the spec they were rendered from (see
+    chart_spec_key). The file modification time serves as the last access time
+    and the least recently used images are evicted once the cache grows past
+    its size limit.
+    """
+
+    def __init__(self, path=RENDER_CACHE_DIR, max_bytes=None):
+        """
+        Open (and create if needed) the render cache directory
+
+        Args:
+            path (str): Cache directory
+            max_bytes (int): Size limit, defaults to get_render_cache_max_bytes()
+        """
+        self.path = path
+        self.max_bytes = max_bytes or get_render_cache_max_bytes()
+        self._lock = threading.Lock()
+
+        if not os.path.exists(path):
+            os.makedirs(path)
+
+    def get_image(self, spec):
+        """
+        Get the image of a chart, rendering it on a cache miss.
+
+        The image is returned as bytes rather than a path, since another request
+        may evict the file before it is sent.
+
+        Args:
+            spec (dict): Chart spec
+
+        Returns:
+            bytes: PNG image, or None if rendering failed
+        """
+        image_path = os.path.join(self.path, f"{chart_spec_key(spec)}.png")
+
+        # Eviction takes the same lock, so a file found here is read completely
+        with self._lock:
+            try:
+                # Mark as recently used
+                os.utime(image_path)
+                with open(image_path, 'rb') as f:
+                    return f.read()
+            except FileNotFoundError:
+                # Not rendered yet or evicted in the meantime
+                pass
+
+        # Render to a temporary file first so concurrent requests never see a partial image
+        render_spec = dict(spec, path=os.path.join(self.path, f".{uuid.uuid4().hex}.png"))
+        result = map_in_pool(render_chart, [render_spec])[0]
+
+        if result.get('error'):
+            logger.error(f"Error rendering chart {spec['name']}: {result['error']}")
+            if os.path.exists(render_spec['path']):
+                os.remove(render_spec['path'])
+            return None
+
+        # Temporary files are never evicted, so the image is read before it is published
+        with open(render_spec['path'], 'rb') as f:
+            image = f.read()
+        os.replace(render_spec['path'], image_path)
+        logger.info(f"Chart {spec['name']} rendered on demand in {result['seconds']:.2f}s")
+
+        self._evict()
+        return image
+
+    def _evict(self):
+        """Remove least recently used images until the cache fits its size limit"""
+        with self._lock:
+            entries = []
+            total_size = 0
+            for entry in os.scandir(self.path):
+                if entry.is_file() and not entry.name.startswith('.'):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total_size += stat.st_size
+
+            if total_size <= self.max_bytes:
+                return
+
+            entries.sort()
+            for _, size, path in entries:
+                if total_size <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                    total_size -= size
+                except FileNotFoundError:
+                    pass
+
+            logger.info(f"Render cache trimmed to {total_size / (1024 * 1024):.1f} MB")
@@ -0,0 +1,181 @@
+import os
+import json
+import sqlite3
+import logging
+import threading
+
+# Get logger
+logger = logging.getLogger(__name__)
+
+# Directory containing all report folders
+CHARTS_DIR = 'jira_charts'
+
+# The catalog lives in jira_charts/data, which is not listed as a report folder
+CATALOG_PATH = os.path.join(CHARTS_DIR, 'data', 'report_catalog.sqlite')
+
+
+def get_report_info(folder, index_data):
+    """
+    Extract the catalog entry of a report from its index data
+
+    Args:
+        folder (str): Report folder name
+        index_data (dict): Contents of the report's index.json (empty if missing)
+
+    Returns:
+        dict: Report metadata shown in the report list
+    """
+    return {
+        'timestamp': folder,
+        'charts_count': len(index_data.get('charts', {})),
+        'total_issues': index_data.get('total_issues', 0),
+        'date_from': index_data.get('date_from'),
+        'date_to': index_data.get('date_to'),
+        # Default to 'jira' if not specified
+        'analysis_type': index_data.get('data_source', 'jira')
+    }
+
+
+class ReportCatalog:
+    """
+    Catalog of report metadata, so the report list does not have to scan
+    every report folder and parse its index.json.
+
+    run_analysis adds a report when it has finished and /delete_reports removes
+    it. When the catalog database is missing it is rebuilt from the report
+    folders on disk.
+    """
+
+    def __init__(self, path=CATALOG_PATH, charts_dir=CHARTS_DIR):
+        """
+        Open the catalog, rebuilding it from disk if the database does not exist
+
+        Args:
+            path (str): Path to the SQLite database file
+            charts_dir (str): Directory containing the report folders
+        """
+        self.path = path
+        self.charts_dir = charts_dir
+        self._lock = threading.Lock()
+
+        catalog_dir = os.path.dirname(path)
+        if catalog_dir and not os.path.exists(catalog_dir):
+            os.makedirs(catalog_dir)
+
+        is_new = not os.path.exists(path)
+
+        with self._connect() as conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS reports (
+                    folder TEXT PRIMARY KEY,
+                    charts_count INTEGER NOT NULL,
+                    total_issues INTEGER NOT NULL,
+                    date_from TEXT,
+                    date_to TEXT,
+                    analysis_type TEXT NOT NULL
+                )
+            ''')
+
+        if is_new:
+            self.rebuild()
+
+    def _connect(self):
+        """Open a new connection to the catalog database"""
+        return sqlite3.connect(self.path, timeout=30)
+
+    def add_report(self, folder):
+        """
+        Add or update a report from its folder on disk
+
+        Args:
+            folder (str): Report folder name
+        """
+        self._put([self._read_report_info(folder)])
+
+    def remove_reports(self, folders):
+        """
+        Remove reports from the catalog
+
+        Args:
+            folders (list): Report folder names
+        """
+        with self._lock, self._connect() as conn:
+            conn.executemany('DELETE FROM reports WHERE folder = ?', [(folder,) for folder in folders])
+
+    def list_reports(self, offset=0, limit=None):
+        """
+        Get a page of reports, newest first
+
+        Args:
+            offset (int): Number of reports to skip
+            limit (int): Maximum number of reports to return (all if None)
+
+        Returns:
+            list: Report metadata dictionaries
+        """
+        with self._connect() as conn:
+            rows = conn.execute('''
+                SELECT folder, charts_count, total_issues, date_from, date_to, analysis_type
+                FROM reports ORDER BY folder DESC LIMIT ? OFFSET ?
+            ''', (limit if limit is not None else -1, offset)).fetchall()
+
+        return [{
+            'timestamp': folder,
+            'charts_count': charts_count,
+            'total_issues': total_issues,
+            'date_from': date_from,
+            'date_to': date_to,
+            'analysis_type': analysis_type
+        } for folder, charts_count, total_issues, date_from, date_to, analysis_type in rows]
+
+    def count_reports(self):
+        """
+        Get the number of reports
+
+        Returns:
+            int: Number of reports in the catalog
+        """
+        with self._connect() as conn:
+            return conn.execute('SELECT COUNT(*) FROM reports').fetchone()[0]
+
+    def rebuild(self):
+        """Replace the catalog contents with the reports found on disk"""
+        reports = []
+
+        if os.path.exists(self.charts_dir):
+            for folder in os.listdir(self.charts_dir):
+                folder_path = os.path.join(self.charts_dir, folder)
+                if os.path.isdir(folder_path) and folder != 'data':
+                    reports.append(self._read_report_info(folder))
+
+        with self._lock, self._connect() as conn:
+            conn.execute('DELETE FROM reports')
+        self._put(reports)
+
+        logger.info(f"Report catalog rebuilt with {len(reports)} reports")
+
+    def _read_report_info(self, folder):
+        """Read the catalog entry of a report from its index.json"""
+        index_data = {}
+        index_file = os.path.join(self.charts_dir, folder, 'index.json')
+        if os.path.exists(index_file):
+            try:
+                with open(index_file, 'r', encoding='utf-8') as f:
+                    index_data = json.load(f)
+            except Exception as e:
+                logger.error(f"Error reading index file {index_file}: {e}")
+
+        return get_report_info(folder, index_data)
+
+    def _put(self, reports):
+        """Insert or replace report entries"""
+        rows = [(report['timestamp'], report['charts_count'], report['total_issues'],
+                 report['date_from'], report['date_to'], report['analysis_type'])
+                for report in reports]
+
+        with self._lock, self._connect() as conn:
+            conn.executemany('''
+                INSERT OR REPLACE INTO reports
+                (folder, charts_count, total_issues, date_from, date_to, analysis_type)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', rows)
@@ -0,0 +1,169 @@
+import io
+import os
+import gzip
+import json
+import logging
+import pandas as pd
+from modules.perf import timed
+
+try:
+    import pyarrow.feather as feather
+except ImportError:
+    feather = None
+
+# Get logger
+logger = logging.getLogger(__name__)
+
+# Processed issues of a report, inside its data directory
+ISSUES_FEATHER_FILE = 'issues.feather'
+ISSUES_JSON_FILE = 'raw_data.json.gz'
+
+# Processed issues of reports created before the columnar store
+LEGACY_ISSUES_FILE = 'raw_data.json'
+
+# Tables derived from the issue changelogs, see save_frame
+TRANSITIONS_FRAME = 'transitions'
+STATUS_TIMELINE_FRAME = 'status_timeline'
+
+# Compression of the Feather file
+FEATHER_COMPRESSION = 'zstd'
+
+# Separators for compact JSON, without the padding of indent=4
+COMPACT_SEPARATORS = (',', ':')
+
+
+@timed('write_json')
+def write_json(path, data):
+    """
+    Write a report JSON file in compact form
+
+    Args:
+        path (str): Output file path
+        data: JSON-serializable data
+    """
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, separators=COMPACT_SEPARATORS)
+
+
+def read_json(path, default=None):
+    """
+    Read a report JSON file
+
+    Args:
+        path (str): File path
+        default: Value returned if the file does not exist
+
+    Returns:
+        Loaded data or default
+    """
+    if not os.path.exists(path):
+        return default
+
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_issue_frame(df, data_dir):
+    """
+    Save the processed issues of a report.
+
+    Uses Feather when pyarrow is installed and gzip-compressed JSON otherwise.
+
+    Args:
+        df (pandas.DataFrame): Processed issues
+        data_dir (str): Report data directory
+
+    Returns:
+        str: Path of the saved file
+    """
+    return _save_frame(df, os.path.join(data_dir, ISSUES_FEATHER_FILE), os.path.join(data_dir, ISSUES_JSON_FILE))
+
+
+def load_issue_frame(report_dir):
+    """
+    Load the processed issues of a report.
+
+    The Feather file is memory-mapped, so only the columns that are used
+    are actually read from disk. Reports saved as JSON are read as well.
+
+    Args:
+        report_dir (str): Report directory
+
+    Returns:
+        pandas.DataFrame: Processed issues, or None if the report has none
+    """
+    data_dir = os.path.join(report_dir, 'data')
+
+    df = _load_frame(os.path.join(data_dir, ISSUES_FEATHER_FILE), os.path.join(data_dir, ISSUES_JSON_FILE))
+    if df is not None:
+        return df
+
+    legacy_path = os.path.join(data_dir, LEGACY_ISSUES_FILE)
+    if os.path.exists(legacy_path):
+        return pd.read_json(legacy_path, orient='records')
+
+    return None
+
+
+def save_frame(df, data_dir, name):
+    """
+    Save a table of a report, like save_issue_frame does for the issues
+
+    Args:
+        df (pandas.DataFrame): Table
+        data_dir (str): Report data directory
+        name (str): Table name, e.g. TRANSITIONS_FRAME
+
+    Returns:
+        str: Path of the saved file
+    """
+    return _save_frame(df, os.path.join(data_dir, f"{name}.feather"), os.path.join(data_dir, f"{name}.json.gz"))
+
+
+def load_frame(report_dir, name):
+    """
+    Load a table saved with save_frame
+
+    Args:
+        report_dir (str): Report directory
+        name (str): Table name
+
+    Returns:
+        pandas.DataFrame: Table, or None if the report has none
+    """
+    data_dir = os.path.join(report_dir, 'data')
+    return _load_frame(os.path.join(data_dir, f"{name}.feather"), os.path.join(data_dir, f"{name}.json.gz"))
+
+
+def _save_frame(df, feather_path, json_path):
+    """Write a DataFrame as Feather, or as gzip JSON with its table schema without pyarrow"""
+    if feather is not None:
+        try:
+            feather.write_feather(df.reset_index(drop=True), feather_path, compression=FEATHER_COMPRESSION)
+            return feather_path
+        except Exception as e:
+            # Columns with mixed types can't be stored in Arrow, keep them as JSON
+            logger.warning(f"Could not save {feather_path} as Feather, using JSON: {e}")
+            if os.path.exists(feather_path):
+                os.remove(feather_path)
+
+    # The schema keeps the column types, plain records would come back as ints, strings and objects
+    with gzip.open(json_path, 'wt', encoding='utf-8') as f:
+        df.to_json(f, orient='table', index=False, date_format='iso')
+    return json_path
+
+
+def _load_frame(feather_path, json_path):
+    """Read a DataFrame written by _save_frame, or None if neither file exists"""
+    if os.path.exists(feather_path):
+        if feather is not None:
+            return feather.read_table(feather_path, memory_map=True).to_pandas()
+        logger.error(f"pyarrow is required to read {feather_path}")
+
+    if os.path.exists(json_path):
+        with gzip.open(json_path, 'rt', encoding='utf-8') as f:
+            text = f.read()
+        # Files saved before the table schema was stored hold a list of records
+        return pd.read_json(io.StringIO(text), orient='table' if text.startswith('{') else 'records')
+
+    return None
@@ -0,0 +1,199 @@
+import os
+import hashlib
+import logging
+import threading
+from contextlib import contextmanager
+
+from modules.jira_analyzer import JiraAnalyzer
+from modules.key_index import get_saved_filter, set_saved_filter, get_report_filter_ids
+
+# Get logger
+logger = logging.getLogger(__name__)
+
+# Slices with up to this many keys are linked with an inline 'issue in (...)' clause
+INLINE_KEYS_LIMIT = 100
+
+# Issue keys per 'issue in (...)' clause of the fallback JQL
+FALLBACK_BATCH_SIZE = 100
+
+# Maximum number of keys in the fallback JQL used when no filter can be saved
+FALLBACK_KEYS_LIMIT = 1000
+
+# Issue keys per saved filter; larger slices are split into part filters
+FILTER_KEYS_LIMIT = 500
+
+# Locks of the slices whose filters are being saved, with the number of threads using each
+_slice_locks = {}
+_slice_locks_lock = threading.Lock()
+
+
+def keys_to_jql(report_dir, chart_type, project, issue_keys):
+    """
+    Build JQL matching exactly the issue keys of a chart slice.
+
+    Small slices are listed inline. Larger ones are saved as a Jira filter
+    (once per slice, see get_slice_filter) and referenced as 'filter=ID', so
+    the link stays short and complete. If the filter cannot be saved, falls
+    back to batched 'issue in (...)' clauses limited to FALLBACK_KEYS_LIMIT keys.
+
+    Args:
+        report_dir (str): Report directory
+        chart_type (str): Type of chart
+        project (str): Project key or 'all'
+        issue_keys (list): Issue keys of the slice
+
+    Returns:
+        str: JQL query
+    """
+    if len(issue_keys) <= INLINE_KEYS_LIMIT:
+        return f'issue in ({", ".join(issue_keys)})'
+
+    filter_id = get_slice_filter(report_dir, chart_type, project or 'all', issue_keys)
+    if filter_id:
+        return f'filter={filter_id}'
+
+    limited_keys = issue_keys[:FALLBACK_KEYS_LIMIT]
+    if len(issue_keys) > FALLBACK_KEYS_LIMIT:
+        logger.warning(f"JQL query limited to first {FALLBACK_KEYS_LIMIT} of {len(issue_keys)} issue keys")
+
+    batches = [limited_keys[i:i + FALLBACK_BATCH_SIZE] for i in range(0, len(limited_keys), FALLBACK_BATCH_SIZE)]
+    return ' OR '.join(f'issue in ({", ".join(batch)})' for batch in batches)
+
+
+def _slice_filter_jql(issue_keys):
+    """JQL of a filter listing issue keys"""
+    return f'issue in ({", ".join(issue_keys)})'
+
+
+@contextmanager
+def _slice_lock(slice_key):
+    """
+    Serialize filter saving per chart slice, so two clicks on one slice don't
+    create two filters while other slices are not held up by its Jira requests
+
+    Args:
+        slice_key (tuple): (report directory, chart type, project)
+    """
+    with _slice_locks_lock:
+        entry = _slice_locks.setdefault(slice_key, [threading.Lock(), 0])
+        entry[1] += 1
+    try:
+        with entry[0]:
+            yield
+    finally:
+        with _slice_locks_lock:
+            entry[1] -= 1
+            if not entry[1]:
+                del _slice_locks[slice_key]
+
+
+def get_slice_filter(report_dir, chart_type, project, issue_keys, analyzer=None):
+    """
+    Get a saved Jira filter matching the issue keys of a chart slice.
+
+    The filter is created on the first request and its ID is stored in the
+    report's key index. Slices of more than FILTER_KEYS_LIMIT keys are split
+    into part filters of at most that many keys, and the returned filter
+    refers to them with 'filter in (...)', so its JQL grows by one filter ID
+    per FILTER_KEYS_LIMIT keys instead of by every key. If the keys of the slice changed since, the returned filter is
+    updated to new parts (keeping its ID) and the old parts are deleted.
+
+    Args:
+        report_dir (str): Report directory
+        chart_type (str): Type of chart
+        project (str): Project key or 'all'
+        issue_keys (list): Issue keys of the slice
+        analyzer (JiraAnalyzer): Analyzer used for the requests, created if not given
+
+    Returns:
+        str: Filter ID, or None if the filter could not be saved
+    """
+    keys_hash = hashlib.sha1('\n'.join(issue_keys).encode('utf-8')).hexdigest()
+
+    with _slice_lock((os.path.normpath(report_dir), chart_type, project)):
+        try:
+            saved = get_saved_filter(report_dir, chart_type, project)
+        except Exception as e:
+            logger.error(f"Error reading saved filter for {chart_type}, project {project}: {e}")
+            return None
+
+        if saved and saved[1] == keys_hash:
+            return saved[0]
+
+        if analyzer is None:
+            analyzer = JiraAnalyzer(check_connection=False)
+
+        report = os.path.basename(os.path.normpath(report_dir))
+        name = f"JIRA-stats {report} {chart_type} {project} [{keys_hash[:8]}]"
+        description = f"{len(issue_keys)} issues of chart '{chart_type}', project {project}, report {report}"
+
+        # Part filters first, so the filter referring to them is never saved with missing parts
+        part_ids = []
+        if len(issue_keys) > FILTER_KEYS_LIMIT:
+            for start in range(0, len(issue_keys), FILTER_KEYS_LIMIT):
+                part = start // FILTER_KEYS_LIMIT + 1
+                part_id = analyzer.create_filter(f"{name} part {part}",
+                                                 _slice_filter_jql(issue_keys[start:start + FILTER_KEYS_LIMIT]),
+                                                 f"Part {part} of {description}")
+                if not part_id:
+                    _delete_filters(analyzer, part_ids)
+                    return None
+                part_ids.append(part_id)
+            jql = f'filter in ({", ".join(part_ids)})'
+        else:
+            jql = _slice_filter_jql(issue_keys)
+
+        if saved and analyzer.update_filter(saved[0], jql):
+            filter_id = saved[0]
+        else:
+            filter_id = analyzer.create_filter(name, jql, description)
+            if not filter_id:
+                _delete_filters(analyzer, part_ids)
+                return None
+            if saved:
+                # The old filter could not be updated, it is replaced
+                _delete_filters(analyzer, [saved[0]])
+
+        if saved:
+            _delete_filters(analyzer, saved[2])
+
+        try:
+            set_saved_filter(report_dir, chart_type, project, filter_id, keys_hash, part_ids)
+        except Exception as e:
+            logger.error(f"Error saving filter {filter_id} for {chart_type}, project {project}: {e}")
+
+        return filter_id
+
+
+def delete_report_filters(report_dir, analyzer=None):
+    """
+    Delete the Jira filters saved for the chart slices of a report.
+    Called before the report is deleted, as the filter IDs are kept in it.
+
+    Args:
+        report_dir (str): Report directory
+        analyzer (JiraAnalyzer): Analyzer used for the requests, created if there are filters to delete
+
+    Returns:
+        int: Number of deleted filters
+    """
+    try:
+        filter_ids = get_report_filter_ids(report_dir)
+    except Exception as e:
+        logger.error(f"Error reading saved filters of report {report_dir}: {e}")
+        return 0
+
+    if not filter_ids:
+        return 0
+
+    if analyzer is None:
+        analyzer = JiraAnalyzer(check_connection=False)
+
+    deleted = _delete_filters(analyzer, filter_ids)
+    logger.info(f"Deleted {deleted} of {len(filter_ids)} saved filters of report {report_dir}")
+    return deleted
+
+
+def _delete_filters(analyzer, filter_ids):
+    """Delete filters, returning how many were deleted; failures are logged by the analyzer"""
+    return sum(1 for filter_id in filter_ids if analyzer.delete_filter(filter_id))
@@ -0,0 +1,239 @@
+import re
+import logging
+import threading
+from enum import Enum
+import numpy as np
+import pandas as pd
+
+try:
+    import config
+except ImportError:
+    config = None
+
+# Get logger
+logger = logging.getLogger(__name__)
+
+
+class StatusCategory(Enum):
+    """Category of an issue status"""
+    OPEN = 'open'
+    CLOSED = 'closed'
+    UNKNOWN = 'unknown'
+
+
+# Terms matched anywhere in a status name, ignoring case; open terms are checked first
+OPEN_TERMS = ('OPEN', 'NEW')
+CLOSED_TERMS = ('CLOSED', 'RESOLVED', 'DONE')
+
+# Column added by StatusClassifier.add_category_column
+CATEGORY_COLUMN = 'category'
+
+# Categories of the category column, in code order
+CATEGORY_VALUES = [category.value for category in StatusCategory]
+CATEGORY_CODES = {category: code for code, category in enumerate(StatusCategory)}
+
+
+class StatusClassifier:
+    """
+    Maps issue statuses to a StatusCategory.
+
+    Entries of status_mapping win over the terms; their keys may be status IDs
+    or status names (ignoring case), their values 'open', 'closed' or 'unknown'.
+    Other statuses are categorized by the open and closed terms found in their
+    name. Mapping and terms are compiled once and every (status ID, name) pair
+    is classified once, so classifying a whole DataFrame costs one lookup per
+    distinct status.
+    """
+
+    def __init__(self, status_mapping=None, open_terms=OPEN_TERMS, closed_terms=CLOSED_TERMS):
+        """
+        Args:
+            status_mapping (dict): Optional mapping of status IDs or names to categories
+            open_terms (tuple): Terms of open status names
+            closed_terms (tuple): Terms of closed status names
+        """
+        self.status_mapping = dict(status_mapping or {})
+
+        self._overrides = {}
+        for status, category in self.status_mapping.items():
+            try:
+                self._overrides[str(status).lower()] = StatusCategory(str(category).lower())
+            except ValueError:
+                logger.warning(f"Ignoring status mapping {status!r} -> {category!r}: "
+                               f"category must be one of {CATEGORY_VALUES}")
+
+        self._open_pattern = _compile_terms(open_terms)
+        self._closed_pattern = _compile_terms(closed_terms)
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def classify(self, status, status_id=None):
+        """
+        Get the category of a status
+
+        Args:
+            status (str): Status name
+            status_id (str): Status ID, optional
+
+        Returns:
+            StatusCategory: Category of the status
+        """
+        key = (status_id, status)
+        category = self._cache.get(key)
+        if category is None:
+            category = self._classify(status, status_id)
+            with self._lock:
+                self._cache[key] = category
+        return category
+
+    def _classify(self, status, status_id):
+        """Classify a status that is not in the cache yet"""
+        if status_id is not None:
+            category = self._overrides.get(str(status_id).lower())
+            if category is not None:
+                return category
+
+        name = str(status).lower() if status is not None else ''
+        category = self._overrides.get(name)
+        if category is None:
+            if self._open_pattern and self._open_pattern.search(name):
+                category = StatusCategory.OPEN
+            elif self._closed_pattern and self._closed_pattern.search(name):
+                category = StatusCategory.CLOSED
+            else:
+                category = StatusCategory.UNKNOWN
+
+        logger.debug(f"Status {status!r} (ID {status_id}) categorized as {category.value}")
+        return category
+
+    def categorize_statuses(self, statuses):
+        """
+        Split statuses by category
+
+        Args:
+            statuses (list): Status names, or (status ID, status name) pairs so that
+                             overrides by ID apply as they do in add_category_column
+
+        Returns:
+            dict: Lists of status names 'all_statuses', 'open_statuses', 'closed_statuses'
+                  and 'unknown_statuses'. A name whose IDs fall in different categories
+                  is listed in each of them.
+        """
+        result = {name: {} for name in ('all_statuses', 'open_statuses', 'closed_statuses', 'unknown_statuses')}
+        for status in statuses:
+            status_id, name = status if isinstance(status, tuple) else (None, status)
+            result['all_statuses'][name] = True
+            result[f"{self.classify(name, status_id).value}_statuses"][name] = True
+        return {list_name: list(names) for list_name, names in result.items()}
+
+    def categorize_frame(self, df):
+        """
+        Split the statuses of processed issues by category, classifying the same
+        (status ID, status name) pairs as add_category_column
+
+        Args:
+            df (pandas.DataFrame): Processed data with a 'status' and optionally a 'status_id' column
+
+        Returns:
+            dict: Lists of status names, see categorize_statuses
+        """
+        if 'status_id' not in df.columns:
+            return self.categorize_statuses(df['status'].unique().tolist())
+
+        pairs = df[['status_id', 'status']].drop_duplicates()
+        return self.categorize_statuses([(_none_if_missing(status_id), _none_if_missing(name))
+                                         for status_id, name in zip(pairs['status_id'], pairs['status'])])
+
+    def add_category_column(self, df):
+        """
+        Add the status category of every issue as a categorical column
+
+        Args:
+            df (pandas.DataFrame): Processed data with 'status' and 'status_id' columns
+
+        Returns:
+            pandas.DataFrame: Copy of df with a CATEGORY_COLUMN column
+        """
+        if df.empty:
+            return df.assign(**{CATEGORY_COLUMN: pd.Categorical([], categories=CATEGORY_VALUES)})
+
+        status_ids = df['status_id'] if 'status_id' in df.columns else pd.Series(None, index=df.index)
+
+        # Classify each distinct (ID, name) pair once and spread the result by code
+        id_codes, ids = pd.factorize(status_ids, use_na_sentinel=False)
+        name_codes, names = pd.factorize(df['status'], use_na_sentinel=False)
+        pair_codes, pairs = pd.factorize(id_codes.astype(np.int64) * len(names) + name_codes)
+
+        categories = np.array([
+            CATEGORY_CODES[self.classify(_none_if_missing(names[pair % len(names)]),
+                                         _none_if_missing(ids[pair // len(names)]))]
+            for pair in pairs
+        ], dtype=np.int8)
+
+        codes = categories[pair_codes]
+        return df.assign(**{CATEGORY_COLUMN: pd.Categorical.from_codes(codes, categories=CATEGORY_VALUES)})
+
+
+def _compile_terms(terms):
+    """Compile status name terms into one lowercase pattern, or None without terms"""
+    if not terms:
+        return None
+    return re.compile('|'.join(re.escape(term.lower()) for term in terms))
+
+
+def _none_if_missing(value):
+    """Turn NaN and None into None"""
+    return None if value is None or (isinstance(value, float) and np.isnan(value)) else value
+
+
+def parse_status_mapping(text):
+    """
+    Parse status overrides entered as text, one "status = category" per line
+
+    Args:
+        text (str): Lines of status IDs or names and their categories; blank lines are skipped
+
+    Returns:
+        dict: Status IDs or names -> categories, empty without overrides
+
+    Raises:
+        ValueError: If a line has no "=" or names an unknown category
+    """
+    status_mapping = {}
+    for line in (text or '').splitlines():
+        if not line.strip():
+            continue
+        status, separator, category = line.partition('=')
+        status, category = status.strip(), category.strip().lower()
+        if not separator or not status:
+            raise ValueError(f"Expected \"status = category\", got {line.strip()!r}")
+        if category not in CATEGORY_VALUES:
+            raise ValueError(f"Unknown category {category!r} of status {status!r}, expected one of {CATEGORY_VALUES}")
+        status_mapping[status] = category
+    return status_mapping
+
+
+_default_classifier = None
+_default_lock = threading.Lock()
+
+
+def get_status_classifier(status_mapping=None):
+    """
+    Get a status classifier
+
+    Args:
+        status_mapping (dict): Status overrides of one analysis. Without them
+                               the shared classifier for config.status_mapping is returned.
+
+    Returns:
+        StatusClassifier: Classifier
+    """
+    global _default_classifier
+
+    if status_mapping:
+        return StatusClassifier(status_mapping)
+
+    with _default_lock:
+        if _default_classifier is None:
+            _default_classifier = StatusClassifier(getattr(config, 'status_mapping', None))
+        return _default_classifier
@@ -0,0 +1,218 @@
+import time
+import logging
+from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+from modules.status_classifier import get_status_classifier, StatusCategory, CATEGORY_COLUMN, CATEGORY_CODES
+
+# Get logger
+logger = logging.getLogger(__name__)
+
+# Seconds in an hour and in a day
+HOUR = 3600
+DAY = 24 * HOUR
+
+
+def build_status_timeline(records, as_of=None):
+    """
+    Create the status timeline and the per-issue transition table from changelog records.
+
+    Every record is flattened into one row per status the issue has been in,
+    so the whole timeline is built from a few NumPy arrays in a single pass
+    over all history items.
+
+    Args:
+        records (list): Records from modules.changelog_parser.parse_issue_changelog
+        as_of (float): When the current status of every issue is left, epoch seconds.
+                       Defaults to now.
+
+    Returns:
+        tuple: (transitions, timeline) DataFrames. transitions has one row per issue
+               with issue_key, transition_count (NA without a changelog) and
+               first_transition; timeline has
+               one row per issue and status period with issue_key, status_id, status,
+               entered_at and left_at. Dates are datetime64 in UTC.
+    """
+    if as_of is None:
+        as_of = time.time()
+
+    issue_keys = [record[0] for record in records]
+    lengths = np.fromiter((len(record[3]) for record in records), dtype=np.int64, count=len(records))
+
+    status_ids = []
+    statuses = []
+    entered = []
+    for record in records:
+        for status_id, status, entered_at in record[3]:
+            status_ids.append(status_id)
+            statuses.append(status)
+            entered.append(entered_at)
+
+    entered = np.array(entered, dtype=np.float64)
+
+    # Every period ends where the next one of the same issue starts, the last one at as_of
+    left = np.empty_like(entered)
+    left[:-1] = entered[1:]
+    ends = np.cumsum(lengths)
+    last_rows = ends[lengths > 0] - 1
+    left[last_rows] = np.maximum(as_of, entered[last_rows])
+
+    timeline = pd.DataFrame({
+        'issue_key': np.repeat(np.array(issue_keys, dtype=object), lengths),
+        'status_id': pd.Categorical(status_ids),
+        'status': pd.Categorical(statuses),
+        'entered_at': _to_datetime(entered),
+        'left_at': _to_datetime(left)
+    })
+
+    first_transitions = np.array([np.nan if record[2] is None else record[2] for record in records],
+                                 dtype=np.float64)
+    transitions = pd.DataFrame({
+        'issue_key': issue_keys,
+        'transition_count': pd.array([record[1] for record in records], dtype='Int32'),
+        'first_transition': _to_datetime(first_transitions)
+    })
+
+    return transitions, timeline
+
+
+def _to_datetime(seconds):
+    """Convert epoch seconds (NaN for missing) to UTC datetimes"""
+    return pd.to_datetime(seconds, unit='s', utc=True)
+
+
+@dataclass(frozen=True)
+class FlowMetrics:
+    """
+    Lead time, cycle time and time in status of the analyzed issues.
+
+    Lead time runs from the creation of an issue until it entered its current,
+    closed status. Cycle time starts when the issue first left the open
+    statuses instead. Both are only known for issues that are closed now.
+    Issues fetched without a changelog are left out.
+
+    Attributes:
+        issues (pandas.DataFrame): Per issue: issue_key, project, created_at, started_at,
+            resolved_at, lead_time_hours and cycle_time_hours (NaN/NaT when unknown)
+        resolved_by_project (pandas.Series): Number of closed issues per project
+        lead_time_days (pandas.Series): Median lead time per project
+        cycle_time_days (pandas.Series): Median cycle time per project
+        time_in_status_hours (pandas.DataFrame): Mean hours per issue spent in each
+            status (columns) by project (index)
+    """
+    issues: pd.DataFrame
+    resolved_by_project: pd.Series
+    lead_time_days: pd.Series
+    cycle_time_days: pd.Series
+    time_in_status_hours: pd.DataFrame
+
+    def to_chart_data(self):
+        """
+        Get the per-project figures for chart_data.json
+
+        Returns:
+            dict: 'resolved_by_project', 'lead_time_days', 'cycle_time_days'
+                  ({project: median days}) and 'time_in_status_hours'
+                  ({project: {status: mean hours per issue}})
+        """
+        return {
+            'resolved_by_project': {str(project): int(count) for project, count in self.resolved_by_project.items()},
+            'lead_time_days': _rounded(self.lead_time_days),
+            'cycle_time_days': _rounded(self.cycle_time_days),
+            'time_in_status_hours': {str(project): _rounded(row[row > 0])
+                                     for project, row in self.time_in_status_hours.iterrows()}
+        }
+
+
+def _rounded(series):
+    """Turn a Series into a {label: value} dict with values rounded to 0.01, skipping NaN"""
+    return {str(label): round(float(value), 2) for label, value in series.dropna().items()}
+
+
+def compute_flow_metrics(timeline, df, classifier=None):
+    """
+    Compute lead time, cycle time and time in status per project.
+
+    Works on the timeline rows in order (all periods of an issue are adjacent,
+    oldest first), so every figure is one vectorized pass or one reduceat.
+
+    Args:
+        timeline (pandas.DataFrame): Timeline from build_status_timeline
+        df (pandas.DataFrame): Processed issues, for the project of every issue
+        classifier (StatusClassifier): Status classifier, the shared one if not given
+
+    Returns:
+        FlowMetrics: Flow figures of the issues
+    """
+    if classifier is None:
+        classifier = get_status_classifier()
+
+    projects_by_key = pd.Series(df['project'].to_numpy(), index=df['issue_key'].to_numpy())
+
+    # Issue boundaries in the timeline
+    issue_keys = timeline['issue_key'].to_numpy()
+    if len(timeline):
+        starts = np.flatnonzero(np.r_[True, issue_keys[1:] != issue_keys[:-1]])
+        last_rows = np.r_[starts[1:], len(timeline)] - 1
+    else:
+        starts = last_rows = np.array([], dtype=np.int64)
+
+    entered = _to_seconds(timeline['entered_at'])
+    left = _to_seconds(timeline['left_at'])
+    categories = classifier.add_category_column(timeline[['status', 'status_id']])[CATEGORY_COLUMN]
+    categories = categories.cat.codes.to_numpy()
+
+    created = entered[starts]
+    resolved = np.where(categories[last_rows] == CATEGORY_CODES[StatusCategory.CLOSED], entered[last_rows], np.nan)
+
+    # Work starts with the first period outside the open statuses
+    started = np.full(len(starts), np.nan)
+    if len(starts):
+        not_open = np.where(categories != CATEGORY_CODES[StatusCategory.OPEN], entered, np.inf)
+        started = np.minimum.reduceat(not_open, starts)
+        started[np.isinf(started)] = np.nan
+
+    issue_projects = projects_by_key.reindex(issue_keys[starts]).to_numpy()
+    issues = pd.DataFrame({
+        'issue_key': issue_keys[starts],
+        'project': issue_projects,
+        'created_at': _to_datetime(created),
+        'started_at': _to_datetime(started),
+        'resolved_at': _to_datetime(resolved),
+        'lead_time_hours': (resolved - created) / HOUR,
+        'cycle_time_hours': (resolved - started) / HOUR
+    })
+
+    resolved_issues = issues[issues['resolved_at'].notna()]
+    by_project = resolved_issues.groupby('project', observed=True)
+    resolved_by_project = by_project.size()
+    lead_time_days = by_project['lead_time_hours'].median() * HOUR / DAY
+    cycle_time_days = by_project['cycle_time_hours'].median() * HOUR / DAY
+
+    # Hours spent in every status, averaged over all issues of the project
+    periods = pd.DataFrame({
+        'project': np.repeat(issue_projects, np.diff(np.r_[starts, len(timeline)])),
+        'status': timeline['status'].to_numpy(),
+        'hours': (left - entered) / HOUR
+    })
+    time_in_status_hours = periods.pivot_table(index='project', columns='status', values='hours',
+                                               aggfunc='sum', fill_value=0, observed=True)
+    issues_per_project = issues.groupby('project', observed=True).size()
+    time_in_status_hours = time_in_status_hours.div(issues_per_project.reindex(time_in_status_hours.index), axis=0)
+
+    logger.info(f"Computed flow metrics for {len(issues)} issues, {len(resolved_issues)} of them closed")
+    return FlowMetrics(
+        issues=issues,
+        resolved_by_project=resolved_by_project,
+        lead_time_days=lead_time_days,
+        cycle_time_days=cycle_time_days,
+        time_in_status_hours=time_in_status_hours
+    )
+
+
+def _to_seconds(dates):
+    """Convert UTC datetimes to epoch seconds, NaN for NaT"""
+    dates = pd.DatetimeIndex(dates)
+    seconds = dates.asi8 / 1e9
+    seconds[dates.isna()] = np.nan
+    return seconds
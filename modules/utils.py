@@ -1,19 +1,27 @@
+import os
 import re
+import gzip
+import json
 import logging
 
 # Get logger
 logger = logging.getLogger(__name__)
 
+# gzip level of raw issue dumps; level 9 takes about three times as long for a file about 10% smaller
+RAW_DUMP_COMPRESSLEVEL = 6
+
 def format_timestamp_for_display(timestamp):
     """
     Convert timestamp format '20250317_193204' to
-    a more readable format '2025-03-17_19-32'
+    a more readable format '2025-03-17_19-32'.
+    Folders of reports started in the same second ('20250317_193204_2')
+    keep their number: '2025-03-17_19-32 (2)'
     """
     if not timestamp or not isinstance(timestamp, str):
         return timestamp
 
     # Check that timestamp matches expected format
-    pattern = r'^\d{8}_\d{6}$'
+    pattern = r'^\d{8}_\d{6}(_\d+)?$'
     if not re.match(pattern, timestamp):
         return timestamp
 
@@ -31,8 +39,86 @@ def format_timestamp_for_display(timestamp):
         hour = time_part[:2]
         minute = time_part[2:4]
 
+        # Keep the number of a duplicate folder
+        number = f" ({time_part[7:]})" if len(time_part) > 6 else ""
+
         # Return formatted date and time
-        return f"{year}-{month}-{day}_{hour}-{minute}"
+        return f"{year}-{month}-{day}_{hour}-{minute}{number}"
     except Exception as e:
         logger.error(f"Error formatting timestamp: {e}")
-        return timestamp
\ No newline at end of file
+        return timestamp
+
+
+def create_report_folder(parent_dir, name):
+    """
+    Create a report folder with a unique name.
+
+    Several analyses may start within the same second, so a number is
+    appended to the name when the folder already exists.
+
+    Args:
+        parent_dir (str): Directory containing all reports
+        name (str): Preferred folder name, usually a timestamp
+
+    Returns:
+        str: Name of the created folder
+    """
+    folder = name
+    number = 1
+    while True:
+        try:
+            os.makedirs(os.path.join(parent_dir, folder))
+            return folder
+        except FileExistsError:
+            number += 1
+            folder = f"{name}_{number}"
+
+
+class RawIssueWriter:
+    """
+    Writes raw issues to a gzip-compressed JSON Lines file page by page,
+    so the full set of raw issues never has to be kept in memory.
+
+    Every page is written as its own gzip member. The file as a whole reads
+    like any .jsonl.gz file, and a single page can be decompressed on its own
+    from the offset and length returned by write_page.
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str): Output file path, usually ending in .jsonl.gz
+        """
+        self.path = path
+        self.count = 0
+        self._file = open(path, 'wb')
+
+    def write_page(self, issues):
+        """
+        Append a page of issues, one JSON document per line
+
+        Args:
+            issues (list): List of issue dictionaries
+
+        Returns:
+            tuple: (offset, length) of the page's gzip member in the file
+        """
+        lines = ''.join(json.dumps(issue, ensure_ascii=False) + '\n' for issue in issues)
+        member = gzip.compress(lines.encode('utf-8'), compresslevel=RAW_DUMP_COMPRESSLEVEL)
+
+        offset = self._file.tell()
+        self._file.write(member)
+        # Pages may be read back by other processes while the dump is still being written
+        self._file.flush()
+        self.count += len(issues)
+        return offset, len(member)
+
+    def close(self):
+        """Flush and close the output file"""
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
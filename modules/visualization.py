@@ -4,23 +4,41 @@ matplotlib.use('Agg')  # Важно установить до любых дру
 
 import os
 import json
+import time
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 from datetime import datetime
 from modules.data_processor import get_improved_open_statuses, get_status_categories, logger
+from modules.metrics import compute_issue_metrics
+from modules.chart_renderer import render_chart
+from modules.process_pool import map_in_pool, get_process_workers
+from modules.render_cache import save_chart_specs, load_chart_specs
+from modules.report_store import write_json, read_json
+from modules.perf import span, timed
 
+try:
+    import config
+except ImportError:
+    config = None
 
-def create_visualizations(df, output_dir='jira_charts', logger=None):
+
+@timed('visualizations')
+def create_visualizations(df, output_dir='jira_charts', logger=None, prerender=None, metrics=None, flow=None):
     """
     Create visualizations from processed data.
     Removed charts "Original estimate by project" and "Time spent by project".
     Added chart for issues without transitions (which are likely still in OPEN status).
 
+    Chart data is prepared here and saved with the report; the PNGs are
+    rendered on first request unless prerender is set (see publish_charts).
+
     Args:
         df (pandas.DataFrame): Processed data
         output_dir (str): Directory for saving visualizations
         logger: Logger instance
+        prerender (bool): Render all PNGs now, e.g. for exports.
+                          Defaults to config.prerender_charts or False.
+        metrics (IssueMetrics): Aggregates of df, computed here if not given
+        flow (FlowMetrics): Lead time, cycle time and time in status, optional
 
     Returns:
         dict: Paths to generated charts
@@ -37,58 +55,76 @@ def create_visualizations(df, output_dir='jira_charts', logger=None):
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
 
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    chart_paths = {}
-
-    # Set consistent style
-    sns.set(style="whitegrid")
-    plt.rcParams.update({'font.size': 10})
+    chart_entries = {}
+
+    # All charts and the summary read the same aggregates
+    if metrics is None:
+        metrics = compute_issue_metrics(df)
+
+    # Prepare all visualizations
+    with span('chart_specs'):
+        chart_entries.update(create_project_distribution_chart(metrics, output_dir))
+        chart_entries.update(create_comparison_chart(metrics, output_dir))
+        chart_entries.update(create_pie_chart(metrics, output_dir))
+        chart_entries.update(create_efficiency_chart(metrics, output_dir))
+        chart_entries.update(create_no_transitions_chart(metrics, output_dir, logger))
+        chart_entries.update(create_open_tasks_chart(metrics, output_dir, logger))
+        chart_entries.update(create_closed_tasks_chart(metrics, output_dir, logger))
+        if flow is not None:
+            chart_entries.update(create_flow_charts(flow, output_dir))
+
+    # Chart specs are rendered, anything else (counts kept when a chart failed) is passed through
+    specs = [entry for entry in chart_entries.values() if isinstance(entry, dict)]
+    with span('publish_charts'):
+        rendered = publish_charts(specs, output_dir, logger, prerender)
 
-    # Create all visualizations
-    chart_paths.update(create_project_distribution_chart(df, output_dir))
-    chart_paths.update(create_comparison_chart(df, output_dir))
-    chart_paths.update(create_pie_chart(df, output_dir))
-    chart_paths.update(create_efficiency_chart(df, output_dir))
-    chart_paths.update(create_no_transitions_chart(df, output_dir, logger))
-    chart_paths.update(create_open_tasks_chart(df, output_dir, logger))
-    chart_paths.update(create_closed_tasks_chart(df, output_dir, logger))
+    chart_paths = {}
+    for name, entry in chart_entries.items():
+        if not isinstance(entry, dict):
+            chart_paths[name] = entry
+        elif name in rendered:
+            chart_paths[name] = rendered[name]
 
     # Generate summary statistics
     summary = {
-        'total_issues': len(df),
-        'total_original_estimate_hours': df['original_estimate_hours'].sum(),
-        'total_time_spent_hours': df['time_spent_hours'].sum(),
-        'projects_count': len(df['project'].unique()),
-        'projects': df['project'].unique().tolist(),
-        'avg_estimate_per_issue': df['original_estimate_hours'].mean() if len(df) > 0 else 0,
-        'avg_time_spent_per_issue': df['time_spent_hours'].mean() if len(df) > 0 else 0,
-        'overall_efficiency': (df['time_spent_hours'].sum() / df['original_estimate_hours'].sum())
-        if df['original_estimate_hours'].sum() > 0 else 0
+        'total_issues': metrics.total_issues,
+        'total_original_estimate_hours': metrics.total_original_estimate_hours,
+        'total_time_spent_hours': metrics.total_time_spent_hours,
+        'projects_count': len(metrics.projects),
+        'projects': list(metrics.projects),
+        'avg_estimate_per_issue': metrics.avg_estimate_per_issue,
+        'avg_time_spent_per_issue': metrics.avg_time_spent_per_issue,
+        'overall_efficiency': (metrics.total_time_spent_hours / metrics.total_original_estimate_hours)
+        if metrics.total_original_estimate_hours > 0 else 0
     }
 
     # Add info about issues without transitions
-    no_transitions_count = df['no_transitions'].sum()
+    no_transitions_count = len(metrics.no_transitions_tasks)
     if no_transitions_count > 0:
         summary['no_transitions_tasks_count'] = int(no_transitions_count)
 
     # Add open tasks data
-    open_statuses = get_improved_open_statuses(df)
-    open_tasks = df[df['status'].isin(open_statuses) & (df['time_spent_hours'] > 0)]
+    open_tasks = metrics.open_tasks
     if not open_tasks.empty:
         summary['open_tasks_count'] = len(open_tasks)
         summary['open_tasks_time_spent_hours'] = open_tasks['time_spent_hours'].sum()
 
     # Add closed tasks data
-    status_categories = get_status_categories(df)
-    closed_statuses = status_categories['closed_statuses']
-    closed_tasks = df[df['status'].isin(closed_statuses) & (~df['has_comments']) & (~df['has_attachments'])]
+    closed_tasks = metrics.closed_tasks
     if not closed_tasks.empty:
         summary['completed_tasks_no_comments_count'] = len(closed_tasks)
 
+    # Add lead and cycle time of closed issues
+    if flow is not None:
+        resolved_issues = flow.issues[flow.issues['resolved_at'].notna()]
+        if not resolved_issues.empty:
+            summary['resolved_issues_count'] = len(resolved_issues)
+            summary['median_lead_time_days'] = resolved_issues['lead_time_hours'].median() / 24
+            summary['median_cycle_time_days'] = resolved_issues['cycle_time_hours'].median() / 24
+
     # Save summary as JSON
     summary_path = f"{output_dir}/summary.json"
-    with open(summary_path, 'w', encoding='utf-8') as f:
-        json.dump(summary, f, indent=4, ensure_ascii=False)
+    write_json(summary_path, summary)
 
     chart_paths['summary'] = summary_path
 
@@ -96,80 +132,219 @@ def create_visualizations(df, output_dir='jira_charts', logger=None):
     return chart_paths
 
 
-def configure_axis(ax, rotation=45):
-    """Configure axis for better readability"""
-    # Get current axis labels
-    labels = ax.get_xticklabels()
-    # Set rotation and alignment
-    ax.set_xticklabels(labels, rotation=rotation, ha='right')
-    # Improve chart layout
-    plt.tight_layout()
+def publish_charts(specs, output_dir, logger, prerender=None):
+    """
+    Save chart specs with the report so the charts can be rendered on demand.
+
+    The /charts route renders a chart the first time it is requested and keeps
+    the image in the shared render cache. With prerender the PNGs are written
+    to the report directory right away.
+
+    Args:
+        specs (list): Chart specs (see modules.chart_renderer.render_chart)
+        output_dir (str): Report directory
+        logger: Logger instance
+        prerender (bool): Render the charts now. Defaults to config.prerender_charts or False.
+
+    Returns:
+        dict: Chart name -> path of the chart image in the report directory
+    """
+    save_chart_specs(specs, output_dir)
 
+    if prerender is None:
+        prerender = getattr(config, 'prerender_charts', False)
+
+    if prerender:
+        return render_charts(specs, output_dir, logger)
+
+    logger.info(f"Saved {len(specs)} chart specs for rendering on demand")
+    return {spec['name']: spec['path'] for spec in specs}
+
+
+def prerender_report_charts(report_dir, logger):
+    """
+    Render all saved charts of a report into its directory, e.g. before exporting it
+
+    Args:
+        report_dir (str): Report directory
+        logger: Logger instance
+
+    Returns:
+        dict: Chart name -> path for charts that were rendered successfully
+    """
+    specs = [dict(spec, path=os.path.join(report_dir, filename))
+             for filename, spec in load_chart_specs(report_dir).items()
+             if not os.path.exists(os.path.join(report_dir, filename))]
+
+    if not specs:
+        return {}
 
-def create_project_distribution_chart(df, output_dir):
+    return render_charts(specs, report_dir, logger)
+
+
+@timed('render_charts')
+def render_charts(specs, output_dir, logger):
+    """
+    Render chart specs to PNG files in the shared process pool.
+
+    Each chart is drawn in its own worker with the object-oriented Agg API, so
+    concurrent analyses never share pyplot state. Per-chart render times are
+    logged and saved to metrics/render_times.json.
+
+    Args:
+        specs (list): Chart specs (see modules.chart_renderer.render_chart)
+        output_dir (str): Report directory
+        logger: Logger instance
+
+    Returns:
+        dict: Chart name -> path for charts that were rendered successfully
+    """
+    started = time.perf_counter()
+    results = map_in_pool(render_chart, specs)
+    elapsed = time.perf_counter() - started
+
+    chart_paths = {}
+    render_times = {}
+    for result in results:
+        render_times[result['name']] = round(result['seconds'], 3)
+        if result.get('error'):
+            logger.error(f"Error rendering chart {result['name']}: {result['error']}")
+            continue
+        chart_paths[result['name']] = result['path']
+        logger.info(f"Chart {result['name']} rendered in {result['seconds']:.2f}s")
+
+    logger.info(f"Rendered {len(chart_paths)} of {len(specs)} charts in {elapsed:.2f}s "
+                f"(up to {get_process_workers()} processes)")
+
+    # Save render timings next to the other metrics
+    metrics_dir = os.path.join(output_dir, 'metrics')
+    if not os.path.exists(metrics_dir):
+        os.makedirs(metrics_dir)
+
+    # Charts may be rendered in several batches, so merge with timings saved earlier
+    render_times_path = os.path.join(metrics_dir, 'render_times.json')
+    timings = read_json(render_times_path, {'total_seconds': 0, 'charts': {}})
+
+    timings['total_seconds'] = round(timings['total_seconds'] + elapsed, 3)
+    timings['charts'].update(render_times)
+
+    write_json(render_times_path, timings)
+
+    return chart_paths
+
+
+def bar_chart_spec(name, path, labels, values, title, xlabel=None, ylabel=None, figsize=(12, 7), **options):
+    """
+    Build a bar chart spec
+
+    Args:
+        name (str): Chart name used as key in chart paths
+        path (str): Output PNG path
+        labels (list): Category labels
+        values (list): Bar heights
+        title (str): Chart title
+        xlabel (str): X axis label
+        ylabel (str): Y axis label
+        figsize (tuple): Figure size in inches
+        **options: Additional spec options (hline, bbox_inches, tight_layout)
+
+    Returns:
+        dict: Chart spec
+    """
+    spec = {
+        'name': name,
+        'kind': 'bar',
+        'path': path,
+        'figsize': figsize,
+        'labels': [str(label) for label in labels],
+        'values': [float(value) for value in values],
+        'title': title,
+        'xlabel': xlabel,
+        'ylabel': ylabel,
+        'tight_layout': True
+    }
+    spec.update(options)
+    return spec
+
+
+def message_chart_spec(name, path, message, title, xlabel=None, ylabel=None, figsize=(12, 7)):
+    """
+    Build a spec for an empty chart showing a message
+
+    Args:
+        name (str): Chart name used as key in chart paths
+        path (str): Output PNG path
+        message (str): Message shown in the middle of the chart
+        title (str): Chart title
+        xlabel (str): X axis label
+        ylabel (str): Y axis label
+        figsize (tuple): Figure size in inches
+
+    Returns:
+        dict: Chart spec
+    """
+    return {
+        'name': name,
+        'kind': 'message',
+        'path': path,
+        'figsize': figsize,
+        'message': message,
+        'title': title,
+        'xlabel': xlabel,
+        'ylabel': ylabel
+    }
+
+
+def create_project_distribution_chart(metrics, output_dir):
     """Create project distribution chart"""
-    plt.figure(figsize=(10, 6))
-    project_counts = df['project'].value_counts()
-    ax = sns.barplot(x=project_counts.index, y=project_counts.values)
-    configure_axis(ax)
-    plt.title('Распределение задач по проектам')
-    plt.xlabel('Проект')
-    plt.ylabel('Количество задач')
+    project_counts = metrics.project_counts
+    project_counts = project_counts[project_counts > 0]
 
     project_chart_path = f"{output_dir}/project_distribution.png"
-    plt.savefig(project_chart_path)
-    plt.close()
-    return {'project_distribution': project_chart_path}
+    spec = bar_chart_spec('project_distribution', project_chart_path,
+                          project_counts.index.tolist(), project_counts.values,
+                          'Распределение задач по проектам', 'Проект', 'Количество задач', figsize=(10, 6))
+    return {'project_distribution': spec}
 
 
-def create_comparison_chart(df, output_dir):
+def create_comparison_chart(metrics, output_dir):
     """Create comparison chart between estimate and time spent"""
     # Get data for projects
-    project_estimates = df.groupby('project')['original_estimate_hours'].sum().sort_values(ascending=False)
-    project_time_spent = df.groupby('project')['time_spent_hours'].sum().sort_values(ascending=False)
+    project_estimates = metrics.by_project['original_estimate_hours']
+    project_time_spent = metrics.by_project['time_spent_hours']
 
-    plt.figure(figsize=(14, 8))
-
-    # Include only projects with either estimate or time spent
-    all_projects = list(set(project_estimates.index) | set(project_time_spent.index))
-
-    comparison_df = pd.DataFrame(index=all_projects, columns=['Исходная оценка', 'Затраченное время'])
-
-    for project in all_projects:
-        comparison_df.loc[project, 'Исходная оценка'] = project_estimates.get(project, 0)
-        comparison_df.loc[project, 'Затраченное время'] = project_time_spent.get(project, 0)
+    comparison_df = pd.DataFrame({
+        'Исходная оценка': project_estimates,
+        'Затраченное время': project_time_spent
+    }).fillna(0)
 
     # Sort by total value (estimate + time spent)
     comparison_df['Всего'] = comparison_df['Исходная оценка'] + comparison_df['Затраченное время']
-    comparison_df = comparison_df.sort_values('Всего', ascending=False).drop('Всего', axis=1)
-
-    comparison_df_melted = pd.melt(
-        comparison_df.reset_index(),
-        id_vars=['index'],
-        value_vars=['Исходная оценка', 'Затраченное время'],
-        var_name='Метрика',
-        value_name='Часы'
-    )
-
-    ax = sns.barplot(x='index', y='Часы', hue='Метрика', data=comparison_df_melted)
-    configure_axis(ax)
-    plt.title('Исходная оценка vs. Затраченное время по проектам (часы)')
-    plt.xlabel('Проект')
-    plt.ylabel('Часы')
+    comparison_df = comparison_df.sort_values('Всего', ascending=False, kind='stable').drop('Всего', axis=1)
 
     comparison_chart_path = f"{output_dir}/estimate_vs_spent_by_project.png"
-    plt.savefig(comparison_chart_path)
-    plt.close()
-    return {'comparison': comparison_chart_path}
+    spec = {
+        'name': 'comparison',
+        'kind': 'grouped_bar',
+        'path': comparison_chart_path,
+        'figsize': (14, 8),
+        'labels': [str(project) for project in comparison_df.index],
+        'series': {column: comparison_df[column].astype(float).tolist() for column in comparison_df.columns},
+        'hue_title': 'Метрика',
+        'title': 'Исходная оценка vs. Затраченное время по проектам (часы)',
+        'xlabel': 'Проект',
+        'ylabel': 'Часы',
+        'tight_layout': True
+    }
+    return {'comparison': spec}
 
 
-def create_pie_chart(df, output_dir):
+def create_pie_chart(metrics, output_dir):
     """Create pie chart of project distribution"""
-    project_counts = df['project'].value_counts()
+    project_counts = metrics.project_counts
+    project_counts = project_counts[project_counts > 0]
 
     if len(project_counts) > 0:
-        plt.figure(figsize=(10, 10))
-
         # Limit number of slices for readability
         MAX_SLICES = 10
         if len(project_counts) > MAX_SLICES:
@@ -182,103 +357,76 @@ def create_pie_chart(df, output_dir):
         else:
             pie_data = project_counts
 
-        plt.pie(pie_data.values, labels=pie_data.index, autopct='%1.1f%%', startangle=90)
-        plt.axis('equal')
-        plt.title('Распределение задач по проектам')
-
         pie_chart_path = f"{output_dir}/project_distribution_pie.png"
-        plt.savefig(pie_chart_path)
-        plt.close()
-        return {'project_pie': pie_chart_path}
+        spec = {
+            'name': 'project_pie',
+            'kind': 'pie',
+            'path': pie_chart_path,
+            'figsize': (10, 10),
+            'labels': [str(label) for label in pie_data.index],
+            'values': [float(value) for value in pie_data.values],
+            'title': 'Распределение задач по проектам'
+        }
+        return {'project_pie': spec}
     return {}
 
 
-def create_efficiency_chart(df, output_dir):
+def create_efficiency_chart(metrics, output_dir):
     """Create efficiency ratio chart"""
     # Get data for projects
-    project_estimates = df.groupby('project')['original_estimate_hours'].sum()
-    project_time_spent = df.groupby('project')['time_spent_hours'].sum()
+    project_estimates = metrics.by_project['original_estimate_hours']
+    project_time_spent = metrics.by_project['time_spent_hours']
 
-    plt.figure(figsize=(12, 7))
     efficiency_df = pd.DataFrame({
         'Исходная оценка': project_estimates,
         'Затраченное время': project_time_spent
     }).fillna(0)
 
     # Calculate efficiency ratio (avoid division by zero)
-    efficiency_df['Коэффициент эффективности'] = efficiency_df.apply(
-        lambda row: row['Затраченное время'] / row['Исходная оценка'] if row['Исходная оценка'] > 0 else 0,
-        axis=1
-    )
+    estimates = efficiency_df['Исходная оценка']
+    efficiency_df['Коэффициент эффективности'] = (
+        efficiency_df['Затраченное время'] / estimates.where(estimates > 0)).fillna(0)
 
     # Sort and filter projects without original estimate
     efficiency_df = efficiency_df[efficiency_df['Исходная оценка'] > 0].sort_values('Коэффициент эффективности')
 
     if not efficiency_df.empty:
-        ax = sns.barplot(x=efficiency_df.index, y=efficiency_df['Коэффициент эффективности'])
-        configure_axis(ax)
-
-        # Add horizontal line at y=1 (where time spent equals original estimate)
-        plt.axhline(y=1, color='r', linestyle='--')
-
-        plt.title('Коэффициент эффективности по проектам (Затраченное время / Исходная оценка)')
-        plt.xlabel('Проект')
-        plt.ylabel('Коэффициент')
-
+        # Horizontal line at y=1 marks where time spent equals original estimate
         efficiency_chart_path = f"{output_dir}/efficiency_ratio_by_project.png"
-        plt.savefig(efficiency_chart_path, bbox_inches='tight')
-        plt.close()
-        return {'efficiency': efficiency_chart_path}
+        spec = bar_chart_spec('efficiency', efficiency_chart_path,
+                              efficiency_df.index.tolist(), efficiency_df['Коэффициент эффективности'].values,
+                              'Коэффициент эффективности по проектам (Затраченное время / Исходная оценка)',
+                              'Проект', 'Коэффициент', hline=1, bbox_inches='tight', tight_layout=False)
+        return {'efficiency': spec}
     return {}
 
 
-def create_no_transitions_chart(df, output_dir, logger):
+def create_no_transitions_chart(metrics, output_dir, logger):
     """Create chart for issues without transitions (likely still in OPEN status)"""
     logger.info("GENERATING NO TRANSITIONS TASKS CHART")
     chart_paths = {}
 
     try:
-        # Filter issues without transitions
-        no_transitions_tasks = df[df['no_transitions'] == True]
+        # Issues without transitions
+        no_transitions_tasks = metrics.no_transitions_tasks
         logger.info(f"FOUND {len(no_transitions_tasks)} TASKS WITH NO TRANSITIONS (PROBABLY NEW)")
 
-        plt.figure(figsize=(12, 7))
+        no_transitions_chart_path = f"{output_dir}/no_transitions_tasks.png"
+        no_transitions_counts = metrics.project_column('no_transitions_tasks', only_with='no_transitions_tasks')
+        no_transitions_by_project = no_transitions_counts.sort_values(ascending=False)
 
-        if not no_transitions_tasks.empty:
-            # Group by project
-            no_transitions_by_project = no_transitions_tasks.groupby('project').size().sort_values(ascending=False)
+        if not no_transitions_by_project.empty:
             logger.info(f"NO TRANSITIONS TASKS BY PROJECT: {no_transitions_by_project.to_dict()}")
-
-            if not no_transitions_by_project.empty:
-                ax = sns.barplot(x=no_transitions_by_project.index, y=no_transitions_by_project.values)
-                ax.set_xticklabels(ax.get_xticklabels(), rotation=45, ha='right')
-                plt.tight_layout()
-                plt.title('Задачи без transitions по проектам (вероятно новые)')
-                plt.xlabel('Проект')
-                plt.ylabel('Количество задач')
-            else:
-                # Empty chart
-                plt.text(0.5, 0.5, "Нет задач без transitions",
-                         horizontalalignment='center', verticalalignment='center',
-                         transform=plt.gca().transAxes, fontsize=14)
-                plt.xticks([])
-                plt.yticks([])
-                plt.title('Задачи без transitions (вероятно новые)')
+            spec = bar_chart_spec('no_transitions_tasks', no_transitions_chart_path,
+                                  no_transitions_by_project.index.tolist(), no_transitions_by_project.values,
+                                  'Задачи без transitions по проектам (вероятно новые)',
+                                  'Проект', 'Количество задач')
         else:
             # Empty chart
-            plt.text(0.5, 0.5, "Нет задач без transitions",
-                     horizontalalignment='center', verticalalignment='center',
-                     transform=plt.gca().transAxes, fontsize=14)
-            plt.xticks([])
-            plt.yticks([])
-            plt.title('Задачи без transitions (вероятно новые)')
-
-        # Save chart
-        no_transitions_chart_path = f"{output_dir}/no_transitions_tasks.png"
-        plt.savefig(no_transitions_chart_path)
-        plt.close()
-        chart_paths['no_transitions_tasks'] = no_transitions_chart_path
-        logger.info(f"NO TRANSITIONS TASKS CHART SAVED TO: {no_transitions_chart_path}")
+            spec = message_chart_spec('no_transitions_tasks', no_transitions_chart_path,
+                                      "Нет задач без transitions", 'Задачи без transitions (вероятно новые)')
+
+        chart_paths['no_transitions_tasks'] = spec
 
         # Save metrics
         metrics_dir = os.path.join(output_dir, 'metrics')
@@ -287,25 +435,70 @@ def create_no_transitions_chart(df, output_dir, logger):
 
         no_transitions_data = {
             'count': len(no_transitions_tasks),
-            'by_project': no_transitions_tasks.groupby(
-                'project').size().to_dict() if not no_transitions_tasks.empty else {}
+            'by_project': no_transitions_counts.to_dict() if not no_transitions_tasks.empty else {}
         }
 
         no_transitions_metrics_path = os.path.join(metrics_dir, 'no_transitions_tasks.json')
-        with open(no_transitions_metrics_path, 'w', encoding='utf-8') as f:
-            json.dump(no_transitions_data, f, indent=2, ensure_ascii=False)
+        write_json(no_transitions_metrics_path, no_transitions_data)
         logger.info(f"NO TRANSITIONS TASKS METRICS SAVED TO: {no_transitions_metrics_path}")
 
     except Exception as e:
         logger.error(f"ERROR GENERATING NO TRANSITIONS TASKS CHART: {str(e)}", exc_info=True)
         # Save issue count even if chart creation fails
+        chart_paths.pop('no_transitions_tasks', None)
         if 'no_transitions_tasks' in locals() and not no_transitions_tasks.empty:
             chart_paths['no_transitions_tasks_count'] = len(no_transitions_tasks)
 
     return chart_paths
 
 
-def create_open_tasks_chart(df, output_dir, logger):
+def create_flow_charts(flow, output_dir):
+    """Create lead/cycle time and time in status charts"""
+    charts = {}
+
+    # Projects with the slowest deliveries first
+    flow_times = pd.DataFrame({
+        'Lead time': flow.lead_time_days,
+        'Cycle time': flow.cycle_time_days
+    }).fillna(0).sort_values('Lead time', ascending=False, kind='stable')
+
+    if not flow_times.empty:
+        charts['lead_cycle_time'] = {
+            'name': 'lead_cycle_time',
+            'kind': 'grouped_bar',
+            'path': f"{output_dir}/lead_cycle_time_by_project.png",
+            'figsize': (14, 8),
+            'labels': [str(project) for project in flow_times.index],
+            'series': {column: flow_times[column].astype(float).tolist() for column in flow_times.columns},
+            'hue_title': 'Метрика',
+            'title': 'Lead time и cycle time закрытых задач по проектам (медиана, дни)',
+            'xlabel': 'Проект',
+            'ylabel': 'Дни',
+            'tight_layout': True
+        }
+
+    # Statuses ordered by total time, so the largest parts are at the bottom of the stack
+    time_in_status = flow.time_in_status_hours
+    if not time_in_status.empty:
+        time_in_status = time_in_status[time_in_status.sum().sort_values(ascending=False, kind='stable').index]
+        charts['time_in_status'] = {
+            'name': 'time_in_status',
+            'kind': 'stacked_bar',
+            'path': f"{output_dir}/time_in_status_by_project.png",
+            'figsize': (14, 8),
+            'labels': [str(project) for project in time_in_status.index],
+            'series': {str(status): time_in_status[status].astype(float).tolist() for status in time_in_status.columns},
+            'hue_title': 'Статус',
+            'title': 'Среднее время задачи в статусах по проектам (часы)',
+            'xlabel': 'Проект',
+            'ylabel': 'Часы',
+            'tight_layout': True
+        }
+
+    return charts
+
+
+def create_open_tasks_chart(metrics, output_dir, logger):
     """Create chart for open tasks with logged time"""
     logger.info("GENERATING OPEN TASKS WITH WORKLOGS CHART - IMPROVED")
     chart_paths = {}
@@ -317,119 +510,90 @@ def create_open_tasks_chart(df, output_dir, logger):
             os.makedirs(metrics_dir)
             logger.info(f"Created metrics directory: {metrics_dir}")
 
-        # Get improved open statuses detection
-        improved_open_statuses = get_improved_open_statuses(df)
-        logger.info(f"IMPROVED OPEN STATUSES: {improved_open_statuses}")
+        # Open statuses from the improved detection
+        logger.info(f"IMPROVED OPEN STATUSES: {list(metrics.open_statuses)}")
 
-        # Filter open tasks with logged time
-        open_tasks_improved = df[df['status'].isin(improved_open_statuses) & (df['time_spent_hours'] > 0)]
+        # Open tasks with logged time
+        open_tasks_improved = metrics.open_tasks
+        open_tasks_time_spent = metrics.project_column('open_tasks_time_spent_hours', only_with='open_tasks')
         logger.info(f"Found {len(open_tasks_improved)} open tasks using improved detection")
 
         # Always create a chart, even if empty
-        plt.figure(figsize=(12, 7))
+        open_tasks_chart_path = f"{output_dir}/open_tasks_time_spent.png"
+        title = 'Затраченное время на открытые задачи'
 
         if not open_tasks_improved.empty:
-            open_tasks_by_project = open_tasks_improved.groupby('project')['time_spent_hours'].sum().sort_values(
-                ascending=False)
+            open_tasks_by_project = open_tasks_time_spent.sort_values(ascending=False)
             logger.info(f"OPEN TASKS BY PROJECT: {open_tasks_by_project.to_dict()}")
-
-            if not open_tasks_by_project.empty:
-                ax = sns.barplot(x=open_tasks_by_project.index, y=open_tasks_by_project.values)
-                ax.set_xticklabels(ax.get_xticklabels(), rotation=45, ha='right')
-                plt.tight_layout()
+            spec = bar_chart_spec('open_tasks', open_tasks_chart_path,
+                                  open_tasks_by_project.index.tolist(), open_tasks_by_project.values,
+                                  title, 'Проект', 'Затраченное время (часы)')
         else:
             # Create an empty chart with a message
-            plt.text(0.5, 0.5, "Нет открытых задач с логированием времени",
-                     horizontalalignment='center', verticalalignment='center',
-                     transform=plt.gca().transAxes, fontsize=14)
-            plt.xticks([])
-            plt.yticks([])
+            spec = message_chart_spec('open_tasks', open_tasks_chart_path,
+                                      "Нет открытых задач с логированием времени",
+                                      title, 'Проект', 'Затраченное время (часы)')
 
-        plt.title('Затраченное время на открытые задачи')
-        plt.xlabel('Проект')
-        plt.ylabel('Затраченное время (часы)')
-
-        # Always save the chart
-        open_tasks_chart_path = f"{output_dir}/open_tasks_time_spent.png"
-        plt.savefig(open_tasks_chart_path)
-        plt.close()
-        chart_paths['open_tasks'] = open_tasks_chart_path
-        logger.info(f"OPEN TASKS CHART SAVED TO: {open_tasks_chart_path}")
+        chart_paths['open_tasks'] = spec
 
         # Always save metrics data, even if empty
         open_tasks_data = {
             'count': int(len(open_tasks_improved)),
             'total_time_spent': float(
                 open_tasks_improved['time_spent_hours'].sum()) if not open_tasks_improved.empty else 0.0,
-            'by_project': open_tasks_improved.groupby('project')[
-                'time_spent_hours'].sum().to_dict() if not open_tasks_improved.empty else {},
-            'task_statuses': open_tasks_improved[
-                'status'].value_counts().to_dict() if not open_tasks_improved.empty else {},
+            'by_project': open_tasks_time_spent.to_dict() if not open_tasks_improved.empty else {},
+            'task_statuses': {status: count for status, count in open_tasks_improved[
+                'status'].value_counts().items() if count > 0} if not open_tasks_improved.empty else {},
             'sample_tasks': open_tasks_improved['issue_key'].head(
                 10).tolist() if not open_tasks_improved.empty else []
         }
 
         # Save metrics file
         open_tasks_metrics_path = os.path.join(metrics_dir, 'open_tasks.json')
-        with open(open_tasks_metrics_path, 'w', encoding='utf-8') as f:
-            json.dump(open_tasks_data, f, indent=2, ensure_ascii=False)
+        write_json(open_tasks_metrics_path, open_tasks_data)
         logger.info(f"OPEN TASKS METRICS SAVED TO: {open_tasks_metrics_path}")
 
     except Exception as e:
         logger.error(f"ERROR GENERATING OPEN TASKS CHART: {str(e)}", exc_info=True)
         # Still include count in summary data even if chart creation fails
+        chart_paths.pop('open_tasks', None)
         if 'open_tasks_improved' in locals() and not open_tasks_improved.empty:
             chart_paths['open_tasks_count'] = len(open_tasks_improved)
 
     return chart_paths
 
 
-def create_closed_tasks_chart(df, output_dir, logger):
+def create_closed_tasks_chart(metrics, output_dir, logger):
     """Create chart for closed tasks without comments or attachments"""
     logger.info("GENERATING CLOSED TASKS WITHOUT COMMENTS CHART")
     chart_paths = {}
 
     try:
-        # Get status categories
-        status_categories = get_status_categories(df)
-        closed_statuses = status_categories['closed_statuses']
-
-        # Filter tasks with these statuses, without comments and attachments
-        closed_tasks = df[df['status'].isin(closed_statuses) & (~df['has_comments']) & (~df['has_attachments'])]
+        # Closed tasks without comments and attachments
+        closed_tasks = metrics.closed_tasks
+        closed_tasks_counts = metrics.project_column('closed_tasks', only_with='closed_tasks')
         logger.info(f"FOUND {len(closed_tasks)} CLOSED TASKS WITHOUT COMMENTS/ATTACHMENTS")
 
         if len(closed_tasks) > 0:
             logger.info(f"SAMPLE CLOSED TASKS: {closed_tasks['issue_key'].head(5).tolist()}")
 
         # Always create a chart, even if empty
-        plt.figure(figsize=(12, 7))
+        closed_tasks_chart_path = f"{output_dir}/completed_tasks_no_comments.png"
+        title = 'Закрытые задачи без комментариев и вложений'
 
         if not closed_tasks.empty:
-            closed_tasks_by_project = closed_tasks.groupby('project').size().sort_values(ascending=False)
+            closed_tasks_by_project = closed_tasks_counts.sort_values(ascending=False)
             logger.info(f"CLOSED TASKS BY PROJECT: {closed_tasks_by_project.to_dict()}")
-
-            if not closed_tasks_by_project.empty:
-                ax = sns.barplot(x=closed_tasks_by_project.index, y=closed_tasks_by_project.values)
-                ax.set_xticklabels(ax.get_xticklabels(), rotation=45, ha='right')
-                plt.tight_layout()
+            spec = bar_chart_spec('completed_tasks_no_comments', closed_tasks_chart_path,
+                                  closed_tasks_by_project.index.tolist(), closed_tasks_by_project.values,
+                                  title, 'Проект', 'Количество задач')
         else:
             # Create an empty chart with a message
-            plt.text(0.5, 0.5, "Нет закрытых задач без комментариев и вложений",
-                     horizontalalignment='center', verticalalignment='center',
-                     transform=plt.gca().transAxes, fontsize=14)
-            plt.xticks([])
-            plt.yticks([])
-
-        plt.title('Закрытые задачи без комментариев и вложений')
-        plt.xlabel('Проект')
-        plt.ylabel('Количество задач')
+            spec = message_chart_spec('completed_tasks_no_comments', closed_tasks_chart_path,
+                                      "Нет закрытых задач без комментариев и вложений",
+                                      title, 'Проект', 'Количество задач')
 
-        # Always save the chart
-        closed_tasks_chart_path = f"{output_dir}/completed_tasks_no_comments.png"
-        plt.savefig(closed_tasks_chart_path)
-        plt.close()
-        chart_paths['completed_tasks_no_comments'] = closed_tasks_chart_path
-        logger.info(f"CLOSED TASKS CHART SAVED TO: {closed_tasks_chart_path}")
+        chart_paths['completed_tasks_no_comments'] = spec
 
         # Save metrics data
         metrics_dir = os.path.join(output_dir, 'metrics')
@@ -438,17 +602,17 @@ def create_closed_tasks_chart(df, output_dir, logger):
 
         closed_tasks_data = {
             'count': len(closed_tasks),
-            'by_project': closed_tasks.groupby('project').size().to_dict() if not closed_tasks.empty else {}
+            'by_project': closed_tasks_counts.to_dict() if not closed_tasks.empty else {}
         }
 
         closed_tasks_metrics_path = os.path.join(metrics_dir, 'closed_tasks.json')
-        with open(closed_tasks_metrics_path, 'w', encoding='utf-8') as f:
-            json.dump(closed_tasks_data, f, indent=2, ensure_ascii=False)
+        write_json(closed_tasks_metrics_path, closed_tasks_data)
         logger.info(f"CLOSED TASKS METRICS SAVED TO: {closed_tasks_metrics_path}")
 
     except Exception as e:
         logger.error(f"ERROR GENERATING CLOSED TASKS CHART: {str(e)}", exc_info=True)
         # Still include count in summary data even if chart creation fails
+        chart_paths.pop('completed_tasks_no_comments', None)
         if 'closed_tasks' in locals() and not closed_tasks.empty:
             chart_paths['completed_tasks_no_comments_count'] = len(closed_tasks)
 
@@ -655,4 +819,4 @@ def run_analysis(use_filter=True, filter_id=114476, jql_query=None, date_from=No
         logger.error(f"Error during analysis: {e}", exc_info=True)
         analysis_state['status_message'] = f"An error occurred: {str(e)}"
     finally:
-        analysis_state['is_running'] = False
\ No newline at end of file
+        analysis_state['is_running'] = False
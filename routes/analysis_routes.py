@@ -1,16 +1,26 @@
+import io
 import os
-import json
 import logging
 import shutil
-import threading
-from flask import render_template, request, redirect, url_for, send_from_directory
-from modules.analysis import run_analysis
-from routes.main_routes import analysis_state
+from flask import render_template, request, redirect, url_for, send_from_directory, send_file
+from modules.render_cache import RenderCache, load_chart_specs
+from routes.main_routes import job_manager, render_index
+from modules.jobs import JobQueueFull
+from modules.report_catalog import ReportCatalog
+from modules.status_classifier import parse_status_mapping
+from modules.key_index import clear_key_cache
+from modules.saved_filters import delete_report_filters
 from modules.utils import format_timestamp_for_display
+from modules.report_store import read_json
+from modules.perf import PERF_FILE
+from modules.profiling import PROFILE_DIR
 
 # Get logger
 logger = logging.getLogger(__name__)
 
+# Seconds a client is asked to wait before starting an analysis again when the job queue is full
+QUEUE_FULL_RETRY_AFTER = 60
+
 # Dictionary with metrics tooltips
 metrics_tooltips = {
     'projects_count': 'Количество уникальных проектов, найденных в анализируемых задачах',
@@ -29,13 +39,12 @@ metrics_tooltips = {
 
 def register_analysis_routes(app):
     """Register routes for analysis operation and viewing"""
+    # Shared cache of charts rendered on demand
+    render_cache = RenderCache()
 
     @app.route('/start_analysis', methods=['POST'])
     def start_analysis():
         """Handle starting a new analysis"""
-        if analysis_state['is_running']:
-            return redirect(url_for('index'))
-
         # Get data source (jira or clm)
         data_source = request.form.get('data_source', 'jira')
 
@@ -48,6 +57,16 @@ def register_analysis_routes(app):
         date_from = date_from if date_from else None
         date_to = date_to if date_to else None
 
+        # Profile the run and save the results to the report
+        profiling = request.form.get('profiling') == 'yes'
+
+        # Status overrides of this analysis; without them config.status_mapping applies
+        try:
+            status_mapping = parse_status_mapping(request.form.get('status_mapping', ''))
+        except ValueError as e:
+            logger.warning(f"Analysis not started: {e}")
+            return render_index(error=f'Анализ не запущен: неверное сопоставление статусов. {e}'), 400
+
         # Source-specific parameters
         if data_source == 'jira':
             # Standard Jira analysis
@@ -62,13 +81,25 @@ def register_analysis_routes(app):
             clm_filter_id = request.form.get('clm_filter_id', '114473')
             clm_jql_query = request.form.get('clm_jql_query', '')
 
-        # Start analysis in a separate thread
-        analysis_thread = threading.Thread(
-            target=run_analysis,
-            args=(data_source, use_filter, filter_id, jql_query, date_from, date_to, clm_filter_id, clm_jql_query)
-        )
-        analysis_thread.daemon = True
-        analysis_thread.start()
+        # Queue the analysis; an identical analysis that is already queued or running is reused
+        try:
+            job_manager.submit(data_source=data_source, use_filter=use_filter, filter_id=filter_id,
+                               jql_query=jql_query, date_from=date_from, date_to=date_to,
+                               clm_filter_id=clm_filter_id, clm_jql_query=clm_jql_query, status_mapping=status_mapping or None,
+                               profiling=profiling)
+        except JobQueueFull as e:
+            logger.warning(f"Analysis not started: {e}")
+            # The form is shown again with the error, and clients are told when to retry
+            return (render_index(error='Анализ не запущен: очередь анализов заполнена. Повторите попытку позже.'),
+                    503, {'Retry-After': str(QUEUE_FULL_RETRY_AFTER)})
+
+        return redirect(url_for('index'))
+
+    @app.route('/cancel/<job_id>', methods=['POST'])
+    def cancel_analysis(job_id):
+        """Handle cancelling a queued or running analysis"""
+        if not job_manager.cancel(job_id):
+            logger.warning(f"Job {job_id} is not active, nothing to cancel")
 
         return redirect(url_for('index'))
 
@@ -87,8 +118,7 @@ def register_analysis_routes(app):
 
         if os.path.exists(chart_data_path):
             try:
-                with open(chart_data_path, 'r', encoding='utf-8') as f:
-                    chart_data = json.load(f)
+                chart_data = read_json(chart_data_path)
             except Exception as e:
                 logger.error(f"Error reading chart data: {e}")
                 chart_data = {}  # Ensure it's initialized even on error
@@ -159,29 +189,33 @@ def register_analysis_routes(app):
                 if chart_type and chart_type not in chart_files:
                     chart_files[chart_type] = os.path.join(timestamp, filename)
 
+        # Charts of newer reports are rendered on first request from their saved specs
+        for filename, spec in load_chart_specs(folder_path).items():
+            if spec['name'] not in chart_files:
+                chart_files[spec['name']] = os.path.join(timestamp, filename)
+
         # Load summary data if available
         summary_data = {}
         summary_file = os.path.join(folder_path, 'summary.json')
         if os.path.exists(summary_file):
             try:
-                with open(summary_file, 'r', encoding='utf-8') as f:
-                    summary_data = json.load(f)
+                summary_data = read_json(summary_file)
             except Exception as e:
                 logger.error(f"Error reading summary file: {e}")
 
         # Check metrics directory for additional data
+        perf_data = None
         metrics_dir = os.path.join(folder_path, 'metrics')
         if os.path.exists(metrics_dir):
             # Look for open tasks metrics
             open_tasks_metrics = os.path.join(metrics_dir, 'open_tasks.json')
             if os.path.exists(open_tasks_metrics):
                 try:
-                    with open(open_tasks_metrics, 'r', encoding='utf-8') as f:
-                        open_tasks_data = json.load(f)
-                        if 'count' in open_tasks_data:
-                            summary_data['open_tasks_count'] = open_tasks_data['count']
-                        if 'total_time_spent' in open_tasks_data:
-                            summary_data['open_tasks_time_spent_hours'] = open_tasks_data['total_time_spent']
+                    open_tasks_data = read_json(open_tasks_metrics)
+                    if 'count' in open_tasks_data:
+                        summary_data['open_tasks_count'] = open_tasks_data['count']
+                    if 'total_time_spent' in open_tasks_data:
+                        summary_data['open_tasks_time_spent_hours'] = open_tasks_data['total_time_spent']
                 except Exception as e:
                     logger.error(f"Error loading open tasks metrics: {e}")
 
@@ -189,10 +223,9 @@ def register_analysis_routes(app):
             closed_tasks_metrics = os.path.join(metrics_dir, 'closed_tasks.json')
             if os.path.exists(closed_tasks_metrics):
                 try:
-                    with open(closed_tasks_metrics, 'r', encoding='utf-8') as f:
-                        closed_tasks_data = json.load(f)
-                        if 'count' in closed_tasks_data:
-                            summary_data['completed_tasks_no_comments_count'] = closed_tasks_data['count']
+                    closed_tasks_data = read_json(closed_tasks_metrics)
+                    if 'count' in closed_tasks_data:
+                        summary_data['completed_tasks_no_comments_count'] = closed_tasks_data['count']
                 except Exception as e:
                     logger.error(f"Error loading closed tasks metrics: {e}")
 
@@ -200,31 +233,40 @@ def register_analysis_routes(app):
             no_transitions_metrics = os.path.join(metrics_dir, 'no_transitions_tasks.json')
             if os.path.exists(no_transitions_metrics):
                 try:
-                    with open(no_transitions_metrics, 'r', encoding='utf-8') as f:
-                        no_transitions_data = json.load(f)
-                        if 'count' in no_transitions_data:
-                            summary_data['no_transitions_tasks_count'] = no_transitions_data['count']
+                    no_transitions_data = read_json(no_transitions_metrics)
+                    if 'count' in no_transitions_data:
+                        summary_data['no_transitions_tasks_count'] = no_transitions_data['count']
                 except Exception as e:
                     logger.error(f"Error loading no transitions tasks metrics: {e}")
 
+            # Stage timings of the analysis
+            try:
+                perf_data = read_json(os.path.join(metrics_dir, PERF_FILE))
+            except Exception as e:
+                logger.error(f"Error loading stage timings: {e}")
+
             # Check for CLM metrics
             clm_metrics = os.path.join(metrics_dir, 'clm_metrics.json')
             if os.path.exists(clm_metrics):
                 try:
-                    with open(clm_metrics, 'r', encoding='utf-8') as f:
-                        clm_data = json.load(f)
-                        for key, value in clm_data.items():
-                            summary_data[key] = value
+                    clm_data = read_json(clm_metrics)
+                    for key, value in clm_data.items():
+                        summary_data[key] = value
                 except Exception as e:
                     logger.error(f"Error loading CLM metrics: {e}")
 
+        # Profiling results, if the run was profiled
+        profile_files = []
+        profile_dir = os.path.join(folder_path, PROFILE_DIR)
+        if os.path.isdir(profile_dir):
+            profile_files = sorted(os.listdir(profile_dir))
+
         # Load index file if available
         index_data = {}
         index_file = os.path.join(folder_path, 'index.json')
         if os.path.exists(index_file):
             try:
-                with open(index_file, 'r', encoding='utf-8') as f:
-                    index_data = json.load(f)
+                index_data = read_json(index_file)
             except Exception as e:
                 logger.error(f"Error reading index file: {e}")
 
@@ -257,6 +299,8 @@ def register_analysis_routes(app):
             'clm_jql_query': index_data.get('clm_jql_query'),
             'data_source': index_data.get('data_source', 'jira'),
             'chart_data': chart_data,
+            'perf': perf_data,
+            'profile_files': profile_files,
             'tooltips': metrics_tooltips
         }
 
@@ -278,6 +322,15 @@ def register_analysis_routes(app):
             # Path with directory, like "timestamp/chart.png"
             dir_path = os.path.join(CHARTS_DIR, os.path.dirname(filename))
             basename = os.path.basename(filename)
+
+            # Charts that were not rendered during analysis are rendered from the saved spec
+            if not os.path.exists(os.path.join(dir_path, basename)) and len(parts) == 2:
+                spec = load_chart_specs(dir_path).get(basename)
+                if spec:
+                    image = render_cache.get_image(spec)
+                    if image:
+                        return send_file(io.BytesIO(image), mimetype='image/png')
+
             return send_from_directory(dir_path, basename)
 
     @app.route('/delete_reports', methods=['POST'])
@@ -289,15 +342,26 @@ def register_analysis_routes(app):
         if not selected_reports:
             return redirect(url_for('index'))
 
+        deleted_reports = []
         for report_id in selected_reports:
             report_path = os.path.join(CHARTS_DIR, report_id)
 
             if os.path.exists(report_path) and os.path.isdir(report_path):
+                # Jira filters of the report's chart links, listed in the report itself
+                delete_report_filters(report_path)
+
                 try:
                     # Recursively delete the report directory
                     shutil.rmtree(report_path)
+                    deleted_reports.append(report_id)
                     logger.info(f"Deleted report: {report_id}")
                 except Exception as e:
                     logger.error(f"Error deleting report {report_id}: {str(e)}")
+            else:
+                # Already gone from disk, only drop it from the catalog
+                deleted_reports.append(report_id)
+
+        ReportCatalog().remove_reports(deleted_reports)
+        clear_key_cache()
 
         return redirect(url_for('index'))
\ No newline at end of file
@@ -1,9 +1,11 @@
 import os
-import json
 import logging
 from flask import request, jsonify
 from modules.log_buffer import get_logs
 from modules.data_processor import get_improved_open_statuses
+from modules.key_index import get_issue_keys
+from modules.saved_filters import keys_to_jql
+from modules.jira_analyzer import get_jira_url
 import pandas as pd
 
 # Get logger
@@ -40,50 +42,9 @@ def register_api_routes(app):
             list: List of issue keys
         """
         try:
-            # Path to the issue keys file
-            issue_keys_dir = os.path.join(CHARTS_DIR, timestamp, 'data')
-            clm_keys_path = os.path.join(issue_keys_dir, 'clm_issue_keys.json')
-
-            if not os.path.exists(clm_keys_path):
-                logger.error(f"CLM issue keys file not found: {clm_keys_path}")
-                return []
-
-            with open(clm_keys_path, 'r', encoding='utf-8') as f:
-                clm_data = json.load(f)
-
-                # Get keys based on chart type
-                if chart_type == 'clm_issues':
-                    keys = clm_data.get('clm_issue_keys', [])
-                elif chart_type == 'est_issues':
-                    keys = clm_data.get('est_issue_keys', [])
-                elif chart_type == 'improvement_issues':
-                    keys = clm_data.get('improvement_issue_keys', [])
-                elif chart_type == 'linked_issues':
-                    keys = clm_data.get('implementation_issue_keys', [])
-                elif chart_type == 'filtered_issues':
-                    keys = clm_data.get('filtered_issue_keys', [])
-                elif chart_type == 'open_tasks':
-                    # Use pre-computed open task keys if available
-                    keys = clm_data.get('open_tasks_issue_keys', [])
-                elif chart_type == 'project_issues':
-                    # IMPROVED: Use the project_issue_mapping directly
-                    if project != 'all' and 'project_issue_mapping' in clm_data:
-                        keys = clm_data.get('project_issue_mapping', {}).get(project, [])
-                    else:
-                        keys = clm_data.get('filtered_issue_keys', [])
-                else:
-                    # Default to filtered issues
-                    keys = clm_data.get('filtered_issue_keys', [])
-
-                # If we need to filter by project and we're not already using project mapping
-                if project != 'all' and chart_type != 'project_issues' and 'project_issue_mapping' in clm_data:
-                    # Get all issues for this project
-                    project_issues = clm_data.get('project_issue_mapping', {}).get(project, [])
-                    # Filter the keys to only those in this project
-                    keys = [key for key in keys if key in project_issues]
-
-                logger.info(f"Found {len(keys)} issue keys for chart type {chart_type}, project {project}")
-                return keys
+            keys = get_issue_keys(os.path.join(CHARTS_DIR, timestamp), chart_type, project)
+            logger.info(f"Found {len(keys)} issue keys for chart type {chart_type}, project {project}")
+            return keys
 
         except Exception as e:
             logger.error(f"Error getting issue keys for CLM chart: {e}")
@@ -103,25 +64,8 @@ def register_api_routes(app):
             issue_keys = get_issue_keys_for_clm_chart(timestamp, project, 'project_issues')
 
             if issue_keys:
-                # IMPROVED: Always use issue keys when available, with batch handling for large sets
-                if len(issue_keys) <= 100:
-                    # For a reasonable number of issues, list them directly
-                    jql = f'issue in ({", ".join(issue_keys)})'
-                elif len(issue_keys) <= 1000:
-                    # For medium-sized sets, split into batches with OR
-                    batch_size = 100
-                    batches = [issue_keys[i:i + batch_size] for i in range(0, len(issue_keys), batch_size)]
-                    batch_conditions = [f'issue in ({", ".join(batch)})' for batch in batches]
-                    jql = ' OR '.join(batch_conditions)
-                else:
-                    # For very large sets, we need to be careful with query length
-                    # Just use the first 1000 issues with a warning note
-                    limited_keys = issue_keys[:1000]
-                    batch_size = 100
-                    batches = [limited_keys[i:i + batch_size] for i in range(0, len(limited_keys), batch_size)]
-                    batch_conditions = [f'issue in ({", ".join(batch)})' for batch in batches]
-                    jql = ' OR '.join(batch_conditions)
-                    logger.warning(f"JQL query limited to first 1000 of {len(issue_keys)} issue keys")
+                # Link the exact key set, through a saved filter for large sets
+                jql = keys_to_jql(os.path.join(CHARTS_DIR, timestamp), 'project_issues', project, issue_keys)
             else:
                 # If no issue keys found, use a simple project filter
                 jql = f'project = {project}'
@@ -188,7 +132,7 @@ def register_api_routes(app):
             jql = final_jql
 
         # Create URL for Jira
-        jira_url = "https://jira.nexign.com/issues/?jql=" + jql.replace(" ", "%20")
+        jira_url = f"{get_jira_url()}/issues/?jql=" + jql.replace(" ", "%20")
 
         # Return JSON with URL and JQL
         return jsonify({
@@ -221,7 +165,7 @@ def register_api_routes(app):
         if not chart_type:
             return jsonify({
                 'error': 'chart_type is required',
-                'url': 'https://jira.nexign.com',
+                'url': get_jira_url(),
                 'jql': ''
             }), 400
 
@@ -230,24 +174,8 @@ def register_api_routes(app):
             issue_keys = get_issue_keys_for_clm_chart(timestamp, project, chart_type)
 
             if issue_keys:
-                # IMPROVED: Always use issue keys when available, with batch handling
-                if len(issue_keys) <= 100:
-                    # For a reasonable number of issues, list them directly
-                    jql = f'issue in ({", ".join(issue_keys)})'
-                elif len(issue_keys) <= 1000:
-                    # For medium-sized sets, split into batches with OR
-                    batch_size = 100
-                    batches = [issue_keys[i:i + batch_size] for i in range(0, len(issue_keys), batch_size)]
-                    batch_conditions = [f'issue in ({", ".join(batch)})' for batch in batches]
-                    jql = ' OR '.join(batch_conditions)
-                else:
-                    # For very large sets, limit to first 1000 issues
-                    limited_keys = issue_keys[:1000]
-                    batch_size = 100
-                    batches = [limited_keys[i:i + batch_size] for i in range(0, len(limited_keys), batch_size)]
-                    batch_conditions = [f'issue in ({", ".join(batch)})' for batch in batches]
-                    jql = ' OR '.join(batch_conditions)
-                    logger.warning(f"JQL query limited to first 1000 of {len(issue_keys)} issue keys")
+                # Link the exact key set, through a saved filter for large sets
+                jql = keys_to_jql(os.path.join(CHARTS_DIR, timestamp), chart_type, project, issue_keys)
             else:
                 # If no issue keys found, use a fallback query
                 if chart_type == 'open_tasks':
@@ -356,7 +284,7 @@ def register_api_routes(app):
             jql = final_jql
 
         # Create URL for Jira
-        jira_url = "https://jira.nexign.com/issues/?jql=" + jql.replace(" ", "%20")
+        jira_url = f"{get_jira_url()}/issues/?jql=" + jql.replace(" ", "%20")
 
         # Log the generated query
         logger.info(f"Generated special JQL for {chart_type}, project {project}: {jql}")
@@ -1,21 +1,120 @@
 import os
 import logging
 from datetime import datetime, timedelta
-from flask import render_template, jsonify
+from flask import render_template, jsonify, request, Response
 from modules.utils import format_timestamp_for_display
+from modules.analysis import run_analysis
+from modules.jobs import JobManager
+from modules.report_catalog import ReportCatalog
+from modules.event_stream import event_stream, format_sse, LOG_EVENT, STATUS_EVENT
 
 # Get logger
 logger = logging.getLogger(__name__)
 
-# Global analysis state
-analysis_state = {
-    'is_running': False,
-    'last_run': None,
-    'progress': 0,
-    'total_issues': 0,
-    'status_message': '',
-    'current_folder': None
-}
+# Analysis jobs of all users, each with its own progress state
+job_manager = JobManager(run_analysis)
+
+# Number of reports per page in the report history
+REPORTS_PER_PAGE = 50
+
+# Seconds between keep-alive comments on an idle /events stream
+EVENTS_KEEPALIVE_SECONDS = 15
+
+# Reconnection delay suggested to EventSource clients, in milliseconds
+EVENTS_RETRY_MS = 3000
+
+# Log records sent to a client that connects to /events for the first time
+EVENTS_INITIAL_LOGS = 50
+
+
+def get_status():
+    """
+    Get the status of all queued and running analyses
+
+    Returns:
+        dict: Active jobs, with top-level fields describing the most recently started one
+    """
+    jobs = [job.to_dict() for job in job_manager.active_jobs()]
+
+    # Top-level fields describe the most recently started job
+    running = [job for job in jobs if job['status'] == 'running']
+    current = running[-1] if running else (jobs[-1] if jobs else {})
+
+    return {
+        'is_running': bool(jobs),
+        'progress': current.get('progress', 0),
+        'status_message': current.get('status_message', ''),
+        'total_issues': current.get('total_issues', 0),
+        'jobs': jobs
+    }
+
+
+def generate_events(last_id, limit):
+    """
+    Generate the /events stream of one client
+
+    Args:
+        last_id (int): Last sequence number the client saw (Last-Event-ID), None for a new client
+        limit (int): Number of recent log records sent to a new client
+
+    Yields:
+        str: Server-Sent Events
+    """
+    yield f"retry: {EVENTS_RETRY_MS}\n\n"
+
+    # A new client, or one that saw events from before a server restart, starts from a snapshot
+    if last_id is None or last_id > event_stream.last_id:
+        records, _, last_id = event_stream.read(0)
+        yield format_sse(STATUS_EVENT, get_status())
+        yield format_sse(LOG_EVENT, [str(record) for _, record in records[-limit:]], last_id)
+
+    while True:
+        records, changed, latest = event_stream.wait(last_id, EVENTS_KEEPALIVE_SECONDS)
+        if latest == last_id:
+            # Comment lines keep proxies from closing the connection and detect gone clients
+            yield ": keep-alive\n\n"
+            continue
+
+        # The last event of a batch carries the latest sequence number
+        status_changed = STATUS_EVENT in changed
+        if records:
+            yield format_sse(LOG_EVENT, [str(record) for _, record in records], None if status_changed else latest)
+        if status_changed:
+            yield format_sse(STATUS_EVENT, get_status(), latest)
+        last_id = latest
+
+
+def render_index(error=None):
+    """
+    Render the main page
+
+    Args:
+        error (str): Error message shown above the analysis form
+
+    Returns:
+        str: Rendered page
+    """
+    # Get a page of analysis reports (sorted by date in reverse order) from the report catalog
+    report_catalog = ReportCatalog()
+    total_pages = max(1, -(-report_catalog.count_reports() // REPORTS_PER_PAGE))
+    page = min(max(request.args.get('page', 1, type=int), 1), total_pages)
+
+    analysis_folders = report_catalog.list_reports(offset=(page - 1) * REPORTS_PER_PAGE, limit=REPORTS_PER_PAGE)
+    for info in analysis_folders:
+        info['display_timestamp'] = format_timestamp_for_display(info['timestamp'])
+
+    # Default date values (month ago - today)
+    today = datetime.now().strftime('%Y-%m-%d')
+    month_ago = (datetime.now() - timedelta(days=30)).strftime('%Y-%m-%d')
+
+    return render_template('index.html',
+                           active_jobs=[job.to_dict() for job in job_manager.active_jobs()],
+                           analysis_folders=analysis_folders,
+                           page=page,
+                           total_pages=total_pages,
+                           default_from=month_ago,
+                           default_to=today,
+                           error=error)
 
 
 def register_main_routes(app):
@@ -24,59 +123,37 @@ def register_main_routes(app):
     @app.route('/')
     def index():
         """Render the main page"""
-        # Get list of all analysis folders (sorted by date in reverse order)
-        CHARTS_DIR = 'jira_charts'
-        analysis_folders = []
-
-        for folder in sorted(os.listdir(CHARTS_DIR), reverse=True):
-            folder_path = os.path.join(CHARTS_DIR, folder)
-            if os.path.isdir(folder_path) and folder != 'data':
-                index_file = os.path.join(folder_path, 'index.json')
-                info = {
-                    'timestamp': folder,
-                    'display_timestamp': format_timestamp_for_display(folder),
-                    'charts_count': 0,
-                    'total_issues': 0,
-                    'date_from': None,
-                    'date_to': None,
-                    'analysis_type': 'jira'  # Default to 'jira' if not specified
-                }
-
-                if os.path.exists(index_file):
-                    try:
-                        import json
-                        with open(index_file, 'r', encoding='utf-8') as f:
-                            data = json.load(f)
-                            info['charts_count'] = len(data.get('charts', {}))
-                            info['total_issues'] = data.get('total_issues', 0)
-                            info['date_from'] = data.get('date_from')
-                            info['date_to'] = data.get('date_to')
-                            # Include the data source type (jira or clm)
-                            info['analysis_type'] = data.get('data_source', 'jira')
-                    except Exception as e:
-                        logger.error(f"Error reading index file {index_file}: {e}")
-
-                analysis_folders.append(info)
-
-        # Default date values (month ago - today)
-        today = datetime.now().strftime('%Y-%m-%d')
-        month_ago = (datetime.now() - timedelta(days=30)).strftime('%Y-%m-%d')
-
-        return render_template('index.html',
-                               analysis_state=analysis_state,
-                               analysis_folders=analysis_folders,
-                               default_from=month_ago,
-                               default_to=today)
+        return render_index()
 
     @app.route('/status')
     def status():
-        """Return the current analysis status"""
-        return {
-            'is_running': analysis_state['is_running'],
-            'progress': analysis_state['progress'],
-            'status_message': analysis_state['status_message'],
-            'total_issues': analysis_state['total_issues']
-        }
+        """Return the status of all queued and running analyses"""
+        return get_status()
+
+    @app.route('/events')
+    def events():
+        """
+        Stream job status changes and new log records as Server-Sent Events.
+
+        'status' events carry the same data as /status, 'log' events a list of
+        new log records. Every event id is a sequence number; a reconnecting
+        client sends the last one as Last-Event-ID and receives only what it missed.
+        """
+        last_id = request.headers.get('Last-Event-ID', type=int)
+        if last_id is None:
+            last_id = request.args.get('last_id', type=int)
+        limit = request.args.get('limit', default=EVENTS_INITIAL_LOGS, type=int)
+
+        return Response(generate_events(last_id, limit), mimetype='text/event-stream',
+                        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+    @app.route('/status/<job_id>')
+    def job_status(job_id):
+        """Return the status of a single analysis job"""
+        job = job_manager.get(job_id)
+        if not job:
+            return jsonify({'error': f'Job {job_id} not found'}), 404
+        return job.to_dict()
 
     @app.errorhandler(404)
     def page_not_found(e):
@@ -463,6 +463,103 @@ document.addEventListener('DOMContentLoaded', function() {
         } else {
             console.log("Projects pie chart not initialized - missing element or data");
         }
+
+        // Lead time and cycle time chart (медиана по закрытым задачам)
+        const ctxLeadCycle = document.getElementById('leadCycleTimeChart');
+        if (ctxLeadCycle && chartData.flow && Object.keys(chartData.flow.lead_time_days || {}).length > 0) {
+            console.log("Initializing lead and cycle time chart");
+
+            const flowData = chartData.flow;
+            // Projects with the slowest deliveries first
+            const flowProjects = Object.keys(flowData.lead_time_days)
+                .sort((a, b) => flowData.lead_time_days[b] - flowData.lead_time_days[a]);
+
+            try {
+                new Chart(ctxLeadCycle.getContext('2d'), {
+                    type: 'bar',
+                    data: {
+                        labels: flowProjects,
+                        datasets: [{
+                            label: 'Lead time (дни)',
+                            data: flowProjects.map(project => flowData.lead_time_days[project] || 0),
+                            backgroundColor: 'rgba(54, 162, 235, 0.7)',
+                            borderColor: 'rgba(54, 162, 235, 1)',
+                            borderWidth: 1
+                        }, {
+                            label: 'Cycle time (дни)',
+                            data: flowProjects.map(project => flowData.cycle_time_days[project] || 0),
+                            backgroundColor: 'rgba(255, 159, 64, 0.7)',
+                            borderColor: 'rgba(255, 159, 64, 1)',
+                            borderWidth: 1
+                        }]
+                    },
+                    options: {
+                        ...commonOptions,
+                        plugins: {
+                            ...commonOptions.plugins,
+                            tooltip: {
+                                callbacks: {
+                                    afterBody: function(items) {
+                                        const project = items[0].label;
+                                        return `Закрыто задач: ${flowData.resolved_by_project[project] || 0}`;
+                                    }
+                                }
+                            }
+                        }
+                    }
+                });
+            } catch (err) {
+                console.error("Error creating lead and cycle time chart:", err);
+            }
+        } else {
+            console.log("Lead and cycle time chart not initialized - missing element or data");
+        }
+
+        // Time in status chart, one stacked bar per project
+        const ctxTimeInStatus = document.getElementById('timeInStatusChart');
+        if (ctxTimeInStatus && chartData.flow && Object.keys(chartData.flow.time_in_status_hours || {}).length > 0) {
+            console.log("Initializing time in status chart");
+
+            const timeInStatus = chartData.flow.time_in_status_hours;
+            const statusProjects = Object.keys(timeInStatus).sort();
+
+            // Statuses ordered by total time, so the largest parts are at the bottom of the stack
+            const statusTotals = {};
+            statusProjects.forEach(project => {
+                Object.entries(timeInStatus[project]).forEach(([status, hours]) => {
+                    statusTotals[status] = (statusTotals[status] || 0) + hours;
+                });
+            });
+            const statusNames = Object.keys(statusTotals).sort((a, b) => statusTotals[b] - statusTotals[a]);
+            const statusColors = getChartColors(statusNames.length);
+
+            try {
+                new Chart(ctxTimeInStatus.getContext('2d'), {
+                    type: 'bar',
+                    data: {
+                        labels: statusProjects,
+                        datasets: statusNames.map((status, index) => ({
+                            label: status,
+                            data: statusProjects.map(project => timeInStatus[project][status] || 0),
+                            backgroundColor: statusColors[index],
+                            borderColor: statusColors[index].replace('0.7', '1'),
+                            borderWidth: 1
+                        }))
+                    },
+                    options: {
+                        ...commonOptions,
+                        scales: {
+                            x: { ...commonOptions.scales.x, stacked: true },
+                            y: { ...commonOptions.scales.y, stacked: true }
+                        }
+                    }
+                });
+            } catch (err) {
+                console.error("Error creating time in status chart:", err);
+            }
+        } else {
+            console.log("Time in status chart not initialized - missing element or data");
+        }
     } catch (error) {
         console.error('Error initializing charts:', error);
     }
@@ -29,6 +29,24 @@ document.addEventListener('DOMContentLoaded', function() {
         }
     }
 
+    // Function to add a log entry to the console
+    function appendLogEntry(log) {
+        const logEntry = document.createElement('div');
+        logEntry.className = 'log-entry';
+
+        // Add color classes based on log level
+        if (log.includes(' - ERROR - ')) {
+            logEntry.classList.add('error');
+        } else if (log.includes(' - WARNING - ')) {
+            logEntry.classList.add('warning');
+        } else if (log.includes(' - INFO - ')) {
+            logEntry.classList.add('info');
+        }
+
+        logEntry.textContent = log;
+        logConsole.appendChild(logEntry);
+    }
+
     // Function to fetch and display logs
     function fetchLogs() {
         const limit = logLimitSelect.value;
@@ -39,22 +57,7 @@ document.addEventListener('DOMContentLoaded', function() {
                 logConsole.innerHTML = '';
 
                 // Add each log entry
-                logs.forEach(log => {
-                    const logEntry = document.createElement('div');
-                    logEntry.className = 'log-entry';
-
-                    // Add color classes based on log level
-                    if (log.includes(' - ERROR - ')) {
-                        logEntry.classList.add('error');
-                    } else if (log.includes(' - WARNING - ')) {
-                        logEntry.classList.add('warning');
-                    } else if (log.includes(' - INFO - ')) {
-                        logEntry.classList.add('info');
-                    }
-
-                    logEntry.textContent = log;
-                    logConsole.appendChild(logEntry);
-                });
+                logs.forEach(appendLogEntry);
 
                 // Scroll to bottom
                 logConsole.scrollTop = logConsole.scrollHeight;
@@ -65,14 +68,39 @@ document.addEventListener('DOMContentLoaded', function() {
             });
     }
 
+    // Function to add records pushed by the event stream
+    function onLogEvent(event) {
+        if (!autoRefreshCheckbox.checked) return;
+
+        const atBottom = logConsole.scrollTop + logConsole.clientHeight >= logConsole.scrollHeight - 5;
+        JSON.parse(event.data).forEach(appendLogEntry);
+
+        // Keep only the selected number of entries
+        const limit = parseInt(logLimitSelect.value, 10);
+        while (logConsole.children.length > limit) {
+            logConsole.removeChild(logConsole.firstChild);
+        }
+
+        // Follow new records unless the user scrolled up
+        if (atBottom) {
+            logConsole.scrollTop = logConsole.scrollHeight;
+        }
+    }
+
     // Function to clear logs
     function clearLogs() {
         logConsole.innerHTML = '';
     }
 
+    // New records are pushed by the event stream of main.js; poll only without it
+    const events = window.jiraEvents;
+
     // Function to start/stop auto refresh
     function toggleAutoRefresh() {
-        if (autoRefreshCheckbox.checked) {
+        if (events) {
+            // The stream keeps running, onLogEvent checks the checkbox
+            if (autoRefreshCheckbox.checked) fetchLogs();
+        } else if (autoRefreshCheckbox.checked) {
             // Start auto refresh
             logRefreshInterval = setInterval(fetchLogs, DEFAULT_REFRESH_INTERVAL);
         } else {
@@ -81,12 +109,17 @@ document.addEventListener('DOMContentLoaded', function() {
         }
     }
 
-    // Initialize with first log fetch
-    fetchLogs();
+    if (events) {
+        // The stream starts with the most recent records
+        events.addEventListener('log', onLogEvent);
+    } else {
+        // Initialize with first log fetch
+        fetchLogs();
 
-    // Set up auto refresh if checked
-    if (autoRefreshCheckbox.checked) {
-        logRefreshInterval = setInterval(fetchLogs, DEFAULT_REFRESH_INTERVAL);
+        // Set up auto refresh if checked
+        if (autoRefreshCheckbox.checked) {
+            logRefreshInterval = setInterval(fetchLogs, DEFAULT_REFRESH_INTERVAL);
+        }
     }
 
     // Add event listeners
@@ -128,30 +128,48 @@ document.addEventListener('DOMContentLoaded', function() {
         };
     }
 
-    // Update status if analysis is running
+    // Update status of queued and running analyses
+    const updateJobs = function(data) {
+        const activeJobs = {};
+        (data.jobs || []).forEach(job => { activeJobs[job.job_id] = job; });
+
+        let jobFinished = false;
+        document.querySelectorAll('[data-job-id]').forEach(jobElement => {
+            const job = activeJobs[jobElement.dataset.jobId];
+            if (!job) {
+                jobFinished = true;
+                return;
+            }
+
+            const statusMessage = jobElement.querySelector('.job-status-message');
+            const progressBar = jobElement.querySelector('.job-progress-bar');
+
+            if (statusMessage && progressBar) {
+                statusMessage.textContent = job.status_message;
+                progressBar.style.width = job.progress + '%';
+                progressBar.setAttribute('aria-valuenow', job.progress);
+                progressBar.textContent = job.progress + '%';
+            }
+        });
+
+        return jobFinished;
+    };
+
+    const reloadOnFinish = function() {
+        // If an analysis is complete, reload page to show the new report
+        setTimeout(() => { window.location.reload(); }, 1000);
+    };
+
+    // Polling fallback for browsers without EventSource
     const refreshStatus = function() {
         fetch('/status')
             .then(response => response.json())
             .then(data => {
-                // If analysis is running, update progress
-                if (data.is_running) {
-                    const statusMessage = document.getElementById('status-message');
-                    const progressBar = document.getElementById('progress-bar');
-
-                    if (statusMessage && progressBar) {
-                        statusMessage.textContent = data.status_message;
-                        progressBar.style.width = data.progress + '%';
-                        progressBar.setAttribute('aria-valuenow', data.progress);
-                        progressBar.textContent = data.progress + '%';
-                    }
-
+                if (updateJobs(data)) {
+                    reloadOnFinish();
+                } else {
                     // Schedule next update in 1 second
                     setTimeout(refreshStatus, 1000);
-                } else {
-                    // If analysis is complete, reload page
-                    if (document.getElementById('status-message')) {
-                        setTimeout(() => { window.location.reload(); }, 1000);
-                    }
                 }
             })
             .catch(error => {
@@ -161,8 +179,27 @@ document.addEventListener('DOMContentLoaded', function() {
             });
     };
 
-    // Start status updates if analysis is running
-    if (document.querySelector('[data-analysis-running="true"]')) {
+    const analysisRunning = document.querySelector('[data-analysis-running="true"]');
+    const logConsoleElement = document.getElementById('log-console');
+
+    // One event stream per page pushes status changes and new log records.
+    // The browser reconnects by itself and sends Last-Event-ID to get only what it missed.
+    if (window.EventSource && (analysisRunning || logConsoleElement)) {
+        const logLimit = document.getElementById('log-limit');
+        const params = logLimit ? `?limit=${logLimit.value}` : '';
+        const events = new EventSource(`/events${params}`);
+        window.jiraEvents = events;
+
+        if (analysisRunning) {
+            events.addEventListener('status', function(event) {
+                if (updateJobs(JSON.parse(event.data))) {
+                    events.close();
+                    reloadOnFinish();
+                }
+            });
+        }
+    } else if (analysisRunning) {
+        // Start status updates if analysis is running
         setTimeout(refreshStatus, 1000);
     }
 });
\ No newline at end of file
@@ -0,0 +1,106 @@
+import os
+import sys
+import json
+import time
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import pytest
+
+# Tests import the application modules from the repository root
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+import config
+
+# modules.jira_analyzer refuses to load without a token; the stubs accept any
+if not getattr(config, 'api_token', None):
+    config.api_token = 'test'
+
+
+class StubJira:
+    """
+    Minimal HTTP server answering every request with a handler function.
+
+    The handler gets (method, path, body) and returns (status, body) or
+    (status, body, headers); dict bodies are sent as JSON. Every request is
+    recorded with its arrival time.
+    """
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.requests = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                pass
+
+            def _handle(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                body = self.rfile.read(length) if length else b''
+                stub.requests.append({'method': self.command, 'path': self.path, 'time': time.monotonic(),
+                                      'body': json.loads(body) if body else None})
+
+                result = stub.handler(self.command, self.path, body)
+                status, response_body = result[:2]
+                headers = result[2] if len(result) > 2 else {}
+                data = json.dumps(response_body).encode('utf-8') if isinstance(response_body, (dict, list)) \
+                    else str(response_body).encode('utf-8')
+
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_POST = do_PUT = do_DELETE = _handle
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stub_jira():
+    """Start StubJira servers for a test: stub_jira(handler) -> StubJira"""
+    stubs = []
+
+    def start(handler):
+        stub = StubJira(handler)
+        stubs.append(stub)
+        return stub
+
+    yield start
+    for stub in stubs:
+        stub.stop()
+
+
+@pytest.fixture(scope='session')
+def fake_jira():
+    """benchmarks.fake_jira server with 1000 synthetic issues, shared by the tests of a session"""
+    from benchmarks.dataset import SyntheticDataset
+    from benchmarks.fake_jira import FakeJira
+
+    jira = FakeJira(SyntheticDataset(1000))
+    jira.start()
+    yield jira
+    jira.stop()
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """Run a test in an empty directory, so reports and caches never touch the repository"""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
@@ -0,0 +1,136 @@
+import pytest
+
+from modules.issue_cache import IssueCache
+from modules.jira_analyzer import JiraAnalyzer, JiraFetchError, split_order_by
+from modules.jobs import new_job_state, check_cancelled, JobCancelled
+
+QUERY = 'filter=114476'
+
+
+@pytest.fixture
+def analyzer(fake_jira):
+    return JiraAnalyzer(jira_url=fake_jira.url, check_connection=False, max_workers=1)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return IssueCache(str(tmp_path / 'issue_cache.sqlite'))
+
+
+def test_first_sync_streams_pages(fake_jira, analyzer, cache):
+    total = len(fake_jira.engine.search(QUERY)[0])
+    stats = {'hits': 0, 'misses': 0}
+    requests_before = fake_jira.get_stats()['requests']
+    pages = analyzer.iter_cached_issue_pages(QUERY, cache, 'keys', stats)
+
+    # The first page is handed out before the rest of the result set is fetched
+    first_page = next(pages)
+    assert len(first_page) < total
+    assert fake_jira.get_stats()['requests'] - requests_before <= 2
+    assert cache.get_last_sync(QUERY) is None
+
+    keys = [issue['key'] for page in [first_page, *pages] for issue in page]
+    assert len(keys) == total
+    assert stats == {'hits': 0, 'misses': len(keys)}
+    assert cache.get_last_sync(QUERY) is not None
+
+    # The next run reads the same issues from the cache
+    stats = {'hits': 0, 'misses': 0}
+    cached_keys = [issue['key'] for page in analyzer.iter_cached_issue_pages(QUERY, cache, 'keys', stats)
+                   for issue in page]
+    assert cached_keys == keys
+    assert stats['hits'] == len(keys)
+
+
+def test_cancel_stops_first_sync(fake_jira, analyzer, cache):
+    state = new_job_state()
+    requests_before = fake_jira.get_stats()['requests']
+    pages = analyzer.iter_cached_issue_pages(QUERY, cache, 'keys', cancel_check=lambda: check_cancelled(state))
+
+    next(pages)
+    state['cancel_requested'] = True
+    with pytest.raises(JobCancelled):
+        next(pages)
+
+    # Cancelled after the second page, and the query is synced again next time
+    assert fake_jira.get_stats()['requests'] - requests_before <= 3
+    assert cache.get_last_sync(QUERY) is None
+
+
+def test_cancel_stops_incremental_sync(fake_jira, analyzer, cache):
+    for _ in analyzer.iter_cached_issue_pages(QUERY, cache, 'keys'):
+        pass
+
+    state = new_job_state()
+    state['cancel_requested'] = True
+    with pytest.raises(JobCancelled):
+        next(analyzer.iter_cached_issue_pages(QUERY, cache, 'keys', cancel_check=lambda: check_cancelled(state)))
+
+
+def fail_updated_search(analyzer, monkeypatch, start_at=None):
+    """Make Jira fail the search for updated issues, at one offset or on every page"""
+    fetch_search_page = analyzer._fetch_search_page
+    updated_calls = []
+
+    def failing_fetch_search_page(search_url, search_params, page_start_at, page_size=100):
+        if 'updated >=' in search_params['jql']:
+            updated_calls.append(page_start_at)
+            if start_at is None or page_start_at == start_at:
+                return None
+        return fetch_search_page(search_url, search_params, page_start_at, page_size)
+
+    monkeypatch.setattr(analyzer, '_fetch_search_page', failing_fetch_search_page)
+    return updated_calls
+
+
+@pytest.mark.parametrize('start_at', [0, 100], ids=['first-page', 'later-page'])
+def test_failed_incremental_sync_keeps_last_sync(fake_jira, analyzer, cache, monkeypatch, start_at):
+    for _ in analyzer.iter_cached_issue_pages(QUERY, cache, 'keys'):
+        pass
+
+    # Every issue counts as updated, so the search has several pages
+    cache.set_query_result(QUERY, [], '2000-01-01T00:00:00+00:00')
+    last_sync = cache.get_last_sync(QUERY)
+    updated_calls = fail_updated_search(analyzer, monkeypatch, start_at)
+
+    with pytest.raises(JiraFetchError):
+        analyzer.sync_issue_cache(QUERY, cache, 'keys')
+
+    assert start_at in updated_calls
+    assert cache.get_last_sync(QUERY) == last_sync
+
+
+def test_failed_first_sync_is_not_recorded(fake_jira, analyzer, cache, monkeypatch):
+    fetch_search_page = analyzer._fetch_search_page
+
+    def failing_fetch_search_page(search_url, search_params, start_at, page_size=100):
+        return None if start_at == 100 else fetch_search_page(search_url, search_params, start_at, page_size)
+
+    monkeypatch.setattr(analyzer, '_fetch_search_page', failing_fetch_search_page)
+    pages = list(analyzer.iter_cached_issue_pages(QUERY, cache, 'keys'))
+
+    assert pages
+    assert cache.get_last_sync(QUERY) is None
+
+
+def test_incremental_sync_of_ordered_query(fake_jira, analyzer, cache):
+    query = f'{QUERY} ORDER BY key DESC'
+    keys = [issue['key'] for page in analyzer.iter_cached_issue_pages(query, cache, 'keys') for issue in page]
+    first_sync = cache.get_last_sync(query)
+    errors_before = fake_jira.get_stats()['errors']
+
+    stats = {'hits': 0, 'misses': 0}
+    cached_keys = [issue['key'] for page in analyzer.iter_cached_issue_pages(query, cache, 'keys', stats)
+                   for issue in page]
+
+    assert cached_keys == keys
+    assert stats['hits'] == len(keys)
+    assert cache.get_last_sync(query) > first_sync
+    # The updated issues were searched with valid JQL
+    assert fake_jira.get_stats()['errors'] == errors_before
+
+
+def test_split_order_by():
+    assert split_order_by('project = TEST order by created DESC') == ('project = TEST', 'order by created DESC')
+    assert split_order_by('ORDER BY key') == ('', 'ORDER BY key')
+    assert split_order_by('filter=114476') == ('filter=114476', '')
@@ -0,0 +1,76 @@
+import pytest
+
+from modules import jira_analyzer
+from modules.jira_analyzer import JiraAnalyzer
+
+
+@pytest.fixture(autouse=True)
+def fast_backoff(monkeypatch):
+    # Backoff before retry n is factor * 2 ** (n - 1) after the first, immediate retry
+    monkeypatch.setattr(jira_analyzer, 'RETRY_BACKOFF_FACTOR', 0.1)
+
+
+def flaky(failures, status=503, headers=None, body=None):
+    """Handler failing the first requests with an error status, then answering with body"""
+    calls = {'count': 0}
+
+    def handler(method, path, request_body):
+        calls['count'] += 1
+        if calls['count'] <= failures:
+            return status, {'errorMessages': ['Service unavailable']}, headers or {}
+        return 200, body if body is not None else {'startAt': 0, 'maxResults': 50, 'total': 1,
+                                                  'issues': [{'key': 'TEST-1', 'fields': {}}]}
+
+    return handler
+
+
+def test_search_is_retried_with_backoff(stub_jira):
+    stub = stub_jira(flaky(3))
+    analyzer = JiraAnalyzer(jira_url=stub.url, check_connection=False)
+
+    issues = analyzer.get_issues_by_filter(jql_query='project = TEST')
+
+    assert [issue['key'] for issue in issues] == ['TEST-1']
+    assert len(stub.requests) == 4
+    assert analyzer.get_request_stats()['retries'] == 3
+
+    # Retries wait 0, 0.2 and 0.4 seconds
+    gaps = [later['time'] - earlier['time'] for earlier, later in zip(stub.requests, stub.requests[1:])]
+    assert gaps[1] >= 0.2 * 0.9
+    assert gaps[2] >= 0.4 * 0.9
+    assert gaps[2] > gaps[1]
+
+
+def test_retry_after_header_is_honoured(stub_jira):
+    stub = stub_jira(flaky(1, status=429, headers={'Retry-After': '1'}))
+    analyzer = JiraAnalyzer(jira_url=stub.url, check_connection=False)
+
+    assert analyzer.get_issues_by_filter(jql_query='project = TEST')
+    assert len(stub.requests) == 2
+    assert stub.requests[1]['time'] - stub.requests[0]['time'] >= 0.9
+
+
+def test_search_gives_up_after_retry_limit(stub_jira):
+    stub = stub_jira(flaky(100))
+    analyzer = JiraAnalyzer(jira_url=stub.url, check_connection=False)
+
+    assert analyzer.get_issues_by_filter(jql_query='project = TEST') == []
+    assert len(stub.requests) == jira_analyzer.RETRY_TOTAL + 1
+
+
+@pytest.mark.parametrize('status', [500, 502, 503])
+def test_filter_creation_is_not_replayed(stub_jira, status):
+    stub = stub_jira(flaky(1, status=status, body={'id': '1000'}))
+    analyzer = JiraAnalyzer(jira_url=stub.url, check_connection=False)
+
+    # Jira may have saved the filter before failing, so a retry could create a duplicate
+    assert analyzer.create_filter('Report filter', 'project = TEST') is None
+    assert [request['method'] for request in stub.requests] == ['POST']
+
+
+def test_filter_update_is_not_replayed(stub_jira):
+    stub = stub_jira(flaky(1))
+    analyzer = JiraAnalyzer(jira_url=stub.url, check_connection=False)
+
+    assert analyzer.update_filter('1000', 'project = TEST') is False
+    assert len(stub.requests) == 1
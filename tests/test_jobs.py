@@ -0,0 +1,119 @@
+import time
+import threading
+
+import pytest
+
+from modules.jobs import JobManager, JobQueueFull, JOB_FINISHED, JOB_RUNNING, ACTIVE_STATUSES
+
+
+class BlockingTarget:
+    """Job target that holds every job until released and tracks how many run at once"""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.lock = threading.Lock()
+        self.running = 0
+        self.max_running = 0
+
+    def __call__(self, number, analysis_state, status_mapping=None):
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        try:
+            analysis_state['status_message'] = f'job {number}'
+            analysis_state['progress'] = number
+            self.release.wait(10)
+            analysis_state['total_issues'] = number * 10
+        finally:
+            with self.lock:
+                self.running -= 1
+
+
+def wait_for(condition, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, 'timed out'
+        time.sleep(0.01)
+
+
+def test_concurrent_jobs_are_bounded_and_isolated():
+    target = BlockingTarget()
+    manager = JobManager(target, max_workers=2, max_queued=3)
+
+    jobs = [manager.submit(number=1)[0], manager.submit(number=2)[0]]
+    wait_for(lambda: sum(job.status == JOB_RUNNING for job in jobs) == 2)
+
+    # Two jobs run, three wait in the queue and the next one is refused
+    jobs += [manager.submit(number=number)[0] for number in (3, 4, 5)]
+    with pytest.raises(JobQueueFull):
+        manager.submit(number=6)
+    assert len(manager.active_jobs()) == 5
+
+    target.release.set()
+    wait_for(lambda: all(job.status not in ACTIVE_STATUSES for job in jobs))
+
+    assert target.max_running == 2
+    for number, job in enumerate(jobs, start=1):
+        assert job.status == JOB_FINISHED
+        assert job.state['status_message'] == f'job {number}'
+        assert job.state['progress'] == number
+        assert job.state['total_issues'] == number * 10
+
+
+def test_identical_job_is_reused():
+    target = BlockingTarget()
+    manager = JobManager(target, max_workers=1, max_queued=2)
+
+    job, created = manager.submit(number=1)
+    same_job, created_again = manager.submit(number=1)
+    assert created and not created_again
+    assert same_job is job
+
+    target.release.set()
+    wait_for(lambda: job.status not in ACTIVE_STATUSES)
+
+
+def test_full_queue_is_reported_to_the_user(workdir, monkeypatch):
+    from app import create_app
+    from routes import analysis_routes
+
+    def refuse(**params):
+        raise JobQueueFull('Job queue is full (20 jobs waiting)')
+
+    monkeypatch.setattr(analysis_routes.job_manager, 'submit', refuse)
+    client = create_app().test_client()
+
+    response = client.post('/start_analysis', data={'data_source': 'jira', 'use_filter': 'yes'})
+
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == str(analysis_routes.QUEUE_FULL_RETRY_AFTER)
+    assert 'очередь анализов заполнена' in response.get_data(as_text=True)
+
+
+def test_status_mapping_is_passed_to_the_analysis(workdir, monkeypatch):
+    from app import create_app
+    from routes import analysis_routes
+
+    submitted = []
+    monkeypatch.setattr(analysis_routes.job_manager, 'submit', lambda **params: submitted.append(params))
+    client = create_app().test_client()
+
+    client.post('/start_analysis', data={'data_source': 'jira', 'status_mapping': '10001 = open\nIn Review = Closed\n'})
+    client.post('/start_analysis', data={'data_source': 'jira'})
+    response = client.post('/start_analysis', data={'data_source': 'jira', 'status_mapping': 'In Review = later'})
+
+    assert [params['status_mapping'] for params in submitted] == [{'10001': 'open', 'In Review': 'closed'}, None]
+    assert response.status_code == 400
+    assert 'неверное сопоставление статусов' in response.get_data(as_text=True)
+
+
+def test_jobs_with_same_status_mapping_are_identical():
+    target = BlockingTarget()
+    manager = JobManager(target, max_workers=1, max_queued=2)
+
+    job, _ = manager.submit(number=1, status_mapping={'Review': 'open', '3': 'closed'})
+    same_job, created = manager.submit(number=1, status_mapping={'3': 'closed', 'Review': 'open'})
+    assert same_job is job and not created
+
+    target.release.set()
+    wait_for(lambda: job.status not in ACTIVE_STATUSES)
@@ -0,0 +1,59 @@
+import pytest
+
+from benchmarks.legacy_report import write_legacy_report, write_current_report, read_report
+from benchmarks.micro import build_issue_frame
+from modules.data_processor import get_improved_open_statuses, get_status_categories
+from modules.metrics import compute_issue_metrics
+
+# Size of the fixed dataset, large enough for open, closed and untouched issues in every project
+ISSUE_COUNT = 2000
+
+
+@pytest.fixture(scope='module', params=['categorical', 'object'])
+def df(request):
+    """Processed issues of a fixed synthetic dataset, with categorical or plain string columns"""
+    df = build_issue_frame(ISSUE_COUNT, seed=1)
+    # Synthetic open issues have no worklogs, log time on every third issue so open tasks are not empty
+    df['time_spent_hours'] = df['time_spent_hours'].where(df.index % 3 != 0, 2.5)
+    if request.param == 'object':
+        df = df.astype({column: object for column in ('project', 'issue_type', 'status', 'status_category')})
+    return df
+
+
+def test_metrics_match_per_helper_aggregates(df):
+    metrics = compute_issue_metrics(df)
+
+    by_project = df.groupby('project', observed=True)
+    assert metrics.project_counts.to_dict() == df['project'].value_counts().to_dict()
+    assert list(metrics.project_counts.index) == list(df['project'].value_counts().index)
+    assert metrics.by_project['original_estimate_hours'].to_dict() == \
+        pytest.approx(by_project['original_estimate_hours'].sum().to_dict())
+    assert metrics.by_project['time_spent_hours'].to_dict() == pytest.approx(by_project['time_spent_hours'].sum().to_dict())
+
+    open_tasks = df[df['status'].isin(get_improved_open_statuses(df)) & (df['time_spent_hours'] > 0)]
+    closed_tasks = df[df['status'].isin(get_status_categories(df)['closed_statuses']) &
+                      (~df['has_comments']) & (~df['has_attachments'])]
+    no_transitions_tasks = df[df['no_transitions']]
+    assert not open_tasks.empty and not closed_tasks.empty and not no_transitions_tasks.empty
+
+    assert metrics.open_tasks['issue_key'].tolist() == open_tasks['issue_key'].tolist()
+    assert metrics.closed_tasks['issue_key'].tolist() == closed_tasks['issue_key'].tolist()
+    assert metrics.no_transitions_tasks['issue_key'].tolist() == no_transitions_tasks['issue_key'].tolist()
+    assert metrics.project_column('open_tasks_time_spent_hours', only_with='open_tasks').to_dict() == \
+        pytest.approx(open_tasks.groupby('project', observed=True)['time_spent_hours'].sum().to_dict())
+    assert metrics.project_column('closed_tasks', only_with='closed_tasks').to_dict() == \
+        closed_tasks.groupby('project', observed=True).size().to_dict()
+    assert {project: list(keys) for project, keys in metrics.issue_keys_by_project.items()} == \
+        {project: df.loc[df['project'] == project, 'issue_key'].tolist() for project in df['project'].unique()}
+
+
+def test_report_files_match_legacy_writer(df, tmp_path):
+    write_legacy_report(df, str(tmp_path / 'legacy'))
+    write_current_report(df, str(tmp_path / 'current'))
+
+    legacy = read_report(str(tmp_path / 'legacy'))
+    current = read_report(str(tmp_path / 'current'))
+
+    assert all(content is not None for content in legacy.values())
+    for name in legacy:
+        assert current[name] == legacy[name], name
@@ -0,0 +1,69 @@
+import os
+
+import pytest
+
+from modules import render_cache
+from modules.render_cache import RenderCache, save_chart_specs
+from modules.visualization import bar_chart_spec
+
+# Signature every PNG file starts with
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+
+def make_spec(name, path, value=1):
+    return bar_chart_spec(name, path, ['A', 'B'], [value, 2], f"Chart {name}")
+
+
+@pytest.fixture
+def renders(monkeypatch):
+    """Count the charts rendered by the cache"""
+    calls = []
+    map_in_pool = render_cache.map_in_pool
+
+    def counting_map_in_pool(function, items):
+        calls.extend(items)
+        return map_in_pool(function, items)
+
+    monkeypatch.setattr(render_cache, 'map_in_pool', counting_map_in_pool)
+    return calls
+
+
+def test_image_is_rendered_once(tmp_path, renders):
+    cache = RenderCache(str(tmp_path / 'cache'))
+    spec = make_spec('chart', str(tmp_path / 'report' / 'chart.png'))
+
+    image = cache.get_image(spec)
+
+    assert image.startswith(PNG_SIGNATURE)
+    assert cache.get_image(spec) == image
+    assert len(renders) == 1
+
+
+def test_evicted_image_is_still_returned(tmp_path, renders):
+    # Every render evicts all images, including the one just rendered
+    cache = RenderCache(str(tmp_path / 'cache'), max_bytes=1)
+    spec = make_spec('chart', str(tmp_path / 'report' / 'chart.png'))
+
+    assert cache.get_image(spec).startswith(PNG_SIGNATURE)
+    assert cache.get_image(make_spec('other', str(tmp_path / 'report' / 'other.png'), 3)).startswith(PNG_SIGNATURE)
+    assert not [name for name in os.listdir(cache.path) if name.endswith('.png')]
+
+    # Rendered again rather than failing on the missing file
+    assert cache.get_image(spec).startswith(PNG_SIGNATURE)
+    assert len(renders) == 3
+
+
+def test_chart_route_serves_evicted_chart(workdir, monkeypatch):
+    import config
+    from app import create_app
+
+    monkeypatch.setattr(config, 'render_cache_max_bytes', 1, raising=False)
+    report_dir = os.path.join('jira_charts', '20240101_000000')
+    save_chart_specs([make_spec('chart', os.path.join(report_dir, 'chart.png'))], report_dir)
+    client = create_app().test_client()
+
+    for _ in range(2):
+        response = client.get('/charts/20240101_000000/chart.png')
+        assert response.status_code == 200
+        assert response.mimetype == 'image/png'
+        assert response.data.startswith(PNG_SIGNATURE)
@@ -0,0 +1,118 @@
+import gzip
+import json
+
+import pytest
+
+from benchmarks.dataset import SyntheticDataset
+from modules import report_store
+from modules.analysis import prepare_chart_data
+from modules.changelog_parser import ChangelogStage
+from modules.data_processor import IssueFrameBuilder
+from modules.metrics import compute_issue_metrics
+from modules.report_store import (write_json, read_json, save_issue_frame, load_issue_frame, save_frame, load_frame,
+                                  STATUS_TIMELINE_FRAME, LEGACY_ISSUES_FILE, ISSUES_JSON_FILE)
+from modules.status_classifier import get_status_classifier
+from modules.status_timeline import build_status_timeline, compute_flow_metrics
+from modules.visualization import create_visualizations
+
+# Size of the fixed dataset
+ISSUE_COUNT = 300
+
+
+@pytest.fixture(scope='module')
+def frames():
+    """Processed issues and status timeline of a fixed synthetic dataset"""
+    dataset = SyntheticDataset(ISSUE_COUNT)
+    issues = [dataset.issue(index, expand=('changelog',)) for index in range(len(dataset))]
+
+    builder = IssueFrameBuilder()
+    builder.add_page(issues)
+    df = get_status_classifier().add_category_column(builder.build())
+
+    changelog_stage = ChangelogStage(use_pool=False)
+    changelog_stage.add_page(issues)
+    timeline_df = build_status_timeline(changelog_stage.records())[1]
+    return df, timeline_df
+
+
+def write_report(df, timeline_df, report_dir):
+    """Write summary.json and chart_data.json of the frames as run_analysis does"""
+    classifier = get_status_classifier()
+    metrics = compute_issue_metrics(df, classifier)
+    flow = compute_flow_metrics(timeline_df, df, classifier)
+
+    (report_dir / 'data').mkdir(parents=True, exist_ok=True)
+    create_visualizations(df, str(report_dir), prerender=False, metrics=metrics, flow=flow)
+    write_json(str(report_dir / 'data' / 'chart_data.json'),
+               prepare_chart_data(df, date_from='2024-01-01', metrics=metrics, flow=flow))
+
+
+def legacy_content(report_dir):
+    """Rewrite the report files with the pretty-printed writer used before write_json and read them back"""
+    content = {}
+    for name in ('summary.json', 'data/chart_data.json'):
+        path = report_dir / name
+        data = read_json(str(path))
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=4, ensure_ascii=False)
+        with open(path, 'r', encoding='utf-8') as f:
+            content[name] = json.load(f)
+    return content
+
+
+@pytest.fixture(scope='module')
+def legacy_report(frames, tmp_path_factory):
+    """Report files written straight from the frames in memory, as before the report store"""
+    report_dir = tmp_path_factory.mktemp('legacy')
+    write_report(*frames, report_dir)
+    return legacy_content(report_dir)
+
+
+@pytest.mark.parametrize('use_feather', [True, False], ids=['feather', 'gzip-json'])
+def test_stored_frames_give_same_report(frames, legacy_report, tmp_path, monkeypatch, use_feather):
+    if not use_feather:
+        monkeypatch.setattr(report_store, 'feather', None)
+    df, timeline_df = frames
+
+    stored_dir = tmp_path / 'stored'
+    (stored_dir / 'data').mkdir(parents=True)
+    issues_path = save_issue_frame(df, str(stored_dir / 'data'))
+    save_frame(timeline_df, str(stored_dir / 'data'), STATUS_TIMELINE_FRAME)
+    assert issues_path.endswith('.feather') == use_feather
+
+    report_dir = tmp_path / 'report'
+    write_report(load_issue_frame(str(stored_dir)), load_frame(str(stored_dir), STATUS_TIMELINE_FRAME), report_dir)
+
+    assert read_json(str(report_dir / 'summary.json')) == legacy_report['summary.json']
+    assert read_json(str(report_dir / 'data' / 'chart_data.json')) == legacy_report['data/chart_data.json']
+
+
+def test_compact_json_is_smaller_with_same_content(frames, tmp_path):
+    write_report(*frames, tmp_path)
+    compact_size = (tmp_path / 'summary.json').stat().st_size
+    compact = read_json(str(tmp_path / 'summary.json'))
+
+    assert legacy_content(tmp_path)['summary.json'] == compact
+    assert (tmp_path / 'summary.json').stat().st_size > compact_size
+
+
+def test_legacy_issue_file_is_read(frames, tmp_path):
+    df = frames[0]
+    (tmp_path / 'data').mkdir()
+    df.to_json(str(tmp_path / 'data' / LEGACY_ISSUES_FILE), orient='records', date_format='iso')
+
+    loaded = load_issue_frame(str(tmp_path))
+
+    assert loaded['issue_key'].tolist() == df['issue_key'].tolist()
+    assert loaded['time_spent_hours'].tolist() == pytest.approx(df['time_spent_hours'].tolist())
+
+
+def test_gzip_records_file_is_read(frames, tmp_path):
+    df = frames[0]
+    (tmp_path / 'data').mkdir()
+    with gzip.open(tmp_path / 'data' / ISSUES_JSON_FILE, 'wt', encoding='utf-8') as f:
+        df.to_json(f, orient='records', date_format='iso')
+
+    loaded = load_issue_frame(str(tmp_path))
+
+    assert loaded['issue_key'].tolist() == df['issue_key'].tolist()
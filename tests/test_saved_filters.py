@@ -0,0 +1,99 @@
+import threading
+
+import pytest
+
+from modules import saved_filters
+from modules.jira_analyzer import JiraAnalyzer
+from modules.key_index import get_saved_filter, get_report_filter_ids
+from modules.saved_filters import get_slice_filter, delete_report_filters
+
+
+@pytest.fixture
+def report_dir(tmp_path):
+    # Filter names include the report folder, which must differ between tests sharing the fake Jira
+    (tmp_path / tmp_path.name / 'data').mkdir(parents=True)
+    return str(tmp_path / tmp_path.name)
+
+
+@pytest.fixture
+def analyzer(fake_jira):
+    return JiraAnalyzer(jira_url=fake_jira.url, check_connection=False)
+
+
+def work_keys(fake_jira, count, skip=0):
+    """Keys of work project issues of the fake Jira"""
+    dataset = fake_jira.dataset
+    return [dataset.key(index) for index in range(skip, skip + count)]
+
+
+def search_keys(analyzer, jql):
+    return sorted(issue['key'] for issue in analyzer.get_issues_by_filter(jql_query=jql, profile='keys'))
+
+
+def test_small_slice_is_one_filter(fake_jira, analyzer, report_dir):
+    keys = work_keys(fake_jira, 150)
+
+    filter_id = get_slice_filter(report_dir, 'open_tasks', 'all', keys, analyzer)
+
+    assert fake_jira.filters[filter_id]['jql'].startswith('issue in (')
+    assert get_saved_filter(report_dir, 'open_tasks', 'all')[2] == []
+    assert search_keys(analyzer, f'filter={filter_id}') == sorted(keys)
+
+
+def test_large_slice_is_split_into_part_filters(fake_jira, analyzer, report_dir, monkeypatch):
+    monkeypatch.setattr(saved_filters, 'FILTER_KEYS_LIMIT', 200)
+    keys = work_keys(fake_jira, 450)
+
+    filter_id = get_slice_filter(report_dir, 'filtered_issues', 'all', keys, analyzer)
+    _, _, part_ids = get_saved_filter(report_dir, 'filtered_issues', 'all')
+
+    assert len(part_ids) == 3
+    assert fake_jira.filters[filter_id]['jql'] == f"filter in ({', '.join(part_ids)})"
+    for part_id in part_ids:
+        assert fake_jira.filters[part_id]['jql'].count('-') <= 200
+    assert search_keys(analyzer, f'filter={filter_id}') == sorted(keys)
+
+    # The same slice reuses the saved filter without any request
+    requests_before = fake_jira.get_stats()['requests']
+    assert get_slice_filter(report_dir, 'filtered_issues', 'all', keys, analyzer) == filter_id
+    assert fake_jira.get_stats()['requests'] == requests_before
+
+
+def test_changed_slice_keeps_filter_id_and_drops_old_parts(fake_jira, analyzer, report_dir, monkeypatch):
+    monkeypatch.setattr(saved_filters, 'FILTER_KEYS_LIMIT', 200)
+    filter_id = get_slice_filter(report_dir, 'filtered_issues', 'NUS', work_keys(fake_jira, 450), analyzer)
+    old_parts = get_saved_filter(report_dir, 'filtered_issues', 'NUS')[2]
+
+    new_keys = work_keys(fake_jira, 120, skip=500)
+    assert get_slice_filter(report_dir, 'filtered_issues', 'NUS', new_keys, analyzer) == filter_id
+
+    assert get_saved_filter(report_dir, 'filtered_issues', 'NUS')[2] == []
+    assert not any(part_id in fake_jira.filters for part_id in old_parts)
+    assert search_keys(analyzer, f'filter={filter_id}') == sorted(new_keys)
+
+
+def test_concurrent_clicks_create_one_filter(fake_jira, analyzer, report_dir):
+    keys = work_keys(fake_jira, 150, skip=300)
+    filters_before = len(fake_jira.filters)
+    results = []
+
+    threads = [threading.Thread(target=lambda: results.append(
+        get_slice_filter(report_dir, 'est_issues', 'all', keys, analyzer))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(set(results)) == 1
+    assert len(fake_jira.filters) == filters_before + 1
+
+
+def test_deleting_report_filters(fake_jira, analyzer, report_dir, monkeypatch):
+    monkeypatch.setattr(saved_filters, 'FILTER_KEYS_LIMIT', 200)
+    get_slice_filter(report_dir, 'filtered_issues', 'all', work_keys(fake_jira, 450), analyzer)
+    get_slice_filter(report_dir, 'open_tasks', 'all', work_keys(fake_jira, 150), analyzer)
+    filter_ids = get_report_filter_ids(report_dir)
+    assert len(filter_ids) == 5
+
+    assert delete_report_filters(report_dir, analyzer) == 5
+    assert not any(filter_id in fake_jira.filters for filter_id in filter_ids)
@@ -0,0 +1,51 @@
+import pandas as pd
+
+from modules.changelog_parser import parse_issue_changelog, parse_jira_datetime
+from modules.data_processor import status_category_changed
+from modules.status_timeline import build_status_timeline
+
+
+def status_change(created, from_id, from_name, to_id, to_name):
+    return {'created': created, 'items': [{'field': 'status', 'from': from_id, 'fromString': from_name,
+                                           'to': to_id, 'toString': to_name}]}
+
+
+# Dates as Jira sends them, in the server's +0300 time zone
+ISSUE = {
+    'key': 'TEST-1',
+    'fields': {
+        'created': '2024-01-15T10:00:00.000+0300',
+        'statuscategorychangedate': '2024-01-16T09:30:00.000+0300',
+        'status': {'id': '6', 'name': 'Done'}
+    },
+    'changelog': {'histories': [
+        status_change('2024-01-16T09:30:00.000+0300', '3', 'In Progress', '6', 'Done'),
+        status_change('2024-01-15T12:00:00.000+0300', '1', 'Open', '3', 'In Progress')
+    ]}
+}
+
+
+def test_jira_dates_with_offset_are_parsed():
+    assert parse_jira_datetime('2024-01-15T10:00:00.000+0300') == pd.Timestamp('2024-01-15T07:00:00Z').timestamp()
+    assert parse_jira_datetime('2024-01-15T10:00:00.000+0000') == pd.Timestamp('2024-01-15T10:00:00Z').timestamp()
+    assert parse_jira_datetime('2024-01-15') is None
+    assert parse_jira_datetime(None) is None
+
+
+def test_timeline_of_non_utc_changelog():
+    transitions, timeline = build_status_timeline([parse_issue_changelog(ISSUE)],
+                                                  as_of=pd.Timestamp('2024-01-20T00:00:00Z').timestamp())
+
+    assert transitions.loc[0, 'transition_count'] == 2
+    assert transitions.loc[0, 'first_transition'] == pd.Timestamp('2024-01-15T09:00:00Z')
+    assert timeline['status'].tolist() == ['Open', 'In Progress', 'Done']
+    assert timeline['entered_at'].tolist() == [pd.Timestamp('2024-01-15T07:00:00Z'),
+                                               pd.Timestamp('2024-01-15T09:00:00Z'),
+                                               pd.Timestamp('2024-01-16T06:30:00Z')]
+    assert timeline['left_at'].iloc[-1] == pd.Timestamp('2024-01-20T00:00:00Z')
+
+
+def test_status_category_change_with_offset():
+    assert status_category_changed(ISSUE)
+    unchanged = {'fields': dict(ISSUE['fields'], statuscategorychangedate=ISSUE['fields']['created'])}
+    assert not status_category_changed(unchanged)
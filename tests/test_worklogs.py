@@ -0,0 +1,99 @@
+from urllib.parse import urlsplit, parse_qs
+
+import pytest
+
+from modules import jira_analyzer
+from modules.data_processor import IssueFrameBuilder, apply_worklog_window
+from modules.jira_analyzer import JiraAnalyzer
+
+# Worklogs of the truncated issue, one hour on each day of January 2024
+WORKLOGS = [{'id': str(day), 'started': f"2024-01-{day:02d}T10:00:00.000+0300", 'timeSpentSeconds': 3600}
+            for day in range(1, 26)]
+
+# Number of worklogs Jira embeds in search results
+EMBEDDED_WORKLOGS = 20
+
+
+def make_issue(key, worklogs, total):
+    return {'key': key, 'fields': {
+        'project': {'key': 'TEST'},
+        'issuetype': {'name': 'Task'},
+        'status': {'id': '1', 'name': 'Open', 'statusCategory': {'name': 'To Do'}},
+        'created': '2024-01-01T09:00:00.000+0300',
+        'timespent': total * 3600,
+        'worklog': {'startAt': 0, 'maxResults': EMBEDDED_WORKLOGS, 'total': total, 'worklogs': worklogs}
+    }}
+
+
+def handler(method, path, body):
+    url = urlsplit(path)
+    if url.path.endswith('/search'):
+        issues = [make_issue('TEST-1', WORKLOGS[:EMBEDDED_WORKLOGS], len(WORKLOGS)),
+                  make_issue('TEST-2', WORKLOGS[19:22], 3)]
+        return 200, {'startAt': 0, 'maxResults': 50, 'total': len(issues), 'issues': issues}
+    if url.path == '/rest/api/2/issue/TEST-1/worklog':
+        params = parse_qs(url.query)
+        start_at = int(params['startAt'][0])
+        max_results = int(params['maxResults'][0])
+        return 200, {'startAt': start_at, 'maxResults': max_results, 'total': len(WORKLOGS),
+                     'worklogs': WORKLOGS[start_at:start_at + max_results]}
+    if url.path == '/rest/api/2/issue/TEST-3/worklog':
+        # Body cut off by a proxy
+        return 200, '{"startAt": 0, "worklogs": [{"id": '
+    return 404, {'errorMessages': ['Not found']}
+
+
+@pytest.fixture
+def stub(stub_jira, monkeypatch):
+    monkeypatch.setattr(jira_analyzer, 'WORKLOG_PAGE_SIZE', 10)
+    return stub_jira(handler)
+
+
+def test_truncated_worklogs_are_paged(stub):
+    analyzer = JiraAnalyzer(jira_url=stub.url, check_connection=False)
+
+    worklogs = analyzer.get_issue_worklogs(['TEST-1'])
+
+    assert [worklog['id'] for worklog in worklogs['TEST-1']] == [worklog['id'] for worklog in WORKLOGS]
+    pages = [request['path'] for request in stub.requests if '/worklog' in request['path']]
+    assert len(pages) == 3
+    assert all('maxResults=10' in page for page in pages)
+
+
+def test_unparsable_worklogs_skip_only_their_issue(stub):
+    analyzer = JiraAnalyzer(jira_url=stub.url, check_connection=False)
+
+    worklogs = analyzer.get_issue_worklogs(['TEST-3', 'TEST-1'])
+
+    assert list(worklogs) == ['TEST-1']
+    assert len(worklogs['TEST-1']) == len(WORKLOGS)
+
+
+def test_window_counts_worklogs_missing_from_search(stub):
+    analyzer = JiraAnalyzer(jira_url=stub.url, check_connection=False)
+    builder = IssueFrameBuilder()
+    builder.add_page(analyzer.get_issues_by_filter(jql_query='project = TEST'))
+    df = builder.build()
+
+    # Only the issue whose embedded list is partial is fetched again
+    assert builder.get_truncated_worklog_keys() == ['TEST-1']
+    for issue_key, worklogs in analyzer.get_issue_worklogs(builder.get_truncated_worklog_keys()).items():
+        builder.set_full_worklogs(issue_key, worklogs)
+
+    df = apply_worklog_window(df, builder.build_worklogs(), '2024-01-21', '2024-01-31').set_index('issue_key')
+
+    # January 21-25 were logged on TEST-1 but are not in the search results
+    assert df.loc['TEST-1', 'time_spent_hours'] == pytest.approx(5.0)
+    assert df.loc['TEST-1', 'time_spent_total_hours'] == pytest.approx(25.0)
+    assert df.loc['TEST-2', 'time_spent_hours'] == pytest.approx(2.0)
+
+
+def test_window_without_full_worklogs_counts_embedded_only(stub):
+    analyzer = JiraAnalyzer(jira_url=stub.url, check_connection=False)
+    builder = IssueFrameBuilder()
+    builder.add_page(analyzer.get_issues_by_filter(jql_query='project = TEST'))
+    df = builder.build()
+
+    df = apply_worklog_window(df, builder.build_worklogs(), '2024-01-21', '2024-01-31').set_index('issue_key')
+
+    assert df.loc['TEST-1', 'time_spent_hours'] == 0.0